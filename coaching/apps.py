@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CoachingConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'coaching'
+    
+    def ready(self):
+        """Import signal handlers when app is ready"""
+        import coaching.signals  # noqa
@@ -0,0 +1,199 @@
+"""
+Coach availability engine.
+
+Free booking slots are computed by sweeping each coach's weekly
+``CoachAvailability`` windows against their booked ``CoachingSession``
+intervals. Booked intervals are loaded once for the whole date range, merged
+into a sorted list of disjoint intervals and walked with a single pointer per
+window, so a week or a month costs two queries however many days or sessions
+it spans.
+
+Results are cached per coach and day under a per-coach generation (the same
+scheme as ``TournamentCache``): booking, cancelling or editing availability
+bumps the generation after commit and every cached day becomes unreachable
+at once. The "bookable from one hour from now" cut-off is applied when
+reading, so cached days stay valid as time passes.
+"""
+
+import bisect
+import logging
+import time
+from collections import defaultdict
+from datetime import datetime, time as dt_time, timedelta
+
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import CoachAvailability, CoachingSession
+
+logger = logging.getLogger(__name__)
+
+# Sessions in these states occupy the coach's calendar
+BOOKED_STATUSES = ('pending', 'confirmed', 'in_progress')
+
+
+class AvailabilityEngine:
+    """Free slot lookup for one or many coaches over a date range"""
+
+    CACHE_TTL = 600  # 10 minutes
+    GENERATION_KEY = 'coach_slots_gen:{coach_id}'
+    DAY_KEY = 'coach_slots:{coach_id}:g{generation}:{day}'
+
+    # Slots must start at least this far in the future
+    BOOKING_BUFFER = timedelta(hours=1)
+    DEFAULT_INCREMENT = 30
+    MAX_RANGE_DAYS = 62
+    NEXT_SLOT_HORIZON_DAYS = 28
+
+    @classmethod
+    def get_slots(cls, coach, start_date, end_date, now=None):
+        """``{date: [slot start datetimes]}`` for every day in the range"""
+        return cls.get_slots_for_coaches([coach], start_date, end_date, now)[coach.id]
+
+    @classmethod
+    def get_slots_for_coaches(cls, coaches, start_date, end_date, now=None):
+        """
+        ``{coach_id: {date: [slot start datetimes]}}`` for every day in the
+        range. Cached days are reused; all missing coaches are computed
+        together with two queries.
+        """
+        now = now or timezone.now()
+        days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+        coaches = {coach.id: coach for coach in coaches}
+
+        generations = cls._get_generations(coaches)
+        keys = {
+            (coach_id, day): cls.DAY_KEY.format(coach_id=coach_id, generation=generations[coach_id], day=day.isoformat())
+            for coach_id in coaches for day in days
+        }
+        cached = cache.get_many(list(keys.values()))
+
+        missing = {coach_id for (coach_id, day), key in keys.items() if key not in cached}
+        computed = {}
+        if missing:
+            computed = cls._compute([coaches[coach_id] for coach_id in missing], days[0], days[-1])
+            cache.set_many({
+                keys[(coach_id, day)]: computed[coach_id][day]
+                for coach_id in missing for day in days
+            }, cls.CACHE_TTL)
+
+        earliest = now + cls.BOOKING_BUFFER
+        result = {}
+        for coach_id in coaches:
+            result[coach_id] = {}
+            for day in days:
+                if coach_id in missing:
+                    slots = computed[coach_id][day]
+                else:
+                    slots = cached[keys[(coach_id, day)]]
+                result[coach_id][day] = [slot for slot in slots if slot >= earliest]
+        return result
+
+    @classmethod
+    def get_next_slots(cls, coaches, now=None):
+        """``{coach_id: first free slot or None}`` within the lookahead horizon"""
+        now = now or timezone.now()
+        today = timezone.localdate(now)
+        end = today + timedelta(days=cls.NEXT_SLOT_HORIZON_DAYS - 1)
+
+        next_slots = {}
+        for coach_id, days in cls.get_slots_for_coaches(coaches, today, end, now).items():
+            next_slots[coach_id] = next((slots[0] for slots in days.values() if slots), None)
+        return next_slots
+
+    @classmethod
+    def get_generation(cls, coach_id):
+        return cls._get_generations({coach_id: None})[coach_id]
+
+    @classmethod
+    def invalidate(cls, coach_id):
+        """Make every cached day of a coach unreachable"""
+        gen_key = cls.GENERATION_KEY.format(coach_id=coach_id)
+        try:
+            try:
+                cache.incr(gen_key)
+            except ValueError:
+                # Counter missing (never used or evicted): seed a fresh one
+                cache.add(gen_key, time.time_ns(), None)
+        except Exception as e:
+            logger.warning(f"Slot cache invalidation failed for coach {coach_id}: {e}")
+
+    @classmethod
+    def _get_generations(cls, coach_ids):
+        gen_keys = {coach_id: cls.GENERATION_KEY.format(coach_id=coach_id) for coach_id in coach_ids}
+        stored = cache.get_many(list(gen_keys.values()))
+        generations = {}
+        for coach_id, gen_key in gen_keys.items():
+            if gen_key not in stored:
+                # Seeded from the clock so it never falls back to a used generation
+                cache.add(gen_key, time.time_ns(), None)
+                stored[gen_key] = cache.get(gen_key)
+            generations[coach_id] = stored[gen_key]
+        return generations
+
+    @classmethod
+    def _compute(cls, coaches, start_date, end_date):
+        """Sweep availability windows against booked intervals (two queries)"""
+        coach_ids = [coach.id for coach in coaches]
+        range_start = timezone.make_aware(datetime.combine(start_date, dt_time.min))
+        range_end = timezone.make_aware(datetime.combine(end_date + timedelta(days=1), dt_time.min))
+
+        windows = defaultdict(lambda: defaultdict(list))
+        for coach_id, weekday, start_time, end_time in CoachAvailability.objects.filter(
+            coach_id__in=coach_ids, is_active=True
+        ).order_by('start_time').values_list('coach_id', 'weekday', 'start_time', 'end_time'):
+            windows[coach_id][weekday].append((start_time, end_time))
+
+        booked = defaultdict(list)
+        for coach_id, session_start, session_end in CoachingSession.objects.filter(
+            coach_id__in=coach_ids,
+            status__in=BOOKED_STATUSES,
+            scheduled_start__lt=range_end,
+            scheduled_end__gt=range_start,
+        ).order_by('scheduled_start').values_list('coach_id', 'scheduled_start', 'scheduled_end'):
+            booked[coach_id].append((session_start, session_end))
+
+        result = {}
+        for coach in coaches:
+            increment = coach.session_increment if coach.session_increment and coach.session_increment > 0 else cls.DEFAULT_INCREMENT
+            result[coach.id] = cls._sweep(
+                windows[coach.id], cls._merge(booked[coach.id]), start_date, end_date, timedelta(minutes=increment)
+            )
+        return result
+
+    @staticmethod
+    def _merge(intervals):
+        """Sorted, overlapping intervals merged into disjoint ones"""
+        merged = []
+        for start, end in intervals:
+            if merged and start <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        return merged
+
+    @staticmethod
+    def _sweep(weekly_windows, booked, start_date, end_date, step):
+        """Slots of length ``step`` inside the windows that miss every booked interval"""
+        booked_ends = [end for start, end in booked]
+        days = {}
+        day = start_date
+        while day <= end_date:
+            slots = []
+            for start_time, end_time in weekly_windows.get(day.weekday(), ()):
+                current = timezone.make_aware(datetime.combine(day, start_time))
+                window_end = timezone.make_aware(datetime.combine(day, end_time))
+                # First booked interval that ends after the window opens
+                i = bisect.bisect_right(booked_ends, current)
+                while current + step <= window_end:
+                    slot_end = current + step
+                    while i < len(booked) and booked[i][1] <= current:
+                        i += 1
+                    if i == len(booked) or booked[i][0] >= slot_end:
+                        slots.append(current)
+                    current = slot_end
+            # Overlapping windows yield the same slot twice
+            days[day] = sorted(set(slots))
+            day += timedelta(days=1)
+        return days
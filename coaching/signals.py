@@ -0,0 +1,45 @@
+"""
+Signal handlers for the coaching app.
+
+Booked sessions, weekly availability and session settings feed the cached
+free slots in ``coaching.availability``; any change to them drops the
+coach's cached days after commit.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from coaching.availability import AvailabilityEngine
+from coaching.models import CoachAvailability, CoachingSession, CoachProfile
+
+
+def _invalidate_after_commit(coach_id):
+    transaction.on_commit(lambda: AvailabilityEngine.invalidate(coach_id))
+
+
+@receiver(post_save, sender=CoachingSession)
+@receiver(post_delete, sender=CoachingSession)
+def invalidate_slots_for_session(sender, instance, raw=False, **kwargs):
+    """Bookings, cancellations and reschedules change the free slots"""
+    if raw:
+        return
+    _invalidate_after_commit(instance.coach_id)
+
+
+@receiver(post_save, sender=CoachAvailability)
+@receiver(post_delete, sender=CoachAvailability)
+def invalidate_slots_for_availability(sender, instance, raw=False, **kwargs):
+    """Edited weekly windows change the free slots"""
+    if raw:
+        return
+    _invalidate_after_commit(instance.coach_id)
+
+
+@receiver(post_save, sender=CoachProfile)
+def invalidate_slots_for_profile(sender, instance, raw=False, created=False, update_fields=None, **kwargs):
+    """The booking increment shapes every slot"""
+    if raw or created:
+        return
+    if update_fields is not None and 'session_increment' not in update_fields:
+        return
+    _invalidate_after_commit(instance.id)
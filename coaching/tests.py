@@ -1,3 +1,120 @@
-from django.test import TestCase
+# coaching/tests.py
+"""Tests for the coach availability engine.
+Weekly windows are swept against booked sessions for a whole range with two
+queries, cached days are reused until a booking changes them, and the coach
+list gets every coach's next free slot in one request.
+"""
 
-# Create your tests here.
+from datetime import datetime, time, timedelta
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from coaching.availability import AvailabilityEngine
+from coaching.models import CoachAvailability, CoachingSession, CoachProfile
+from core.models import Game, User
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class AvailabilityEngineTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.game = Game.objects.create(name='Coaching Game', slug='coaching-game', genre='other')
+        self.student = User.objects.create_user(
+            email='student@example.com', password='testpass123', username='student'
+        )
+        self.coach = self._make_coach('coach')
+
+        # Two Mondays, at least a week out
+        today = timezone.localdate()
+        self.monday = today + timedelta(days=7 + (7 - today.weekday()) % 7)
+        self.next_monday = self.monday + timedelta(days=7)
+
+    def _make_coach(self, username):
+        user = User.objects.create_user(
+            email=f'{username}@example.com', password='testpass123', username=username
+        )
+        coach = CoachProfile.objects.create(
+            user=user, bio='Coach', hourly_rate=50, session_increment=60,
+            is_verified=True, status='active'
+        )
+        CoachAvailability.objects.create(coach=coach, weekday=0, start_time=time(10), end_time=time(12))
+        return coach
+
+    def _at(self, day, hour, minute=0):
+        return timezone.make_aware(datetime.combine(day, time(hour, minute)))
+
+    def _book(self, start, minutes=30):
+        with self.captureOnCommitCallbacks(execute=True):
+            return CoachingSession.objects.create(
+                coach=self.coach, student=self.student, game=self.game,
+                scheduled_start=start, scheduled_end=start + timedelta(minutes=minutes),
+                duration_minutes=minutes, price=25, status='confirmed'
+            )
+
+    def test_range_is_swept_with_two_queries_and_cached(self):
+        self._book(self._at(self.monday, 10, 30))
+
+        with self.assertNumQueries(2):
+            days = AvailabilityEngine.get_slots(self.coach, self.monday, self.next_monday)
+
+        self.assertEqual(len(days), 8)
+        self.assertEqual(days[self.monday], [self._at(self.monday, 11)])
+        self.assertEqual(days[self.next_monday], [self._at(self.next_monday, 10), self._at(self.next_monday, 11)])
+        self.assertEqual(days[self.monday + timedelta(days=1)], [])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(AvailabilityEngine.get_slots(self.coach, self.monday, self.next_monday), days)
+
+    def test_booking_and_cancellation_invalidate_cached_slots(self):
+        AvailabilityEngine.get_slots(self.coach, self.monday, self.monday)
+
+        session = self._book(self._at(self.monday, 11), minutes=60)
+        self.assertEqual(
+            AvailabilityEngine.get_slots(self.coach, self.monday, self.monday)[self.monday],
+            [self._at(self.monday, 10)]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            session.status = 'cancelled'
+            session.save()
+        self.assertEqual(
+            len(AvailabilityEngine.get_slots(self.coach, self.monday, self.monday)[self.monday]), 2
+        )
+
+    def test_slots_inside_booking_buffer_are_hidden(self):
+        now = self._at(self.monday, 9, 30)
+        days = AvailabilityEngine.get_slots(self.coach, self.monday, self.monday, now=now)
+        self.assertEqual(days[self.monday], [self._at(self.monday, 11)])
+
+    def test_range_endpoint(self):
+        url = reverse('coaching:available_slots', kwargs={'coach_pk': self.coach.pk})
+
+        data = self.client.get(url, {'start': self.monday.isoformat(), 'end': self.next_monday.isoformat()}).json()
+        self.assertEqual(len(data['days']), 8)
+        self.assertEqual(len(data['days'][self.monday.isoformat()]), 2)
+
+        single = self.client.get(url, {'date': self.monday.isoformat()}).json()
+        self.assertEqual(single['slots'], data['days'][self.monday.isoformat()])
+
+        too_long = self.client.get(url, {'start': self.monday.isoformat(),
+                                         'end': (self.monday + timedelta(days=90)).isoformat()})
+        self.assertEqual(too_long.status_code, 400)
+
+    def test_next_slots_for_coach_list_in_one_request(self):
+        other = self._make_coach('other')
+        CoachAvailability.objects.filter(coach=other).delete()
+
+        # Coach lookup, availability windows, booked sessions
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                reverse('coaching:next_available_slots'), {'coaches': f'{self.coach.pk},{other.pk}'}
+            )
+
+        next_slots = response.json()['next_slots']
+        self.assertIsNone(next_slots[str(other.pk)])
+        self.assertIsNotNone(next_slots[str(self.coach.pk)])
@@ -31,4 +31,5 @@ urlpatterns = [
     
     # API endpoints
     path('api/coach/<uuid:coach_pk>/slots/', views.get_available_slots, name='available_slots'),
+    path('api/coaches/next-slots/', views.get_next_available_slots, name='next_available_slots'),
 ]
\ No newline at end of file
@@ -9,6 +9,9 @@ from django.utils import timezone
 from django.http import JsonResponse, HttpResponseForbidden
 from django.db.models import Q, Avg, Count
 from datetime import datetime, timedelta
+import logging
+import uuid
+from .availability import AvailabilityEngine
 from .models import (CoachProfile, CoachGameExpertise, CoachAvailability,
                      CoachingSession, SessionReview, CoachingPackage)
 from .forms import (CoachProfileForm, AvailabilityFormSet, BookingForm,
@@ -19,6 +22,8 @@ from store.managers import PaystackPaymentProcessor, PaymentProcessorError
 
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
+logger = logging.getLogger(__name__)
+
 
 class CoachListView(ListView):
     """List all active coaches"""
@@ -232,8 +237,6 @@ def book_session(request, coach_pk):
                 messages.error(request, f'Payment error: {str(e)}')
                 return redirect('coaching:book_session', coach_pk=coach_pk)
         else:
-            import logging
-            logger = logging.getLogger(__name__)
             logger.warning(f"BookingForm invalid: {form.errors.as_json()}")
     else:
         form = BookingForm(coach=coach)
@@ -529,93 +532,79 @@ def purchase_package(request, pk):
     return render(request, 'coaching/purchase_package.html', {'package': package})
 
 
+def _slot_json(slot):
+    local = timezone.localtime(slot)
+    return {
+        'time': local.strftime('%I:%M %p'),  # 12-hour format
+        'datetime': local.isoformat()
+    }
+
+
 def get_available_slots(request, coach_pk):
-    """API endpoint to get available time slots"""
+    """
+    API endpoint to get available time slots.
+    
+    ``?date=YYYY-MM-DD`` returns ``{'slots': [...]}`` for one day;
+    ``?start=YYYY-MM-DD&end=YYYY-MM-DD`` returns ``{'days': {date: [...]}}``
+    for a whole week or month at once.
+    """
     try:
-        coach = get_object_or_404(CoachProfile, pk=coach_pk)
+        coach = get_object_or_404(CoachProfile.objects.only('id', 'session_increment'), pk=coach_pk)
         date_str = request.GET.get('date')
+        start_str = request.GET.get('start')
+        end_str = request.GET.get('end')
         
-        if not date_str:
+        if not date_str and not (start_str and end_str):
             return JsonResponse({'error': 'Date required'}, status=400)
         
         try:
-            date = datetime.strptime(date_str, '%Y-%m-%d').date()
+            if date_str:
+                start_date = end_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+            else:
+                start_date = datetime.strptime(start_str, '%Y-%m-%d').date()
+                end_date = datetime.strptime(end_str, '%Y-%m-%d').date()
         except ValueError:
             return JsonResponse({'error': 'Invalid date format'}, status=400)
         
-        # Ensure date is not in the past
-        if date < timezone.now().date():
-            return JsonResponse({'slots': []})  # No slots for past dates
+        if end_date < start_date or (end_date - start_date).days >= AvailabilityEngine.MAX_RANGE_DAYS:
+            return JsonResponse({'error': 'Invalid date range'}, status=400)
         
-        # Get coach's availability for this weekday
-        weekday = date.weekday()
-        availability = coach.availability.filter(weekday=weekday, is_active=True)
+        # No slots for past dates
+        today = timezone.localdate()
+        days = {}
+        if end_date >= today:
+            days = AvailabilityEngine.get_slots(coach, max(start_date, today), end_date)
         
-        if not availability.exists():
-            return JsonResponse({'slots': []})  # No availability for this day
+        if date_str:
+            return JsonResponse({'slots': [_slot_json(slot) for slot in days.get(start_date, [])]})
         
-        # Get session increment with fallback
-        session_increment = getattr(coach, 'session_increment', 30)
-        if not session_increment or session_increment <= 0:
-            session_increment = 30
-        
-        # Get existing bookings
-        existing_sessions = CoachingSession.objects.filter(
-            coach=coach,
-            scheduled_start__date=date,
-            status__in=['pending', 'confirmed', 'in_progress']
-        ).values_list('scheduled_start', 'scheduled_end')
-        
-        # Generate available slots
-        slots = []
-        current_time = timezone.now()
-        
-        for avail in availability:
-            # Create timezone-aware datetimes
-            start_datetime = timezone.make_aware(datetime.combine(date, avail.start_time))
-            end_datetime = timezone.make_aware(datetime.combine(date, avail.end_time))
-            
-            # If the date is today, start from current time + buffer
-            if date == timezone.now().date():
-                buffer_time = current_time + timedelta(hours=1)  # 1 hour buffer
-                if start_datetime < buffer_time:
-                    start_datetime = buffer_time
-            
-            current = start_datetime
-            while current < end_datetime:
-                slot_end = current + timedelta(minutes=session_increment)
-                
-                # Don't create slots that extend past availability end time
-                if slot_end > end_datetime:
-                    break
-                
-                # Check if slot is available
-                is_available = True
-                for session_start, session_end in existing_sessions:
-                    # Ensure session times are timezone-aware
-                    if timezone.is_naive(session_start):
-                        session_start = timezone.make_aware(session_start)
-                    if timezone.is_naive(session_end):
-                        session_end = timezone.make_aware(session_end)
-                    
-                    # Check for overlap
-                    if (current < session_end and slot_end > session_start):
-                        is_available = False
-                        break
-                
-                if is_available:
-                    slots.append({
-                        'time': current.strftime('%I:%M %p'),  # 12-hour format
-                        'datetime': current.isoformat()
-                    })
-                
-                current = slot_end
-        
-        return JsonResponse({'slots': slots})
+        return JsonResponse({'days': {
+            (start_date + timedelta(days=offset)).isoformat(): [
+                _slot_json(slot) for slot in days.get(start_date + timedelta(days=offset), [])
+            ]
+            for offset in range((end_date - start_date).days + 1)
+        }})
     
     except Exception as e:
-        # Log the error for debugging
-        print(f"Error in get_available_slots: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return JsonResponse({'error': 'An error occurred loading time slots'}, status=500)
\ No newline at end of file
+        logger.exception(f"Error in get_available_slots: {str(e)}")
+        return JsonResponse({'error': 'An error occurred loading time slots'}, status=500)
+
+
+def get_next_available_slots(request):
+    """
+    API endpoint for the coach list: the next free slot of every coach in
+    ``?coaches=<id>,<id>,...`` with one cached batch lookup.
+    """
+    coach_ids = [coach_id for coach_id in request.GET.get('coaches', '').split(',') if coach_id][:50]
+    try:
+        coach_ids = [uuid.UUID(coach_id) for coach_id in coach_ids]
+    except ValueError:
+        return JsonResponse({'error': 'Invalid coach id'}, status=400)
+    
+    coaches = CoachProfile.objects.filter(pk__in=coach_ids).only('id', 'session_increment')
+    next_slots = AvailabilityEngine.get_next_slots(coaches) if coach_ids else {}
+    
+    return JsonResponse({'next_slots': {
+        str(coach_id): _slot_json(slot) if slot else None
+        for coach_id, slot in next_slots.items()
+    }})
@@ -43,6 +43,26 @@ app.conf.beat_schedule = {
         'task': 'coaching.tasks.send_review_requests',
         'schedule': crontab(hour=10, minute=0),  # Daily at 10 AM
     },
+    'flush-analytics-beacons': {
+        'task': 'tournaments.tasks.flush_analytics_beacons',
+        'schedule': crontab(),  # Every minute
+    },
+    'flush-tournament-counters': {
+        'task': 'tournaments.tasks.flush_tournament_counters',
+        'schedule': crontab(),  # Every minute
+    },
+    'rollup-tournament-analytics': {
+        'task': 'tournaments.tasks.rollup_tournament_analytics',
+        'schedule': crontab(minute=5),  # Every hour
+    },
+    'prune-tournament-analytics': {
+        'task': 'tournaments.tasks.prune_tournament_analytics',
+        'schedule': crontab(hour=4, minute=15),  # Daily at 4:15 AM
+    },
+    'reconcile-notification-unread-counts': {
+        'task': 'notifications.tasks.reconcile_unread_counts',
+        'schedule': crontab(minute='*/15'),  # Every 15 minutes
+    },
     'refresh-all-user-recommendations': {
         'task': 'dashboard.tasks.refresh_all_user_recommendations',
         'schedule': crontab(hour=2, minute=0),  # Daily at 2 AM
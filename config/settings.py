@@ -102,6 +102,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost so query counts and timings cover every other middleware
+    'core.middleware.RequestInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -205,6 +207,10 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Tournament image derivatives (WebP/JPEG sizes): built by a Celery task after
+# upload ('celery') or inline after commit ('sync')
+IMAGE_DERIVATIVES_BACKEND = config('IMAGE_DERIVATIVES_BACKEND', default='celery')
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -399,6 +405,73 @@ COACHING_SESSION_DURATION = 60  # minutes
 POINTS_PER_WIN = 100
 POINTS_PER_LOSS = 25
 
+# ==============================================================================
+# LIVE UPDATES (tournament SSE streams)
+# ==============================================================================
+
+# 'local' keeps subscribers in-process (tests, dev server); 'redis' fans out
+# across worker processes. Serve the stream under ASGI (config.asgi) in production.
+LIVE_UPDATES_BROKER = config('LIVE_UPDATES_BROKER', default='local' if DEBUG else 'redis')
+LIVE_UPDATES_REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
+
+# ==============================================================================
+# ANALYTICS ROLLUPS
+# ==============================================================================
+
+# Raw page views older than this are pruned once rolled up; dashboards read
+# hourly/daily rollups plus the hours since the last rollup run
+ANALYTICS_RAW_RETENTION_DAYS = config('ANALYTICS_RAW_RETENTION_DAYS', default=30, cast=int)
+# Closed hours re-rolled on each run to pick up late engagement updates
+ANALYTICS_ROLLUP_LOOKBACK_HOURS = config('ANALYTICS_ROLLUP_LOOKBACK_HOURS', default=3, cast=int)
+
+# Beacon ingestion buffer: 'local' (in-process), 'redis' (shared list) or
+# 'sync' (write-through). Buffered beacons are bulk-written by a background
+# flusher once a batch fills up or the oldest event reaches the age limit.
+ANALYTICS_BEACON_BUFFER = config('ANALYTICS_BEACON_BUFFER', default='local' if DEBUG else 'redis')
+ANALYTICS_BEACON_REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
+ANALYTICS_BEACON_BATCH_SIZE = config('ANALYTICS_BEACON_BATCH_SIZE', default=500, cast=int)
+ANALYTICS_BEACON_MAX_AGE = config('ANALYTICS_BEACON_MAX_AGE', default=5, cast=float)  # seconds
+# Beacons arriving while this many are pending are dropped and counted
+ANALYTICS_BEACON_MAX_PENDING = config('ANALYTICS_BEACON_MAX_PENDING', default=50000, cast=int)
+
+# ==============================================================================
+# TOURNAMENT COUNTERS
+# ==============================================================================
+
+# View/share counters buffer: 'local' (in-process), 'redis' (shared hashes)
+# or 'sync' (write-through). Buffered deltas are written with F() updates that
+# leave Tournament.updated_at untouched; registrations are always written through.
+TOURNAMENT_COUNTER_BUFFER = config('TOURNAMENT_COUNTER_BUFFER', default='local' if DEBUG else 'redis')
+TOURNAMENT_COUNTER_REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
+# How often the 'local' backend writes its own deltas (seconds)
+TOURNAMENT_COUNTER_FLUSH_INTERVAL = config('TOURNAMENT_COUNTER_FLUSH_INTERVAL', default=60, cast=int)
+
+# ==============================================================================
+# REQUEST INSTRUMENTATION
+# ==============================================================================
+
+# Per-view query counts, repeated SQL and database/cache/template time, served
+# at core:request_metrics and logged for requests over budget or with N+1s
+REQUEST_INSTRUMENTATION = config('REQUEST_INSTRUMENTATION', default=True, cast=bool)
+# Add a Server-Timing header with the same numbers
+REQUEST_INSTRUMENTATION_HEADERS = config('REQUEST_INSTRUMENTATION_HEADERS', default=DEBUG, cast=bool)
+# Query budgets by URL name, for views that cannot use @query_budget
+QUERY_BUDGETS = {}
+# Raise QueryBudgetExceeded instead of logging (core.pytest_plugin enables it)
+QUERY_BUDGET_STRICT = config('QUERY_BUDGET_STRICT', default=False, cast=bool)
+
+# ==============================================================================
+# DASHBOARD SNAPSHOTS
+# ==============================================================================
+
+# Cold dashboard widgets are rendered as placeholders and fetched after the
+# page loads instead of being built before the first byte
+DASHBOARD_LAZY_WIDGETS = config('DASHBOARD_LAZY_WIDGETS', default=True, cast=bool)
+# Rebuild invalidated widgets (and missing recommendations) in Celery
+DASHBOARD_SNAPSHOT_PREWARM = config('DASHBOARD_SNAPSHOT_PREWARM', default=not DEBUG, cast=bool)
+# Placement updates within this window share one tournament achievement check
+ACHIEVEMENT_CHECK_COALESCE_SECONDS = config('ACHIEVEMENT_CHECK_COALESCE_SECONDS', default=30, cast=int)
+
 # ==============================================================================
 # SOCIAL MEDIA URLS (for landing page)
 # ==============================================================================
@@ -451,6 +524,11 @@ MAX_NOTIFICATIONS_PER_USER = 1000
 # Notification expiry (days)
 NOTIFICATION_EXPIRY_DAYS = 90
 
+# Email/push delivery for new notifications: 'celery' (background task) or
+# 'sync' (inline after commit). Each batch shares one SMTP connection.
+NOTIFICATION_DELIVERY_BACKEND = config('NOTIFICATION_DELIVERY_BACKEND', default='celery')
+NOTIFICATION_EMAIL_BATCH_SIZE = config('NOTIFICATION_EMAIL_BATCH_SIZE', default=100, cast=int)
+
 # ==============================================================================
 # SECURITY SETTINGS
 # ==============================================================================
@@ -463,6 +541,11 @@ ACCOUNT_LOCK_DURATION = 3600  # 1 hour
 
 # Rate limiting
 RATE_LIMIT_ENABLED = config('RATE_LIMIT_ENABLED', default=True, cast=bool)
+# Sliding-window counters: 'redis' (one Lua round-trip per hit) or 'cache'
+# (Django cache). Route classes for store.middleware.RateLimitMiddleware can
+# be overridden with RATE_LIMIT_POLICIES (see DEFAULT_RATE_LIMIT_POLICIES).
+RATE_LIMIT_BACKEND = config('RATE_LIMIT_BACKEND', default='cache' if DEBUG else 'redis')
+RATE_LIMIT_REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')
 
 # Session security
 SESSION_COOKIE_SECURE = not DEBUG
@@ -660,6 +743,8 @@ CART_EXPIRY_DAYS = 30  # Days to keep cart for authenticated users
 
 # Order settings
 ORDER_NUMBER_PREFIX = 'EYT'
+# Order numbers reserved per worker at a time (1 keeps numbers gap-free)
+ORDER_NUMBER_BLOCK_SIZE = config('ORDER_NUMBER_BLOCK_SIZE', default=1, cast=int)
 
 # Inventory settings
 LOW_STOCK_THRESHOLD = 10  # Show warning when stock is below this
@@ -19,3 +19,23 @@ DATABASES = {
 
 # Ensure the test runner uses the in‑memory database
 # (Django does this automatically when using SQLite with ':memory:')
+
+# Write analytics beacons through so tests can assert on the stored rows
+ANALYTICS_BEACON_BUFFER = 'sync'
+
+# Write tournament view/share/registration counters through
+TOURNAMENT_COUNTER_BUFFER = 'sync'
+
+# Build dashboard widgets inline so rendered pages contain every section, and
+# keep snapshot refreshes off the Celery broker
+DASHBOARD_LAZY_WIDGETS = False
+DASHBOARD_SNAPSHOT_PREWARM = False
+
+# Build tournament image derivatives inline after commit
+IMAGE_DERIVATIVES_BACKEND = 'sync'
+
+# Count rate limits in the Django cache so tests can reset them with cache.clear()
+RATE_LIMIT_BACKEND = 'cache'
+
+# Deliver notification emails inline after commit
+NOTIFICATION_DELIVERY_BACKEND = 'sync'
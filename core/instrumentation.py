@@ -0,0 +1,311 @@
+"""
+Server-side request instrumentation.
+
+``profile_request()`` records, for everything that runs inside it, the number
+of database queries and the time spent in the database, the cache and
+template rendering. Queries are also grouped by fingerprint (the SQL with
+literals and parameter lists collapsed), so the same statement issued once
+per row -- the usual N+1 pattern -- shows up as one fingerprint with a high
+count.
+
+``RequestInstrumentationMiddleware`` (``core.middleware``) profiles every
+request, aggregates the results per view in ``request_metrics`` (served by
+``core.performance_views.request_metrics``) and logs one line for requests
+that exceed their query budget or repeat a statement ``N_PLUS_ONE_THRESHOLD``
+times. Declare a budget with ``@query_budget(n)`` on a view function or class,
+or in the ``QUERY_BUDGETS`` setting keyed by URL name. With
+``QUERY_BUDGET_STRICT`` enabled (the ``core.pytest_plugin`` turns it on for
+tests) an over-budget request raises ``QueryBudgetExceeded``.
+
+Profiles nest: queries recorded by an inner profile are also added to the
+enclosing one, so a test-level budget still sees the queries of the requests
+it makes.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# A statement repeated this many times in one request is reported as N+1
+N_PLUS_ONE_THRESHOLD = 5
+
+# Cache methods timed while a profile is active
+CACHE_METHODS = (
+    'get', 'set', 'add', 'delete', 'get_many', 'set_many', 'delete_many',
+    'get_or_set', 'incr', 'decr', 'touch', 'has_key',
+)
+
+_current_profile = ContextVar('request_profile', default=None)
+_hooks_installed = False
+_hooks_lock = threading.Lock()
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_LIST = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A view ran more queries than its declared budget (strict mode only)"""
+
+
+def fingerprint(sql):
+    """SQL with literals and placeholder lists collapsed, for grouping repeats"""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class RequestProfile:
+    """Query, cache and template timings for one request (or test)"""
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.queries = 0
+        self.db_time = 0.0
+        self.cache_calls = 0
+        self.cache_time = 0.0
+        self.template_time = 0.0
+        self.fingerprints = Counter()
+        self.started = time.perf_counter()
+        self.duration = None
+        self._cache_depth = 0
+        self._template_depth = 0
+
+    def record_query(self, sql, elapsed):
+        self.queries += 1
+        self.db_time += elapsed
+        self.fingerprints[fingerprint(sql)] += 1
+        if self.parent is not None:
+            self.parent.record_query(sql, elapsed)
+
+    def record_cache(self, elapsed):
+        self.cache_calls += 1
+        self.cache_time += elapsed
+        if self.parent is not None:
+            self.parent.record_cache(elapsed)
+
+    def record_template(self, elapsed):
+        self.template_time += elapsed
+        if self.parent is not None:
+            self.parent.record_template(elapsed)
+
+    def finish(self):
+        self.duration = time.perf_counter() - self.started
+
+    @property
+    def duplicate_queries(self):
+        """Queries beyond the first for every repeated fingerprint"""
+        return sum(count - 1 for count in self.fingerprints.values() if count > 1)
+
+    def repeated(self, threshold=N_PLUS_ONE_THRESHOLD):
+        """``[(fingerprint, count)]`` for statements run at least ``threshold`` times"""
+        return [
+            (sql, count) for sql, count in self.fingerprints.most_common()
+            if count >= threshold
+        ]
+
+    def summary(self):
+        return {
+            'queries': self.queries,
+            'duplicate_queries': self.duplicate_queries,
+            'db_ms': round(self.db_time * 1000, 2),
+            'cache_calls': self.cache_calls,
+            'cache_ms': round(self.cache_time * 1000, 2),
+            'template_ms': round(self.template_time * 1000, 2),
+            'total_ms': round((self.duration or 0) * 1000, 2),
+        }
+
+
+def current_profile():
+    """The innermost active profile, if any"""
+    return _current_profile.get()
+
+
+def _record_execute(execute, sql, params, many, context):
+    profile = _current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.record_query(sql, time.perf_counter() - start)
+
+
+@contextmanager
+def profile_request():
+    """Profile everything executed in the block; yields the ``RequestProfile``"""
+    from django.db import connections
+
+    install_hooks()
+    profile = RequestProfile(parent=_current_profile.get())
+    token = _current_profile.set(profile)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(_record_execute))
+            yield profile
+    finally:
+        profile.finish()
+        _current_profile.reset(token)
+
+
+def _timed_cache_method(method):
+    @wraps(method)
+    def timed(*args, **kwargs):
+        profile = _current_profile.get()
+        if profile is None:
+            return method(*args, **kwargs)
+        # Base implementations (get_many, get_or_set, ...) call other methods
+        profile._cache_depth += 1
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            profile._cache_depth -= 1
+            if profile._cache_depth == 0:
+                profile.record_cache(time.perf_counter() - start)
+    timed._instrumented = True
+    return timed
+
+
+def _timed_template_render(render):
+    @wraps(render)
+    def timed(self, context):
+        profile = _current_profile.get()
+        if profile is None:
+            return render(self, context)
+        # Included and extended templates render inside their parent
+        profile._template_depth += 1
+        start = time.perf_counter()
+        try:
+            return render(self, context)
+        finally:
+            profile._template_depth -= 1
+            if profile._template_depth == 0:
+                profile.record_template(time.perf_counter() - start)
+    return timed
+
+
+def install_hooks():
+    """Wrap configured cache backends and ``Template.render`` once per process"""
+    global _hooks_installed
+    if _hooks_installed:
+        return
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+
+        from django.core.cache import caches
+        from django.template.base import Template
+
+        for alias in settings.CACHES:
+            backend_class = type(caches[alias])
+            for name in CACHE_METHODS:
+                method = getattr(backend_class, name, None)
+                if method is not None and not getattr(method, '_instrumented', False):
+                    setattr(backend_class, name, _timed_cache_method(method))
+
+        Template.render = _timed_template_render(Template.render)
+        _hooks_installed = True
+
+
+def query_budget(max_queries):
+    """Declare the most queries a view may run per request"""
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+
+def get_query_budget(view_func, view_name=None):
+    """Budget declared on the view function, its class, or in QUERY_BUDGETS"""
+    budget = getattr(view_func, 'query_budget', None)
+    if budget is None:
+        budget = getattr(getattr(view_func, 'view_class', None), 'query_budget', None)
+    if budget is None and view_name:
+        budget = getattr(settings, 'QUERY_BUDGETS', {}).get(view_name)
+    return budget
+
+
+class RequestMetrics:
+    """Per-view aggregates of request profiles, kept in process memory"""
+
+    def __init__(self):
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def record(self, view_name, profile, budget=None):
+        summary = profile.summary()
+        with self._lock:
+            stats = self._views.get(view_name)
+            if stats is None:
+                stats = self._views[view_name] = {
+                    'requests': 0,
+                    'queries': 0,
+                    'max_queries': 0,
+                    'duplicate_queries': 0,
+                    'db_ms': 0.0,
+                    'cache_ms': 0.0,
+                    'template_ms': 0.0,
+                    'total_ms': 0.0,
+                    'budget': budget,
+                    'over_budget': 0,
+                    'repeated': Counter(),
+                }
+            stats['requests'] += 1
+            stats['queries'] += summary['queries']
+            stats['max_queries'] = max(stats['max_queries'], summary['queries'])
+            stats['duplicate_queries'] += summary['duplicate_queries']
+            for field in ('db_ms', 'cache_ms', 'template_ms', 'total_ms'):
+                stats[field] += summary[field]
+            stats['budget'] = budget
+            if budget is not None and summary['queries'] > budget:
+                stats['over_budget'] += 1
+            for sql, count in profile.repeated():
+                stats['repeated'][sql] = max(stats['repeated'][sql], count)
+
+    def snapshot(self):
+        """Per-view averages, slowest database time first"""
+        with self._lock:
+            rows = []
+            for view_name, stats in self._views.items():
+                requests = stats['requests']
+                rows.append({
+                    'view': view_name,
+                    'requests': requests,
+                    'avg_queries': round(stats['queries'] / requests, 2),
+                    'max_queries': stats['max_queries'],
+                    'avg_duplicate_queries': round(stats['duplicate_queries'] / requests, 2),
+                    'avg_db_ms': round(stats['db_ms'] / requests, 2),
+                    'avg_cache_ms': round(stats['cache_ms'] / requests, 2),
+                    'avg_template_ms': round(stats['template_ms'] / requests, 2),
+                    'avg_total_ms': round(stats['total_ms'] / requests, 2),
+                    'budget': stats['budget'],
+                    'over_budget': stats['over_budget'],
+                    'repeated_queries': [
+                        {'sql': sql, 'count': count}
+                        for sql, count in stats['repeated'].most_common(5)
+                    ],
+                })
+        rows.sort(key=lambda row: row['avg_db_ms'] * row['requests'], reverse=True)
+        return rows
+
+    def reset(self):
+        with self._lock:
+            self._views.clear()
+
+
+request_metrics = RequestMetrics()
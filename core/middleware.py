@@ -0,0 +1,81 @@
+"""
+Request instrumentation middleware for EYTGaming platform.
+Records per-view query counts, repeated SQL and database/cache/template time.
+"""
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+import logging
+
+from .instrumentation import (
+    QueryBudgetExceeded, get_query_budget, profile_request, request_metrics,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RequestInstrumentationMiddleware:
+    """
+    Profile every request and aggregate the results per view.
+
+    Requests that exceed their query budget or repeat one statement
+    ``N_PLUS_ONE_THRESHOLD`` times are logged with their most repeated SQL;
+    the rest are logged at DEBUG. With ``REQUEST_INSTRUMENTATION_HEADERS`` a
+    ``Server-Timing`` header exposes the numbers to browser dev tools.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_INSTRUMENTATION', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._query_budget = None
+        with profile_request() as profile:
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        if match is None:
+            return response
+
+        view_name = match.view_name or match._func_path
+        budget = request._query_budget
+        request_metrics.record(view_name, profile, budget)
+
+        over_budget = budget is not None and profile.queries > budget
+        repeated = profile.repeated()
+        summary = profile.summary()
+        line = (
+            f"{request.method} {view_name} queries={summary['queries']} "
+            f"duplicates={summary['duplicate_queries']} db={summary['db_ms']}ms "
+            f"cache={summary['cache_ms']}ms templates={summary['template_ms']}ms "
+            f"total={summary['total_ms']}ms"
+        )
+        if over_budget or repeated:
+            details = '; '.join(f"{count}x {sql[:200]}" for sql, count in repeated[:3])
+            budget_note = f" budget={budget}" if budget is not None else ''
+            logger.warning(f"{line}{budget_note} repeated: {details or 'none'}")
+        else:
+            logger.debug(line)
+
+        if getattr(settings, 'REQUEST_INSTRUMENTATION_HEADERS', False):
+            response['Server-Timing'] = (
+                f'db;dur={summary["db_ms"]};desc="{summary["queries"]} queries", '
+                f'cache;dur={summary["cache_ms"]}, tpl;dur={summary["template_ms"]}'
+            )
+
+        if over_budget and getattr(settings, 'QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(
+                f"{view_name} ran {profile.queries} queries (budget {budget}). "
+                f"Most repeated: " + '; '.join(
+                    f"{count}x {sql}" for sql, count in profile.repeated(threshold=2)[:3]
+                )
+            )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = getattr(request, 'resolver_match', None)
+        request._query_budget = get_query_budget(
+            view_func, match.view_name if match else None
+        )
+        return None
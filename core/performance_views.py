@@ -11,6 +11,8 @@ from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
 from django.views import View
 
+from .instrumentation import request_metrics as collected_request_metrics
+
 logger = logging.getLogger(__name__)
 
 
@@ -52,6 +54,29 @@ def performance_data(request):
         }, status=500)
 
 
+@require_http_methods(["GET", "DELETE"])
+def request_metrics(request):
+    """
+    Server-side request metrics per view (staff only).
+    GET returns query counts, repeated SQL and database/cache/template time
+    averaged per view for this process; DELETE resets them.
+    """
+    if not (request.user.is_authenticated and request.user.is_staff):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Staff access required'
+        }, status=403)
+    
+    if request.method == 'DELETE':
+        collected_request_metrics.reset()
+        return JsonResponse({'status': 'success', 'message': 'Request metrics reset'})
+    
+    return JsonResponse({
+        'status': 'success',
+        'views': collected_request_metrics.snapshot()
+    })
+
+
 class PerformanceAPIView(View):
     """
     Class-based view for performance data collection
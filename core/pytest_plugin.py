@@ -0,0 +1,49 @@
+"""
+pytest plugin enforcing query budgets (enabled in pytest.ini with
+``-p core.pytest_plugin``).
+
+- Views declared with ``@query_budget(n)`` (or listed in ``QUERY_BUDGETS``)
+  raise ``QueryBudgetExceeded`` when a test request runs more than ``n``
+  queries, so the test fails with the most repeated SQL in the message.
+- ``@pytest.mark.query_budget(n)`` fails a test that runs more than ``n``
+  queries in total, including those made by test client requests.
+"""
+
+import pytest
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'query_budget(max_queries): fail the test if it runs more than max_queries database queries',
+    )
+
+
+@pytest.fixture(autouse=True)
+def _query_budgets(request):
+    from django.conf import settings
+    if not settings.configured:
+        yield
+        return
+
+    from django.test import override_settings
+    from core.instrumentation import profile_request
+
+    marker = request.node.get_closest_marker('query_budget')
+    with override_settings(QUERY_BUDGET_STRICT=True):
+        if marker is None:
+            yield
+            return
+
+        budget = marker.args[0] if marker.args else marker.kwargs['max_queries']
+        with profile_request() as profile:
+            yield
+        if profile.queries > budget:
+            repeated = '\n'.join(
+                f"  {count}x {sql}" for sql, count in profile.repeated(threshold=2)[:5]
+            )
+            pytest.fail(
+                f"{request.node.nodeid} ran {profile.queries} queries (budget {budget})"
+                + (f"\nMost repeated:\n{repeated}" if repeated else ''),
+                pytrace=False,
+            )
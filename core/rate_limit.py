@@ -0,0 +1,171 @@
+"""
+Shared sliding-window rate limiting.
+
+Each limited identity (an IP address, a user id) has one counter per fixed
+window of ``window`` seconds. A hit is allowed when the current window's
+count plus the previous window's count, weighted by how much of the previous
+window still overlaps the sliding window, stays within the limit. Two keys
+per identity bound the keyspace, and a burst straddling a window boundary
+cannot get twice the limit through.
+
+A check and its increment happen together: rejected hits are not counted, so
+a client that backs off is admitted again as soon as the window slides.
+
+Backends, chosen with the ``RATE_LIMIT_BACKEND`` setting:
+
+- ``'redis'`` runs the check and increment as one Lua script: one atomic
+  round-trip per hit, shared by every process.
+- ``'cache'`` uses the Django cache (in-process in development and tests).
+  The increment is atomic where the cache's ``incr`` is, but the check is a
+  separate read, so concurrent hits may overshoot slightly.
+
+A backend error fails open: the hit is allowed and a warning logged.
+"""
+
+import logging
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'rl'
+
+RateLimitResult = namedtuple('RateLimitResult', ['allowed', 'count', 'limit'])
+
+# KEYS: current window, previous window
+# ARGV: limit, cost, previous window weight, current window TTL
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local estimate = current + previous * tonumber(ARGV[3])
+if estimate + cost > limit then
+    return {0, tostring(estimate)}
+end
+current = redis.call('INCRBY', KEYS[1], cost)
+if current == cost then
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+end
+return {1, tostring(estimate + cost)}
+"""
+
+
+def _window_keys(scope, identity, window, now):
+    """Current and previous window keys, and the previous window's weight"""
+    index, offset = divmod(now, window)
+    index = int(index)
+    weight = 1 - offset / window
+    base = f"{KEY_PREFIX}:{scope}:{identity}:{window}"
+    return f"{base}:{index}", f"{base}:{index - 1}", weight
+
+
+class CacheRateLimitBackend:
+    """Sliding windows stored in the Django cache"""
+
+    def hit(self, current_key, previous_key, weight, limit, cost, ttl):
+        estimate = self._estimate(current_key, previous_key, weight)
+        if estimate + cost > limit:
+            return False, estimate
+        try:
+            cache.incr(current_key, cost)
+        except ValueError:
+            # First hit in this window
+            if not cache.add(current_key, cost, ttl):
+                cache.incr(current_key, cost)
+        return True, estimate + cost
+
+    def peek(self, current_key, previous_key, weight):
+        return self._estimate(current_key, previous_key, weight)
+
+    @staticmethod
+    def _estimate(current_key, previous_key, weight):
+        counts = cache.get_many([current_key, previous_key])
+        return counts.get(current_key, 0) + counts.get(previous_key, 0) * weight
+
+
+class RedisRateLimitBackend:
+    """Sliding windows checked and incremented by one Lua script"""
+
+    def __init__(self, url):
+        self.url = url
+        self._client = None
+        self._script = None
+
+    def hit(self, current_key, previous_key, weight, limit, cost, ttl):
+        allowed, estimate = self._get_script()(
+            keys=[current_key, previous_key], args=[limit, cost, repr(weight), ttl]
+        )
+        return bool(allowed), float(estimate)
+
+    def peek(self, current_key, previous_key, weight):
+        current, previous = self._get_client().mget([current_key, previous_key])
+        return int(current or 0) + int(previous or 0) * weight
+
+    def _get_client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    def _get_script(self):
+        if self._script is None:
+            # register_script sends EVALSHA and loads the script on first miss
+            self._script = self._get_client().register_script(SLIDING_WINDOW_SCRIPT)
+        return self._script
+
+
+class RateLimiter:
+    """Check-and-count hits against sliding-window limits"""
+
+    @classmethod
+    def hit(cls, scope, identity, limit, window, cost=1, now=None):
+        """
+        Count a hit for ``identity`` under ``scope`` unless that would exceed
+        ``limit`` hits per ``window`` seconds. Returns a ``RateLimitResult``.
+        """
+        now = time.time() if now is None else now
+        current_key, previous_key, weight = _window_keys(scope, identity, window, now)
+        try:
+            allowed, count = get_rate_limit_backend().hit(
+                current_key, previous_key, weight, limit, cost, window * 2
+            )
+        except Exception as e:
+            logger.warning(f"Rate limit check failed for {scope}, allowing: {e}")
+            return RateLimitResult(True, 0, limit)
+        return RateLimitResult(allowed, count, limit)
+
+    @classmethod
+    def is_limited(cls, scope, identity, limit, window, now=None):
+        """Whether the next hit would be rejected, without counting one"""
+        now = time.time() if now is None else now
+        current_key, previous_key, weight = _window_keys(scope, identity, window, now)
+        try:
+            return get_rate_limit_backend().peek(current_key, previous_key, weight) >= limit
+        except Exception as e:
+            logger.warning(f"Rate limit check failed for {scope}, allowing: {e}")
+            return False
+
+
+_cache_backend = CacheRateLimitBackend()
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_rate_limit_backend():
+    """Process-wide backend configured by RATE_LIMIT_BACKEND"""
+    global _backend
+    backend = getattr(settings, 'RATE_LIMIT_BACKEND', 'cache')
+    if backend != 'redis':
+        return _cache_backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = RedisRateLimitBackend(
+                    getattr(settings, 'RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0')
+                )
+    return _backend
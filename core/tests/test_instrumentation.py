@@ -0,0 +1,86 @@
+# core/tests/test_instrumentation.py
+"""Tests for server-side request instrumentation.
+Repeated statements are grouped by fingerprint, per-view metrics are
+aggregated by the middleware, and strict mode fails over-budget views.
+"""
+
+from django.http import JsonResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import path
+
+from core.instrumentation import (
+    QueryBudgetExceeded, fingerprint, profile_request, query_budget, request_metrics,
+)
+from core.models import User
+
+
+@query_budget(2)
+def users_view(request):
+    # One query per user: the N+1 shape the detector should report
+    names = [User.objects.get(pk=pk).username for pk in User.objects.values_list('pk', flat=True)]
+    return JsonResponse({'users': names})
+
+
+urlpatterns = [
+    path('users/', users_view, name='instrumented_users'),
+]
+
+
+class FingerprintTest(SimpleTestCase):
+    def test_literals_and_placeholder_lists_collapse(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 42 AND name = 'x''y'"),
+            fingerprint("SELECT * FROM t WHERE id = 7 AND name = 'z'"),
+        )
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s)'),
+            'SELECT * FROM t WHERE id IN (...)',
+        )
+
+
+@override_settings(ROOT_URLCONF='core.tests.test_instrumentation')
+class RequestInstrumentationTest(TestCase):
+    def setUp(self):
+        request_metrics.reset()
+        self.addCleanup(request_metrics.reset)
+        User.objects.bulk_create([
+            User(email=f'user{i}@example.com', username=f'user{i}') for i in range(6)
+        ])
+
+    def test_profile_groups_repeated_queries(self):
+        with profile_request() as profile:
+            for pk in User.objects.values_list('pk', flat=True):
+                User.objects.get(pk=pk)
+
+        self.assertEqual(profile.queries, 7)
+        self.assertEqual(profile.duplicate_queries, 5)
+        [(sql, count)] = profile.repeated()
+        self.assertEqual(count, 6)
+        self.assertIn('WHERE', sql)
+
+    def test_nested_profiles_add_to_the_enclosing_one(self):
+        with profile_request() as outer:
+            User.objects.count()
+            with profile_request() as inner:
+                User.objects.count()
+
+        self.assertEqual((outer.queries, inner.queries), (2, 1))
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_middleware_records_metrics_per_view(self):
+        with self.assertLogs('core.middleware', level='WARNING') as logs:
+            response = self.client.get('/users/')
+
+        self.assertEqual(response.status_code, 200)
+        [row] = request_metrics.snapshot()
+        self.assertEqual(row['view'], 'instrumented_users')
+        self.assertEqual(row['budget'], 2)
+        self.assertEqual(row['over_budget'], 1)
+        self.assertGreaterEqual(row['max_queries'], 7)
+        self.assertEqual(row['repeated_queries'][0]['count'], 6)
+        self.assertIn('budget=2', logs.output[0])
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_strict_mode_fails_over_budget_views(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.client.get('/users/')
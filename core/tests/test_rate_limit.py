@@ -0,0 +1,85 @@
+# core/tests/test_rate_limit.py
+"""Tests for the shared sliding-window rate limiter.
+Bursts across a window boundary are still limited, rejected hits are not
+counted, and the store middleware applies route-class policies without
+touching the limiter for exempt paths.
+"""
+
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from core.rate_limit import RateLimiter
+from store.middleware import RateLimitMiddleware
+
+
+@override_settings(
+    RATE_LIMIT_BACKEND='cache',
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class SlidingWindowTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_previous_window_counts_towards_the_limit(self):
+        start = 6000.0  # start of a 60 second window
+        for _ in range(10):
+            self.assertTrue(RateLimiter.hit('test', 'ip', 10, 60, now=start + 50).allowed)
+        self.assertFalse(RateLimiter.hit('test', 'ip', 10, 60, now=start + 59).allowed)
+
+        # Just past the boundary most of the previous window still overlaps
+        self.assertFalse(RateLimiter.hit('test', 'ip', 10, 60, now=start + 61).allowed)
+        # Half way through the next window half of it has slid out
+        results = [RateLimiter.hit('test', 'ip', 10, 60, now=start + 90).allowed for _ in range(6)]
+        self.assertEqual(results, [True] * 5 + [False])
+
+    def test_rejected_hits_are_not_counted(self):
+        for _ in range(25):
+            RateLimiter.hit('test', 'spammer', 5, 60, now=6000.0)
+        self.assertTrue(RateLimiter.is_limited('test', 'spammer', 5, 60, now=6000.0))
+        self.assertFalse(RateLimiter.is_limited('test', 'spammer', 5, 60, now=6120.0))
+
+    def test_backend_errors_fail_open(self):
+        with mock.patch('core.rate_limit.CacheRateLimitBackend.hit', side_effect=ConnectionError):
+            self.assertTrue(RateLimiter.hit('test', 'ip', 1, 60).allowed)
+
+
+@override_settings(
+    RATE_LIMIT_ENABLED=True,
+    RATE_LIMIT_BACKEND='cache',
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class RouteClassPolicyTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.middleware = RateLimitMiddleware(lambda request: HttpResponse('OK'))
+
+    def _get(self, path, ip='10.0.0.1'):
+        request = self.factory.get(path)
+        request.META['REMOTE_ADDR'] = ip
+        return self.middleware(request)
+
+    def test_paths_share_their_route_class_budget(self):
+        for i in range(10):
+            self.assertEqual(self._get(f'/store/checkout/step-{i}/').status_code, 200)
+        self.assertEqual(self._get('/store/payment/confirm/').status_code, 429)
+        # Other route classes keep their own budget
+        self.assertEqual(self._get('/store/products/').status_code, 200)
+
+    def test_exempt_paths_skip_the_limiter(self):
+        with mock.patch.object(RateLimiter, 'hit') as hit:
+            for path in ('/static/app.css', '/media/a.png', '/notifications/unread/'):
+                self.assertEqual(self._get(path).status_code, 200)
+        hit.assert_not_called()
+
+    @override_settings(RATE_LIMIT_POLICIES=[
+        {'name': 'api', 'prefixes': ['/api/'], 'limit': 2, 'window': 30},
+        {'name': 'default', 'prefixes': [], 'limit': 1000, 'window': 60},
+    ])
+    def test_policies_come_from_settings(self):
+        middleware = RateLimitMiddleware(lambda request: HttpResponse('OK'))
+        self.assertEqual(middleware.get_limit('/api/things/'), 2)
+        self.assertEqual(middleware.get_limit('/store/checkout/'), 1000)
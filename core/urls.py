@@ -6,6 +6,7 @@ app_name = 'core'
 urlpatterns = [
     # Performance monitoring endpoint
     path('api/performance/', performance_views.PerformanceAPIView.as_view(), name='performance_data'),
+    path('api/performance/requests/', performance_views.request_metrics, name='request_metrics'),
     # Leaderboard - public
     path('leaderboard/', views.leaderboard, name='leaderboard'),
     # News detail
@@ -102,8 +102,8 @@ class LandingPageView(TemplateView):
 
 def leaderboard(request):
     """Public leaderboard page — tournaments, top players, prize winners"""
-    from django.db.models import Sum, Count, Q
     from tournaments.models import Tournament, Participant
+    from tournaments.services import LeaderboardService
 
     # Active & upcoming tournaments
     active_tournaments = Tournament.objects.filter(
@@ -117,33 +117,9 @@ def leaderboard(request):
         status='completed'
     ).select_related('game', 'organizer').order_by('-actual_end', '-start_datetime')[:6]
 
-    # Top individual players by wins across all tournaments
-    top_players = Participant.objects.filter(
-        user__isnull=False,
-        status='confirmed',
-        tournament__is_public=True,
-    ).values(
-        'user__id', 'user__username', 'user__display_name', 'user__avatar'
-    ).annotate(
-        total_wins=Sum('matches_won'),
-        total_losses=Sum('matches_lost'),
-        tournaments_played=Count('tournament', distinct=True),
-        total_prize=Sum('prize_won'),
-    ).filter(total_wins__gt=0).order_by('-total_wins', '-tournaments_played')[:20]
-
-    # Top teams by wins
-    top_teams = Participant.objects.filter(
-        team__isnull=False,
-        status='confirmed',
-        tournament__is_public=True,
-    ).values(
-        'team__id', 'team__name', 'team__tag', 'team__logo'
-    ).annotate(
-        total_wins=Sum('matches_won'),
-        total_losses=Sum('matches_lost'),
-        tournaments_played=Count('tournament', distinct=True),
-        total_prize=Sum('prize_won'),
-    ).filter(total_wins__gt=0).order_by('-total_wins', '-tournaments_played')[:20]
+    # Top players and teams by wins, read from the materialized leaderboard
+    top_players = LeaderboardService.top_players()
+    top_teams = LeaderboardService.top_teams()
 
     # Prize winners (participants with prize > 0)
     prize_winners = Participant.objects.filter(
@@ -0,0 +1,131 @@
+"""
+Declarative achievement rules.
+
+Each rule ties an achievement slug to a metric and a threshold: the metric
+value becomes the user's progress and the achievement is earned once it
+reaches the threshold. Metrics are grouped by source so that evaluating all
+rules for an event costs one aggregated query per source for a whole batch
+of users, however many rules there are.
+
+Add new achievements with ``register_rule()`` (or by extending ``RULES``)
+and, if needed, a new metric in ``METRIC_SOURCES``/``_load_*``.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+from django.db.models import Count, Q
+
+
+@dataclass(frozen=True)
+class AchievementRule:
+    """Earn ``slug`` once ``metric`` reaches ``threshold``"""
+    slug: str
+    metric: str
+    threshold: int = 1
+
+
+# Achievement type evaluated for each event
+EVENT_ACHIEVEMENT_TYPES = {
+    'tournament_completed': 'tournament',
+    'team_joined': 'social',
+    'profile_completed': 'platform',
+}
+
+RULES: Dict[str, AchievementRule] = {}
+
+
+def register_rule(rule: AchievementRule) -> AchievementRule:
+    """Add or replace the rule for an achievement slug"""
+    if rule.metric not in METRIC_SOURCES:
+        raise ValueError(f"Unknown achievement metric: {rule.metric}")
+    RULES[rule.slug] = rule
+    return rule
+
+
+def rules_for_slugs(slugs: Iterable[str]) -> Dict[str, AchievementRule]:
+    """Registered rules for the given achievement slugs"""
+    return {slug: RULES[slug] for slug in slugs if slug in RULES}
+
+
+def load_metrics(user_ids: List, metrics: Iterable[str]) -> Dict:
+    """
+    Load metric values for a batch of users.
+
+    Runs one aggregated query per metric source needed by ``metrics``.
+
+    Returns:
+        Dictionary mapping user_id to ``{metric: value}``; users without
+        rows for a source get 0 for its metrics
+    """
+    values = {user_id: {} for user_id in user_ids}
+    sources = {METRIC_SOURCES[metric] for metric in metrics}
+
+    for source in sources:
+        loader = _LOADERS[source]
+        source_metrics = [name for name, src in METRIC_SOURCES.items() if src == source]
+        loaded = loader(user_ids)
+        for user_id in user_ids:
+            row = loaded.get(user_id, {})
+            for name in source_metrics:
+                values[user_id][name] = row.get(name, 0) or 0
+
+    return values
+
+
+def _load_participation(user_ids: List) -> Dict:
+    from tournaments.models import Participant
+
+    rows = Participant.objects.filter(
+        user_id__in=user_ids,
+        status='confirmed'
+    ).values('user_id').annotate(
+        tournaments=Count('id'),
+        wins=Count('id', filter=Q(final_placement=1)),
+        top_three=Count('id', filter=Q(final_placement__lte=3, final_placement__isnull=False)),
+    )
+    return {row['user_id']: row for row in rows}
+
+
+def _load_teams(user_ids: List) -> Dict:
+    from teams.models import TeamMember
+
+    rows = TeamMember.objects.filter(
+        user_id__in=user_ids,
+        status='active'
+    ).values('user_id').annotate(active_teams=Count('id'))
+    return {row['user_id']: row for row in rows}
+
+
+def _load_profile(user_ids: List) -> Dict:
+    from core.models import User
+
+    return {
+        user_id: {'profile_complete': 100 if completed else 0}
+        for user_id, completed in User.objects.filter(
+            id__in=user_ids
+        ).values_list('id', 'profile_completed')
+    }
+
+
+# Metric name -> source loaded by one aggregated query
+METRIC_SOURCES = {
+    'tournaments': 'participation',
+    'wins': 'participation',
+    'top_three': 'participation',
+    'active_teams': 'teams',
+    'profile_complete': 'profile',
+}
+
+_LOADERS = {
+    'participation': _load_participation,
+    'teams': _load_teams,
+    'profile': _load_profile,
+}
+
+
+register_rule(AchievementRule('first-tournament-win', 'wins'))
+register_rule(AchievementRule('ten-tournaments', 'tournaments', 10))
+register_rule(AchievementRule('top-three-finish', 'top_three'))
+register_rule(AchievementRule('first-team', 'active_teams'))
+register_rule(AchievementRule('profile-complete', 'profile_complete', 100))
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-16 09:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def remove_duplicate_recommendations(apps, schema_editor):
+    """Keep the newest row for each (user, type, item) before adding the constraint"""
+    Recommendation = apps.get_model('dashboard', 'Recommendation')
+    seen = set()
+    duplicate_ids = []
+    for rec in Recommendation.objects.order_by('-created_at').values(
+        'id', 'user_id', 'recommendation_type', 'content_type_id', 'object_id'
+    ).iterator():
+        key = (rec['user_id'], rec['recommendation_type'], rec['content_type_id'], rec['object_id'])
+        if key in seen:
+            duplicate_ids.append(rec['id'])
+        else:
+            seen.add(key)
+    Recommendation.objects.filter(id__in=duplicate_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('dashboard', '0003_initial_achievements'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_recommendations, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='recommendation',
+            constraint=models.UniqueConstraint(fields=('user', 'recommendation_type', 'content_type', 'object_id'), name='unique_user_recommendation'),
+        ),
+    ]
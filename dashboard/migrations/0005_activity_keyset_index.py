@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-16 21:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0004_recommendation_unique_user_recommendation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='activity',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': 'Activity', 'verbose_name_plural': 'Activities'},
+        ),
+        migrations.RemoveIndex(
+            model_name='activity',
+            name='activities_user_id_7bdf29_idx',
+        ),
+        migrations.AddIndex(
+            model_name='activity',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='activities_user_keyset_idx'),
+        ),
+    ]
@@ -38,9 +38,10 @@ class Activity(models.Model):
     
     class Meta:
         db_table = 'activities'
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
         indexes = [
-            models.Index(fields=['user', '-created_at']),
+            # Keyset pagination of a user's feed
+            models.Index(fields=['user', '-created_at', '-id'], name='activities_user_keyset_idx'),
             models.Index(fields=['activity_type', '-created_at']),
         ]
         verbose_name = 'Activity'
@@ -180,6 +181,12 @@ class Recommendation(models.Model):
             models.Index(fields=['user', 'recommendation_type', '-score']),
             models.Index(fields=['user', 'is_dismissed']),
         ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'recommendation_type', 'content_type', 'object_id'],
+                name='unique_user_recommendation',
+            ),
+        ]
         verbose_name = 'Recommendation'
         verbose_name_plural = 'Recommendations'
     
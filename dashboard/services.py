@@ -6,12 +6,16 @@ This module provides services for statistics calculation, caching, and data aggr
 
 from django.core.cache import cache
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Sum, Count, Q, Avg, Min
 from django.utils import timezone
-from datetime import timedelta
+from collections import defaultdict
+from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional
+import base64
+import binascii
+import json
 import uuid
 
 
@@ -388,6 +392,9 @@ class ActivityService:
     # Cache TTL in seconds (15 minutes)
     CACHE_TTL = 900
     
+    # Rows removed per statement by delete_old_activities
+    DELETE_CHUNK_SIZE = 5000
+    
     @classmethod
     def record_activity(cls, user_id: uuid.UUID, activity_type: str, data: Optional[Dict] = None) -> 'Activity':
         """
@@ -427,6 +434,9 @@ class ActivityService:
         """
         Get activity feed for a user with optional filtering and pagination.
         
+        Page-number API kept for existing callers; deep pages use OFFSET, so
+        feeds should prefer the keyset-based get_activity_page().
+        
         Args:
             user_id: UUID of the user
             filters: Optional dictionary with keys:
@@ -446,30 +456,14 @@ class ActivityService:
         
         **Validates: Requirements 1.3, 8.1, 8.3, 8.5**
         """
-        from dashboard.models import Activity
         from django.core.paginator import Paginator
         
-        # Build base queryset
-        queryset = Activity.objects.filter(user_id=user_id).select_related('user')
+        # Build filtered queryset
+        queryset = cls._filtered_queryset(user_id, filters).select_related('user')
         
-        # Apply filters
-        if filters:
-            # Filter by activity type
-            if 'activity_type' in filters and filters['activity_type']:
-                queryset = queryset.filter(activity_type=filters['activity_type'])
-            
-            # Filter by date range
-            if 'date_from' in filters and filters['date_from']:
-                queryset = queryset.filter(created_at__gte=filters['date_from'])
-            
-            if 'date_to' in filters and filters['date_to']:
-                queryset = queryset.filter(created_at__lte=filters['date_to'])
-        
-        # Get total count before pagination
-        total_count = queryset.count()
-        
-        # Apply pagination
+        # Apply pagination (the paginator's COUNT is the only one)
         paginator = Paginator(queryset, page_size)
+        total_count = paginator.count
         
         # Ensure page is within valid range
         if page < 1:
@@ -490,6 +484,121 @@ class ActivityService:
             'has_previous': page_obj.has_previous(),
         }
     
+    @classmethod
+    def get_activity_page(cls, user_id: uuid.UUID, filters: Optional[Dict] = None,
+                          cursor: Optional[str] = None, page_size: int = 25) -> Dict:
+        """
+        Get one page of a user's activity feed using keyset pagination.
+        
+        Pages are ordered by (created_at, id) descending and continue after
+        the position encoded in ``cursor``, so deep pages cost the same as the
+        first one. The total is cached instead of counted on every request.
+        
+        Args:
+            user_id: UUID of the user
+            filters: Optional filters (see get_activity_feed)
+            cursor: Opaque cursor returned as ``next_cursor`` by the previous page
+            page_size: Number of activities per page (default 25)
+            
+        Returns:
+            Dictionary containing:
+                - activities: List of Activity objects
+                - next_cursor: Cursor for the next page, or None
+                - has_next: Whether another page exists
+                - total_count: Cached number of activities matching filters
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        
+        **Validates: Requirements 1.3, 8.1, 8.3, 8.5**
+        """
+        queryset = cls._filtered_queryset(user_id, filters)
+        
+        if cursor:
+            created_at, activity_id = cls.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=activity_id)
+            )
+        
+        activities = list(queryset.order_by('-created_at', '-id')[:page_size + 1])
+        has_next = len(activities) > page_size
+        activities = activities[:page_size]
+        
+        return {
+            'activities': activities,
+            'next_cursor': cls.encode_cursor(activities[-1]) if has_next else None,
+            'has_next': has_next,
+            'total_count': cls.get_activity_count(user_id, filters),
+        }
+    
+    @classmethod
+    def get_activity_count(cls, user_id: uuid.UUID, filters: Optional[Dict] = None) -> int:
+        """
+        Number of activities matching filters, cached per user.
+        
+        Counts for every filter combination live under the user's
+        ``activity_feed`` cache key, which record_activity() deletes.
+        """
+        cache_key = f"activity_feed:{user_id}"
+        counts = cache.get(cache_key) or {}
+        signature = cls._filters_signature(filters)
+        
+        if signature not in counts:
+            counts[signature] = cls._filtered_queryset(user_id, filters).count()
+            cache.set(cache_key, counts, cls.CACHE_TTL)
+        
+        return counts[signature]
+    
+    @classmethod
+    def encode_cursor(cls, activity) -> str:
+        """Opaque cursor pointing just after ``activity``"""
+        raw = json.dumps([activity.created_at.isoformat(), str(activity.id)])
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+    
+    @classmethod
+    def decode_cursor(cls, cursor: str):
+        """Decode a cursor into (created_at, activity_id); raises ValueError"""
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, activity_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            return datetime.fromisoformat(created_at), uuid.UUID(activity_id)
+        except (TypeError, ValueError, binascii.Error) as e:
+            raise ValueError(f"Invalid activity cursor: {cursor}") from e
+    
+    @classmethod
+    def _filtered_queryset(cls, user_id: uuid.UUID, filters: Optional[Dict] = None):
+        """Activities of a user narrowed by activity_type/date_from/date_to"""
+        from dashboard.models import Activity
+        
+        queryset = Activity.objects.filter(user_id=user_id)
+        
+        if filters:
+            # Filter by activity type
+            if filters.get('activity_type'):
+                queryset = queryset.filter(activity_type=filters['activity_type'])
+            
+            # Filter by date range
+            if filters.get('date_from'):
+                queryset = queryset.filter(created_at__gte=filters['date_from'])
+            
+            if filters.get('date_to'):
+                queryset = queryset.filter(created_at__lte=filters['date_to'])
+        
+        return queryset
+    
+    @classmethod
+    def _filters_signature(cls, filters: Optional[Dict]) -> str:
+        """Stable cache signature for a filters dict"""
+        filters = filters or {}
+        parts = []
+        for name in ('activity_type', 'date_from', 'date_to'):
+            value = filters.get(name)
+            if hasattr(value, 'date'):
+                # Relative ranges ("last 7 days") move every request; bucket by day
+                value = value.date()
+            parts.append(f"{name}={value or ''}")
+        return '&'.join(parts)
+    
     @classmethod
     def get_activity_types(cls) -> List[tuple]:
         """
@@ -504,15 +613,17 @@ class ActivityService:
         return Activity.ACTIVITY_TYPES
     
     @classmethod
-    def delete_old_activities(cls, days: int = 90) -> int:
+    def delete_old_activities(cls, days: int = 90, chunk_size: Optional[int] = None) -> int:
         """
         Delete activities older than specified number of days.
         
         This is a cleanup method to maintain database size and comply
-        with data retention policies.
+        with data retention policies. Rows are deleted oldest first in
+        chunks of ``chunk_size`` so no single statement locks a large range.
         
         Args:
             days: Number of days to keep (default 90)
+            chunk_size: Rows per delete (default DELETE_CHUNK_SIZE)
             
         Returns:
             Number of activities deleted
@@ -521,11 +632,22 @@ class ActivityService:
         """
         from dashboard.models import Activity
         
+        chunk_size = chunk_size or cls.DELETE_CHUNK_SIZE
+        
         # Calculate cutoff date
         cutoff_date = timezone.now() - timedelta(days=days)
         
-        # Delete old activities
-        deleted_count, _ = Activity.objects.filter(created_at__lt=cutoff_date).delete()
+        deleted_count = 0
+        while True:
+            chunk_ids = list(
+                Activity.objects.filter(created_at__lt=cutoff_date)
+                .order_by('created_at', 'id')
+                .values_list('id', flat=True)[:chunk_size]
+            )
+            if not chunk_ids:
+                break
+            deleted, _ = Activity.objects.filter(id__in=chunk_ids).delete()
+            deleted_count += deleted
         
         return deleted_count
 
@@ -539,6 +661,9 @@ class AchievementService:
     tracking progress, and managing achievement showcase.
     """
     
+    # Users evaluated per chunk by batch achievement checks
+    BATCH_SIZE = 500
+    
     @classmethod
     def check_achievements(cls, user_id: uuid.UUID, event_type: str) -> List['UserAchievement']:
         """
@@ -559,122 +684,149 @@ class AchievementService:
         
         **Validates: Requirements 7.1**
         """
+        return cls.check_achievements_batch([user_id], event_type)[user_id]
+    
+    @classmethod
+    def check_achievements_batch(cls, user_ids: List[uuid.UUID], event_type: str) -> Dict:
+        """
+        Check and award achievements for a batch of users.
+        
+        All registered rules for the event's achievement type are evaluated in
+        one pass against metrics loaded with one aggregated query per metric
+        source. Progress rows are written with bulk_create/bulk_update, points
+        with one bulk_update and activities with one bulk_create. The users'
+        rows are locked while progress is read and written, so concurrent
+        batches for the same user run one after the other.
+        
+        Args:
+            user_ids: UUIDs of the users to check
+            event_type: Type of event that triggered the check
+            
+        Returns:
+            Dictionary mapping each user_id to the list of UserAchievement
+            objects that were newly awarded or had their progress updated
+        
+        **Validates: Requirements 7.1**
+        """
+        from dashboard.achievement_rules import EVENT_ACHIEVEMENT_TYPES, load_metrics, rules_for_slugs
         from dashboard.models import Achievement, UserAchievement
-        from tournaments.models import Participant
-        from teams.models import TeamMember
+        from dashboard.snapshots import DashboardSnapshotService
+        from core.models import User
         
-        awarded_achievements = []
+        user_ids = list(dict.fromkeys(user_ids))
+        results = {user_id: [] for user_id in user_ids}
         
-        # Get active achievements for this event type
-        if event_type == 'tournament_completed':
-            achievement_type = 'tournament'
-        elif event_type == 'team_joined':
-            achievement_type = 'social'
-        elif event_type == 'profile_completed':
-            achievement_type = 'platform'
-        else:
-            return awarded_achievements
+        achievement_type = EVENT_ACHIEVEMENT_TYPES.get(event_type)
+        if achievement_type is None or not user_ids:
+            return results
         
-        # Get all active achievements of this type
-        achievements = Achievement.objects.filter(
+        achievements = list(Achievement.objects.filter(
             achievement_type=achievement_type,
             is_active=True
-        )
+        ))
+        rules = rules_for_slugs(achievement.slug for achievement in achievements)
+        achievements = [achievement for achievement in achievements if achievement.slug in rules]
+        if not achievements:
+            return results
         
-        for achievement in achievements:
-            # Check if user already has this achievement
-            user_achievement, created = UserAchievement.objects.get_or_create(
-                user_id=user_id,
-                achievement=achievement,
-                defaults={'current_value': 0}
+        metrics = load_metrics(user_ids, {rule.metric for rule in rules.values()})
+        now = timezone.now()
+        
+        achievements_by_id = {achievement.id: achievement for achievement in achievements}
+        with transaction.atomic():
+            # Lock the users first (in a fixed order): row locks on progress
+            # rows cannot cover rows that do not exist yet, so two batches for
+            # the same user would otherwise both create the same rows
+            list(User.objects.select_for_update().filter(id__in=user_ids).order_by('id').values_list('id', flat=True))
+            
+            existing = {}
+            for row in UserAchievement.objects.select_for_update().filter(
+                user_id__in=user_ids,
+                achievement__in=achievements
+            ):
+                # Reuse the loaded achievement so awards cost no query each
+                row.achievement = achievements_by_id[row.achievement_id]
+                existing[(row.user_id, row.achievement_id)] = row
+            
+            to_create = []
+            to_update = []
+            awarded = []
+            for user_id in user_ids:
+                for achievement in achievements:
+                    rule = rules[achievement.slug]
+                    current_value = metrics[user_id][rule.metric]
+                    should_award = current_value >= rule.threshold
+                    
+                    user_achievement = existing.get((user_id, achievement.id))
+                    if user_achievement is None:
+                        user_achievement = UserAchievement(
+                            user_id=user_id,
+                            achievement=achievement,
+                            current_value=current_value
+                        )
+                        to_create.append(user_achievement)
+                    elif user_achievement.is_completed:
+                        continue
+                    elif user_achievement.current_value != current_value or should_award:
+                        user_achievement.current_value = current_value
+                        user_achievement.updated_at = now
+                        to_update.append(user_achievement)
+                    else:
+                        continue
+                    
+                    if should_award:
+                        user_achievement.is_completed = True
+                        user_achievement.earned_at = now
+                        awarded.append(user_achievement)
+                    results[user_id].append(user_achievement)
+            
+            UserAchievement.objects.bulk_create(to_create, batch_size=cls.BATCH_SIZE)
+            UserAchievement.objects.bulk_update(
+                to_update,
+                ['current_value', 'is_completed', 'earned_at', 'updated_at'],
+                batch_size=cls.BATCH_SIZE
             )
             
-            # Skip if already completed
-            if user_achievement.is_completed:
-                continue
-            
-            # Check criteria based on achievement slug
-            should_award = False
-            current_value = 0
-            
-            if achievement.slug == 'first-tournament-win':
-                # Check if user has won a tournament
-                wins = Participant.objects.filter(
-                    user_id=user_id,
-                    final_placement=1,
-                    status='confirmed'
-                ).count()
-                current_value = wins
-                should_award = wins >= 1
-            
-            elif achievement.slug == 'ten-tournaments':
-                # Check if user has participated in 10 tournaments
-                participations = Participant.objects.filter(
-                    user_id=user_id,
-                    status='confirmed'
-                ).count()
-                current_value = participations
-                should_award = participations >= 10
-            
-            elif achievement.slug == 'top-three-finish':
-                # Check if user has finished in top 3
-                top_3 = Participant.objects.filter(
-                    user_id=user_id,
-                    final_placement__lte=3,
-                    final_placement__isnull=False,
-                    status='confirmed'
-                ).count()
-                current_value = top_3
-                should_award = top_3 >= 1
-            
-            elif achievement.slug == 'first-team':
-                # Check if user has joined a team
-                team_memberships = TeamMember.objects.filter(
-                    user_id=user_id,
-                    status='active'
-                ).count()
-                current_value = team_memberships
-                should_award = team_memberships >= 1
-            
-            elif achievement.slug == 'profile-complete':
-                # Check if profile is 100% complete
-                from core.models import User
-                user = User.objects.get(id=user_id)
-                should_award = user.profile_completed
-                current_value = 100 if should_award else 0
-            
-            # Update progress
-            user_achievement.current_value = current_value
-            
-            # Award if criteria met
-            if should_award and not user_achievement.is_completed:
-                user_achievement.is_completed = True
-                user_achievement.earned_at = timezone.now()
-                user_achievement.save()
-                
-                # Award points to user
-                from core.models import User
-                user = User.objects.get(id=user_id)
-                user.add_points(achievement.points_reward)
-                
-                # Record activity
-                ActivityService.record_activity(
-                    user_id=user_id,
-                    activity_type='achievement_earned',
-                    data={
-                        'achievement_id': str(achievement.id),
-                        'achievement_name': achievement.name,
-                        'points_reward': achievement.points_reward
-                    }
-                )
-                
-                awarded_achievements.append(user_achievement)
-            elif current_value != user_achievement.current_value:
-                # Just update progress
-                user_achievement.save()
-                awarded_achievements.append(user_achievement)
+            if awarded:
+                cls._apply_awards(awarded)
+        
+        if awarded:
+            awarded_user_ids = {user_achievement.user_id for user_achievement in awarded}
+            cache.delete_many([f"activity_feed:{user_id}" for user_id in awarded_user_ids])
+            DashboardSnapshotService.invalidate_users(awarded_user_ids, 'activity')
+        
+        return results
+    
+    @classmethod
+    def _apply_awards(cls, awarded: List['UserAchievement']) -> None:
+        """Add reward points and record achievement activities for new awards"""
+        from dashboard.models import Activity
+        from core.models import User
         
-        return awarded_achievements
+        points = defaultdict(int)
+        for user_achievement in awarded:
+            points[user_achievement.user_id] += user_achievement.achievement.points_reward
+        
+        users = list(User.objects.select_for_update().filter(id__in=list(points)))
+        for user in users:
+            user.total_points += points[user.id]
+            user.update_level()
+        User.objects.bulk_update(users, ['total_points', 'level'], batch_size=cls.BATCH_SIZE)
+        
+        Activity.objects.bulk_create([
+            Activity(
+                user_id=user_achievement.user_id,
+                activity_type='achievement_earned',
+                data={
+                    'achievement_id': str(user_achievement.achievement.id),
+                    'achievement_name': user_achievement.achievement.name,
+                    'achievement_type': user_achievement.achievement.achievement_type,
+                    'rarity': user_achievement.achievement.rarity,
+                    'points_reward': user_achievement.achievement.points_reward,
+                }
+            )
+            for user_achievement in awarded
+        ], batch_size=cls.BATCH_SIZE)
     
     @classmethod
     def award_achievement(cls, user_id: uuid.UUID, achievement_id: uuid.UUID) -> 'UserAchievement':
@@ -923,6 +1075,12 @@ class RecommendationService:
     # Dismissal cooldown in days
     DISMISSAL_COOLDOWN_DAYS = 30
     
+    # Users scored per batch by the nightly refresh
+    BATCH_SIZE = 500
+    
+    # Fields refreshed when a recommendation already exists for the same item
+    REFRESH_FIELDS = ['score', 'reason', 'expires_at', 'is_dismissed', 'dismissed_at']
+    
     @classmethod
     def get_tournament_recommendations(cls, user_id: uuid.UUID, limit: int = 3):
         """
@@ -943,104 +1101,8 @@ class RecommendationService:
         
         **Validates: Requirements 13.1, 13.2, 13.3**
         """
-        from dashboard.models import Recommendation
-        from tournaments.models import Tournament
-        from core.models import UserGameProfile
-        from django.contrib.contenttypes.models import ContentType
-        
-        # Get user's game profiles
-        game_profiles = UserGameProfile.objects.filter(user_id=user_id)
-        
-        if not game_profiles.exists():
-            return Recommendation.objects.none()
-        
-        # Get games user plays
-        user_game_ids = list(game_profiles.values_list('game_id', flat=True))
-        
-        # Get user's skill ratings by game
-        skill_ratings = {
-            profile.game_id: profile.skill_rating or 0
-            for profile in game_profiles
-        }
-        
-        # Get active tournaments for user's games
-        now = timezone.now()
-        tournaments = Tournament.objects.filter(
-            game_id__in=user_game_ids,
-            status__in=['registration', 'draft'],
-            registration_end__gt=now,
-            start_datetime__gt=now
-        ).select_related('game')
-        
-        # Get existing recommendations (including dismissed ones for filtering)
-        existing_recs = Recommendation.objects.filter(
-            user_id=user_id,
-            recommendation_type='tournament'
-        )
-        
-        # Get dismissed tournament IDs within cooldown period
-        cooldown_date = now - timedelta(days=cls.DISMISSAL_COOLDOWN_DAYS)
-        dismissed_tournament_ids = set(
-            existing_recs.filter(
-                is_dismissed=True,
-                dismissed_at__gte=cooldown_date
-            ).values_list('object_id', flat=True)
-        )
-        
-        # Get already recommended tournament IDs (not expired)
-        already_recommended_ids = set(
-            existing_recs.filter(
-                is_dismissed=False,
-                expires_at__gt=now
-            ).values_list('object_id', flat=True)
-        )
-        
-        # Filter out dismissed and already recommended tournaments
-        tournaments = tournaments.exclude(id__in=dismissed_tournament_ids)
-        tournaments = tournaments.exclude(id__in=already_recommended_ids)
-        
-        # Score and rank tournaments
-        scored_tournaments = []
-        for tournament in tournaments:
-            from core.models import User
-            user = User.objects.get(id=user_id)
-            score = cls.calculate_recommendation_score(user, tournament)
-            if score > 0:
-                scored_tournaments.append((tournament, score))
-        
-        # Sort by score descending
-        scored_tournaments.sort(key=lambda x: x[1], reverse=True)
-        
-        # Take top N
-        top_tournaments = scored_tournaments[:limit]
-        
-        # Create or update recommendations
-        tournament_content_type = ContentType.objects.get_for_model(Tournament)
-        recommendations = []
-        
-        for tournament, score in top_tournaments:
-            # Generate reason
-            reason = cls._generate_tournament_reason(user_id, tournament, skill_ratings)
-            
-            # Create or update recommendation
-            rec, created = Recommendation.objects.update_or_create(
-                user_id=user_id,
-                recommendation_type='tournament',
-                content_type=tournament_content_type,
-                object_id=tournament.id,
-                defaults={
-                    'score': score,
-                    'reason': reason,
-                    'expires_at': now + timedelta(hours=24),
-                    'is_dismissed': False,
-                    'dismissed_at': None,
-                }
-            )
-            recommendations.append(rec)
-        
-        return Recommendation.objects.filter(
-            id__in=[r.id for r in recommendations]
-        ).select_related('user')
+        generated = cls.generate_recommendations([user_id], limit=limit, recommendation_types=('tournament',))
+        return cls._recommendations_queryset(user_id, 'tournament', generated[user_id]['tournament'])
     
     @classmethod
     def get_team_recommendations(cls, user_id: uuid.UUID, limit: int = 3):
@@ -1060,98 +1122,259 @@ class RecommendationService:
         Returns:
             QuerySet of Recommendation objects for teams
         
+        **Validates: Requirements 13.1, 13.2, 13.3**
+        """
+        generated = cls.generate_recommendations([user_id], limit=limit, recommendation_types=('team',))
+        return cls._recommendations_queryset(user_id, 'team', generated[user_id]['team'])
+    
+    @classmethod
+    def generate_recommendations(cls, user_ids: List[uuid.UUID], limit: int = 3,
+                                 recommendation_types=('tournament', 'team')) -> Dict:
+        """
+        Score and store recommendations for a batch of users.
+        
+        Open tournaments, recruiting teams, game profiles, participation
+        counts and existing recommendations are each loaded with one query
+        for the whole batch. Every user is then scored against the candidates
+        for their games in memory and the top ``limit`` items per type are
+        written with a single upsert.
+        
+        Args:
+            user_ids: UUIDs of the users to score
+            limit: Maximum number of recommendations per type and user
+            recommendation_types: Types to generate ('tournament', 'team')
+            
+        Returns:
+            Dictionary mapping each user_id to ``{type: [object_id, ...]}``
+            with the recommended object IDs in rank order
+        
         **Validates: Requirements 13.1, 13.2, 13.3**
         """
         from dashboard.models import Recommendation
-        from teams.models import Team
         from core.models import UserGameProfile
-        from django.contrib.contenttypes.models import ContentType
         
-        # Get user's game profiles
-        game_profiles = UserGameProfile.objects.filter(user_id=user_id)
+        user_ids = list(user_ids)
+        results = {
+            user_id: {rec_type: [] for rec_type in recommendation_types}
+            for user_id in user_ids
+        }
         
-        if not game_profiles.exists():
-            return Recommendation.objects.none()
+        # Game profiles for the batch: user_id -> {game_id: skill_rating}
+        skill_ratings = defaultdict(dict)
+        for user_id, game_id, skill_rating in UserGameProfile.objects.filter(
+            user_id__in=user_ids
+        ).values_list('user_id', 'game_id', 'skill_rating'):
+            skill_ratings[user_id][game_id] = skill_rating or 0
         
-        # Get games user plays
-        user_game_ids = list(game_profiles.values_list('game_id', flat=True))
+        if not skill_ratings:
+            return results
         
-        # Get recruiting teams for user's games
         now = timezone.now()
-        teams = Team.objects.filter(
-            game_id__in=user_game_ids,
-            is_recruiting=True,
-            status='active'
-        ).select_related('game')
+        game_ids = {game_id for ratings in skill_ratings.values() for game_id in ratings}
+        excluded = cls._excluded_object_ids(list(skill_ratings), recommendation_types, now)
+        
+        rows = []
+        if 'tournament' in recommendation_types:
+            rows += cls._rank_tournaments(skill_ratings, game_ids, excluded, limit, now, results)
+        if 'team' in recommendation_types:
+            rows += cls._rank_teams(skill_ratings, game_ids, excluded, limit, now, results)
+        
+        if rows:
+            Recommendation.objects.bulk_create(
+                rows,
+                batch_size=cls.BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['user', 'recommendation_type', 'content_type', 'object_id'],
+                update_fields=cls.REFRESH_FIELDS,
+            )
         
-        # Get existing recommendations (including dismissed ones for filtering)
-        existing_recs = Recommendation.objects.filter(
-            user_id=user_id,
-            recommendation_type='team'
-        )
+        if 'tournament' in recommendation_types:
+            # bulk_create sends no signals; drop the dashboard widgets directly
+            from dashboard.snapshots import DashboardSnapshotService
+            DashboardSnapshotService.invalidate_users(user_ids, 'recommendations')
+        
+        return results
+    
+    @classmethod
+    def refresh_recommendations_batch(cls, user_ids: List[uuid.UUID]) -> Dict:
+        """
+        Regenerate recommendations for a batch of users.
+        
+        Bulk equivalent of refresh_recommendations() used by the nightly job.
+        
+        Args:
+            user_ids: UUIDs of the users to refresh
+            
+        Returns:
+            Dictionary containing:
+                - user_count: Number of users processed
+                - total_count: Total number of recommendations generated
+        
+        **Validates: Requirements 13.5**
+        """
+        from dashboard.models import Recommendation
+        
+        user_ids = list(user_ids)
+        Recommendation.objects.filter(
+            user_id__in=user_ids,
+            expires_at__lt=timezone.now()
+        ).delete()
+        
+        generated = cls.generate_recommendations(user_ids, limit=3)
+        
+        return {
+            'user_count': len(user_ids),
+            'total_count': sum(
+                len(object_ids)
+                for by_type in generated.values()
+                for object_ids in by_type.values()
+            ),
+        }
+    
+    @classmethod
+    def _excluded_object_ids(cls, user_ids: List[uuid.UUID], recommendation_types, now) -> Dict:
+        """
+        Object IDs that must not be recommended again, keyed by
+        (user_id, recommendation_type): dismissed within the cooldown period
+        or already recommended and not yet expired.
+        """
+        from dashboard.models import Recommendation
         
-        # Get dismissed team IDs within cooldown period
         cooldown_date = now - timedelta(days=cls.DISMISSAL_COOLDOWN_DAYS)
-        dismissed_team_ids = set(
-            existing_recs.filter(
-                is_dismissed=True,
-                dismissed_at__gte=cooldown_date
-            ).values_list('object_id', flat=True)
-        )
+        excluded = defaultdict(set)
+        rows = Recommendation.objects.filter(
+            user_id__in=user_ids,
+            recommendation_type__in=recommendation_types
+        ).filter(
+            Q(is_dismissed=True, dismissed_at__gte=cooldown_date) |
+            Q(is_dismissed=False, expires_at__gt=now)
+        ).values_list('user_id', 'recommendation_type', 'object_id')
+        
+        for user_id, rec_type, object_id in rows:
+            excluded[(user_id, rec_type)].add(object_id)
+        return excluded
+    
+    @classmethod
+    def _rank_tournaments(cls, skill_ratings, game_ids, excluded, limit, now, results) -> List:
+        """Score open tournaments for every user in the batch"""
+        from tournaments.models import Tournament, Participant
         
-        # Get already recommended team IDs (not expired)
-        already_recommended_ids = set(
-            existing_recs.filter(
-                is_dismissed=False,
-                expires_at__gt=now
-            ).values_list('object_id', flat=True)
-        )
+        tournaments = list(Tournament.objects.filter(
+            game_id__in=game_ids,
+            status__in=['registration', 'draft'],
+            registration_end__gt=now,
+            start_datetime__gt=now
+        ).select_related('game'))
+        if not tournaments:
+            return []
         
-        # Filter out dismissed and already recommended teams
-        teams = teams.exclude(id__in=dismissed_team_ids)
-        teams = teams.exclude(id__in=already_recommended_ids)
+        # Confirmed past participations per (user, game)
+        participations = {
+            (row['user_id'], row['tournament__game_id']): row['count']
+            for row in Participant.objects.filter(
+                user_id__in=list(skill_ratings),
+                tournament__game_id__in=game_ids,
+                status='confirmed'
+            ).values('user_id', 'tournament__game_id').annotate(count=Count('id'))
+        }
         
-        # Score and rank teams
-        scored_teams = []
-        for team in teams:
-            from core.models import User
-            user = User.objects.get(id=user_id)
-            score = cls.calculate_recommendation_score(user, team)
-            if score > 0:
-                scored_teams.append((team, score))
+        def score(user_id, tournament, user_skill):
+            return (
+                50.0
+                + cls._skill_match_points(tournament, user_skill)
+                + min(20.0, participations.get((user_id, tournament.game_id), 0) * 5.0)
+            )
+        
+        return cls._rank_candidates(
+            'tournament', tournaments, score,
+            lambda user_id, tournament: cls._generate_tournament_reason(
+                user_id, tournament, skill_ratings[user_id]
+            ),
+            skill_ratings, excluded, limit, now, results
+        )
+    
+    @classmethod
+    def _rank_teams(cls, skill_ratings, game_ids, excluded, limit, now, results) -> List:
+        """Score recruiting teams for every user in the batch"""
+        from teams.models import Team
+        
+        teams = list(Team.objects.filter(
+            game_id__in=game_ids,
+            is_recruiting=True,
+            status='active'
+        ).select_related('game').annotate(
+            active_member_count=Count('members', filter=Q(members__status='active'))
+        ))
+        if not teams:
+            return []
         
-        # Sort by score descending
-        scored_teams.sort(key=lambda x: x[1], reverse=True)
+        def score(user_id, team, user_skill):
+            return (
+                50.0
+                + cls._skill_match_points(team, user_skill)
+                + cls._team_activity_points(team.active_member_count)
+            )
         
-        # Take top N
-        top_teams = scored_teams[:limit]
+        return cls._rank_candidates(
+            'team', teams, score,
+            lambda user_id, team: cls._generate_team_reason(user_id, team),
+            skill_ratings, excluded, limit, now, results
+        )
+    
+    @classmethod
+    def _rank_candidates(cls, rec_type, candidates, score_func, reason_func,
+                         skill_ratings, excluded, limit, now, results) -> List:
+        """
+        Rank candidates per user and build unsaved Recommendation rows.
+        Candidates keep their query order for equal scores.
+        """
+        from dashboard.models import Recommendation
+        from django.contrib.contenttypes.models import ContentType
         
-        # Create or update recommendations
-        team_content_type = ContentType.objects.get_for_model(Team)
-        recommendations = []
+        content_type = ContentType.objects.get_for_model(type(candidates[0]))
+        expires_at = now + timedelta(hours=24)
+        rows = []
         
-        for team, score in top_teams:
-            # Generate reason
-            reason = cls._generate_team_reason(user_id, team)
+        for user_id, ratings in skill_ratings.items():
+            skipped = excluded.get((user_id, rec_type), ())
+            scored = []
+            for item in candidates:
+                if item.game_id not in ratings or item.id in skipped:
+                    continue
+                score = round(score_func(user_id, item, ratings[item.game_id]), 2)
+                if score > 0:
+                    scored.append((item, score))
             
-            # Create or update recommendation
-            rec, created = Recommendation.objects.update_or_create(
-                user_id=user_id,
-                recommendation_type='team',
-                content_type=team_content_type,
-                object_id=team.id,
-                defaults={
-                    'score': score,
-                    'reason': reason,
-                    'expires_at': now + timedelta(hours=24),
-                    'is_dismissed': False,
-                    'dismissed_at': None,
-                }
-            )
-            recommendations.append(rec)
+            scored.sort(key=lambda x: x[1], reverse=True)
+            
+            for item, score in scored[:limit]:
+                rows.append(Recommendation(
+                    user_id=user_id,
+                    recommendation_type=rec_type,
+                    content_type=content_type,
+                    object_id=item.id,
+                    score=score,
+                    reason=reason_func(user_id, item),
+                    expires_at=expires_at,
+                    is_dismissed=False,
+                    dismissed_at=None,
+                ))
+                results[user_id][rec_type].append(item.id)
+        
+        return rows
+    
+    @classmethod
+    def _recommendations_queryset(cls, user_id: uuid.UUID, rec_type: str, object_ids: List):
+        """Stored recommendations for the given object IDs"""
+        from dashboard.models import Recommendation
+        
+        if not object_ids:
+            return Recommendation.objects.none()
         
         return Recommendation.objects.filter(
-            id__in=[r.id for r in recommendations]
+            user_id=user_id,
+            recommendation_type=rec_type,
+            object_id__in=object_ids
         ).select_related('user')
     
     @classmethod
@@ -1191,23 +1414,7 @@ class RecommendationService:
                 score += 50.0
                 
                 # Skill level match (30 points)
-                # Check if tournament has skill requirements
-                if hasattr(item, 'min_skill_rating') and hasattr(item, 'max_skill_rating'):
-                    if item.min_skill_rating and item.max_skill_rating:
-                        user_skill = user_profile.skill_rating or 0
-                        if item.min_skill_rating <= user_skill <= item.max_skill_rating:
-                            score += 30.0
-                        else:
-                            # Partial points for being close
-                            distance = min(
-                                abs(user_skill - item.min_skill_rating),
-                                abs(user_skill - item.max_skill_rating)
-                            )
-                            if distance <= 500:  # Within 500 rating points
-                                score += 15.0
-                else:
-                    # No skill requirements, give full points
-                    score += 30.0
+                score += cls._skill_match_points(item, user_profile.skill_rating or 0)
                 
                 # Past participation patterns (20 points)
                 # Check if user has participated in similar tournaments
@@ -1232,39 +1439,45 @@ class RecommendationService:
                 score += 50.0
                 
                 # Skill level match (30 points)
-                # Check if team has skill requirements
-                if hasattr(item, 'min_skill_rating') and hasattr(item, 'max_skill_rating'):
-                    if item.min_skill_rating and item.max_skill_rating:
-                        user_skill = user_profile.skill_rating or 0
-                        if item.min_skill_rating <= user_skill <= item.max_skill_rating:
-                            score += 30.0
-                        else:
-                            # Partial points for being close
-                            distance = min(
-                                abs(user_skill - item.min_skill_rating),
-                                abs(user_skill - item.max_skill_rating)
-                            )
-                            if distance <= 500:  # Within 500 rating points
-                                score += 15.0
-                else:
-                    # No skill requirements, give full points
-                    score += 30.0
+                score += cls._skill_match_points(item, user_profile.skill_rating or 0)
                 
                 # Team activity (20 points)
-                # Check team's recent activity
-                if hasattr(item, 'member_count'):
-                    # More active teams get higher scores
-                    if item.member_count >= 5:
-                        score += 20.0
-                    elif item.member_count >= 3:
-                        score += 15.0
-                    elif item.member_count >= 1:
-                        score += 10.0
-                else:
-                    score += 10.0  # Default partial points
+                # More active teams get higher scores
+                score += cls._team_activity_points(item.member_count)
         
         return round(score, 2)
     
+    @classmethod
+    def _skill_match_points(cls, item, user_skill: int) -> float:
+        """
+        Skill level match component of the recommendation score (max 30).
+        Items without skill requirements get full points.
+        """
+        if hasattr(item, 'min_skill_rating') and hasattr(item, 'max_skill_rating'):
+            if item.min_skill_rating and item.max_skill_rating:
+                if item.min_skill_rating <= user_skill <= item.max_skill_rating:
+                    return 30.0
+                # Partial points for being close
+                distance = min(
+                    abs(user_skill - item.min_skill_rating),
+                    abs(user_skill - item.max_skill_rating)
+                )
+                if distance <= 500:  # Within 500 rating points
+                    return 15.0
+            return 0.0
+        return 30.0
+    
+    @classmethod
+    def _team_activity_points(cls, member_count: int) -> float:
+        """Team activity component of the recommendation score (max 20)"""
+        if member_count >= 5:
+            return 20.0
+        elif member_count >= 3:
+            return 15.0
+        elif member_count >= 1:
+            return 10.0
+        return 0.0
+    
     @classmethod
     def dismiss_recommendation(cls, user_id: uuid.UUID, rec_id: uuid.UUID) -> None:
         """
@@ -1324,8 +1537,9 @@ class RecommendationService:
         ).delete()
         
         # Generate new recommendations
-        tournament_recs = cls.get_tournament_recommendations(user_id, limit=3)
-        team_recs = cls.get_team_recommendations(user_id, limit=3)
+        generated = cls.generate_recommendations([user_id], limit=3)[user_id]
+        tournament_recs = cls._recommendations_queryset(user_id, 'tournament', generated['tournament'])
+        team_recs = cls._recommendations_queryset(user_id, 'team', generated['team'])
         
         return {
             'tournament_recommendations': tournament_recs,
@@ -6,14 +6,16 @@ Performance Optimizations (Task 23.4):
 - Cache invalidation on new activity (activity feed)
 - Cache invalidation on preference change (recommendations)
 - All cache invalidation uses StatisticsService.invalidate_cache() for consistency
+- Dashboard widget snapshots are refreshed when the data behind them changes
 """
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.db import transaction
 from django.core.cache import cache
 from core.models import User, UserGameProfile
-from dashboard.models import ProfileCompleteness, Activity, UserAchievement
+from dashboard.models import ProfileCompleteness, Activity, UserAchievement, Recommendation
 from dashboard.services import ActivityService, StatisticsService
+from dashboard.snapshots import DashboardSnapshotService
 
 
 @receiver(post_save, sender=User)
@@ -110,9 +112,10 @@ def record_tournament_activity(sender, instance, created, **kwargs):
             if instance.tournament.game:
                 cache.delete(f"user_game_stats:{instance.user.id}:{instance.tournament.game.id}")
             
-            # Check for tournament-related achievements
-            from dashboard.tasks import check_user_achievements
-            check_user_achievements.delay(str(instance.user.id), 'tournament_completed')
+            # Check tournament-related achievements for all players in one job
+            from dashboard.tasks import schedule_tournament_achievement_check
+            tournament_id = instance.tournament_id
+            transaction.on_commit(lambda: schedule_tournament_achievement_check(tournament_id))
     except Exception:
         # Silently fail to avoid breaking tournament operations
         pass
@@ -328,3 +331,57 @@ def record_game_profile_activity(sender, instance, created, **kwargs):
     except Exception:
         # Silently fail to avoid breaking game profile operations
         pass
+
+
+# Dashboard Snapshot Signal Handlers
+#
+# Upcoming tournaments are not refreshed from Tournament saves (view counters
+# save often); that shared widget relies on its short TTL instead.
+
+def _refresh_dashboard(user_id, *widgets):
+    """Refresh dashboard widget snapshots once the current transaction commits"""
+    transaction.on_commit(lambda: DashboardSnapshotService.refresh(user_id, *widgets))
+
+
+@receiver(post_save, sender='tournaments.Participant')
+@receiver(post_delete, sender='tournaments.Participant')
+@receiver(post_save, sender='teams.TeamMember')
+@receiver(post_delete, sender='teams.TeamMember')
+def refresh_dashboard_stats(sender, instance, **kwargs):
+    """
+    Refresh the statistics cards when participations or teams change.
+    The unread notification count is read from its own counter on render.
+    """
+    if instance.user_id:
+        _refresh_dashboard(instance.user_id, 'stats')
+
+
+@receiver(post_save, sender=Activity)
+def refresh_dashboard_activity(sender, instance, created, **kwargs):
+    """Refresh the activity feed widget when an activity is recorded"""
+    if created:
+        _refresh_dashboard(instance.user_id, 'activity')
+
+
+@receiver(post_save, sender=Recommendation)
+def refresh_dashboard_recommendations(sender, instance, **kwargs):
+    """Refresh the recommendations widget when a recommendation changes (e.g. dismissal)"""
+    _refresh_dashboard(instance.user_id, 'recommendations')
+
+
+@receiver(post_save, sender='payments.Payment')
+@receiver(post_save, sender='payments.PaymentMethod')
+@receiver(post_delete, sender='payments.PaymentMethod')
+def refresh_dashboard_payments(sender, instance, **kwargs):
+    """Refresh the payment summary widget when payments or saved methods change"""
+    if instance.user_id:
+        _refresh_dashboard(instance.user_id, 'payments')
+
+
+@receiver(post_save, sender='store.Product')
+@receiver(post_delete, sender='store.Product')
+@receiver(post_save, sender='store.ProductImage')
+@receiver(post_delete, sender='store.ProductImage')
+def refresh_dashboard_featured_products(sender, instance, **kwargs):
+    """Drop the shared merch teaser when products or their images change"""
+    _refresh_dashboard(None, 'featured_products')
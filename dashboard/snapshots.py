@@ -0,0 +1,251 @@
+"""
+Precomputed dashboard widget snapshots.
+
+Each dashboard widget (statistics cards, activity feed, upcoming events,
+recommendations, payment summary, merch teaser) is built independently and
+stored in the cache under its own key with its own TTL. ``dashboard_home``
+reads every widget with a single ``cache.get_many`` round trip; widgets that
+are cold are either built inline or, with ``DASHBOARD_LAZY_WIDGETS`` enabled,
+rendered as placeholders that the page fetches concurrently from
+``dashboard:widget`` once the first byte has been sent.
+
+Widget builders only read. Recommendations are served from the rows stored by
+the recommendation refresh jobs; when a user has none yet a background refresh
+is queued (with ``DASHBOARD_SNAPSHOT_PREWARM``) instead of scoring tournaments
+on the request path.
+
+Signal handlers in ``dashboard.signals`` call ``refresh()`` when the data
+behind a widget changes: the stale payload is dropped immediately and, with
+``DASHBOARD_SNAPSHOT_PREWARM`` enabled, rebuilt by a Celery task.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardSnapshotService:
+    """
+    Service for building, caching and invalidating dashboard widget payloads.
+
+    A widget payload is a dictionary of template context variables, so a
+    cached payload can be merged straight into the dashboard context or
+    rendered on its own as a fragment.
+    """
+
+    # Widget name -> (template, cache TTL in seconds, shared between users)
+    WIDGETS = {
+        'stats': ('dashboard/components/stats_cards_gaming.html', 300, False),
+        'activity': ('dashboard/components/activity_feed_gaming.html', 900, False),
+        'upcoming_tournaments': ('dashboard/components/upcoming_tournaments_gaming.html', 300, True),
+        'recommendations': ('dashboard/components/recommendations_gaming.html', 3600, False),
+        'payments': ('dashboard/components/payment_summary_gaming.html', 900, False),
+        'featured_products': ('dashboard/components/featured_products_gaming.html', 1800, True),
+    }
+
+    # Widgets always built inline (above the fold, cheap when cold)
+    EAGER_WIDGETS = ('stats',)
+
+    # Default payloads used when a builder fails
+    FALLBACKS = {
+        'stats': {
+            'stats': {
+                'total_tournaments': 0,
+                'win_rate': 0.0,
+                'current_teams': 0,
+                'unread_notifications': 0,
+            },
+        },
+        'activity': {'recent_activities': []},
+        'upcoming_tournaments': {'upcoming_tournaments': []},
+        'recommendations': {'recommendations': []},
+        'payments': {
+            'payment_summary': {
+                'total_spent': 0,
+                'recent_payments_count': 0,
+                'saved_payment_methods_count': 0,
+                'has_default_method': False,
+                'recent_payments': [],
+            },
+        },
+        'featured_products': {'featured_products': []},
+    }
+
+    @classmethod
+    def cache_key(cls, widget: str, user_id=None) -> str:
+        """Cache key for a widget payload (shared widgets ignore user_id)"""
+        if cls.WIDGETS[widget][2]:
+            return f"dashboard_widget:{widget}"
+        return f"dashboard_widget:{widget}:{user_id}"
+
+    @classmethod
+    def get_cached(cls, user_id, widgets=None):
+        """
+        Read cached widget payloads in one cache round trip.
+
+        Args:
+            user_id: UUID of the user
+            widgets: Widget names to read (default: all widgets)
+
+        Returns:
+            Tuple of (payloads, missing): payloads maps widget name to its
+            cached payload, missing lists the cold widget names in order
+        """
+        widgets = list(widgets or cls.WIDGETS)
+        keys = {cls.cache_key(widget, user_id): widget for widget in widgets}
+        cached = cache.get_many(list(keys))
+
+        payloads = {keys[key]: payload for key, payload in cached.items()}
+        missing = [widget for widget in widgets if widget not in payloads]
+        return payloads, missing
+
+    @classmethod
+    def get_widget(cls, user, widget: str):
+        """Cached payload for a widget, building and storing it when cold"""
+        payload = cache.get(cls.cache_key(widget, user.id))
+        if payload is None:
+            payload = cls.build(user, widget)
+        return payload
+
+    @classmethod
+    def build(cls, user, widget: str):
+        """
+        Build a widget payload and store it with the widget's TTL.
+
+        Builder errors are logged and answered with the widget's fallback
+        payload, which is not cached.
+        """
+        builder = getattr(cls, f"_build_{widget}")
+        try:
+            payload = builder(user)
+        except Exception as e:
+            logger.error(f"Error building dashboard widget {widget} for user {user.id}: {str(e)}")
+            return cls.FALLBACKS[widget]
+
+        cache.set(cls.cache_key(widget, user.id), payload, cls.WIDGETS[widget][1])
+        return payload
+
+    @classmethod
+    def refresh(cls, user_id, *widgets) -> None:
+        """
+        Drop stale widget payloads and queue a rebuild.
+
+        Called by signal handlers; the rebuild runs in Celery when
+        DASHBOARD_SNAPSHOT_PREWARM is enabled, otherwise the next dashboard
+        request rebuilds the widgets.
+        """
+        widgets = [widget for widget in widgets if widget in cls.WIDGETS]
+        if not widgets:
+            return
+
+        cache.delete_many([cls.cache_key(widget, user_id) for widget in widgets])
+
+        if user_id is None or not getattr(settings, 'DASHBOARD_SNAPSHOT_PREWARM', False):
+            return
+
+        try:
+            from dashboard.tasks import refresh_dashboard_widgets
+            refresh_dashboard_widgets.delay(str(user_id), widgets)
+        except Exception as e:
+            logger.warning(f"Could not queue dashboard widget refresh for user {user_id}: {str(e)}")
+
+    @classmethod
+    def invalidate_users(cls, user_ids, *widgets) -> None:
+        """Drop per-user widget payloads for many users without rebuilding"""
+        cache.delete_many([
+            cls.cache_key(widget, user_id)
+            for user_id in user_ids
+            for widget in widgets
+        ])
+
+    # Widget builders
+
+    @classmethod
+    def _build_stats(cls, user):
+        from dashboard.services import StatisticsService
+        from notifications.counters import UnreadCounter
+        from teams.models import TeamMember
+
+        user_stats = StatisticsService.get_user_statistics(user.id)
+        return {
+            'stats': {
+                'total_tournaments': user_stats['total_tournaments'],
+                'win_rate': user_stats['win_rate'],
+                'current_teams': TeamMember.objects.filter(user=user, status='active').count(),
+                'unread_notifications': UnreadCounter.get(user.id),
+            },
+        }
+
+    @classmethod
+    def _build_activity(cls, user):
+        from dashboard.services import ActivityService
+
+        # First keyset page of the feed; the total is cached, never counted per request
+        return {
+            'recent_activities': ActivityService.get_activity_page(user.id, page_size=10)['activities'],
+        }
+
+    @classmethod
+    def _build_upcoming_tournaments(cls, user):
+        from tournaments.models import Tournament
+
+        now = timezone.now()
+        return {
+            'upcoming_tournaments': list(
+                Tournament.objects.filter(
+                    start_datetime__gte=now,
+                    start_datetime__lte=now + timedelta(days=7),
+                    status__in=['registration', 'draft', 'check_in']
+                ).select_related('game', 'organizer', 'venue').order_by('start_datetime')[:5]
+            ),
+        }
+
+    @classmethod
+    def _build_recommendations(cls, user):
+        from dashboard.models import Recommendation
+
+        recommendations = list(
+            Recommendation.objects.filter(
+                user=user,
+                recommendation_type='tournament',
+                is_dismissed=False,
+                expires_at__gt=timezone.now()
+            ).select_related('user').order_by('-score', '-created_at')[:3]
+        )
+
+        if not recommendations and getattr(settings, 'DASHBOARD_SNAPSHOT_PREWARM', False):
+            # Scoring writes rows, so it never runs on the request path
+            try:
+                from dashboard.tasks import refresh_user_recommendations
+                refresh_user_recommendations.delay(str(user.id))
+            except Exception as e:
+                logger.warning(f"Could not queue recommendation refresh for user {user.id}: {str(e)}")
+
+        return {'recommendations': recommendations}
+
+    @classmethod
+    def _build_payments(cls, user):
+        from dashboard.services import PaymentSummaryService
+
+        payment_summary = PaymentSummaryService.get_payment_summary(user.id)
+        payment_summary['recent_payments'] = list(payment_summary['recent_payments'])
+        return {'payment_summary': payment_summary}
+
+    @classmethod
+    def _build_featured_products(cls, user):
+        from store.models import Product
+
+        return {
+            'featured_products': list(
+                Product.objects.filter(
+                    is_active=True,
+                    is_featured=True,
+                    stock_quantity__gt=0
+                ).prefetch_related('images').order_by('-created_at')[:4]
+            ),
+        }
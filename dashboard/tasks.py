@@ -2,7 +2,7 @@
 Celery tasks for dashboard functionality.
 
 This module provides background tasks for recommendation refresh,
-activity cleanup, and achievement checks.
+dashboard widget snapshots, activity cleanup, and achievement checks.
 """
 
 from celery import shared_task
@@ -58,40 +58,91 @@ def refresh_user_recommendations(user_id):
 
 
 @shared_task
-def refresh_all_user_recommendations():
+def refresh_recommendations_chunk(user_ids):
+    """
+    Refresh recommendations for one chunk of users.
+    
+    Candidates, game profiles and dismissals are loaded once for the whole
+    chunk and results are written in bulk. Dispatched in parallel by
+    refresh_all_user_recommendations(parallel=True).
+    
+    Args:
+        user_ids: List of UUID strings
+        
+    Returns:
+        Dictionary with the chunk's user and recommendation counts
+    
+    **Validates: Requirements 13.5**
+    """
+    from dashboard.services import RecommendationService
+    import uuid
+    
+    try:
+        user_uuids = [uuid.UUID(str(user_id)) for user_id in user_ids]
+        return RecommendationService.refresh_recommendations_batch(user_uuids)
+    
+    except Exception as e:
+        logger.error(f"Error refreshing recommendations for chunk of {len(user_ids)} users: {str(e)}")
+        raise
+
+
+@shared_task
+def refresh_all_user_recommendations(chunk_size=None, parallel=False):
     """
     Refresh recommendations for all active users.
     
     This task is scheduled to run daily and refreshes recommendations
-    for all users who have game profiles and are active.
+    for all users who have game profiles and are active. Users are
+    processed in chunks of ``chunk_size``; with ``parallel=True`` every
+    chunk is dispatched as its own refresh_recommendations_chunk task.
+    
+    Args:
+        chunk_size: Users per chunk (default RecommendationService.BATCH_SIZE)
+        parallel: Dispatch chunks to workers instead of running them here
     
     Returns:
         Dictionary with statistics about the refresh operation
     
     **Validates: Requirements 13.5**
     """
+    from celery import group
     from core.models import User
     from dashboard.services import RecommendationService
     
     try:
+        chunk_size = chunk_size or RecommendationService.BATCH_SIZE
+        
         # Get all active users with game profiles
-        users = User.objects.filter(
-            is_active=True,
-            game_profiles__isnull=False
-        ).distinct()
+        user_ids = [
+            str(user_id) for user_id in User.objects.filter(
+                is_active=True,
+                game_profiles__isnull=False
+            ).distinct().order_by('id').values_list('id', flat=True)
+        ]
+        chunks = [user_ids[i:i + chunk_size] for i in range(0, len(user_ids), chunk_size)]
+        
+        if parallel:
+            group(refresh_recommendations_chunk.s(chunk) for chunk in chunks).apply_async()
+            logger.info(
+                f"Daily recommendation refresh dispatched: "
+                f"{len(user_ids)} users in {len(chunks)} chunks"
+            )
+            return {
+                'user_count': len(user_ids),
+                'chunk_count': len(chunks),
+            }
         
         success_count = 0
         error_count = 0
         total_recommendations = 0
         
-        for user in users:
+        for chunk in chunks:
             try:
-                result = RecommendationService.refresh_recommendations(user.id)
-                success_count += 1
+                result = refresh_recommendations_chunk(chunk)
+                success_count += result['user_count']
                 total_recommendations += result['total_count']
-            except Exception as e:
-                logger.error(f"Error refreshing recommendations for user {user.id}: {str(e)}")
-                error_count += 1
+            except Exception:
+                error_count += len(chunk)
         
         logger.info(
             f"Daily recommendation refresh complete: "
@@ -191,3 +242,110 @@ def check_user_achievements(user_id, event_type):
     except Exception as e:
         logger.error(f"Error checking achievements for user {user_id}: {str(e)}")
         raise
+
+
+@shared_task
+def check_tournament_achievements(tournament_id, event_type='tournament_completed', chunk_size=None):
+    """
+    Re-evaluate achievements for every player of a tournament.
+    
+    Runs as one job: players are checked in chunks of ``chunk_size`` with
+    AchievementService.check_achievements_batch() instead of queuing one
+    check_user_achievements task per player. Scheduled (and coalesced) by
+    schedule_tournament_achievement_check().
+    
+    Args:
+        tournament_id: UUID string of the tournament
+        event_type: Achievement event to evaluate
+        chunk_size: Users per chunk (default AchievementService.BATCH_SIZE)
+        
+    Returns:
+        Dictionary with user and award counts
+    
+    **Validates: Requirements 7.1**
+    """
+    from django.core.cache import cache
+    from dashboard.services import AchievementService
+    from tournaments.models import Participant
+    
+    cache.delete(f"achievement_check_pending:{tournament_id}")
+    
+    try:
+        chunk_size = chunk_size or AchievementService.BATCH_SIZE
+        user_ids = list(Participant.objects.filter(
+            tournament_id=tournament_id,
+            user__isnull=False
+        ).order_by('user_id').values_list('user_id', flat=True).distinct())
+        
+        awarded_count = 0
+        for i in range(0, len(user_ids), chunk_size):
+            results = AchievementService.check_achievements_batch(user_ids[i:i + chunk_size], event_type)
+            awarded_count += sum(
+                1 for user_achievements in results.values()
+                for user_achievement in user_achievements
+                if user_achievement.is_completed
+            )
+        
+        logger.info(
+            f"Achievement check for tournament {tournament_id} (event: {event_type}): "
+            f"{len(user_ids)} users, {awarded_count} achievements awarded"
+        )
+        
+        return {
+            'tournament_id': str(tournament_id),
+            'user_count': len(user_ids),
+            'achievements_awarded': awarded_count,
+        }
+    
+    except Exception as e:
+        logger.error(f"Error checking achievements for tournament {tournament_id}: {str(e)}")
+        raise
+
+
+def schedule_tournament_achievement_check(tournament_id, delay=None):
+    """
+    Queue check_tournament_achievements() once per tournament.
+    
+    Placement updates arrive one participant at a time; the first one queues
+    the job with a short countdown and later ones within that window are
+    folded into it. Runs from on_commit hooks, so a cache or broker outage is
+    logged instead of raised into the caller's save.
+    """
+    from django.conf import settings
+    from django.core.cache import cache
+    
+    delay = delay if delay is not None else getattr(settings, 'ACHIEVEMENT_CHECK_COALESCE_SECONDS', 30)
+    try:
+        if cache.add(f"achievement_check_pending:{tournament_id}", True, delay * 2):
+            check_tournament_achievements.apply_async((str(tournament_id),), countdown=delay)
+    except Exception as e:
+        logger.warning(f"Could not queue achievement check for tournament {tournament_id}: {str(e)}")
+
+
+@shared_task
+def refresh_dashboard_widgets(user_id, widgets):
+    """
+    Rebuild a user's dashboard widget snapshots.
+    
+    Queued by DashboardSnapshotService.refresh() from signal handlers so the
+    next dashboard request finds the widgets warm.
+    
+    Args:
+        user_id: UUID string of the user
+        widgets: Widget names to rebuild
+        
+    Returns:
+        Dictionary with the rebuilt widget names
+    """
+    from core.models import User
+    from dashboard.snapshots import DashboardSnapshotService
+    
+    try:
+        user = User.objects.get(pk=user_id)
+    except User.DoesNotExist:
+        return {'user_id': str(user_id), 'widgets': []}
+    
+    for widget in widgets:
+        DashboardSnapshotService.build(user, widget)
+    
+    return {'user_id': str(user_id), 'widgets': list(widgets)}
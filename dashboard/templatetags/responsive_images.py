@@ -14,6 +14,7 @@ WebP Support:
 """
 
 from django import template
+from django.core.files.storage import default_storage
 from django.utils.safestring import mark_safe
 from PIL import Image
 import os
@@ -47,6 +48,31 @@ def get_webp_url(image_url):
     return webp_url
 
 
+def derivative_srcsets(manifest):
+    """
+    WebP and JPEG srcset strings from an image derivative manifest
+    (``Tournament.image_derivatives[field]``), or (None, None).
+    """
+    derivatives = (manifest or {}).get('derivatives')
+    if not derivatives:
+        return None, None
+    ordered = sorted(derivatives, key=lambda derivative: derivative['width'])
+    webp = ', '.join(f"{default_storage.url(d['webp'])} {d['width']}w" for d in ordered)
+    jpeg = ', '.join(f"{default_storage.url(d['jpeg'])} {d['width']}w" for d in ordered)
+    return webp, jpeg
+
+
+@register.filter
+def derivative_srcset(manifest, image_format="jpeg"):
+    """
+    srcset for pre-generated derivatives of one format ('webp' or 'jpeg')
+    
+    Usage: {{ tournament.image_derivatives.banner|derivative_srcset:"webp" }}
+    """
+    webp, jpeg = derivative_srcsets(manifest)
+    return (webp if image_format == "webp" else jpeg) or ""
+
+
 @register.simple_tag
 def responsive_avatar(image_field, alt_text="", css_class="", lazy=True, img_id=""):
     """
@@ -118,7 +144,7 @@ def responsive_avatar(image_field, alt_text="", css_class="", lazy=True, img_id=
 
 
 @register.simple_tag
-def responsive_banner(image_field, alt_text="", css_class="", img_id=""):
+def responsive_banner(image_field, alt_text="", css_class="", img_id="", manifest=None):
     """
     Generate responsive banner image with srcset
     
@@ -127,6 +153,7 @@ def responsive_banner(image_field, alt_text="", css_class="", img_id=""):
         alt_text: Alt text for accessibility
         css_class: Additional CSS classes
         img_id: Optional id attribute for the img element
+        manifest: Optional derivative manifest; adds WebP/JPEG size srcsets
     
     Returns:
         HTML img tag with srcset for responsive loading
@@ -140,9 +167,9 @@ def responsive_banner(image_field, alt_text="", css_class="", img_id=""):
     # Get the base URL
     base_url = image_field.url
     
-    # Generate srcset for different sizes
-    # In production, these would be pre-generated or generated on-the-fly
-    srcset = f"{base_url} 1920w"
+    # Generate srcset for different sizes, from pre-generated derivatives if available
+    webp_srcset, jpeg_srcset = derivative_srcsets(manifest)
+    srcset = jpeg_srcset or f"{base_url} 1920w"
     
     # Responsive sizes based on viewport
     sizes = "(max-width: 768px) 640px, (max-width: 1024px) 1280px, 1920px"
@@ -161,6 +188,12 @@ def responsive_banner(image_field, alt_text="", css_class="", img_id=""):
         decoding="async"
     />'''
     
+    if webp_srcset:
+        html = f'''<picture>
+    <source type="image/webp" srcset="{webp_srcset}" sizes="{sizes}">
+    {html}
+</picture>'''
+    
     return mark_safe(html)
 
 
@@ -0,0 +1,148 @@
+"""
+Tests for rule-based achievement evaluation.
+
+All rules for an event are evaluated in one pass against aggregated metrics,
+so the number of queries must not grow with the number of users or rules.
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.models import User, Game
+from dashboard.models import Achievement, Activity, UserAchievement
+from dashboard.services import AchievementService
+from dashboard.tasks import check_tournament_achievements
+from tournaments.models import Tournament, Participant
+
+
+class AchievementRuleEngineTest(TestCase):
+    """Test batch achievement checks."""
+
+    def setUp(self):
+        now = timezone.now()
+        self.game = Game.objects.create(name='Rule Game', slug='rule-game', genre='fps')
+        self.organizer = User.objects.create_user(
+            username='organizer', email='organizer@example.com', password='testpass123'
+        )
+        self.first_win = Achievement.objects.create(
+            name='First Win', slug='first-tournament-win', description='Win a tournament',
+            achievement_type='tournament', points_reward=150
+        )
+        self.ten_tournaments = Achievement.objects.create(
+            name='Veteran', slug='ten-tournaments', description='Play ten tournaments',
+            achievement_type='tournament', is_progressive=True, target_value=10, points_reward=50
+        )
+        self.top_three = Achievement.objects.create(
+            name='Podium', slug='top-three-finish', description='Finish in the top three',
+            achievement_type='tournament', points_reward=25
+        )
+
+        self.tournament = Tournament.objects.create(
+            name='Rule Cup',
+            slug='rule-cup',
+            description='Finished',
+            game=self.game,
+            organizer=self.organizer,
+            status='completed',
+            registration_start=now - timedelta(days=10),
+            registration_end=now - timedelta(days=5),
+            check_in_start=now - timedelta(days=3),
+            start_datetime=now - timedelta(days=2),
+        )
+
+        self.users = []
+        for i in range(4):
+            user = User.objects.create_user(
+                username=f'ruler{i}', email=f'ruler{i}@example.com', password='testpass123'
+            )
+            Participant.objects.create(
+                tournament=self.tournament, user=user, status='confirmed', final_placement=i + 1
+            )
+            self.users.append(user)
+
+    def test_awards_points_progress_and_activity(self):
+        winner, _, _, last = self.users
+        results = AchievementService.check_achievements_batch(
+            [user.id for user in self.users], 'tournament_completed'
+        )
+
+        earned = {ua.achievement.slug for ua in results[winner.id] if ua.is_completed}
+        self.assertEqual(earned, {'first-tournament-win', 'top-three-finish'})
+        self.assertFalse(any(ua.is_completed for ua in results[last.id]))
+
+        veteran = UserAchievement.objects.get(user=winner, achievement=self.ten_tournaments)
+        self.assertEqual(veteran.current_value, 1)
+        self.assertFalse(veteran.is_completed)
+
+        winner.refresh_from_db()
+        self.assertEqual(winner.total_points, 175)
+        self.assertEqual(winner.level, 2)
+        self.assertEqual(
+            Activity.objects.filter(user=winner, activity_type='achievement_earned').count(), 2
+        )
+
+    def test_completed_achievements_are_not_awarded_twice(self):
+        winner = self.users[0]
+        AchievementService.check_achievements(winner.id, 'tournament_completed')
+        results = AchievementService.check_achievements(winner.id, 'tournament_completed')
+
+        self.assertEqual(results, [])
+        winner.refresh_from_db()
+        self.assertEqual(winner.total_points, 175)
+
+    def test_query_count_does_not_grow_with_users(self):
+        def count_queries(user_ids):
+            UserAchievement.objects.all().delete()
+            User.objects.update(total_points=0, level=1)
+            with CaptureQueriesContext(connection) as ctx:
+                AchievementService.check_achievements_batch(user_ids, 'tournament_completed')
+            return len(ctx.captured_queries)
+
+        # Both batches contain a winner, so both award points
+        self.assertEqual(
+            count_queries([self.users[0].id]),
+            count_queries([user.id for user in self.users])
+        )
+
+    def test_awarding_existing_progress_rows_costs_no_query_per_award(self):
+        def count_queries(users):
+            UserAchievement.objects.all().delete()
+            User.objects.update(total_points=0, level=1)
+            UserAchievement.objects.bulk_create([
+                UserAchievement(user=user, achievement=self.top_three, current_value=0)
+                for user in users
+            ])
+            with CaptureQueriesContext(connection) as ctx:
+                AchievementService.check_achievements_batch([user.id for user in users], 'tournament_completed')
+            return len(ctx.captured_queries)
+
+        self.assertEqual(count_queries(self.users[:1]), count_queries(self.users[:3]))
+
+    def test_placement_save_survives_scheduling_failure(self):
+        participant = Participant.objects.get(user=self.users[3])
+        with patch.object(check_tournament_achievements, 'apply_async', side_effect=ConnectionError('broker down')):
+            with self.assertLogs('dashboard.tasks', level='WARNING'):
+                with self.captureOnCommitCallbacks(execute=True):
+                    participant.final_placement = 2
+                    participant.save()
+
+    def test_unknown_event_is_ignored(self):
+        results = AchievementService.check_achievements_batch([self.users[0].id], 'unknown')
+
+        self.assertEqual(results, {self.users[0].id: []})
+        self.assertFalse(UserAchievement.objects.exists())
+
+    def test_tournament_job_checks_players_in_chunks(self):
+        result = check_tournament_achievements(str(self.tournament.id), chunk_size=3)
+
+        self.assertEqual(result['user_count'], 4)
+        # Winner: first win + podium; second and third: podium
+        self.assertEqual(result['achievements_awarded'], 4)
+        self.assertEqual(
+            UserAchievement.objects.filter(achievement=self.top_three, is_completed=True).count(), 3
+        )
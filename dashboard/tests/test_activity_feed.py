@@ -0,0 +1,101 @@
+"""
+Tests for the keyset-paginated activity feed.
+
+Cursor pages must walk the whole feed without gaps or duplicates (including
+activities that share a timestamp), totals must come from the cache, and
+retention deletes must run in chunks.
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import User
+from dashboard.models import Activity
+from dashboard.services import ActivityService
+
+
+class KeysetActivityFeedTest(TestCase):
+    """Test cursor pagination, cached totals and chunked retention."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='feeder', email='feeder@example.com', password='testpass123'
+        )
+        now = timezone.now()
+        activities = [
+            Activity(user=self.user, activity_type='profile_updated', data={'n': i})
+            for i in range(7)
+        ]
+        Activity.objects.bulk_create(activities)
+        # Two pairs share a timestamp so the id tiebreaker is exercised
+        for i, activity in enumerate(activities):
+            Activity.objects.filter(id=activity.id).update(created_at=now - timedelta(minutes=i // 2))
+
+    def test_cursor_pages_cover_feed_once(self):
+        seen = []
+        cursor = None
+        while True:
+            page = ActivityService.get_activity_page(self.user.id, cursor=cursor, page_size=3)
+            seen.extend(activity.id for activity in page['activities'])
+            if not page['has_next']:
+                self.assertIsNone(page['next_cursor'])
+                break
+            cursor = page['next_cursor']
+
+        expected = list(
+            Activity.objects.filter(user=self.user).order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+
+    def test_invalid_cursor_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            ActivityService.get_activity_page(self.user.id, cursor='not-a-cursor')
+
+    def test_total_is_cached_until_new_activity(self):
+        first = ActivityService.get_activity_page(self.user.id, page_size=3)
+        self.assertEqual(first['total_count'], 7)
+
+        with CaptureQueriesContext(connection) as ctx:
+            ActivityService.get_activity_page(self.user.id, cursor=first['next_cursor'], page_size=3)
+        self.assertEqual(len(ctx.captured_queries), 1)
+
+        ActivityService.record_activity(self.user.id, 'team_joined', {'team_name': 'Feed'})
+        self.assertEqual(ActivityService.get_activity_count(self.user.id), 8)
+
+    def test_delete_old_activities_in_chunks(self):
+        Activity.objects.filter(user=self.user).update(created_at=timezone.now() - timedelta(days=120))
+        Activity.objects.create(user=self.user, activity_type='profile_updated')
+
+        with CaptureQueriesContext(connection) as ctx:
+            deleted = ActivityService.delete_old_activities(days=90, chunk_size=3)
+
+        self.assertEqual(deleted, 7)
+        self.assertEqual(Activity.objects.filter(user=self.user).count(), 1)
+        deletes = [q for q in ctx.captured_queries if q['sql'].startswith('DELETE')]
+        self.assertEqual(len(deletes), 3)
+
+    def test_view_returns_next_batch_for_ajax(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('dashboard:activity'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['activities']), 7)
+        self.assertFalse(response.context['has_next'])
+
+        page = ActivityService.get_activity_page(self.user.id, page_size=5)
+        response = self.client.get(
+            reverse('dashboard:activity'),
+            {'cursor': page['next_cursor']},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest'
+        )
+
+        self.assertTemplateUsed(response, 'dashboard/components/activity_feed_items.html')
+        self.assertTemplateNotUsed(response, 'dashboard/activity.html')
+        self.assertEqual(len(response.context['activities']), 2)
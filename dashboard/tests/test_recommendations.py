@@ -0,0 +1,186 @@
+"""
+Tests for batch recommendation scoring.
+
+The batch engine must produce the same scores as the per-item scorer while
+loading candidates, profiles and dismissals once per chunk of users.
+"""
+
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.models import User, UserGameProfile, Game
+from dashboard.models import Recommendation
+from dashboard.services import RecommendationService
+from dashboard.tasks import refresh_all_user_recommendations
+from teams.models import Team, TeamMember
+from tournaments.models import Tournament, Participant
+
+
+class BatchRecommendationTest(TestCase):
+    """Test set-based recommendation generation."""
+
+    def setUp(self):
+        now = timezone.now()
+        self.game = Game.objects.create(name='Batch Game', slug='batch-game', genre='fps')
+        self.other_game = Game.objects.create(name='Other Game', slug='other-game', genre='moba')
+        self.organizer = User.objects.create_user(
+            username='organizer', email='organizer@example.com', password='testpass123'
+        )
+
+        self.tournaments = []
+        for i in range(5):
+            self.tournaments.append(Tournament.objects.create(
+                name=f'Open Cup {i}',
+                slug=f'open-cup-{i}',
+                description='Open for registration',
+                game=self.game if i < 4 else self.other_game,
+                organizer=self.organizer,
+                status='registration',
+                registration_start=now - timedelta(days=1),
+                registration_end=now + timedelta(days=5 + i),
+                check_in_start=now + timedelta(days=6 + i),
+                start_datetime=now + timedelta(days=7 + i),
+            ))
+
+        past = Tournament.objects.create(
+            name='Past Cup',
+            slug='past-cup',
+            description='Finished',
+            game=self.game,
+            organizer=self.organizer,
+            status='completed',
+            registration_start=now - timedelta(days=30),
+            registration_end=now - timedelta(days=25),
+            check_in_start=now - timedelta(days=21),
+            start_datetime=now - timedelta(days=20),
+        )
+
+        self.users = []
+        for i in range(4):
+            user = User.objects.create_user(
+                username=f'player{i}', email=f'player{i}@example.com', password='testpass123'
+            )
+            UserGameProfile.objects.create(user=user, game=self.game, skill_rating=1000 + i * 100)
+            self.users.append(user)
+        UserGameProfile.objects.create(user=self.users[0], game=self.other_game)
+
+        # Past participation boosts the score for player0 and player1
+        Participant.objects.create(tournament=past, user=self.users[0], status='confirmed')
+        Participant.objects.create(tournament=past, user=self.users[1], status='confirmed')
+
+        captain = User.objects.create_user(
+            username='captain', email='captain@example.com', password='testpass123'
+        )
+        self.team = Team.objects.create(
+            name='Recruiters', tag='REC', game=self.game, captain=captain, is_recruiting=True
+        )
+        TeamMember.objects.create(team=self.team, user=captain, role='captain', status='active')
+
+    def test_batch_scores_match_single_item_scorer(self):
+        user_ids = [user.id for user in self.users]
+        generated = RecommendationService.generate_recommendations(user_ids, limit=10)
+
+        for user in self.users:
+            for rec_type in ('tournament', 'team'):
+                recs = Recommendation.objects.filter(user=user, recommendation_type=rec_type)
+                self.assertEqual(
+                    sorted(recs.values_list('object_id', flat=True)),
+                    sorted(generated[user.id][rec_type])
+                )
+                for rec in recs:
+                    self.assertEqual(
+                        rec.score,
+                        RecommendationService.calculate_recommendation_score(user, rec.content_object)
+                    )
+
+        # Only player0 plays the other game
+        self.assertIn(self.tournaments[4].id, generated[self.users[0].id]['tournament'])
+        self.assertNotIn(self.tournaments[4].id, generated[self.users[1].id]['tournament'])
+
+    def test_query_count_does_not_grow_with_users(self):
+        def count_queries(user_ids):
+            Recommendation.objects.all().delete()
+            with CaptureQueriesContext(connection) as ctx:
+                RecommendationService.generate_recommendations(user_ids)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(
+            count_queries([self.users[1].id]),
+            count_queries([user.id for user in self.users[1:]])
+        )
+
+    def test_limit_and_rank_order(self):
+        generated = RecommendationService.generate_recommendations([self.users[0].id], limit=3)
+        object_ids = generated[self.users[0].id]['tournament']
+        self.assertEqual(len(object_ids), 3)
+
+        scores = list(
+            Recommendation.objects.filter(user=self.users[0], recommendation_type='tournament')
+            .values_list('score', flat=True)
+        )
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_dismissed_items_are_excluded(self):
+        tournament_type = ContentType.objects.get_for_model(Tournament)
+        Recommendation.objects.create(
+            user=self.users[2],
+            recommendation_type='tournament',
+            content_type=tournament_type,
+            object_id=self.tournaments[0].id,
+            reason='Dismissed',
+            is_dismissed=True,
+            dismissed_at=timezone.now(),
+            expires_at=timezone.now() - timedelta(hours=1),
+        )
+
+        generated = RecommendationService.generate_recommendations([self.users[2].id], limit=10)
+
+        self.assertNotIn(self.tournaments[0].id, generated[self.users[2].id]['tournament'])
+        self.assertTrue(Recommendation.objects.get(
+            user=self.users[2], object_id=self.tournaments[0].id
+        ).is_dismissed)
+
+    def test_existing_rows_are_updated_in_place(self):
+        tournament_type = ContentType.objects.get_for_model(Tournament)
+        stale = Recommendation.objects.create(
+            user=self.users[3],
+            recommendation_type='tournament',
+            content_type=tournament_type,
+            object_id=self.tournaments[0].id,
+            score=1.0,
+            reason='Old',
+            is_dismissed=True,
+            dismissed_at=timezone.now() - timedelta(days=RecommendationService.DISMISSAL_COOLDOWN_DAYS + 1),
+            expires_at=timezone.now() - timedelta(days=1),
+        )
+
+        recs = RecommendationService.get_tournament_recommendations(self.users[3].id, limit=10)
+
+        self.assertIn(stale.id, recs.values_list('id', flat=True))
+        stale.refresh_from_db()
+        self.assertFalse(stale.is_dismissed)
+        self.assertEqual(stale.score, 80.0)
+        self.assertEqual(
+            Recommendation.objects.filter(user=self.users[3], object_id=self.tournaments[0].id).count(), 1
+        )
+
+    def test_user_without_game_profiles_gets_nothing(self):
+        user = User.objects.create_user(username='nogames', email='nogames@example.com', password='testpass123')
+        self.assertFalse(RecommendationService.get_tournament_recommendations(user.id).exists())
+        self.assertFalse(RecommendationService.get_team_recommendations(user.id).exists())
+
+    def test_nightly_refresh_runs_in_chunks(self):
+        result = refresh_all_user_recommendations(chunk_size=3)
+
+        self.assertEqual(result['success_count'], 4)
+        self.assertEqual(result['error_count'], 0)
+        self.assertEqual(result['total_recommendations'], Recommendation.objects.count())
+        for user in self.users:
+            self.assertEqual(
+                Recommendation.objects.filter(user=user, recommendation_type='team').count(), 1
+            )
@@ -0,0 +1,147 @@
+"""
+Tests for precomputed dashboard widget snapshots.
+
+The dashboard must read warm widgets from the cache, never write on a GET,
+render cold widgets lazily when enabled, and drop stale widgets when the data
+behind them changes.
+"""
+
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from coaching.models import CoachProfile, CoachingSession
+from core.models import User, UserGameProfile, Game
+from dashboard.models import Recommendation
+from dashboard.services import ActivityService
+from dashboard.snapshots import DashboardSnapshotService
+from tournaments.models import Tournament
+
+
+@override_settings(DASHBOARD_LAZY_WIDGETS=False, DASHBOARD_SNAPSHOT_PREWARM=False)
+class DashboardSnapshotTest(TestCase):
+    """Test widget snapshot reads, lazy rendering and invalidation."""
+
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.user = User.objects.create_user(
+            username='snapshot', email='snapshot@example.com', password='testpass123'
+        )
+        self.game = Game.objects.create(name='Snapshot Game', slug='snapshot-game', genre='fps')
+        UserGameProfile.objects.create(user=self.user, game=self.game, skill_rating=1200)
+        self.tournament = Tournament.objects.create(
+            name='Snapshot Cup',
+            slug='snapshot-cup',
+            description='Open for registration',
+            game=self.game,
+            organizer=self.user,
+            status='registration',
+            registration_start=now - timedelta(days=1),
+            registration_end=now + timedelta(days=2),
+            check_in_start=now + timedelta(days=3),
+            start_datetime=now + timedelta(days=4),
+        )
+        ActivityService.record_activity(self.user.id, 'profile_updated', {'fields_updated': ['bio']})
+        self.client.force_login(self.user)
+
+    def test_dashboard_does_not_write_recommendations(self):
+        """Recommendations are read from stored rows only"""
+        response = self.client.get(reverse('dashboard:home'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Recommendation.objects.exists())
+
+    def test_dashboard_lists_upcoming_coaching_sessions(self):
+        """The legacy upcoming sessions queryset is valid and renders"""
+        coach_user = User.objects.create_user(
+            username='coach', email='coach@example.com', password='testpass123'
+        )
+        coach = CoachProfile.objects.create(user=coach_user, bio='Coach', hourly_rate=50)
+        start = timezone.now() + timedelta(days=1)
+        session = CoachingSession.objects.create(
+            coach=coach, student=self.user, game=self.game,
+            scheduled_start=start, scheduled_end=start + timedelta(hours=1),
+            duration_minutes=60, price=50, status='confirmed'
+        )
+
+        response = self.client.get(reverse('dashboard:home'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['upcoming_sessions']), [session])
+
+    def test_warm_dashboard_skips_widget_queries(self):
+        """A second request is served from cached widget payloads"""
+        self.client.get(reverse('dashboard:home'))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('dashboard:home'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['upcoming_tournaments'], [self.tournament])
+        widget_tables = ('dashboard_activity', 'notifications_notification', 'teams_teammember',
+                         'tournaments_tournament', 'payments_payment', 'store_product')
+        for query in queries.captured_queries:
+            self.assertFalse(
+                any(table in query['sql'] for table in widget_tables),
+                query['sql'],
+            )
+
+    @override_settings(DASHBOARD_LAZY_WIDGETS=True)
+    def test_cold_widgets_render_lazily(self):
+        """Cold widgets become placeholders that the widget endpoint fills in"""
+        response = self.client.get(reverse('dashboard:home'))
+
+        lazy_widgets = response.context['lazy_widgets']
+        self.assertIn('activity', lazy_widgets)
+        self.assertNotIn('stats', lazy_widgets)
+        self.assertContains(response, reverse('dashboard:widget', args=['activity']))
+
+        response = self.client.get(reverse('dashboard:widget', args=['activity']))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['recent_activities']), 1)
+        self.assertIsNotNone(cache.get(DashboardSnapshotService.cache_key('activity', self.user.id)))
+
+    def test_unknown_widget_returns_404(self):
+        response = self.client.get(reverse('dashboard:widget', args=['nope']))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_recording_activity_refreshes_widget(self):
+        """New activity drops the cached activity widget"""
+        DashboardSnapshotService.build(self.user, 'activity')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ActivityService.record_activity(self.user.id, 'team_joined', {'team_name': 'Snap'})
+
+        self.assertIsNone(cache.get(DashboardSnapshotService.cache_key('activity', self.user.id)))
+        payload = DashboardSnapshotService.get_widget(self.user, 'activity')
+        self.assertEqual(len(payload['recent_activities']), 2)
+
+    def test_dismissal_refreshes_recommendations(self):
+        """Dismissing a recommendation removes it from the widget"""
+        recommendation = Recommendation.objects.create(
+            user=self.user,
+            recommendation_type='tournament',
+            content_type=ContentType.objects.get_for_model(Tournament),
+            object_id=self.tournament.id,
+            score=50.0,
+            reason='Matches your games',
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+        payload = DashboardSnapshotService.get_widget(self.user, 'recommendations')
+        self.assertEqual(payload['recommendations'], [recommendation])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recommendation.is_dismissed = True
+            recommendation.save()
+
+        payload = DashboardSnapshotService.get_widget(self.user, 'recommendations')
+        self.assertEqual(payload['recommendations'], [])
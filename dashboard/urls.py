@@ -8,6 +8,7 @@ urlpatterns = [
     path('activity/', views.dashboard_activity, name='activity'),
     path('stats/', views.dashboard_stats, name='stats'),
     path('payments/summary/', views.dashboard_payment_summary, name='payment_summary'),
+    path('widgets/<str:widget>/', views.dashboard_widget, name='widget'),
     
     # Profile URLs - order matters! More specific patterns first
     path('profile/edit/', views.profile_edit, name='profile_edit'),
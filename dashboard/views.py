@@ -13,7 +13,8 @@ Performance Optimizations (Task 23.1):
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.http import JsonResponse
+from django.conf import settings
+from django.http import Http404, JsonResponse
 from django.utils import timezone
 from django.db import models
 from datetime import timedelta
@@ -21,8 +22,8 @@ from PIL import Image
 import io
 import json
 from tournaments.models import Tournament, Participant, Match
-from store.models import Product
 from coaching.models import CoachingSession
+from notifications.counters import UnreadCounter
 from notifications.models import Notification
 from teams.models import TeamMember, Team, TeamInvite
 from core.models import User, UserGameProfile
@@ -39,11 +40,11 @@ from dashboard.forms import (
 from dashboard.services import (
     StatisticsService,
     ActivityService,
-    RecommendationService,
     PaymentSummaryService,
     PrivacyService,
     ProfileExportService
 )
+from dashboard.snapshots import DashboardSnapshotService
 from security.models import AuditLog
 
 
@@ -60,164 +61,84 @@ def dashboard_home(request):
     - Payment summary
     - Quick actions
     
+    Widget payloads are precomputed by DashboardSnapshotService and read
+    with one cache round trip. Cold widgets are built inline, or rendered as
+    placeholders loaded from dashboard_widget when DASHBOARD_LAZY_WIDGETS is
+    enabled. The view never writes.
+    
     **Validates: Requirements 1.1, 1.2, 1.3, 1.4, 1.5, 12.1**
     """
+    payloads, missing = DashboardSnapshotService.get_cached(request.user.id)
     
-    # Get user statistics using StatisticsService
-    try:
-        user_stats = StatisticsService.get_user_statistics(request.user.id)
-    except Exception as e:
-        user_stats = {
-            'total_tournaments': 0,
-            'total_matches': 0,
-            'matches_won': 0,
-            'matches_lost': 0,
-            'win_rate': 0.0,
-            'total_prize_won': 0,
-            'top_3_finishes': 0,
-            'average_placement': None,
-        }
-    
-    # Get current teams count
-    try:
-        current_teams = TeamMember.objects.filter(
-            user=request.user,
-            status='active'
-        ).count()
-    except Exception as e:
-        current_teams = 0
-    
-    # Get unread notifications count
-    try:
-        unread_notifications = Notification.objects.filter(
-            user=request.user,
-            read=False
-        ).count()
-    except Exception as e:
-        unread_notifications = 0
-    
-    # Build statistics cards data
-    stats = {
-        'total_tournaments': user_stats['total_tournaments'],
-        'win_rate': user_stats['win_rate'],
-        'current_teams': current_teams,
-        'unread_notifications': unread_notifications,
-        'total_points': request.user.total_points,
-        'level': request.user.level,
-    }
-    
-    # Get recent activity feed (last 10 activities)
-    try:
-        activity_data = ActivityService.get_activity_feed(
-            user_id=request.user.id,
-            filters=None,
-            page=1,
-            page_size=10
-        )
-        recent_activities = activity_data['activities']
-    except Exception as e:
-        recent_activities = []
-    
-    # Get upcoming events (7-day window)
-    # Optimized with select_related for foreign keys
-    try:
-        seven_days_from_now = timezone.now() + timedelta(days=7)
-        upcoming_tournaments = Tournament.objects.filter(
-            start_datetime__gte=timezone.now(),
-            start_datetime__lte=seven_days_from_now,
-            status__in=['registration', 'draft', 'check_in']
-        ).select_related('game', 'organizer', 'venue').order_by('start_datetime')[:5]
-    except Exception as e:
-        upcoming_tournaments = []
-    
-    # Get tournament recommendations (top 3)
-    try:
-        recommendations = RecommendationService.get_tournament_recommendations(
-            user_id=request.user.id,
-            limit=3
-        )
-    except Exception as e:
-        recommendations = []
-    
-    # Get payment summary
-    try:
-        payment_summary = PaymentSummaryService.get_payment_summary(request.user.id)
-    except Exception as e:
-        payment_summary = {
-            'total_spent': 0,
-            'recent_payments_count': 0,
-            'saved_payment_methods_count': 0,
-            'has_default_method': False,
-            'recent_payments': [],
-        }
-    
-    # Legacy data for backward compatibility with existing templates
-    try:
-        user_tournaments = Participant.objects.filter(
-            user=request.user
-        ).select_related('tournament', 'tournament__game').order_by('-created_at')[:5]
-    except Exception as e:
-        user_tournaments = []
-    
-    try:
-        upcoming_sessions = CoachingSession.objects.filter(
-            student=request.user,
-            scheduled_time__gte=timezone.now(),
-            status='confirmed'
-        ).select_related('coach', 'game').order_by('scheduled_time')[:5]
-    except Exception as e:
-        upcoming_sessions = []
+    lazy_widgets = []
+    for widget in missing:
+        if (getattr(settings, 'DASHBOARD_LAZY_WIDGETS', False)
+                and widget not in DashboardSnapshotService.EAGER_WIDGETS):
+            lazy_widgets.append(widget)
+        else:
+            payloads[widget] = DashboardSnapshotService.build(request.user, widget)
+    
+    context = {}
+    for payload in payloads.values():
+        context.update(payload)
+    
+    # Level and XP come from the already-loaded user, the unread count from
+    # its own cached counter (notifications change too often for the widget)
+    context['stats'] = dict(
+        context.get('stats', {}),
+        total_points=request.user.total_points,
+        level=request.user.level,
+        unread_notifications=UnreadCounter.get(request.user.id),
+    )
+    context['lazy_widgets'] = lazy_widgets
     
-    try:
-        recent_notifications = Notification.objects.filter(
-            user=request.user
-        ).order_by('-created_at')[:10]
-    except Exception as e:
-        recent_notifications = []
+    # Legacy data for backward compatibility with existing templates.
+    # These querysets are lazy and only hit the database if a template uses them.
+    context['user_tournaments'] = Participant.objects.filter(
+        user=request.user
+    ).select_related('tournament', 'tournament__game').order_by('-created_at')[:5]
+    context['upcoming_sessions'] = CoachingSession.objects.filter(
+        student=request.user,
+        scheduled_start__gte=timezone.now(),
+        status='confirmed'
+    ).select_related('coach', 'game').order_by('scheduled_start')[:5]
+    context['recent_notifications'] = Notification.objects.filter(
+        user=request.user
+    ).order_by('-created_at')[:10]
     
-    # Get featured products for merch teaser (up to 4)
-    try:
-        featured_products = list(Product.objects.filter(
-            is_active=True,
-            is_featured=True,
-            stock_quantity__gt=0
-        ).prefetch_related('images').order_by('-created_at')[:4])
-    except Exception as e:
-        import logging
-        logging.getLogger(__name__).error(f'featured_products query failed: {e}')
-        featured_products = []
-
-    context = {
-        # New dashboard data
-        'stats': stats,
-        'recent_activities': recent_activities,
-        'upcoming_tournaments': upcoming_tournaments,
-        'recommendations': recommendations,
-        'payment_summary': payment_summary,
+    return render(request, 'dashboard/home.html', context)
 
-        # Merch teaser
-        'featured_products': featured_products,
 
-        # Legacy data for backward compatibility
-        'user_tournaments': user_tournaments,
-        'upcoming_sessions': upcoming_sessions,
-        'recent_notifications': recent_notifications,
-    }
+@login_required
+def dashboard_widget(request, widget):
+    """
+    Render a single dashboard widget as an HTML fragment.
     
-    return render(request, 'dashboard/home.html', context)
+    Used by the dashboard to load widgets that were cold when the page was
+    rendered. The payload is built and cached if it is still missing.
+    """
+    if widget not in DashboardSnapshotService.WIDGETS:
+        raise Http404("Unknown dashboard widget")
+    
+    template_name = DashboardSnapshotService.WIDGETS[widget][0]
+    context = dict(DashboardSnapshotService.get_widget(request.user, widget))
+    
+    return render(request, template_name, context)
 
 
 
 @login_required
 def dashboard_activity(request):
     """
-    Activity feed view with filtering and pagination.
+    Activity feed view with filtering and infinite scroll.
     
     Displays user's activity feed with optional filters:
     - activity_type: Filter by activity type
     - date_range: Filter by date range (7d, 30d, 90d, all)
     
-    Implements pagination with 25 activities per page.
+    Pages of 25 activities are fetched with keyset cursors. AJAX requests
+    for a ``cursor`` return only the next batch of items, which the page
+    appends as the user scrolls.
     
     **Validates: Requirements 8.3, 8.5**
     """
@@ -225,13 +146,7 @@ def dashboard_activity(request):
     # Get filter parameters from request
     activity_type = request.GET.get('activity_type', '')
     date_range = request.GET.get('date_range', 'all')
-    page = request.GET.get('page', 1)
-    
-    # Convert page to integer
-    try:
-        page = int(page)
-    except (ValueError, TypeError):
-        page = 1
+    cursor = request.GET.get('cursor') or None
     
     # Build filters dictionary
     filters = {}
@@ -250,40 +165,52 @@ def dashboard_activity(request):
         elif date_range == '90d':
             filters['date_from'] = now - timedelta(days=90)
     
-    # Get activity feed with filters and pagination
+    # Get one page of the activity feed
     try:
-        activity_data = ActivityService.get_activity_feed(
-            user_id=request.user.id,
-            filters=filters,
-            page=page,
-            page_size=25
-        )
+        try:
+            activity_data = ActivityService.get_activity_page(
+                user_id=request.user.id,
+                filters=filters,
+                cursor=cursor,
+                page_size=25
+            )
+        except ValueError:
+            # Malformed cursor: start again from the newest activity
+            activity_data = ActivityService.get_activity_page(
+                user_id=request.user.id,
+                filters=filters,
+                page_size=25
+            )
     except Exception as e:
         activity_data = {
             'activities': [],
-            'total_count': 0,
-            'page': 1,
-            'page_size': 25,
-            'total_pages': 0,
+            'next_cursor': None,
             'has_next': False,
-            'has_previous': False,
+            'total_count': 0,
         }
     
-    # Get available activity types for filter dropdown
-    activity_types = ActivityService.get_activity_types()
+    next_url = None
+    if activity_data['has_next']:
+        params = request.GET.copy()
+        params['cursor'] = activity_data['next_cursor']
+        next_url = f"?{params.urlencode()}"
     
     context = {
         'activities': activity_data['activities'],
         'total_count': activity_data['total_count'],
-        'page': activity_data['page'],
-        'page_size': activity_data['page_size'],
-        'total_pages': activity_data['total_pages'],
         'has_next': activity_data['has_next'],
-        'has_previous': activity_data['has_previous'],
-        'activity_types': activity_types,
+        'next_url': next_url,
+    }
+    
+    # Infinite scroll requests only need the next batch of items
+    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+        return render(request, 'dashboard/components/activity_feed_items.html', context)
+    
+    context.update({
+        'activity_types': ActivityService.get_activity_types(),
         'selected_activity_type': activity_type,
         'selected_date_range': date_range,
-    }
+    })
     
     return render(request, 'dashboard/activity.html', context)
 
@@ -6,6 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
+    if len(sys.argv) > 1 and sys.argv[1] == 'test':
+        # Same settings pytest uses (pytest.ini)
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings_test')
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
     try:
         from django.core.management import execute_from_command_line
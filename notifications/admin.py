@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
+from .counters import UnreadCounter
 from .models import Notification, NotificationPreference, NotificationTemplate
 
 
@@ -103,7 +104,9 @@ class NotificationAdmin(admin.ModelAdmin):
     mark_as_read.short_description = "Mark selected as read"
     
     def mark_as_unread(self, request, queryset):
+        user_ids = set(queryset.values_list('user_id', flat=True))
         queryset.update(read=False, read_at=None)
+        UnreadCounter.invalidate(user_ids)
         self.message_user(request, f"{queryset.count()} notifications marked as unread.")
     mark_as_unread.short_description = "Mark selected as unread"
 
@@ -0,0 +1,164 @@
+"""
+Cached per-user unread notification counters.
+
+Every open tab polls ``unread_count``/``recent_notifications``, and the
+dashboard and notification list show the same number. Instead of a COUNT per
+request, each user's unread count is kept in the cache:
+
+- ``notif_unread:{user_id}`` holds the count. A missing counter (first use or
+  eviction) is recounted from the database on the next read; adjustments to a
+  missing counter are skipped, so the cache never holds a partial count.
+- ``notif_version:{user_id}`` is bumped by every change to the user's
+  notifications. Seeded from the clock when missing, like the bracket
+  version, so it never repeats; with the count it makes up the polling ETag.
+
+Adjustments are applied after commit: creating a notification increments,
+marking one read or deleting an unread one decrements, and changes the
+counter cannot follow (admin "mark as unread", edits through ``save()``) drop
+it. ``reconcile`` recounts users whose notifications changed recently and
+runs from Celery beat; the counter TTL bounds any drift left for everyone
+else.
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+
+def _clock_seed():
+    return time.time_ns() // 1000
+
+
+class UnreadCounter:
+    """Unread notification counts and polling versions per user"""
+
+    COUNT_KEY = 'notif_unread:{user_id}'
+    VERSION_KEY = 'notif_version:{user_id}'
+    COUNT_TTL = 3600  # 1 hour
+
+    # How far back reconcile looks for users with changed notifications
+    RECONCILE_WINDOW = timedelta(minutes=30)
+    RECONCILE_CHUNK = 500
+
+    @classmethod
+    def get(cls, user_id):
+        """Unread count for a user"""
+        return cls.get_state(user_id)[0]
+
+    @classmethod
+    def get_state(cls, user_id):
+        """``(unread count, version)`` with one cache read; a missing count is recounted"""
+        count_key, version_key = cls._keys(user_id)
+        stored = cache.get_many([count_key, version_key])
+
+        count = stored.get(count_key)
+        if count is None:
+            count = Notification.objects.filter(user_id=user_id, read=False).count()
+            cache.add(count_key, count, cls.COUNT_TTL)
+
+        version = stored.get(version_key)
+        if version is None:
+            cache.add(version_key, _clock_seed(), None)
+            version = cache.get(version_key)
+        return count, version
+
+    @classmethod
+    def etag(cls, user_id, count, version, *parts):
+        suffix = ''.join(f"-{part}" for part in parts)
+        return f'W/"notifications-{user_id}-{version}-{count}{suffix}"'
+
+    @classmethod
+    def adjust(cls, deltas):
+        """Apply ``{user_id: change in unread count}`` once the current transaction commits"""
+        deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+        if deltas:
+            transaction.on_commit(lambda: cls._apply(deltas))
+
+    @classmethod
+    def invalidate(cls, user_ids):
+        """Drop counters after changes they cannot follow; the next read recounts"""
+        user_ids = list(user_ids)
+        if user_ids:
+            transaction.on_commit(lambda: cls._drop(user_ids))
+
+    @classmethod
+    def reconcile(cls, since=None):
+        """
+        Correct cached counters of users whose notifications were created or
+        read since ``since`` (default: ``RECONCILE_WINDOW`` ago). Returns the
+        number of counters corrected.
+        """
+        since = since or timezone.now() - cls.RECONCILE_WINDOW
+        user_ids = list(
+            Notification.objects.filter(Q(created_at__gte=since) | Q(read_at__gte=since))
+            .order_by().values_list('user_id', flat=True).distinct()
+        )
+
+        corrected = 0
+        for start in range(0, len(user_ids), cls.RECONCILE_CHUNK):
+            chunk = user_ids[start:start + cls.RECONCILE_CHUNK]
+            keys = {user_id: cls.COUNT_KEY.format(user_id=user_id) for user_id in chunk}
+            cached = cache.get_many(list(keys.values()))
+            if not cached:
+                continue
+
+            counts = dict(
+                Notification.objects.filter(user_id__in=chunk, read=False)
+                .order_by().values('user_id').annotate(unread=Count('id'))
+                .values_list('user_id', 'unread')
+            )
+            stale = {
+                user_id: counts.get(user_id, 0) for user_id, key in keys.items()
+                if key in cached and cached[key] != counts.get(user_id, 0)
+            }
+            if stale:
+                cache.set_many({keys[user_id]: count for user_id, count in stale.items()}, cls.COUNT_TTL)
+                for user_id in stale:
+                    cls._bump(cls.VERSION_KEY.format(user_id=user_id))
+                corrected += len(stale)
+        return corrected
+
+    @classmethod
+    def _keys(cls, user_id):
+        return cls.COUNT_KEY.format(user_id=user_id), cls.VERSION_KEY.format(user_id=user_id)
+
+    @classmethod
+    def _apply(cls, deltas):
+        for user_id, delta in deltas.items():
+            count_key, version_key = cls._keys(user_id)
+            try:
+                try:
+                    if cache.incr(count_key, delta) < 0:
+                        cache.delete(count_key)
+                except ValueError:
+                    # Not cached: the next read recounts
+                    pass
+                cls._bump(version_key)
+            except Exception as e:
+                logger.warning(f"Unread counter update failed for user {user_id}: {e}")
+
+    @classmethod
+    def _drop(cls, user_ids):
+        try:
+            cache.delete_many([cls.COUNT_KEY.format(user_id=user_id) for user_id in user_ids])
+            for user_id in user_ids:
+                cls._bump(cls.VERSION_KEY.format(user_id=user_id))
+        except Exception as e:
+            logger.warning(f"Unread counter invalidation failed: {e}")
+
+    @staticmethod
+    def _bump(version_key):
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # Counter missing (never polled or evicted): seed a fresh one
+            cache.add(version_key, _clock_seed(), None)
@@ -138,16 +138,50 @@ class Notification(models.Model):
     def mark_as_read(self):
         """Mark notification as read"""
         from django.utils import timezone
+        from .counters import UnreadCounter
         if not self.read:
             self.read = True
             self.read_at = timezone.now()
-            self.save(update_fields=['read', 'read_at'])
+            # Only the request that actually flips the row adjusts the counter
+            updated = Notification.objects.filter(pk=self.pk, read=False).update(
+                read=True, read_at=self.read_at
+            )
+            UnreadCounter.adjust({self.user_id: -updated})
     
     @classmethod
     def create_notification(cls, user, title, message, notification_type='system',
                           priority='normal', content_object=None, action_url='',
                           delivery_methods=None, **metadata):
         """Convenience method to create notifications"""
+        return cls.create_bulk(
+            [user], title, message,
+            notification_type=notification_type,
+            priority=priority,
+            content_object=content_object,
+            action_url=action_url,
+            delivery_methods=delivery_methods,
+            **metadata
+        )[0]
+    
+    @classmethod
+    def create_bulk(cls, users, title, message, notification_type='system',
+                    priority='normal', content_object=None, action_url='',
+                    delivery_methods=None, **metadata):
+        """
+        Create the same notification for many users with one INSERT.
+        
+        Email and push are kept per recipient only where their
+        NotificationPreference allows them (one query for all recipients);
+        delivery is queued after commit instead of run in the request.
+        """
+        from collections import Counter
+        from django.db import transaction
+        from .counters import UnreadCounter
+        from .delivery import queue_delivery
+        
+        users = list(users)
+        if not users:
+            return []
         
         # Get content type and object id if content_object provided
         content_type = None
@@ -156,56 +190,57 @@ class Notification(models.Model):
             content_type = ContentType.objects.get_for_model(content_object)
             object_id = str(content_object.pk)
         
-        notification = cls.objects.create(
-            user=user,
-            title=title,
-            message=message,
-            notification_type=notification_type,
-            priority=priority,
-            content_type=content_type,
-            object_id=object_id,
-            action_url=action_url,
-            delivery_methods=delivery_methods or ['in_app'],
-            metadata=metadata
-        )
+        methods = delivery_methods or ['in_app']
+        preferences = {}
+        if any(method != 'in_app' for method in methods):
+            preferences = {
+                preference.user_id: preference
+                for preference in NotificationPreference.objects.filter(user__in=users)
+            }
+        # Users who never saved preferences get the defaults
+        default_preference = NotificationPreference()
+        
+        notifications = []
+        for user in users:
+            preference = preferences.get(user.pk, default_preference)
+            notifications.append(cls(
+                user=user,
+                title=title,
+                message=message,
+                notification_type=notification_type,
+                priority=priority,
+                content_type=content_type,
+                object_id=object_id,
+                action_url=action_url,
+                delivery_methods=[
+                    method for method in methods
+                    if method == 'in_app' or preference.should_send_notification(notification_type, method)
+                ],
+                metadata=metadata
+            ))
+        cls.objects.bulk_create(notifications)
+        # bulk_create sends no post_save, so the unread counters are bumped here
+        UnreadCounter.adjust(Counter(notification.user_id for notification in notifications))
         
         # Trigger delivery based on methods
-        if 'email' in notification.delivery_methods:
-            notification.send_email()
-        if 'push' in notification.delivery_methods:
-            notification.send_push()
+        pending = [
+            notification.pk for notification in notifications
+            if {'email', 'push'}.intersection(notification.delivery_methods)
+        ]
+        if pending:
+            transaction.on_commit(lambda: queue_delivery(pending))
         
-        return notification
+        return notifications
     
     def send_email(self):
         """Send notification via email"""
-        from django.core.mail import send_mail
-        from django.conf import settings
-        
-        try:
-            send_mail(
-                subject=self.title,
-                message=self.message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[self.user.email],
-                fail_silently=False,
-            )
-            from django.utils import timezone
-            self.email_sent = True
-            self.email_sent_at = timezone.now()
-            self.save(update_fields=['email_sent', 'email_sent_at'])
-        except Exception as e:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.error(f"Failed to send email notification: {e}")
+        from .delivery import deliver_notifications
+        deliver_notifications([self.pk], methods=('email',))
     
     def send_push(self):
         """Send push notification (placeholder for future implementation)"""
-        # TODO: Implement push notification logic
-        from django.utils import timezone
-        self.push_sent = True
-        self.push_sent_at = timezone.now()
-        self.save(update_fields=['push_sent', 'push_sent_at'])
+        from .delivery import deliver_notifications
+        deliver_notifications([self.pk], methods=('push',))
 
 
 class NotificationPreference(models.Model):
@@ -0,0 +1,32 @@
+"""
+Signal handlers for the notifications app.
+
+Keep the cached unread counters in ``notifications.counters`` in step with
+notifications saved or deleted one at a time. ``create_bulk``,
+``mark_as_read`` and ``mark_all_as_read`` write without signals and adjust
+the counters themselves.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from notifications.counters import UnreadCounter
+from notifications.models import Notification
+
+
+@receiver(post_save, sender=Notification)
+def count_saved_notification(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """New unread notifications add to the count; edits that may flip ``read`` drop it"""
+    if raw:
+        return
+    if created:
+        if not instance.read:
+            UnreadCounter.adjust({instance.user_id: 1})
+    elif update_fields is None or 'read' in update_fields:
+        UnreadCounter.invalidate([instance.user_id])
+
+
+@receiver(post_delete, sender=Notification)
+def count_deleted_notification(sender, instance, **kwargs):
+    """Deleting an unread notification lowers the count"""
+    if not instance.read:
+        UnreadCounter.adjust({instance.user_id: -1})
@@ -0,0 +1,23 @@
+"""
+Celery tasks for notification delivery.
+"""
+
+from celery import shared_task
+
+
+@shared_task
+def deliver_notifications(notification_ids):
+    """Send pending email/push for a batch of notifications over one connection"""
+    from .delivery import deliver_notifications as deliver
+
+    sent = deliver(notification_ids)
+    return f"Delivered {sent['email']} emails and {sent['push']} push notifications"
+
+
+@shared_task
+def reconcile_unread_counts():
+    """Correct cached unread counters of users with recently changed notifications"""
+    from .counters import UnreadCounter
+
+    corrected = UnreadCounter.reconcile()
+    return f"Corrected {corrected} unread notification counters"
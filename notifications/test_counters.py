@@ -0,0 +1,97 @@
+"""
+Tests for the cached unread notification counters
+"""
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .counters import UnreadCounter
+from .models import Notification
+
+User = get_user_model()
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class UnreadCounterTests(TestCase):
+    """Test the counter stays in step with notification changes"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+
+    def _create(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Notification.objects.create(
+                user=self.user, title='Test', message='Test', notification_type='system', **kwargs
+            )
+
+    def test_counter_follows_changes_without_counting(self):
+        self.assertEqual(UnreadCounter.get(self.user.id), 0)
+
+        first = self._create()
+        self._create(read=True)
+        with self.captureOnCommitCallbacks(execute=True):
+            Notification.create_bulk([self.user], title='Bulk', message='Test')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(UnreadCounter.get(self.user.id), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.mark_as_read()
+            first.mark_as_read()
+        self.assertEqual(UnreadCounter.get(self.user.id), 1)
+
+        unread = self._create()
+        with self.captureOnCommitCallbacks(execute=True):
+            unread.delete()
+        self.assertEqual(UnreadCounter.get(self.user.id), 1)
+
+    def test_reconcile_corrects_drift(self):
+        self._create()
+        UnreadCounter.get(self.user.id)
+        # A write the counter never heard about
+        Notification.objects.bulk_create([
+            Notification(user=self.user, title='Missed', message='Test', notification_type='system')
+        ])
+
+        self.assertEqual(UnreadCounter.reconcile(), 1)
+        self.assertEqual(UnreadCounter.get(self.user.id), 2)
+        self.assertEqual(UnreadCounter.reconcile(), 0)
+
+    def test_polling_answers_304_until_something_changes(self):
+        self.client.login(username='testuser', password='testpass123')
+        self._create()
+
+        url = reverse('notifications:unread_count')
+        response = self.client.get(url)
+        self.assertEqual(json.loads(response.content)['count'], 1)
+        etag = response['ETag']
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('notifications:mark_all_as_read'))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['count'], 0)
+
+    def test_recent_notifications_etag_differs_for_json_and_html(self):
+        self.client.login(username='testuser', password='testpass123')
+        url = reverse('notifications:recent')
+
+        html = self.client.get(url)
+        ajax = self.client.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.assertNotEqual(html['ETag'], ajax['ETag'])
+        self.assertEqual(
+            self.client.get(url, HTTP_X_REQUESTED_WITH='XMLHttpRequest', HTTP_IF_NONE_MATCH=ajax['ETag']).status_code,
+            304
+        )
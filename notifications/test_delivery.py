@@ -0,0 +1,80 @@
+"""
+Tests for batched notification delivery
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.mail import get_connection
+from django.test import TestCase, override_settings
+
+from .models import Notification, NotificationPreference
+
+User = get_user_model()
+
+
+@override_settings(NOTIFICATION_DELIVERY_BACKEND='sync')
+class BulkNotificationDeliveryTests(TestCase):
+    """Test create_bulk and the email/push delivery pipeline"""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(
+                username=f'member{i}',
+                email=f'member{i}@example.com',
+                password='testpass123'
+            )
+            for i in range(5)
+        ]
+        NotificationPreference.objects.create(user=self.users[0], email_team_activity=False)
+
+    def _notify(self, **kwargs):
+        return Notification.create_bulk(
+            self.users,
+            title='Urgent announcement',
+            message='Scrims moved to 8pm',
+            notification_type='team',
+            delivery_methods=['in_app', 'email'],
+            **kwargs
+        )
+
+    def test_rows_and_preferences_take_one_query_each(self):
+        """One preference query and one INSERT, delivery deferred to commit"""
+        with self.assertNumQueries(2):
+            with self.captureOnCommitCallbacks() as callbacks:
+                notifications = self._notify()
+
+        self.assertEqual(len(notifications), 5)
+        self.assertEqual(Notification.objects.filter(title='Urgent announcement').count(), 5)
+        self.assertEqual(len(mail.outbox), 0)
+        # Unread counter update and email delivery
+        self.assertEqual(len(callbacks), 2)
+
+    def test_emails_share_one_connection_and_respect_preferences(self):
+        with mock.patch('notifications.delivery.get_connection', wraps=get_connection) as connect:
+            with self.captureOnCommitCallbacks(execute=True):
+                notifications = self._notify()
+
+        connect.assert_called_once()
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            [f'member{i}@example.com' for i in range(1, 5)]
+        )
+
+        # The opted-out member still gets the in-app notification
+        opted_out = Notification.objects.get(pk=notifications[0].pk)
+        self.assertEqual(opted_out.delivery_methods, ['in_app'])
+        self.assertFalse(opted_out.email_sent)
+        self.assertEqual(
+            Notification.objects.filter(title='Urgent announcement', email_sent=True).count(), 4
+        )
+
+    @override_settings(NOTIFICATION_EMAIL_BATCH_SIZE=2)
+    def test_large_fan_outs_are_split_into_batches(self):
+        with mock.patch('notifications.delivery.get_connection', wraps=get_connection) as connect:
+            with self.captureOnCommitCallbacks(execute=True):
+                self._notify()
+
+        # Four emails in batches of two
+        self.assertEqual(connect.call_count, 2)
+        self.assertEqual(len(mail.outbox), 4)
@@ -4,12 +4,26 @@ Notification views
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
 from django.views.decorators.http import require_POST
 from django.db.models import Q
 
+from .counters import UnreadCounter
 from .models import Notification, NotificationPreference
 
 
+def _polling_etag(request, *parts):
+    """Unread count and an ETag for the user's current notification version"""
+    count, version = UnreadCounter.get_state(request.user.id)
+    return count, UnreadCounter.etag(request.user.id, count, version, *parts)
+
+
+def _with_etag(response, etag):
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
 @login_required
 def notification_list(request):
     """List all notifications for the user"""
@@ -29,7 +43,7 @@ def notification_list(request):
     
     context = {
         'notifications': notifications,
-        'unread_count': Notification.objects.filter(user=request.user, read=False).count(),
+        'unread_count': UnreadCounter.get(request.user.id),
         'filter_type': filter_type,
     }
     
@@ -78,10 +92,11 @@ def mark_as_read(request, notification_id):
 @require_POST
 def mark_all_as_read(request):
     """Mark all notifications as read"""
-    Notification.objects.filter(
+    updated = Notification.objects.filter(
         user=request.user,
         read=False
     ).update(read=True)
+    UnreadCounter.adjust({request.user.id: -updated})
     
     return JsonResponse({'success': True})
 
@@ -103,13 +118,18 @@ def delete_notification(request, notification_id):
 
 @login_required
 def unread_count(request):
-    """Get unread notification count (for AJAX)"""
-    count = Notification.objects.filter(
-        user=request.user,
-        read=False
-    ).count()
+    """
+    Get unread notification count (for AJAX).
     
-    return JsonResponse({'count': count})
+    Served from the cached counter; polls with a matching If-None-Match
+    answer 304 without touching the database.
+    """
+    count, etag = _polling_etag(request, 'count')
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    
+    return _with_etag(JsonResponse({'count': count}), etag)
 
 
 @login_required
@@ -163,18 +183,24 @@ def notification_preferences(request):
 
 @login_required
 def recent_notifications(request):
-    """Get recent notifications (for dropdown/widget)"""
+    """
+    Get recent notifications (for dropdown/widget).
+    
+    Any change to the user's notifications bumps the version in the ETag, so
+    an unchanged list answers 304 after one cache read.
+    """
+    is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+    unread_count, etag = _polling_etag(request, 'recent', 'json' if is_ajax else 'html')
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    
     notifications = Notification.objects.filter(
         user=request.user
     ).order_by('-created_at')[:10]
     
-    unread_count = Notification.objects.filter(
-        user=request.user,
-        read=False
-    ).count()
-    
     # Return JSON for AJAX requests
-    if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+    if is_ajax:
         data = {
             'notifications': [
                 {
@@ -191,7 +217,7 @@ def recent_notifications(request):
             ],
             'unread_count': unread_count,
         }
-        return JsonResponse(data)
+        return _with_etag(JsonResponse(data), etag)
     
     # Return HTML for regular requests
     context = {
@@ -199,4 +225,4 @@ def recent_notifications(request):
         'unread_count': unread_count,
     }
     
-    return render(request, 'notifications/recent.html', context)
+    return _with_etag(render(request, 'notifications/recent.html', context), etag)
@@ -0,0 +1,131 @@
+"""
+Precomputed product listing index for the store catalog.
+
+Instead of caching rendered pages per query string (which let free-text
+search fill the cache with entries nobody reuses), the catalog caches one
+compact index per category and sort order: the ordered ``(id, price)`` pairs
+of the active products. A page is sliced from the index, price ranges are
+applied to it in Python, and only the products on the page are loaded, by
+primary key. The number of cached entries is bounded by categories × sort
+orders, and every page, page size and price range reuses them.
+
+Indexes live under a store-wide generation (the same scheme as
+``TournamentCache``): saving a product or changing its rating bumps the
+generation after commit and every index becomes unreachable at once.
+
+Search results are free-form and are not cached; the matching ids are read
+with one query and paged the same way.
+"""
+
+import logging
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Prefetch, Q
+
+from .models import Product, ProductImage
+
+logger = logging.getLogger(__name__)
+
+
+class ProductListingIndex:
+    """Cached, ordered product id lists and page hydration"""
+
+    CACHE_TTL = 900  # 15 minutes
+    GENERATION_KEY = 'store_listing_gen'
+    INDEX_KEY = 'store_listing:g{generation}:{category}:{sort}'
+
+    DEFAULT_SORT = 'newest'
+    SORT_ORDERS = {
+        'newest': ('-created_at', 'name'),
+        'price_low': ('price', 'name'),
+        'price_high': ('-price', 'name'),
+        'name': ('name',),
+        'rating': (F('average_rating').desc(nulls_last=True), '-review_count', 'name'),
+    }
+
+    @classmethod
+    def get_entries(cls, category=None, sort_by=DEFAULT_SORT, min_price=None, max_price=None):
+        """Ordered ``(id, price)`` pairs of active products, from the cached index"""
+        key = cls.INDEX_KEY.format(
+            generation=cls.get_generation(),
+            category=category.pk if category else 'all',
+            sort=sort_by,
+        )
+        entries = cache.get(key)
+        if entries is None:
+            products = Product.objects.filter(is_active=True)
+            if category:
+                products = products.filter(category=category)
+            entries = list(
+                products.order_by(*cls.SORT_ORDERS[sort_by]).values_list('id', 'price')
+            )
+            cache.set(key, entries, cls.CACHE_TTL)
+        return cls._filter_price(entries, min_price, max_price)
+
+    @classmethod
+    def search_entries(cls, query, category=None, sort_by=DEFAULT_SORT, min_price=None, max_price=None):
+        """Ordered ``(id, price)`` pairs matching a search (one query, not cached)"""
+        products = Product.objects.filter(
+            Q(name__icontains=query) | Q(description__icontains=query),
+            is_active=True,
+        )
+        if category:
+            products = products.filter(category=category)
+        if min_price is not None:
+            products = products.filter(price__gte=min_price)
+        if max_price is not None:
+            products = products.filter(price__lte=max_price)
+        return list(products.order_by(*cls.SORT_ORDERS[sort_by]).values_list('id', 'price'))
+
+    @classmethod
+    def hydrate(cls, page):
+        """Replace a page of ``(id, price)`` entries with its products, in order"""
+        ids = [product_id for product_id, price in page.object_list]
+        products = {
+            product.id: product
+            for product in Product.objects.filter(pk__in=ids, is_active=True).select_related('category').prefetch_related(
+                Prefetch(
+                    'images',
+                    queryset=ProductImage.objects.filter(is_primary=True).order_by('-is_primary', 'display_order'),
+                    to_attr='primary_images'
+                )
+            )
+        }
+        # Products deactivated since the index was built are skipped
+        page.object_list = [products[product_id] for product_id in ids if product_id in products]
+        return page
+
+    @classmethod
+    def get_generation(cls):
+        generation = cache.get(cls.GENERATION_KEY)
+        if generation is None:
+            # Seeded from the clock so it never falls back to a used generation
+            cache.add(cls.GENERATION_KEY, time.time_ns(), None)
+            generation = cache.get(cls.GENERATION_KEY)
+        return generation
+
+    @classmethod
+    def invalidate(cls):
+        """Make every cached index unreachable once the current transaction commits"""
+        transaction.on_commit(cls._bump)
+
+    @classmethod
+    def _bump(cls):
+        try:
+            try:
+                cache.incr(cls.GENERATION_KEY)
+            except ValueError:
+                cache.add(cls.GENERATION_KEY, time.time_ns(), None)
+        except Exception as e:
+            logger.warning(f"Store listing invalidation failed: {e}")
+
+    @staticmethod
+    def _filter_price(entries, min_price, max_price):
+        if min_price is None and max_price is None:
+            return entries
+        return [
+            (product_id, price) for product_id, price in entries
+            if (min_price is None or price >= min_price) and (max_price is None or price <= max_price)
+        ]
@@ -4,6 +4,7 @@ Business logic managers for the EYTGaming Store.
 This module contains manager classes that encapsulate business logic:
 - CartManager: Shopping cart operations
 - OrderManager: Order creation and management
+- OrderNumberAllocator: Per-year order number sequence
 - InventoryManager: Stock management
 - PaymentProcessor: Payment processing (abstract interface)
 - StripePaymentProcessor: Stripe payment gateway integration
@@ -11,10 +12,12 @@ This module contains manager classes that encapsulate business logic:
 """
 
 from abc import ABC, abstractmethod
-from django.db import transaction
+from django.db import IntegrityError, ProgrammingError, connection, transaction
+from django.db.models import Case, F, IntegerField, Q, Value, When
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.conf import settings
+from collections import defaultdict, deque
 from decimal import Decimal
 from datetime import datetime
 import stripe
@@ -22,15 +25,27 @@ import requests
 import hmac
 import hashlib
 import logging
-from .models import Cart, CartItem, Product, ProductVariant, Order, OrderItem
+import threading
+from .models import (
+    Cart, CartItem, Product, ProductVariant, Order, OrderItem, OrderNumberSequence
+)
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 
 class InsufficientStockError(Exception):
-    """Raised when attempting to add more items than available in stock."""
-    pass
+    """
+    Raised when attempting to add more items than available in stock.
+    
+    When raised by InventoryManager.reserve_many, ``shortfalls`` lists every
+    line that could not be reserved as dicts with ``product``, ``variant``,
+    ``available`` and ``requested`` keys.
+    """
+    
+    def __init__(self, message='', shortfalls=None):
+        super().__init__(message)
+        self.shortfalls = shortfalls or []
 
 
 class InventoryManager:
@@ -86,30 +101,59 @@ class InventoryManager:
         Raises:
             InsufficientStockError: If insufficient stock available
         """
-        if variant:
-            # Lock the variant row for update to prevent race conditions
-            locked_variant = ProductVariant.objects.select_for_update().get(id=variant.id)
+        InventoryManager.reserve_many([(product, variant, quantity)])
+    
+    @staticmethod
+    @transaction.atomic
+    def reserve_many(items):
+        """
+        Reserve stock for several lines at once (e.g. a whole cart).
+        
+        Every affected Product and ProductVariant row is locked with one
+        SELECT FOR UPDATE per model, always in primary key order, so two
+        checkouts sharing products acquire their locks in the same order
+        and cannot deadlock. Stock is then decremented with one conditional
+        UPDATE per model. Nothing is reserved unless every line fits.
+        
+        Args:
+            items: Iterable of (product, variant, quantity) tuples;
+                variant may be None. Lines for the same row are combined.
             
-            if locked_variant.stock_quantity < quantity:
-                raise InsufficientStockError(
-                    f"Insufficient stock for {product.name} - {variant.name}. "
-                    f"Available: {locked_variant.stock_quantity}, Requested: {quantity}"
-                )
+        Returns:
+            None
             
-            locked_variant.stock_quantity -= quantity
-            locked_variant.save()
-        else:
-            # Lock the product row for update to prevent race conditions
-            locked_product = Product.objects.select_for_update().get(id=product.id)
+        Raises:
+            InsufficientStockError: If any line has insufficient stock.
+                All shortfalls are reported together in ``shortfalls``.
+        """
+        product_lines, variant_lines = InventoryManager._group_lines(items)
+        
+        shortfalls = (
+            InventoryManager._find_shortfalls(Product, product_lines) +
+            InventoryManager._find_shortfalls(ProductVariant, variant_lines)
+        )
+        if shortfalls:
+            raise InsufficientStockError(
+                '; '.join(shortfall['message'] for shortfall in shortfalls),
+                shortfalls=shortfalls
+            )
+        
+        for model, lines in ((Product, product_lines), (ProductVariant, variant_lines)):
+            if not lines:
+                continue
             
-            if locked_product.stock_quantity < quantity:
-                raise InsufficientStockError(
-                    f"Insufficient stock for {product.name}. "
-                    f"Available: {locked_product.stock_quantity}, Requested: {quantity}"
-                )
+            # Only rows that still cover the requested quantity are updated
+            covered = Q()
+            for row_id, line in lines.items():
+                covered |= Q(id=row_id, stock_quantity__gte=line['quantity'])
             
-            locked_product.stock_quantity -= quantity
-            locked_product.save()
+            updated = model.objects.filter(covered).update(
+                stock_quantity=F('stock_quantity') - InventoryManager._quantity_case(lines),
+                updated_at=timezone.now()
+            )
+            if updated != len(lines):
+                # Only possible if a caller changed stock without taking the row locks
+                raise InsufficientStockError("Stock changed during reservation, please try again")
     
     @staticmethod
     @transaction.atomic
@@ -118,7 +162,8 @@ class InventoryManager:
         Restore stock when order is cancelled.
         
         Uses SELECT FOR UPDATE to ensure atomic stock restoration.
-        Iterates through all order items and restores their quantities.
+        All order items are combined per product/variant; rows are locked in
+        primary key order and restored with one UPDATE per model.
         
         Args:
             order: Order object whose stock should be restored
@@ -126,21 +171,87 @@ class InventoryManager:
         Returns:
             None
         """
-        for item in order.items.all():
-            if item.variant:
-                # Lock the variant row for update
-                locked_variant = ProductVariant.objects.select_for_update().get(
-                    id=item.variant.id
-                )
-                locked_variant.stock_quantity += item.quantity
-                locked_variant.save()
+        product_lines, variant_lines = InventoryManager._group_lines(
+            (item.product, item.variant, item.quantity) for item in order.items.all()
+        )
+        
+        for model, lines in ((Product, product_lines), (ProductVariant, variant_lines)):
+            if not lines:
+                continue
+            
+            # Lock the rows in primary key order
+            locked_ids = list(
+                model.objects.select_for_update()
+                .filter(id__in=lines)
+                .order_by('pk')
+                .values_list('pk', flat=True)
+            )
+            
+            model.objects.filter(id__in=locked_ids).update(
+                stock_quantity=F('stock_quantity') + InventoryManager._quantity_case(lines),
+                updated_at=timezone.now()
+            )
+    
+    @staticmethod
+    def _group_lines(items):
+        """
+        Combine (product, variant, quantity) lines per stock row.
+        Variant lines draw from the variant's stock, others from the product's.
+        
+        Returns:
+            tuple: ({product_id: line}, {variant_id: line}) where each line is
+            ``{'product': ..., 'variant': ..., 'quantity': total}``
+        """
+        product_lines = {}
+        variant_lines = {}
+        for product, variant, quantity in items:
+            lines, row_id = (variant_lines, variant.id) if variant else (product_lines, product.id)
+            if row_id in lines:
+                lines[row_id]['quantity'] += quantity
             else:
-                # Lock the product row for update
-                locked_product = Product.objects.select_for_update().get(
-                    id=item.product.id
-                )
-                locked_product.stock_quantity += item.quantity
-                locked_product.save()
+                lines[row_id] = {'product': product, 'variant': variant, 'quantity': quantity}
+        return product_lines, variant_lines
+    
+    @staticmethod
+    def _find_shortfalls(model, lines):
+        """Lock rows in primary key order and list lines that exceed stock"""
+        if not lines:
+            return []
+        
+        available = dict(
+            model.objects.select_for_update()
+            .filter(id__in=lines)
+            .order_by('pk')
+            .values_list('pk', 'stock_quantity')
+        )
+        
+        shortfalls = []
+        for row_id, line in lines.items():
+            stock = available.get(row_id, 0)
+            if stock < line['quantity']:
+                name = line['product'].name
+                if line['variant']:
+                    name = f"{name} - {line['variant'].name}"
+                shortfalls.append({
+                    'product': line['product'],
+                    'variant': line['variant'],
+                    'available': stock,
+                    'requested': line['quantity'],
+                    'message': (
+                        f"Insufficient stock for {name}. "
+                        f"Available: {stock}, Requested: {line['quantity']}"
+                    ),
+                })
+        return shortfalls
+    
+    @staticmethod
+    def _quantity_case(lines):
+        """Per-row quantity expression: CASE WHEN id=x THEN qty ... END"""
+        return Case(
+            *[When(id=row_id, then=Value(line['quantity'])) for row_id, line in lines.items()],
+            default=Value(0),
+            output_field=IntegerField()
+        )
 
 
 class CartManager:
@@ -434,6 +545,163 @@ class CartManager:
 
 
 
+class OrderNumberAllocator:
+    """
+    Per-year order number sequence.
+    
+    Numbers are handed out in O(1) and never collide, so checkout needs no
+    count of existing orders and no retry loop:
+    
+    - PostgreSQL: one database sequence per year (``nextval`` is atomic and
+      never blocks other transactions). ORDER_NUMBER_BLOCK_SIZE is applied
+      as the sequence's CACHE, so each connection pre-reserves a block.
+    - Other databases: a locked OrderNumberSequence row per year, bumped by
+      ORDER_NUMBER_BLOCK_SIZE with one UPDATE. Numbers beyond the first of a
+      block are kept in process memory once the reserving transaction
+      commits, so later checkouts in the same worker skip the database.
+    
+    A year's sequence starts after the orders already numbered that year.
+    Blocks larger than 1 may leave gaps when a worker stops.
+    """
+    
+    SEQUENCE_NAME = 'store_order_number_{year}'
+    
+    # year -> deque of [next, last] ranges reserved by this process
+    _reserved = defaultdict(deque)
+    _lock = threading.RLock()
+    
+    @classmethod
+    def next_number(cls, year):
+        """
+        Return the next sequential number for the given year.
+        
+        Args:
+            year: Four-digit year the number belongs to
+            
+        Returns:
+            int: Sequential number, unique within the year
+        """
+        value = cls._take_reserved(year)
+        if value is not None:
+            return value
+        
+        block_size = max(1, getattr(settings, 'ORDER_NUMBER_BLOCK_SIZE', 1))
+        
+        if connection.vendor == 'postgresql':
+            return cls._next_from_sequence(year, block_size)
+        
+        first, last = cls._reserve_block(year, block_size)
+        if last > first:
+            # Only reuse the rest of the block if the counter bump is committed
+            transaction.on_commit(lambda: cls._add_reserved(year, first + 1, last))
+        return first
+    
+    @classmethod
+    def reset(cls):
+        """Forget numbers reserved by this process (used by tests)"""
+        with cls._lock:
+            cls._reserved.clear()
+    
+    @classmethod
+    def _take_reserved(cls, year):
+        with cls._lock:
+            ranges = cls._reserved.get(year)
+            while ranges:
+                current = ranges[0]
+                if current[0] <= current[1]:
+                    value = current[0]
+                    current[0] += 1
+                    return value
+                ranges.popleft()
+        return None
+    
+    @classmethod
+    def _add_reserved(cls, year, first, last):
+        with cls._lock:
+            cls._reserved[year].append([first, last])
+    
+    @classmethod
+    def _initial_value(cls, year):
+        """Highest number already used in a year, so a new sequence continues after it"""
+        prefix = f"{getattr(settings, 'ORDER_NUMBER_PREFIX', 'EYT')}-{year}-"
+        highest = 0
+        
+        last_number = Order.objects.filter(
+            order_number__startswith=prefix
+        ).order_by('-order_number').values_list('order_number', flat=True).first()
+        if last_number:
+            try:
+                highest = int(last_number[len(prefix):])
+            except ValueError:
+                logger.warning(f"Unexpected order number format: {last_number}")
+        
+        # Orders numbered before the sequence existed were numbered by count
+        year_orders_count = Order.objects.filter(
+            created_at__gte=datetime(year, 1, 1)
+        ).count()
+        return max(highest, year_orders_count)
+    
+    @classmethod
+    def _next_from_sequence(cls, year, block_size):
+        """nextval() on the year's PostgreSQL sequence, creating it on first use"""
+        sequence_name = cls.SEQUENCE_NAME.format(year=int(year))
+        
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT to_regclass(%s)", [sequence_name])
+            if cursor.fetchone()[0] is None:
+                start = cls._initial_value(year) + 1
+                try:
+                    with transaction.atomic():
+                        cursor.execute(
+                            f"CREATE SEQUENCE IF NOT EXISTS {sequence_name} "
+                            f"START WITH {int(start)} CACHE {int(block_size)}"
+                        )
+                except (IntegrityError, ProgrammingError):
+                    # Created concurrently by another checkout
+                    pass
+            
+            cursor.execute("SELECT nextval(%s)", [sequence_name])
+            return cursor.fetchone()[0]
+    
+    @classmethod
+    def _reserve_block(cls, year, block_size):
+        """
+        Bump the year's counter row by block_size and return the reserved
+        (first, last) range. The UPDATE holds the row lock until commit.
+        """
+        if connection.vendor == 'sqlite':
+            # SQLite allows a single writer; serialize in-process instead of
+            # failing with "database is locked" under parallel checkouts
+            with cls._lock:
+                return cls._bump_counter(year, block_size)
+        return cls._bump_counter(year, block_size)
+    
+    @classmethod
+    def _bump_counter(cls, year, block_size):
+        with transaction.atomic():
+            updated = OrderNumberSequence.objects.filter(year=year).update(
+                last_value=F('last_value') + block_size
+            )
+            if not updated:
+                try:
+                    with transaction.atomic():
+                        OrderNumberSequence.objects.create(
+                            year=year,
+                            last_value=cls._initial_value(year) + block_size
+                        )
+                except IntegrityError:
+                    # Row created concurrently; take the next block from it
+                    OrderNumberSequence.objects.filter(year=year).update(
+                        last_value=F('last_value') + block_size
+                    )
+            
+            last = OrderNumberSequence.objects.filter(year=year).values_list(
+                'last_value', flat=True
+            ).get()
+        
+        return last - block_size + 1, last
+
+
 class OrderManager:
     """
     Business logic manager for order creation and management.
@@ -505,33 +773,22 @@ class OrderManager:
         subtotal = Decimal('0.00')
         cart_items = cart.items.select_related('product', 'variant').all()
         
-        # Reserve stock for all items first (will raise InsufficientStockError if any fail)
+        # Check availability before reserving
         for cart_item in cart_items:
-            # Check availability before reserving
             if not cart_item.is_available:
                 raise ValidationError(
                     f"{cart_item.product.name} is no longer available"
                 )
-            
-            if not cart_item.has_sufficient_stock:
-                available = (
-                    cart_item.variant.stock_quantity 
-                    if cart_item.variant 
-                    else cart_item.product.stock_quantity
-                )
-                raise InsufficientStockError(
-                    f"Insufficient stock for {cart_item.product.name}. "
-                    f"Available: {available}, Requested: {cart_item.quantity}"
-                )
-            
-            # Reserve stock (atomic operation with row-level locking)
-            InventoryManager.reserve_stock(
-                cart_item.product,
-                cart_item.variant,
-                cart_item.quantity
-            )
-            
-            # Calculate subtotal
+        
+        # Reserve stock for all items at once (atomic, rows locked in primary
+        # key order); raises InsufficientStockError listing every shortfall
+        InventoryManager.reserve_many(
+            (cart_item.product, cart_item.variant, cart_item.quantity)
+            for cart_item in cart_items
+        )
+        
+        # Calculate subtotal
+        for cart_item in cart_items:
             subtotal += cart_item.total_price
         
         # Calculate shipping and tax (simplified for now)
@@ -596,36 +853,20 @@ class OrderManager:
         - YYYY: Current year
         - NNNNNN: Sequential 6-digit number (padded with zeros)
         
-        The sequential number is based on the count of orders created
-        in the current year, ensuring uniqueness.
+        The sequential number comes from OrderNumberAllocator, a per-year
+        sequence, so numbers are unique under concurrent checkouts without
+        counting or probing the orders table.
         
         Returns:
             str: Unique order number (e.g., "EYT-2024-000001")
         """
-        from django.db import transaction
-        
+        prefix = getattr(settings, 'ORDER_NUMBER_PREFIX', 'EYT')
         current_year = datetime.now().year
         
-        # Use a transaction to ensure atomicity
-        with transaction.atomic():
-            # Get count of orders created this year
-            year_start = datetime(current_year, 1, 1)
-            year_orders_count = Order.objects.filter(
-                created_at__gte=year_start
-            ).count()
-            
-            # Generate sequential number (next order number)
-            sequential_number = year_orders_count + 1
-            
-            # Format: EYT-YYYY-NNNNNN
-            order_number = f"EYT-{current_year}-{sequential_number:06d}"
-            
-            # Ensure uniqueness (handle race conditions)
-            while Order.objects.filter(order_number=order_number).exists():
-                sequential_number += 1
-                order_number = f"EYT-{current_year}-{sequential_number:06d}"
+        sequential_number = OrderNumberAllocator.next_number(current_year)
         
-        return order_number
+        # Format: EYT-YYYY-NNNNNN
+        return f"{prefix}-{current_year}-{sequential_number:06d}"
     
     @staticmethod
     def update_status(order, new_status, tracking_number=None):
@@ -2,31 +2,52 @@
 Security middleware for the EYTGaming Store.
 
 This module implements rate limiting and other security features
-to protect the store from abuse and attacks.
+to protect the store from abuse and attacks. Counting is done by the
+shared sliding-window limiter in ``core.rate_limit``.
 """
 
 import logging
-from django.core.cache import cache
+from collections import namedtuple
 from django.http import HttpResponse
 from django.conf import settings
 
+from core.rate_limit import RateLimiter
+
 logger = logging.getLogger('security')
 
 
+# Route classes checked in order; the first matching path prefix wins.
+# A limit of None exempts the route class without touching the rate limiter.
+DEFAULT_RATE_LIMIT_POLICIES = [
+    {'name': 'checkout', 'prefixes': ['/store/checkout/', '/store/payment/'], 'limit': 10, 'window': 60},
+    {'name': 'exempt', 'prefixes': ['/notifications/', '/__debug__/', '/static/', '/media/', '/admin/'],
+     'limit': None},
+    {'name': 'default', 'prefixes': [], 'limit': 100, 'window': 60},
+]
+
+
+RatePolicy = namedtuple('RatePolicy', ['name', 'limit', 'window'])
+
+
 class RateLimitMiddleware:
     """
     Rate limiting middleware to prevent abuse and DDoS attacks.
     
-    Implements different rate limits for different endpoints:
+    Implements different rate limits for different route classes
+    (``RATE_LIMIT_POLICIES``), counted per IP with the shared sliding-window
+    limiter in ``core.rate_limit``:
     - Checkout endpoints: 10 requests per minute per IP
     - General endpoints: 100 requests per minute per IP
+    - Static/media, admin, notifications, debug toolbar: exempt
     
     Validates: Requirements 5.1, 5.2, 5.3, 5.4, 5.5
     """
     
     def __init__(self, get_response):
         self.get_response = get_response
-        self.cache = cache
+        self.prefixes, self.default_policy = self._compile_policies(
+            getattr(settings, 'RATE_LIMIT_POLICIES', DEFAULT_RATE_LIMIT_POLICIES)
+        )
         
     def __call__(self, request):
         # Check if rate limiting is enabled
@@ -34,7 +55,8 @@ class RateLimitMiddleware:
             return self.get_response(request)
         
         # Check if request should be rate limited
-        if self.is_rate_limited(request):
+        policy = self.get_policy(request.path)
+        if policy.limit is not None and self.is_rate_limited(request, policy):
             logger.warning(
                 f'Rate limit exceeded for {request.META.get("REMOTE_ADDR")} on {request.path}',
                 extra={
@@ -47,41 +69,45 @@ class RateLimitMiddleware:
             return HttpResponse(
                 'Too Many Requests. Please try again later.',
                 status=429,
-                headers={'Retry-After': '60'}
+                headers={'Retry-After': str(policy.window)}
             )
         
         return self.get_response(request)
     
-    def is_rate_limited(self, request):
+    def is_rate_limited(self, request, policy=None):
         """
-        Check if the request exceeds the rate limit.
+        Count the request against its route class and check the limit.
         
         Args:
             request: The HTTP request object
+            policy: The request's RatePolicy (looked up if omitted)
             
         Returns:
             bool: True if rate limited, False otherwise
         """
-        # Get client IP address
-        ip_address = self.get_client_ip(request)
-        
-        # Determine rate limit based on path
-        limit = self.get_limit(request.path)
+        policy = policy or self.get_policy(request.path)
+        if policy.limit is None:
+            return False
         
-        # Create cache key
-        cache_key = f'rate_limit:{ip_address}:{request.path}'
-        
-        # Get current count
-        count = self.cache.get(cache_key, 0)
-        
-        # Check if limit exceeded
-        if count >= limit:
-            return True
-        
-        # Increment count with 60 second timeout
-        self.cache.set(cache_key, count + 1, timeout=60)
+        result = RateLimiter.hit(
+            f'route:{policy.name}', self.get_client_ip(request), policy.limit, policy.window
+        )
+        return not result.allowed
+    
+    def get_policy(self, path):
+        """
+        Get the route class policy for a path.
         
-        return False
+        Args:
+            path: The request path
+            
+        Returns:
+            RatePolicy: name, limit (None when exempt) and window in seconds
+        """
+        for prefix, policy in self.prefixes:
+            if path.startswith(prefix):
+                return policy
+        return self.default_policy
     
     def get_limit(self, path):
         """
@@ -91,30 +117,21 @@ class RateLimitMiddleware:
             path: The request path
             
         Returns:
-            int: The rate limit (requests per minute)
+            int: The rate limit (requests per window), None when exempt
         """
-        # Stricter limits for checkout endpoints
-        if '/store/checkout/' in path or '/store/payment/' in path:
-            return 10
-
-        # Exempt notification endpoints (polling, unread count, recent, etc.)
-        if path.startswith('/notifications/'):
-            return 10000  # effectively unlimited
-
-        # Exempt Django Debug Toolbar requests
-        if path.startswith('/__debug__/'):
-            return 10000
-
-        # Exempt static/media files
-        if path.startswith('/static/') or path.startswith('/media/'):
-            return 10000
-
-        # Exempt admin panel
-        if path.startswith('/admin/'):
-            return 10000
-
-        # Default limit for other endpoints
-        return 100
+        return self.get_policy(path).limit
+    
+    @staticmethod
+    def _compile_policies(policies):
+        """Flatten policies into ordered (prefix, RatePolicy) pairs plus the default"""
+        prefixes = []
+        default_policy = RatePolicy('default', 100, 60)
+        for config in policies:
+            policy = RatePolicy(config['name'], config.get('limit'), config.get('window', 60))
+            if not config.get('prefixes'):
+                default_policy = policy
+            prefixes.extend((prefix, policy) for prefix in config.get('prefixes', ()))
+        return prefixes, default_policy
     
     def get_client_ip(self, request):
         """
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-16 14:20
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Avg, Count
+
+
+def backfill_ratings(apps, schema_editor):
+    Product = apps.get_model('store', 'Product')
+    ProductReview = apps.get_model('store', 'ProductReview')
+
+    aggregates = (
+        ProductReview.objects.order_by().values('product_id')
+        .annotate(avg_rating=Avg('rating'), count=Count('id'))
+    )
+    for row in aggregates:
+        Product.objects.filter(pk=row['product_id']).update(
+            average_rating=round(Decimal(row['avg_rating']), 1),
+            review_count=row['count'],
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0009_ordernumbersequence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='average_rating',
+            field=models.DecimalField(blank=True, decimal_places=1, help_text='Average review rating, empty until the first review', max_digits=2, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
@@ -83,6 +83,15 @@ class Product(models.Model):
         default=False,
         help_text='Feature this product in the Merch Teaser section on the home dashboard'
     )
+    # Denormalized from ProductReview by update_rating()
+    average_rating = models.DecimalField(
+        max_digits=2,
+        decimal_places=1,
+        null=True,
+        blank=True,
+        help_text='Average review rating, empty until the first review'
+    )
+    review_count = models.PositiveIntegerField(default=0)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -129,23 +138,24 @@ class Product(models.Model):
         """Check if product stock is low (below 10 units)."""
         return 0 < self.stock_quantity < 10
     
-    @property
-    def average_rating(self):
+    def update_rating(self):
         """
-        Calculate average rating from all reviews.
-        Returns None if no reviews exist.
+        Recalculate the stored average rating and review count from reviews.
+        Called when a ProductReview is saved or deleted.
         
         Requirements: 12.7
         """
-        from django.db.models import Avg
-        result = self.reviews.aggregate(avg_rating=Avg('rating'))
-        avg = result.get('avg_rating')
-        return round(avg, 1) if avg is not None else None
-    
-    @property
-    def review_count(self):
-        """Get total number of reviews for this product."""
-        return self.reviews.count()
+        from decimal import Decimal
+        from django.db.models import Avg, Count
+        result = self.reviews.aggregate(avg_rating=Avg('rating'), count=Count('id'))
+        avg = result['avg_rating']
+        self.average_rating = round(Decimal(avg), 1) if avg is not None else None
+        self.review_count = result['count']
+        # A plain UPDATE: updated_at and the product save signals stay untouched
+        Product.objects.filter(pk=self.pk).update(
+            average_rating=self.average_rating,
+            review_count=self.review_count
+        )
 
 
 class ProductVariant(models.Model):
@@ -592,6 +602,27 @@ class OrderItem(models.Model):
         super().save(*args, **kwargs)
 
 
+class OrderNumberSequence(models.Model):
+    """
+    Per-year order number counter.
+    Used by OrderNumberAllocator on databases without native sequences;
+    PostgreSQL uses one database sequence per year instead.
+    """
+    year = models.PositiveIntegerField(primary_key=True)
+    last_value = models.BigIntegerField(
+        default=0,
+        help_text='Highest sequential number handed out for this year'
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Order Number Sequence'
+        verbose_name_plural = 'Order Number Sequences'
+    
+    def __str__(self):
+        return f"{self.year}: {self.last_value}"
+
+
 
 # ============================================================================
 # Wishlist Models
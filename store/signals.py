@@ -1,8 +1,39 @@
 """
 Django signals for the EYTGaming Store.
 
-This module will contain signal handlers for store events
-such as order creation, payment confirmation, etc.
+Reviews keep the denormalized rating on their product up to date, and
+product or rating changes drop the cached listing indexes in
+``store.listing``.
 """
 
-# Signals will be implemented in later tasks
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from store.listing import ProductListingIndex
+from store.models import Product, ProductReview
+
+
+@receiver(post_save, sender=ProductReview)
+@receiver(post_delete, sender=ProductReview)
+def update_product_rating(sender, instance, raw=False, **kwargs):
+    """Recalculate the product's average rating and review count"""
+    if raw:
+        return
+    product = Product.objects.filter(pk=instance.product_id).first()
+    if product:
+        product.update_rating()
+        slug = product.slug
+        transaction.on_commit(lambda: cache.delete(f'product_detail_{slug}'))
+        # The "top rated" order depends on the rating
+        ProductListingIndex.invalidate()
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_listing(sender, instance, raw=False, **kwargs):
+    """New, edited, repriced and deactivated products change the listing"""
+    if raw:
+        return
+    ProductListingIndex.invalidate()
@@ -399,3 +399,107 @@ class TestInventoryManagerAtomicity:
         # Stock should be rolled back to original value
         self.product.refresh_from_db()
         assert self.product.stock_quantity == initial_stock
+
+
+@pytest.mark.django_db
+class TestInventoryManagerReserveMany:
+    """Tests for reserve_many method."""
+    
+    def setup_method(self):
+        """Set up test data."""
+        self.category = Category.objects.create(name='Test Category', slug='test-category')
+        self.product1 = Product.objects.create(
+            name='Product 1',
+            slug='product-1',
+            description='Test description',
+            price=Decimal('29.99'),
+            category=self.category,
+            stock_quantity=10
+        )
+        self.product2 = Product.objects.create(
+            name='Product 2',
+            slug='product-2',
+            description='Test description',
+            price=Decimal('39.99'),
+            category=self.category,
+            stock_quantity=2
+        )
+        self.variant = ProductVariant.objects.create(
+            product=self.product1,
+            name='Size: Large',
+            sku='TEST-L',
+            stock_quantity=4
+        )
+    
+    def test_reserve_many_success(self):
+        """Test reserving products and variants together."""
+        InventoryManager.reserve_many([
+            (self.product1, None, 3),
+            (self.product2, None, 2),
+            (self.product1, self.variant, 4),
+        ])
+        
+        self.product1.refresh_from_db()
+        self.product2.refresh_from_db()
+        self.variant.refresh_from_db()
+        assert self.product1.stock_quantity == 7
+        assert self.product2.stock_quantity == 0
+        assert self.variant.stock_quantity == 0
+    
+    def test_reserve_many_combines_lines_for_same_row(self):
+        """Test that repeated lines for one product are checked as a total."""
+        with pytest.raises(InsufficientStockError) as exc_info:
+            InventoryManager.reserve_many([
+                (self.product2, None, 1),
+                (self.product2, None, 2),
+            ])
+        
+        assert exc_info.value.shortfalls[0]['requested'] == 3
+        self.product2.refresh_from_db()
+        assert self.product2.stock_quantity == 2
+    
+    def test_reserve_many_reports_every_shortfall(self):
+        """Test that all shortfalls are reported and nothing is reserved."""
+        with pytest.raises(InsufficientStockError) as exc_info:
+            InventoryManager.reserve_many([
+                (self.product1, None, 1),
+                (self.product2, None, 5),
+                (self.product1, self.variant, 9),
+            ])
+        
+        shortfalls = exc_info.value.shortfalls
+        assert [(s['available'], s['requested']) for s in shortfalls] == [(2, 5), (4, 9)]
+        assert "Insufficient stock for Product 2" in str(exc_info.value)
+        assert "Insufficient stock for Product 1 - Size: Large" in str(exc_info.value)
+        
+        self.product1.refresh_from_db()
+        assert self.product1.stock_quantity == 10
+    
+    def test_reserve_many_query_count_is_constant(self, django_assert_max_num_queries):
+        """Test that a whole cart is reserved with one lock and one update per model."""
+        products = [
+            Product.objects.create(
+                name=f'Bulk {i}',
+                slug=f'bulk-{i}',
+                description='Test description',
+                price=Decimal('9.99'),
+                category=self.category,
+                stock_quantity=5
+            )
+            for i in range(10)
+        ]
+        
+        # Savepoint + lock + update per model (+ release)
+        with django_assert_max_num_queries(6):
+            InventoryManager.reserve_many(
+                [(product, None, 1) for product in products] + [(self.product1, self.variant, 1)]
+            )
+        
+        assert Product.objects.filter(slug__startswith='bulk-', stock_quantity=4).count() == 10
+    
+    def test_reserve_many_empty(self):
+        """Test reserving nothing is a no-op."""
+        InventoryManager.reserve_many([])
+        
+        self.product1.refresh_from_db()
+        assert self.product1.stock_quantity == 10
@@ -18,9 +18,9 @@ from django.utils import timezone
 
 from store.models import (
     Cart, CartItem, Product, ProductVariant, Category,
-    Order, OrderItem
+    Order, OrderItem, OrderNumberSequence
 )
-from store.managers import OrderManager, CartManager, InsufficientStockError
+from store.managers import OrderManager, CartManager, InsufficientStockError, OrderNumberAllocator
 
 User = get_user_model()
 
@@ -388,6 +388,127 @@ class TestOrderManagerGenerateOrderNumber:
         assert sequential >= 2  # Should be at least 2
 
 
+@pytest.mark.django_db
+class TestOrderNumberAllocator:
+    """Tests for the per-year order number sequence."""
+    
+    def setup_method(self):
+        OrderNumberAllocator.reset()
+    
+    def teardown_method(self):
+        OrderNumberAllocator.reset()
+    
+    def test_numbers_are_consecutive(self):
+        """Test consecutive calls hand out consecutive numbers."""
+        first = OrderNumberAllocator.next_number(2030)
+        second = OrderNumberAllocator.next_number(2030)
+        
+        assert second == first + 1
+        assert OrderNumberSequence.objects.get(year=2030).last_value == second
+    
+    def test_years_are_independent(self):
+        """Test each year has its own sequence."""
+        assert OrderNumberAllocator.next_number(2030) == 1
+        assert OrderNumberAllocator.next_number(2031) == 1
+        assert OrderNumberAllocator.next_number(2030) == 2
+    
+    def test_constant_query_count(self, django_assert_max_num_queries):
+        """Test allocation cost does not depend on the number of orders."""
+        OrderNumberAllocator.next_number(2030)
+        
+        # Savepoint, UPDATE, SELECT, release
+        with django_assert_max_num_queries(4):
+            OrderNumberAllocator.next_number(2030)
+    
+    def test_block_reservation(self, settings, django_assert_num_queries,
+                               django_capture_on_commit_callbacks):
+        """Test numbers after the first of a block are served from memory."""
+        settings.ORDER_NUMBER_BLOCK_SIZE = 5
+        
+        with django_capture_on_commit_callbacks(execute=True):
+            first = OrderNumberAllocator.next_number(2030)
+        assert OrderNumberSequence.objects.get(year=2030).last_value == first + 4
+        
+        with django_assert_num_queries(0):
+            rest = [OrderNumberAllocator.next_number(2030) for _ in range(4)]
+        
+        assert rest == [first + 1, first + 2, first + 3, first + 4]
+        with django_capture_on_commit_callbacks(execute=True):
+            assert OrderNumberAllocator.next_number(2030) == first + 5
+    
+    def test_rolled_back_block_is_not_reused(self, settings):
+        """Test a block reserved in a rolled back transaction is discarded."""
+        from django.db import transaction
+        settings.ORDER_NUMBER_BLOCK_SIZE = 5
+        
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                OrderNumberAllocator.next_number(2030)
+                raise RuntimeError("checkout failed")
+        
+        assert OrderNumberAllocator._take_reserved(2030) is None
+        assert not OrderNumberSequence.objects.filter(year=2030).exists()
+    
+    def test_sequence_continues_after_existing_orders(self):
+        """Test a new year sequence starts after already numbered orders."""
+        user = User.objects.create_user(
+            email='testuser@example.com',
+            username='testuser',
+            password='testpass123'
+        )
+        Order.objects.create(
+            order_number='EYT-2030-000041',
+            user=user,
+            subtotal=Decimal('29.99'),
+            shipping_cost=Decimal('10.00'),
+            tax=Decimal('2.99'),
+            total=Decimal('42.98'),
+            shipping_name='Test User',
+            shipping_address_line1='123 Test St',
+            shipping_city='Test City',
+            shipping_state='TS',
+            shipping_postal_code='12345',
+            shipping_country='Test Country',
+            shipping_phone='+1234567890',
+            payment_method='stripe',
+            payment_intent_id='pi_test_123'
+        )
+        
+        assert OrderNumberAllocator.next_number(2030) == 42
+
+
+@pytest.mark.django_db(transaction=True)
+class TestOrderNumberAllocatorConcurrency:
+    """Concurrency benchmark: parallel checkouts never share a number."""
+    
+    def setup_method(self):
+        OrderNumberAllocator.reset()
+    
+    def teardown_method(self):
+        OrderNumberAllocator.reset()
+    
+    @pytest.mark.parametrize('block_size', [1, 10])
+    def test_parallel_allocation_has_no_duplicates(self, settings, block_size):
+        """Test threads allocating at once get distinct, gap-free numbers."""
+        from concurrent.futures import ThreadPoolExecutor
+        from django.db import connection
+        settings.ORDER_NUMBER_BLOCK_SIZE = block_size
+        
+        workers, per_worker = 8, 25
+        
+        def allocate(_):
+            try:
+                return [OrderNumberAllocator.next_number(2030) for _ in range(per_worker)]
+            finally:
+                connection.close()
+        
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            numbers = [n for batch in executor.map(allocate, range(workers)) for n in batch]
+        
+        assert len(numbers) == len(set(numbers)) == workers * per_worker
+        assert sorted(numbers) == list(range(1, workers * per_worker + 1))
+
+
 @pytest.mark.django_db
 class TestOrderManagerUpdateStatus:
     """Tests for update_status method."""
@@ -0,0 +1,121 @@
+"""
+Unit tests for denormalized product ratings and the listing index.
+
+Tests:
+- Review saves and deletes keep Product.average_rating/review_count current
+- Listing pages cost the same number of queries however many products they show
+- Cached indexes are reused across pages and price ranges and dropped on change
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from decimal import Decimal
+
+from store.listing import ProductListingIndex
+from store.models import Product, Category, ProductReview
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class TestProductListing(TestCase):
+    """Test stored ratings and the cached listing index."""
+
+    def setUp(self):
+        """Set up test data."""
+        cache.clear()
+        self.category = Category.objects.create(name='Jerseys', slug='jerseys')
+        self.product = self._create_product('Team Jersey', Decimal('49.99'))
+
+    def _create_product(self, name, price):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Product.objects.create(
+                name=name,
+                slug=name.lower().replace(' ', '-'),
+                description='Test description',
+                price=price,
+                category=self.category,
+                stock_quantity=10,
+                is_active=True
+            )
+
+    def _review(self, username, rating, product=None):
+        user = User.objects.create_user(
+            username=username, email=f'{username}@example.com', password='testpass123'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            return ProductReview.objects.create(product=product or self.product, user=user, rating=rating)
+
+    def test_reviews_update_stored_rating(self):
+        """Test rating aggregates follow review saves and deletes."""
+        assert self.product.average_rating is None
+        assert self.product.review_count == 0
+
+        self._review('first', 5)
+        review = self._review('second', 4)
+        self.product.refresh_from_db()
+        assert self.product.average_rating == Decimal('4.5')
+        assert self.product.review_count == 2
+
+        with self.captureOnCommitCallbacks(execute=True):
+            review.delete()
+        self.product.refresh_from_db()
+        assert self.product.average_rating == Decimal('5.0')
+        assert self.product.review_count == 1
+
+    def test_page_queries_do_not_grow_with_products(self):
+        """Test a full page costs the same queries as a nearly empty one."""
+        url = reverse('store:product_list')
+        self._review('reviewer', 4)
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as small_page:
+            self.client.get(url)
+
+        for i in range(30):
+            self._create_product(f'Product {i}', Decimal('19.99'))
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as full_page:
+            response = self.client.get(url)
+
+        assert len(response.context['products']) == 24
+        assert len(full_page.captured_queries) == len(small_page.captured_queries)
+
+    def test_index_is_reused_and_invalidated(self):
+        """Test pages and price ranges share one index until a product changes."""
+        cheap = self._create_product('Sticker', Decimal('4.99'))
+        url = reverse('store:product_list')
+        self.client.get(url, {'sort': 'price_low'})
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {'sort': 'price_low', 'max_price': '10.00'})
+        assert list(response.context['products']) == [cheap]
+        # The price range was applied to the cached index, not the database
+        assert not any('"price"' in query['sql'] and '<=' in query['sql'] for query in queries.captured_queries)
+
+        new = self._create_product('Mousepad', Decimal('9.99'))
+        response = self.client.get(url, {'sort': 'price_low', 'max_price': '10.00'})
+        assert list(response.context['products']) == [cheap, new]
+
+    def test_rating_sort_and_uncached_search(self):
+        """Test top rated ordering and that searches add no cache entries."""
+        hoodie = self._create_product('Team Hoodie', Decimal('69.99'))
+        self._review('fan', 5, product=hoodie)
+        self._review('critic', 2)
+
+        entries = ProductListingIndex.get_entries(sort_by='rating')
+        assert [product_id for product_id, price in entries] == [hoodie.id, self.product.id]
+
+        generation = ProductListingIndex.get_generation()
+        response = self.client.get(reverse('store:product_list'), {'q': 'hoodie'})
+        assert list(response.context['products']) == [hoodie]
+        assert cache.get(ProductListingIndex.INDEX_KEY.format(
+            generation=generation, category='all', sort='newest'
+        )) is None
@@ -19,13 +19,14 @@ from django.http import JsonResponse
 from django.core.exceptions import ValidationError
 from django.views.decorators.csrf import csrf_protect, csrf_exempt
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
-from django.db.models import Q, Prefetch
+from django.db.models import Prefetch
 from django.urls import reverse
 from django.core.cache import cache
 from decimal import Decimal, InvalidOperation
 import json
 
 from .models import Product, ProductVariant, Cart, CartItem, Category, ProductImage, Order, OrderItem
+from .listing import ProductListingIndex
 from .managers import CartManager, InsufficientStockError
 from .utils import InputValidator
 
@@ -43,100 +44,54 @@ def product_list(request):
     - Category filtering
     - Search by name, description, tags
     - Price range filtering
-    - Sorting (price, name, newest)
+    - Sorting (price, name, newest, rating)
     - Pagination (24 products per page)
     
+    Listings are served from ProductListingIndex: cached id lists per
+    category and sort order, hydrated by primary key one page at a time.
+    Ratings are stored on Product, so cards render without extra queries.
+    
     Requirements: 6.1, 6.3, 6.4, 6.7, 17.1, 17.2, 17.3, 17.4, 17.5, 20.5
     """
-    # Build cache key from query parameters
-    cache_key_parts = ['product_list']
     category_slug = request.GET.get('category')
     search_query = request.GET.get('q', '').strip()
     min_price = request.GET.get('min_price')
     max_price = request.GET.get('max_price')
     sort_by = request.GET.get('sort', 'newest')
-    page = request.GET.get('page', 1)
-    
-    if category_slug:
-        cache_key_parts.append(f'cat_{category_slug}')
-    if search_query:
-        cache_key_parts.append(f'q_{search_query[:50]}')  # Limit search query length in cache key
-    if min_price:
-        cache_key_parts.append(f'min_{min_price}')
-    if max_price:
-        cache_key_parts.append(f'max_{max_price}')
-    cache_key_parts.append(f'sort_{sort_by}')
-    cache_key_parts.append(f'page_{page}')
-    
-    cache_key = '_'.join(cache_key_parts)
-    
-    # Try to get from cache
-    cached_context = cache.get(cache_key)
-    if cached_context:
-        return render(request, 'store/product_list.html', cached_context)
-    
-    # Start with active products only
-    products = Product.objects.filter(is_active=True)
+    if sort_by not in ProductListingIndex.SORT_ORDERS:
+        # Default to newest
+        sort_by = ProductListingIndex.DEFAULT_SORT
     
     # Category filtering
     selected_category = None
     if category_slug:
         selected_category = get_object_or_404(Category, slug=category_slug)
-        products = products.filter(category=selected_category)
-    
-    # Search functionality with sanitization
-    if search_query:
-        # Sanitize search query to prevent SQL injection
-        sanitized_query = InputValidator.sanitize_search_query(search_query)
-        
-        if sanitized_query:
-            # Search in product name and description
-            products = products.filter(
-                Q(name__icontains=sanitized_query) |
-                Q(description__icontains=sanitized_query)
-            )
     
     # Price range filtering
-    if min_price:
-        try:
-            min_price_decimal = Decimal(min_price)
-            if min_price_decimal >= 0:
-                products = products.filter(price__gte=min_price_decimal)
-        except (ValueError, TypeError, InvalidOperation):
-            pass  # Ignore invalid price values
+    price_range = {}
+    for name, value in (('min_price', min_price), ('max_price', max_price)):
+        if value:
+            try:
+                value = Decimal(value)
+                if value >= 0:
+                    price_range[name] = value
+            except (ValueError, TypeError, InvalidOperation):
+                pass  # Ignore invalid price values
     
-    if max_price:
-        try:
-            max_price_decimal = Decimal(max_price)
-            if max_price_decimal >= 0:
-                products = products.filter(price__lte=max_price_decimal)
-        except (ValueError, TypeError, InvalidOperation):
-            pass  # Ignore invalid price values
-    
-    # Sorting
-    if sort_by == 'price_low':
-        products = products.order_by('price', 'name')
-    elif sort_by == 'price_high':
-        products = products.order_by('-price', 'name')
-    elif sort_by == 'name':
-        products = products.order_by('name')
-    elif sort_by == 'newest':
-        products = products.order_by('-created_at', 'name')
-    else:
-        # Default to newest
-        products = products.order_by('-created_at', 'name')
+    # Search functionality with sanitization
+    sanitized_query = InputValidator.sanitize_search_query(search_query) if search_query else ''
     
-    # Optimize queries with select_related and prefetch_related
-    products = products.select_related('category').prefetch_related(
-        Prefetch(
-            'images',
-            queryset=ProductImage.objects.filter(is_primary=True).order_by('-is_primary', 'display_order'),
-            to_attr='primary_images'
+    # Ordered (id, price) entries: searches hit the database, everything
+    # else is sliced from the cached per-category index
+    if sanitized_query:
+        entries = ProductListingIndex.search_entries(
+            sanitized_query, selected_category, sort_by, **price_range
         )
-    )
+    else:
+        entries = ProductListingIndex.get_entries(selected_category, sort_by, **price_range)
     
-    # Pagination (24 products per page)
-    paginator = Paginator(products, 24)
+    # Pagination (24 products per page), loading only the page's products
+    paginator = Paginator(entries, 24)
     page = request.GET.get('page', 1)
     
     try:
@@ -145,6 +100,7 @@ def product_list(request):
         products_page = paginator.page(1)
     except EmptyPage:
         products_page = paginator.page(paginator.num_pages)
+    ProductListingIndex.hydrate(products_page)
     
     # Get all categories for filter UI (cache categories separately)
     categories_cache_key = 'product_categories_tree'
@@ -165,9 +121,6 @@ def product_list(request):
         'total_products': paginator.count,
     }
     
-    # Cache the context for 5 minutes
-    cache.set(cache_key, context, 60 * 5)
-    
     return render(request, 'store/product_list.html', context)
 
 
@@ -1777,8 +1730,9 @@ def submit_review(request, product_slug):
             comment=comment
         )
         
-        # Get updated average rating
-        avg_rating = product.average_rating
+        # Get updated average rating (stored on the product by the review signal)
+        product.refresh_from_db(fields=['average_rating', 'review_count'])
+        avg_rating = float(product.average_rating) if product.average_rating is not None else None
         review_count = product.review_count
         
         return JsonResponse({
@@ -211,27 +211,25 @@ class TeamNotificationService:
         # Use email for urgent announcements
         delivery_methods = ['in_app', 'email'] if announcement.priority == 'urgent' else ['in_app']
         
-        for member in active_members:
-            # Don't notify the person who posted the announcement
-            if member.user != posted_by:
-                Notification.create_notification(
-                    user=member.user,
-                    title=f"New Team Announcement: {announcement.title}",
-                    message=f"{posted_by.get_display_name()} posted an announcement in {team.name}.",
-                    notification_type='team',
-                    priority=notif_priority,
-                    content_object=announcement,
-                    action_url=f'/teams/{team.slug}/announcements/',
-                    delivery_methods=delivery_methods,
-                    metadata={
-                        'team_id': str(team.id),
-                        'team_name': team.name,
-                        'announcement_id': str(announcement.id),
-                        'announcement_priority': announcement.priority,
-                        'posted_by_id': str(posted_by.id),
-                        'posted_by_name': posted_by.get_display_name(),
-                    }
-                )
+        # Don't notify the person who posted the announcement
+        Notification.create_bulk(
+            [member.user for member in active_members if member.user != posted_by],
+            title=f"New Team Announcement: {announcement.title}",
+            message=f"{posted_by.get_display_name()} posted an announcement in {team.name}.",
+            notification_type='team',
+            priority=notif_priority,
+            content_object=announcement,
+            action_url=f'/teams/{team.slug}/announcements/',
+            delivery_methods=delivery_methods,
+            metadata={
+                'team_id': str(team.id),
+                'team_name': team.name,
+                'announcement_id': str(announcement.id),
+                'announcement_priority': announcement.priority,
+                'posted_by_id': str(posted_by.id),
+                'posted_by_name': posted_by.get_display_name(),
+            }
+        )
     
     # ========================================================================
     # Role Changes
@@ -321,27 +319,25 @@ class TeamNotificationService:
         """
         active_members = team.members.filter(status='active').select_related('user')
         
-        for member in active_members:
-            # Don't notify the person who registered
-            if member.user != registered_by:
-                Notification.create_notification(
-                    user=member.user,
-                    title=f"Team registered for {tournament.name}",
-                    message=f"{team.name} has been registered for {tournament.name} by {registered_by.get_display_name()}.",
-                    notification_type='tournament',
-                    priority='normal',
-                    content_object=tournament,
-                    action_url=f'/tournaments/{tournament.slug}/',
-                    delivery_methods=['in_app'],
-                    metadata={
-                        'team_id': str(team.id),
-                        'team_name': team.name,
-                        'tournament_id': str(tournament.id),
-                        'tournament_name': tournament.name,
-                        'registered_by_id': str(registered_by.id),
-                        'registered_by_name': registered_by.get_display_name(),
-                    }
-                )
+        # Don't notify the person who registered
+        Notification.create_bulk(
+            [member.user for member in active_members if member.user != registered_by],
+            title=f"Team registered for {tournament.name}",
+            message=f"{team.name} has been registered for {tournament.name} by {registered_by.get_display_name()}.",
+            notification_type='tournament',
+            priority='normal',
+            content_object=tournament,
+            action_url=f'/tournaments/{tournament.slug}/',
+            delivery_methods=['in_app'],
+            metadata={
+                'team_id': str(team.id),
+                'team_name': team.name,
+                'tournament_id': str(tournament.id),
+                'tournament_name': tournament.name,
+                'registered_by_id': str(registered_by.id),
+                'registered_by_name': registered_by.get_display_name(),
+            }
+        )
     
     @classmethod
     def notify_tournament_starting(cls, team, tournament):
@@ -354,23 +350,22 @@ class TeamNotificationService:
         """
         active_members = team.members.filter(status='active').select_related('user')
         
-        for member in active_members:
-            Notification.create_notification(
-                user=member.user,
-                title=f"Tournament starting soon: {tournament.name}",
-                message=f"Your team {team.name} has a tournament starting soon!",
-                notification_type='tournament',
-                priority='high',
-                content_object=tournament,
-                action_url=f'/tournaments/{tournament.slug}/',
-                delivery_methods=['in_app', 'email'],
-                metadata={
-                    'team_id': str(team.id),
-                    'team_name': team.name,
-                    'tournament_id': str(tournament.id),
-                    'tournament_name': tournament.name,
-                }
-            )
+        Notification.create_bulk(
+            [member.user for member in active_members],
+            title=f"Tournament starting soon: {tournament.name}",
+            message=f"Your team {team.name} has a tournament starting soon!",
+            notification_type='tournament',
+            priority='high',
+            content_object=tournament,
+            action_url=f'/tournaments/{tournament.slug}/',
+            delivery_methods=['in_app', 'email'],
+            metadata={
+                'team_id': str(team.id),
+                'team_name': team.name,
+                'tournament_id': str(tournament.id),
+                'tournament_name': tournament.name,
+            }
+        )
     
     @classmethod
     def notify_tournament_win(cls, team, tournament):
@@ -383,23 +378,22 @@ class TeamNotificationService:
         """
         active_members = team.members.filter(status='active').select_related('user')
         
-        for member in active_members:
-            Notification.create_notification(
-                user=member.user,
-                title=f"🏆 {team.name} won {tournament.name}!",
-                message=f"Congratulations! Your team has won {tournament.name}!",
-                notification_type='tournament',
-                priority='high',
-                content_object=tournament,
-                action_url=f'/teams/{team.slug}/',
-                delivery_methods=['in_app', 'email'],
-                metadata={
-                    'team_id': str(team.id),
-                    'team_name': team.name,
-                    'tournament_id': str(tournament.id),
-                    'tournament_name': tournament.name,
-                }
-            )
+        Notification.create_bulk(
+            [member.user for member in active_members],
+            title=f"🏆 {team.name} won {tournament.name}!",
+            message=f"Congratulations! Your team has won {tournament.name}!",
+            notification_type='tournament',
+            priority='high',
+            content_object=tournament,
+            action_url=f'/teams/{team.slug}/',
+            delivery_methods=['in_app', 'email'],
+            metadata={
+                'team_id': str(team.id),
+                'team_name': team.name,
+                'tournament_id': str(tournament.id),
+                'tournament_name': tournament.name,
+            }
+        )
     
     # ========================================================================
     # Team Achievements (Requirement 15.4)
@@ -418,24 +412,23 @@ class TeamNotificationService:
         """
         active_members = team.members.filter(status='active').select_related('user')
         
-        for member in active_members:
-            Notification.create_notification(
-                user=member.user,
-                title=f"🏆 New Achievement Unlocked!",
-                message=f"{team.name} earned: {achievement.title} - {achievement.description}",
-                notification_type='team',
-                priority='normal',
-                content_object=achievement,
-                action_url=f'/teams/{team.slug}/',
-                delivery_methods=['in_app'],
-                metadata={
-                    'team_id': str(team.id),
-                    'team_name': team.name,
-                    'achievement_id': str(achievement.id),
-                    'achievement_type': achievement.achievement_type,
-                    'achievement_title': achievement.title,
-                }
-            )
+        Notification.create_bulk(
+            [member.user for member in active_members],
+            title=f"🏆 New Achievement Unlocked!",
+            message=f"{team.name} earned: {achievement.title} - {achievement.description}",
+            notification_type='team',
+            priority='normal',
+            content_object=achievement,
+            action_url=f'/teams/{team.slug}/',
+            delivery_methods=['in_app'],
+            metadata={
+                'team_id': str(team.id),
+                'team_name': team.name,
+                'achievement_id': str(achievement.id),
+                'achievement_type': achievement.achievement_type,
+                'achievement_title': achievement.title,
+            }
+        )
     
     # ========================================================================
     # Roster Changes (Joins, Leaves, Removals)
@@ -480,24 +473,22 @@ class TeamNotificationService:
         if all_members:
             # Notify all active members
             active_members = team.members.filter(status='active').select_related('user')
-            for member in active_members:
-                if member.user != left_member:
-                    Notification.create_notification(
-                        user=member.user,
-                        title=f"{left_member.get_display_name()} left {team.name}",
-                        message=f"{left_member.get_display_name()} has left the team.",
-                        notification_type='team',
-                        priority='low',
-                        content_object=team,
-                        action_url=f'/teams/{team.slug}/',
-                        delivery_methods=['in_app'],
-                        metadata={
-                            'team_id': str(team.id),
-                            'team_name': team.name,
-                            'user_id': str(left_member.id),
-                            'user_name': left_member.get_display_name(),
-                        }
-                    )
+            Notification.create_bulk(
+                [member.user for member in active_members if member.user != left_member],
+                title=f"{left_member.get_display_name()} left {team.name}",
+                message=f"{left_member.get_display_name()} has left the team.",
+                notification_type='team',
+                priority='low',
+                content_object=team,
+                action_url=f'/teams/{team.slug}/',
+                delivery_methods=['in_app'],
+                metadata={
+                    'team_id': str(team.id),
+                    'team_name': team.name,
+                    'user_id': str(left_member.id),
+                    'user_name': left_member.get_display_name(),
+                }
+            )
         else:
             # Notify only captain
             Notification.create_notification(
@@ -554,21 +545,19 @@ class TeamNotificationService:
             disbanded_by: User who disbanded the team
             members: List of TeamMember instances
         """
-        for member in members:
-            if member.user != disbanded_by:
-                Notification.create_notification(
-                    user=member.user,
-                    title=f"{team.name} has been disbanded",
-                    message=f"Team captain {disbanded_by.get_display_name()} has disbanded the team.",
-                    notification_type='team',
-                    priority='normal',
-                    content_object=team,
-                    action_url='/teams/',
-                    delivery_methods=['in_app', 'email'],
-                    metadata={
-                        'team_id': str(team.id),
-                        'team_name': team.name,
-                        'disbanded_by_id': str(disbanded_by.id),
-                        'disbanded_by_name': disbanded_by.get_display_name(),
-                    }
-                )
+        Notification.create_bulk(
+            [member.user for member in members if member.user != disbanded_by],
+            title=f"{team.name} has been disbanded",
+            message=f"Team captain {disbanded_by.get_display_name()} has disbanded the team.",
+            notification_type='team',
+            priority='normal',
+            content_object=team,
+            action_url='/teams/',
+            delivery_methods=['in_app', 'email'],
+            metadata={
+                'team_id': str(team.id),
+                'team_name': team.name,
+                'disbanded_by_id': str(disbanded_by.id),
+                'disbanded_by_name': disbanded_by.get_display_name(),
+            }
+        )
@@ -384,15 +384,38 @@ class MatchAdmin(admin.ModelAdmin):
     status_badge.short_description = 'Status'
     
     def mark_ready(self, request, queryset):
-        updated = queryset.filter(participant1__isnull=False, 
-                                  participant2__isnull=False).update(status='ready')
+        queryset = queryset.filter(participant1__isnull=False, 
+                                   participant2__isnull=False)
+        changed = self._matches_by_tournament(queryset)
+        updated = queryset.update(status='ready')
+        self._publish_bracket_changes(changed)
         self.message_user(request, f'{updated} matches marked as ready.')
     mark_ready.short_description = 'Mark selected matches as ready'
     
     def mark_completed(self, request, queryset):
+        changed = self._matches_by_tournament(queryset)
         updated = queryset.update(status='completed', completed_at=timezone.now())
+        self._publish_bracket_changes(changed)
         self.message_user(request, f'{updated} matches marked as completed.')
     mark_completed.short_description = 'Mark selected matches as completed'
+    
+    @staticmethod
+    def _matches_by_tournament(queryset):
+        changed = {}
+        for tournament_id, match_id in queryset.values_list('tournament_id', 'id'):
+            changed.setdefault(tournament_id, []).append(match_id)
+        return changed
+    
+    @staticmethod
+    def _publish_bracket_changes(changed):
+        """queryset.update() skips Match.save(), so publish the bracket changes here"""
+        from django.db import transaction
+        from tournaments.bracket_snapshot import record_bracket_changes
+        
+        for tournament_id, match_ids in changed.items():
+            transaction.on_commit(
+                lambda tournament_id=tournament_id, match_ids=match_ids: record_bracket_changes(tournament_id, match_ids)
+            )
 
 
 @admin.register(MatchDispute)
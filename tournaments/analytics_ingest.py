@@ -0,0 +1,537 @@
+"""
+Buffered ingestion for analytics beacons.
+
+Page view, engagement and performance metric beacons are turned into small
+JSON-safe events and pushed onto a buffer in O(1) instead of being written in
+the request thread. A background flusher drains the buffer in batches (when
+``ANALYTICS_BEACON_BATCH_SIZE`` events are pending or every
+``ANALYTICS_BEACON_MAX_AGE`` seconds) and writes each batch with a handful of
+``bulk_create``/``bulk_update`` queries.
+
+Backends, chosen with the ``ANALYTICS_BEACON_BUFFER`` setting:
+
+- ``'local'`` keeps events in an in-process deque (development server).
+- ``'redis'`` pushes events onto a shared Redis list, so any worker process
+  (or the periodic Celery task) can flush them.
+- ``'sync'`` writes every beacon through immediately (tests).
+
+When more than ``ANALYTICS_BEACON_MAX_PENDING`` events are waiting, new
+beacons are dropped rather than slowing requests down. Drops, and beacons that
+cannot be attributed to a page view at flush time, are counted per kind and
+reported by the flusher.
+
+Queuing a page view marks its session in the cache, so the engagement and
+metric endpoints can still answer 404 for a session that never sent a page
+view, even while its page view is waiting in the buffer.
+
+Performance timings are coerced to non-negative integers when queued. If a
+batch still fails to write, its events are written one by one and only the
+ones that fail are discarded; if the database is unreachable the batch is put
+back for the next flush.
+"""
+
+import atexit
+import json
+import logging
+import threading
+import uuid
+from collections import Counter, deque
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+
+from .analytics_models import PageView, UserEngagement, PerformanceMetric
+from .analytics_service import AnalyticsService
+from .models import Tournament
+
+logger = logging.getLogger(__name__)
+
+BEACON_KEY = 'analytics_beacons'
+DROPPED_KEY = 'analytics_beacons:dropped'
+SESSION_KEY = 'analytics_session:{session_key}'
+# How long a queued page view vouches for its session
+SESSION_TTL = 86400
+
+PERFORMANCE_FIELDS = (
+    'loadTime', 'domContentLoaded', 'firstPaint', 'firstContentfulPaint',
+    'largestContentfulPaint', 'screenWidth', 'screenHeight',
+    'viewportWidth', 'viewportHeight',
+)
+# Largest value a PositiveIntegerField holds on every backend
+MAX_TIMING = 2147483647
+
+ENGAGEMENT_UPDATE_FIELDS = [
+    'time_on_page', 'scroll_depth', 'clicks_count',
+    'registration_button_clicks', 'share_button_clicks', 'tab_switches',
+    'participant_card_clicks', 'bracket_preview_clicks',
+    'bounced', 'session_end',
+]
+
+
+def _clean_timing(value):
+    """A beacon timing or dimension as a PositiveIntegerField value, or None"""
+    try:
+        value = int(round(float(value)))
+    except (TypeError, ValueError, OverflowError):
+        return None
+    return value if 0 <= value <= MAX_TIMING else None
+
+
+class LocalBeaconBuffer:
+    """In-process FIFO buffer with a hard size limit"""
+
+    def __init__(self, max_pending):
+        self.max_pending = max_pending
+        self._events = deque()
+        self._dropped = Counter()
+        self._lock = threading.Lock()
+
+    def push(self, event):
+        """Queue an event; returns False if it was dropped"""
+        with self._lock:
+            if len(self._events) >= self.max_pending:
+                self._dropped[event['kind']] += 1
+                return False
+            self._events.append(event)
+            return True
+
+    def drain(self, limit):
+        with self._lock:
+            return [self._events.popleft() for _ in range(min(limit, len(self._events)))]
+
+    def pending(self):
+        return len(self._events)
+
+    def record_dropped(self, kind, count=1):
+        with self._lock:
+            self._dropped[kind] += count
+
+    def dropped_counts(self, reset=False):
+        with self._lock:
+            counts = dict(self._dropped)
+            if reset:
+                self._dropped.clear()
+        return counts
+
+
+class RedisBeaconBuffer:
+    """Buffer shared by all processes through a Redis list"""
+
+    def __init__(self, url, max_pending):
+        self.url = url
+        self.max_pending = max_pending
+        self._client = None
+
+    def push(self, event):
+        try:
+            client = self._get_client()
+            if client.rpush(BEACON_KEY, json.dumps(event)) > self.max_pending:
+                # Over the limit: give back the newest event instead of growing
+                client.rpop(BEACON_KEY)
+                client.hincrby(DROPPED_KEY, event['kind'], 1)
+                return False
+            return True
+        except Exception as e:
+            logger.warning(f"Dropping analytics beacon, buffer unavailable: {e}")
+            return False
+
+    def drain(self, limit):
+        pipe = self._get_client().pipeline(transaction=True)
+        pipe.lrange(BEACON_KEY, 0, limit - 1)
+        pipe.ltrim(BEACON_KEY, limit, -1)
+        raw_events, _ = pipe.execute()
+        return [json.loads(raw) for raw in raw_events]
+
+    def pending(self):
+        return self._get_client().llen(BEACON_KEY)
+
+    def record_dropped(self, kind, count=1):
+        self._get_client().hincrby(DROPPED_KEY, kind, count)
+
+    def dropped_counts(self, reset=False):
+        pipe = self._get_client().pipeline(transaction=True)
+        pipe.hgetall(DROPPED_KEY)
+        if reset:
+            pipe.delete(DROPPED_KEY)
+        counts = pipe.execute()[0]
+        return {
+            (kind.decode() if isinstance(kind, bytes) else kind): int(count)
+            for kind, count in counts.items()
+        }
+
+    def _get_client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+
+class BeaconFlusher:
+    """
+    Daemon thread that flushes the buffer when a batch is full or the oldest
+    pending event reaches the age limit.
+    """
+
+    def __init__(self, buffer, batch_size, max_age):
+        self.buffer = buffer
+        self.batch_size = batch_size
+        self.max_age = max_age
+        self._pushed = 0
+        self._wake = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def notify(self):
+        """Called after each push; wakes the thread early once a batch is full"""
+        self._ensure_running()
+        self._pushed += 1
+        if self._pushed >= self.batch_size:
+            self._wake.set()
+
+    def _ensure_running(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                if self._thread is None:
+                    atexit.register(self._flush_at_exit)
+                self._thread = threading.Thread(
+                    target=self._run, name='analytics-beacon-flusher', daemon=True
+                )
+                self._thread.start()
+
+    def _flush_at_exit(self):
+        try:
+            BeaconIngestService.flush(self.buffer)
+        except Exception as e:
+            logger.error(f"Error flushing analytics beacons at exit: {e}")
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.max_age)
+            self._wake.clear()
+            self._pushed = 0
+            try:
+                close_old_connections()
+                BeaconIngestService.flush(self.buffer)
+            except Exception as e:
+                logger.error(f"Error flushing analytics beacons: {e}")
+            finally:
+                close_old_connections()
+
+
+class BeaconIngestService:
+    """Accept analytics beacons without writing, and write them in batches"""
+
+    # ------------------------------------------------------------------
+    # Accepting beacons
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def enqueue_page_view(cls, request, url, performance_data=None):
+        """Queue a page view beacon; returns the id the page view will get"""
+        page_view_id = str(uuid.uuid4())
+        user = request.user if request.user.is_authenticated else None
+        if not request.session.session_key:
+            request.session.create()
+        performance_data = performance_data or {}
+
+        cls._enqueue({
+            'kind': 'page_view',
+            'id': page_view_id,
+            'ts': timezone.now().isoformat(),
+            'url': url,
+            'session_key': request.session.session_key,
+            'user_id': str(user.pk) if user else None,
+            'user_agent': request.META.get('HTTP_USER_AGENT', ''),
+            'ip_address': AnalyticsService._get_client_ip(request),
+            'referrer': request.META.get('HTTP_REFERER', ''),
+            'performance': {
+                key: _clean_timing(performance_data.get(key)) for key in PERFORMANCE_FIELDS
+            },
+        })
+        try:
+            cache.set(SESSION_KEY.format(session_key=request.session.session_key), True, SESSION_TTL)
+        except Exception as e:
+            logger.warning(f"Could not mark analytics session: {e}")
+        return page_view_id
+
+    @classmethod
+    def has_page_view(cls, session_key):
+        """Whether the session has a page view, stored or still queued"""
+        try:
+            if cache.get(SESSION_KEY.format(session_key=session_key)):
+                return True
+        except Exception as e:
+            logger.warning(f"Could not read analytics session mark: {e}")
+        return PageView.objects.filter(session_key=session_key).exists()
+
+    @classmethod
+    def enqueue_engagement(cls, session_key, engagement_data):
+        """Queue an engagement beacon for the session's latest page view"""
+        cls._enqueue({
+            'kind': 'engagement',
+            'ts': timezone.now().isoformat(),
+            'session_key': session_key,
+            'data': engagement_data,
+        })
+
+    @classmethod
+    def enqueue_metric(cls, session_key, metric_name, metric_value, metric_type='user_timing',
+                       metric_unit='ms', metadata=None):
+        """Queue a performance metric for the session's latest page view"""
+        metric_id = str(uuid.uuid4())
+        cls._enqueue({
+            'kind': 'metric',
+            'id': metric_id,
+            'ts': timezone.now().isoformat(),
+            'session_key': session_key,
+            'metric_name': metric_name,
+            'metric_value': metric_value,
+            'metric_type': metric_type,
+            'metric_unit': metric_unit,
+            'metadata': metadata or {},
+        })
+        return metric_id
+
+    @classmethod
+    def _enqueue(cls, event):
+        buffer, flusher = get_beacon_buffer()
+        accepted = buffer.push(event)
+        if flusher is None:
+            # Write-through mode
+            cls.flush(buffer)
+        elif accepted:
+            flusher.notify()
+        return accepted
+
+    # ------------------------------------------------------------------
+    # Flushing
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def flush(cls, buffer=None):
+        """Drain the buffer batch by batch; returns the number of events written"""
+        buffer = buffer or get_beacon_buffer()[0]
+        batch_size = getattr(settings, 'ANALYTICS_BEACON_BATCH_SIZE', 500)
+
+        written = 0
+        while True:
+            events = buffer.drain(batch_size)
+            if not events:
+                break
+            try:
+                orphaned = cls.write_batch(events)
+            except (OperationalError, InterfaceError) as e:
+                # Database unavailable: keep the events for the next flush
+                logger.error(f"Analytics beacon flush failed, requeueing {len(events)} events: {e}")
+                for event in events:
+                    buffer.push(event)
+                break
+            except Exception as e:
+                logger.error(f"Analytics beacon batch failed, writing events one by one: {e}")
+                orphaned = cls._write_each(events)
+            for kind, count in orphaned.items():
+                buffer.record_dropped(kind, count)
+            written += len(events) - sum(orphaned.values())
+            if len(events) < batch_size:
+                break
+
+        dropped = buffer.dropped_counts(reset=True)
+        if dropped:
+            logger.warning(f"Dropped analytics beacons: {dropped}")
+        return written
+
+    @classmethod
+    def stats(cls):
+        """Pending events and drop counts since the last flush report"""
+        buffer, _ = get_beacon_buffer()
+        return {
+            'backend': getattr(settings, 'ANALYTICS_BEACON_BUFFER', 'local'),
+            'pending': buffer.pending(),
+            'dropped': buffer.dropped_counts(),
+        }
+
+    @classmethod
+    def write_batch(cls, events):
+        """
+        Write one batch of events. Returns per-kind counts of events that were
+        discarded because no page view could be found for their session.
+        """
+        page_views = [event for event in events if event['kind'] == 'page_view']
+        engagements = [event for event in events if event['kind'] == 'engagement']
+        metrics = [event for event in events if event['kind'] == 'metric']
+        orphaned = Counter()
+
+        with transaction.atomic():
+            if page_views:
+                cls._write_page_views(page_views)
+
+            sessions = {event['session_key'] for event in engagements + metrics if event['session_key']}
+            latest = cls._latest_page_views(sessions) if sessions else {}
+
+            if engagements:
+                orphaned['engagement'] += cls._write_engagements(engagements, latest)
+            if metrics:
+                orphaned['metric'] += cls._write_metrics(metrics, latest)
+
+        return +orphaned
+
+    @classmethod
+    def _write_each(cls, events):
+        """Write events singly so one bad event does not lose the batch"""
+        discarded = Counter()
+        for event in events:
+            try:
+                discarded.update(cls.write_batch([event]))
+            except Exception as e:
+                logger.warning(f"Discarding analytics beacon ({event['kind']}): {e}")
+                discarded[event['kind']] += 1
+        return discarded
+
+    @staticmethod
+    def _write_page_views(events):
+        slugs = {
+            AnalyticsService._tournament_slug_for_url(event['url'])
+            for event in events
+        }
+        tournament_ids = dict(
+            Tournament.objects.filter(slug__in=slugs - {None}).values_list('slug', 'id')
+        )
+
+        rows = []
+        for event in events:
+            perf = event['performance']
+            rows.append(PageView(
+                id=event['id'],
+                url=event['url'],
+                page_type='tournament_detail',
+                tournament_id=tournament_ids.get(AnalyticsService._tournament_slug_for_url(event['url'])),
+                user_id=event['user_id'],
+                session_key=event['session_key'] or '',
+                user_agent=event['user_agent'],
+                ip_address=event['ip_address'],
+                referrer=event['referrer'],
+                is_mobile=AnalyticsService._is_mobile_device(event['user_agent']),
+                device_class=AnalyticsService._device_class(event['user_agent']),
+                load_time=perf['loadTime'],
+                dom_content_loaded=perf['domContentLoaded'],
+                first_paint=perf['firstPaint'],
+                first_contentful_paint=perf['firstContentfulPaint'],
+                largest_contentful_paint=perf['largestContentfulPaint'],
+                screen_width=perf['screenWidth'],
+                screen_height=perf['screenHeight'],
+                viewport_width=perf['viewportWidth'],
+                viewport_height=perf['viewportHeight'],
+            ))
+        PageView.objects.bulk_create(rows)
+        UserEngagement.objects.bulk_create([UserEngagement(page_view_id=row.id) for row in rows])
+
+        # created_at is auto_now_add; restore the time the beacon arrived
+        PageView.objects.filter(id__in=[row.id for row in rows]).update(created_at=Case(
+            *[When(id=event['id'], then=Value(datetime.fromisoformat(event['ts']))) for event in events],
+            output_field=DateTimeField()
+        ))
+
+    @staticmethod
+    def _latest_page_views(session_keys):
+        """Most recent page view per session, like update_engagement's lookup"""
+        latest = {}
+        for page_view in PageView.objects.filter(session_key__in=session_keys).only(
+            'id', 'url', 'is_mobile', 'session_key', 'created_at'
+        ).order_by('session_key', 'created_at'):
+            latest[page_view.session_key] = page_view
+        return latest
+
+    @staticmethod
+    def _write_engagements(events, latest):
+        page_view_ids = {
+            latest[event['session_key']].id for event in events if event['session_key'] in latest
+        }
+        engagements = {
+            engagement.page_view_id: engagement
+            for engagement in UserEngagement.objects.filter(page_view_id__in=page_view_ids)
+        }
+
+        orphaned = 0
+        touched = {}
+        # Beacons are applied in arrival order, so the latest values win
+        for event in events:
+            page_view = latest.get(event['session_key'])
+            engagement = engagements.get(page_view.id) if page_view else None
+            if engagement is None:
+                orphaned += 1
+                continue
+            AnalyticsService.apply_engagement_data(engagement, event['data'])
+            touched[engagement.pk] = engagement
+
+        if touched:
+            UserEngagement.objects.bulk_update(list(touched.values()), ENGAGEMENT_UPDATE_FIELDS)
+        return orphaned
+
+    @staticmethod
+    def _write_metrics(events, latest):
+        rows = []
+        for event in events:
+            page_view = latest.get(event['session_key'])
+            if page_view is None:
+                continue
+            rows.append(PerformanceMetric(
+                id=event['id'],
+                metric_type=event['metric_type'],
+                metric_name=event['metric_name'],
+                metric_value=event['metric_value'],
+                metric_unit=event['metric_unit'],
+                page_view_id=page_view.id,
+                url=page_view.url,
+                is_mobile=page_view.is_mobile,
+                metadata=event['metadata'],
+            ))
+        PerformanceMetric.objects.bulk_create(rows)
+        return len(events) - len(rows)
+
+
+_buffer = None
+_flusher = None
+_buffer_lock = threading.Lock()
+
+
+def get_beacon_buffer():
+    """
+    Return the process-wide ``(buffer, flusher)`` configured by
+    ANALYTICS_BEACON_BUFFER; the flusher is None in write-through mode.
+    """
+    global _buffer, _flusher
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                backend = getattr(settings, 'ANALYTICS_BEACON_BUFFER', 'local')
+                max_pending = getattr(settings, 'ANALYTICS_BEACON_MAX_PENDING', 50000)
+                if backend == 'redis':
+                    buffer = RedisBeaconBuffer(
+                        getattr(settings, 'ANALYTICS_BEACON_REDIS_URL', 'redis://localhost:6379/0'),
+                        max_pending
+                    )
+                else:
+                    buffer = LocalBeaconBuffer(max_pending)
+
+                if backend != 'sync':
+                    _flusher = BeaconFlusher(
+                        buffer,
+                        getattr(settings, 'ANALYTICS_BEACON_BATCH_SIZE', 500),
+                        getattr(settings, 'ANALYTICS_BEACON_MAX_AGE', 5),
+                    )
+                _buffer = buffer
+    return _buffer, _flusher
+
+
+def reset_beacon_buffer():
+    """Drop the process-wide buffer (used by tests)"""
+    global _buffer, _flusher
+    with _buffer_lock:
+        _buffer = None
+        _flusher = None
@@ -15,11 +15,21 @@ import json
 class PageView(models.Model):
     """Track page views and performance metrics"""
     
+    DEVICE_CLASSES = [
+        ('desktop', 'Desktop'),
+        ('mobile', 'Mobile'),
+        ('tablet', 'Tablet'),
+    ]
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     
     # Page information
     url = models.URLField(max_length=500)
     page_type = models.CharField(max_length=50, default='tournament_detail')
+    tournament = models.ForeignKey(
+        'tournaments.Tournament', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='page_views', help_text="Tournament resolved from the URL when tracked"
+    )
     
     # User information (optional for anonymous users)
     user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True)
@@ -43,6 +53,7 @@ class PageView(models.Model):
     viewport_width = models.PositiveIntegerField(null=True, blank=True)
     viewport_height = models.PositiveIntegerField(null=True, blank=True)
     is_mobile = models.BooleanField(default=False)
+    device_class = models.CharField(max_length=10, choices=DEVICE_CLASSES, default='desktop')
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -55,6 +66,7 @@ class PageView(models.Model):
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['session_key', '-created_at']),
             models.Index(fields=['is_mobile', '-created_at']),
+            models.Index(fields=['created_at'], name='analytics_pv_created_idx'),
         ]
     
     def __str__(self):
@@ -342,4 +354,84 @@ class AnalyticsSummary(models.Model):
         ]
     
     def __str__(self):
-        return f"{self.period_type} summary for {self.period_start.date()}"
\ No newline at end of file
+        return f"{self.period_type} summary for {self.period_start.date()}"
+
+
+class AnalyticsRollup(models.Model):
+    """
+    Hourly/daily tournament page analytics per tournament and device class.
+    Averages are stored as totals plus sample counts so buckets can be summed
+    over any range; the dashboard reads only these rows.
+    """
+    
+    PERIOD_TYPES = [
+        ('hourly', 'Hourly'),
+        ('daily', 'Daily'),
+    ]
+    
+    DEVICE_CLASSES = PageView.DEVICE_CLASSES + [
+        ('unknown', 'Unknown'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    
+    # Bucket key (tournament is null for pages not tied to a tournament)
+    period_type = models.CharField(max_length=10, choices=PERIOD_TYPES)
+    period_start = models.DateTimeField()
+    tournament = models.ForeignKey(
+        'tournaments.Tournament', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='analytics_rollups'
+    )
+    device_class = models.CharField(max_length=10, choices=DEVICE_CLASSES)
+    
+    # Page metrics
+    page_views = models.PositiveIntegerField(default=0)
+    unique_visitors = models.PositiveIntegerField(default=0, help_text="Distinct sessions within the bucket")
+    load_time_total = models.BigIntegerField(default=0)
+    load_time_samples = models.PositiveIntegerField(default=0)
+    first_paint_total = models.BigIntegerField(default=0)
+    first_paint_samples = models.PositiveIntegerField(default=0)
+    largest_contentful_paint_total = models.BigIntegerField(default=0)
+    largest_contentful_paint_samples = models.PositiveIntegerField(default=0)
+    
+    # Engagement metrics
+    engagement_samples = models.PositiveIntegerField(default=0)
+    time_on_page_total = models.BigIntegerField(default=0)
+    time_on_page_samples = models.PositiveIntegerField(default=0)
+    scroll_depth_total = models.BigIntegerField(default=0)
+    total_clicks = models.BigIntegerField(default=0)
+    bounces = models.PositiveIntegerField(default=0)
+    
+    # Conversion and error metrics
+    conversions = models.PositiveIntegerField(default=0)
+    errors = models.PositiveIntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'analytics_rollups'
+        ordering = ['-period_start']
+        indexes = [
+            models.Index(fields=['period_type', 'period_start'], name='analytics_rollup_period_idx'),
+            models.Index(fields=['tournament', 'period_type', 'period_start'], name='analytics_rollup_tourn_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.period_type} rollup for {self.period_start} ({self.device_class})"
+
+
+class AnalyticsRollupState(models.Model):
+    """
+    Progress of the rollup pipeline. Hourly buckets before ``watermark`` have
+    been rolled up by the scheduled job, and days before it have daily rows.
+    """
+    
+    name = models.CharField(max_length=50, primary_key=True)
+    watermark = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'analytics_rollup_state'
+    
+    def __str__(self):
+        return f"{self.name} rolled up to {self.watermark}"
@@ -0,0 +1,362 @@
+"""
+Rollup pipeline for tournament page analytics.
+
+Raw PageView/UserEngagement/ConversionEvent/ErrorLog rows are folded into
+hourly AnalyticsRollup rows keyed by tournament and device class, and hourly
+rows are folded into daily ones. Only the scheduled job writes rollups.
+Dashboards read the rollups for hours the job has closed and aggregate the
+still-open tail (hours at or after the watermark) from raw rows without
+writing anything. Raw page views older than the retention window are pruned
+in batches once they have been rolled up.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
+from uuid import UUID
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from .analytics_models import (
+    PageView, ConversionEvent, ErrorLog, AnalyticsRollup, AnalyticsRollupState
+)
+from .models import Tournament
+
+logger = logging.getLogger(__name__)
+
+# Additive AnalyticsRollup columns
+METRIC_FIELDS = [
+    'page_views', 'unique_visitors',
+    'load_time_total', 'load_time_samples',
+    'first_paint_total', 'first_paint_samples',
+    'largest_contentful_paint_total', 'largest_contentful_paint_samples',
+    'engagement_samples', 'time_on_page_total', 'time_on_page_samples',
+    'scroll_depth_total', 'total_clicks', 'bounces',
+    'conversions', 'errors',
+]
+
+PAGE_VIEW_METRICS = {
+    'page_views': Count('id'),
+    'unique_visitors': Count('session_key', distinct=True),
+    'load_time_total': Sum('load_time'),
+    'load_time_samples': Count('load_time'),
+    'first_paint_total': Sum('first_paint'),
+    'first_paint_samples': Count('first_paint'),
+    'largest_contentful_paint_total': Sum('largest_contentful_paint'),
+    'largest_contentful_paint_samples': Count('largest_contentful_paint'),
+    # One engagement row per page view, so these joins do not fan out
+    'engagement_samples': Count('engagement'),
+    'time_on_page_total': Sum('engagement__time_on_page'),
+    'time_on_page_samples': Count('engagement__time_on_page'),
+    'scroll_depth_total': Sum('engagement__scroll_depth'),
+    'total_clicks': Sum('engagement__clicks_count'),
+    'bounces': Count('engagement', filter=Q(engagement__bounced=True)),
+}
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+
+def floor_hour(value):
+    return value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def floor_day(value):
+    return floor_hour(value).replace(hour=0)
+
+
+def ceil_hour(value):
+    floored = floor_hour(value)
+    return floored if floored == value else floored + HOUR
+
+
+class AnalyticsRollupService:
+    """Build, read and prune tournament analytics rollups"""
+
+    STATE_NAME = 'tournament_analytics'
+    BATCH_SIZE = 1000
+
+    @classmethod
+    def retention_days(cls):
+        return getattr(settings, 'ANALYTICS_RAW_RETENTION_DAYS', 30)
+
+    @classmethod
+    def lookback_hours(cls):
+        return getattr(settings, 'ANALYTICS_ROLLUP_LOOKBACK_HOURS', 3)
+
+    @classmethod
+    def get_watermark(cls):
+        return AnalyticsRollupState.objects.filter(
+            name=cls.STATE_NAME
+        ).values_list('watermark', flat=True).first()
+
+    # ------------------------------------------------------------------
+    # Building rollups
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def rollup_pending(cls, now=None):
+        """
+        Scheduled job: roll up every closed hour since the watermark (minus a
+        lookback for late engagement updates), fold completed days into daily
+        rows and advance the watermark. Returns the new watermark.
+        """
+        now = now or timezone.now()
+        target = floor_hour(now)
+
+        with transaction.atomic():
+            state = cls._lock_state()
+            if state.watermark is not None:
+                start = state.watermark - timedelta(hours=cls.lookback_hours())
+            else:
+                first = cls._first_raw_timestamp()
+                start = floor_day(first) if first else target
+            start = min(floor_hour(start), target)
+
+            cls._rebuild_hourly(start, target)
+            cls._rebuild_daily(floor_day(start), floor_day(target))
+
+            state.watermark = target
+            state.save(update_fields=['watermark', 'updated_at'])
+
+        logger.info(f"Analytics rolled up from {start} to {target}")
+        return target
+
+    @staticmethod
+    def _first_raw_timestamp():
+        timestamps = [
+            model.objects.order_by('created_at').values_list('created_at', flat=True).first()
+            for model in (PageView, ConversionEvent, ErrorLog)
+        ]
+        timestamps = [value for value in timestamps if value is not None]
+        return min(timestamps) if timestamps else None
+
+    @classmethod
+    def _lock_state(cls):
+        """Serialize rollup writers on the pipeline state row"""
+        AnalyticsRollupState.objects.get_or_create(name=cls.STATE_NAME)
+        return AnalyticsRollupState.objects.select_for_update().get(name=cls.STATE_NAME)
+
+    @classmethod
+    def _rebuild_hourly(cls, start, end):
+        """Replace hourly rollups for [start, end) with fresh aggregates of raw rows"""
+        cls._replace('hourly', start, end, cls._aggregate_hourly(start, end))
+
+    @classmethod
+    def _aggregate_hourly(cls, start, end, tournament_id=None):
+        """
+        Hourly metrics of raw rows in [start, end), keyed like rollup rows;
+        only ``tournament_id``'s rows when given
+        """
+        buckets = defaultdict(lambda: dict.fromkeys(METRIC_FIELDS, 0))
+        trunc = TruncHour('created_at', tzinfo=dt_timezone.utc)
+        tournament_ct = ContentType.objects.get_for_model(Tournament)
+
+        page_views = PageView.objects.filter(
+            created_at__gte=start,
+            created_at__lt=end,
+            page_type='tournament_detail'
+        )
+        conversions = ConversionEvent.objects.filter(
+            created_at__gte=start,
+            created_at__lt=end,
+            event_type='registration_completed'
+        )
+        errors = ErrorLog.objects.filter(
+            created_at__gte=start,
+            created_at__lt=end
+        )
+        if tournament_id is not None:
+            tournament_id = UUID(str(tournament_id))
+            page_views = page_views.filter(tournament_id=tournament_id)
+            conversions = conversions.filter(
+                content_type=tournament_ct,
+                object_id__in=[str(tournament_id), tournament_id.hex]
+            )
+            errors = errors.filter(page_view__tournament_id=tournament_id)
+
+        page_views = page_views.annotate(bucket=trunc).values(
+            'bucket', 'tournament_id', 'device_class'
+        ).annotate(**PAGE_VIEW_METRICS)
+        for row in page_views:
+            bucket = buckets[(row['bucket'], row['tournament_id'], row['device_class'])]
+            for field in PAGE_VIEW_METRICS:
+                bucket[field] = row[field] or 0
+
+        conversions = conversions.annotate(bucket=trunc).values(
+            'bucket', 'content_type_id', 'object_id', 'page_view__device_class'
+        ).annotate(count=Count('id'))
+        conversion_rows = list(conversions)
+        tournament_ids = cls._existing_tournament_ids(
+            row['object_id'] for row in conversion_rows if row['content_type_id'] == tournament_ct.id
+        )
+        for row in conversion_rows:
+            row_tournament_id = None
+            if row['content_type_id'] == tournament_ct.id:
+                row_tournament_id = tournament_ids.get(row['object_id'])
+            device_class = row['page_view__device_class'] or 'unknown'
+            buckets[(row['bucket'], row_tournament_id, device_class)]['conversions'] += row['count']
+
+        errors = errors.annotate(bucket=trunc).values(
+            'bucket', 'page_view__tournament_id', 'page_view__device_class'
+        ).annotate(count=Count('id'))
+        for row in errors:
+            device_class = row['page_view__device_class'] or 'unknown'
+            buckets[(row['bucket'], row['page_view__tournament_id'], device_class)]['errors'] += row['count']
+
+        return buckets
+
+    @classmethod
+    def _rebuild_daily(cls, start, end):
+        """Replace daily rollups for [start, end) by folding hourly rows"""
+        if start >= end:
+            return
+
+        hourly = AnalyticsRollup.objects.filter(
+            period_type='hourly',
+            period_start__gte=start,
+            period_start__lt=end
+        ).annotate(
+            bucket=TruncDay('period_start', tzinfo=dt_timezone.utc)
+        ).values('bucket', 'tournament_id', 'device_class').annotate(
+            **{field: Sum(field) for field in METRIC_FIELDS}
+        )
+
+        buckets = {
+            (row['bucket'], row['tournament_id'], row['device_class']): {
+                field: row[field] or 0 for field in METRIC_FIELDS
+            }
+            for row in hourly
+        }
+        cls._replace('daily', start, end, buckets)
+
+    @classmethod
+    def _replace(cls, period_type, start, end, buckets):
+        AnalyticsRollup.objects.filter(
+            period_type=period_type,
+            period_start__gte=start,
+            period_start__lt=end
+        ).delete()
+        AnalyticsRollup.objects.bulk_create([
+            AnalyticsRollup(
+                period_type=period_type,
+                period_start=period_start,
+                tournament_id=tournament_id,
+                device_class=device_class,
+                **metrics
+            )
+            for (period_start, tournament_id, device_class), metrics in buckets.items()
+        ], batch_size=cls.BATCH_SIZE)
+
+    @staticmethod
+    def _existing_tournament_ids(object_ids):
+        """Map ConversionEvent object ids to ids of tournaments that still exist"""
+        candidates = {}
+        for object_id in set(object_ids):
+            try:
+                candidates[object_id] = UUID(object_id)
+            except (TypeError, ValueError):
+                continue
+        existing = set(Tournament.objects.filter(id__in=candidates.values()).values_list('id', flat=True))
+        return {
+            object_id: tournament_id
+            for object_id, tournament_id in candidates.items()
+            if tournament_id in existing
+        }
+
+    # ------------------------------------------------------------------
+    # Reading rollups
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def read_range(cls, start, end, tournament_id=None):
+        """
+        Metrics covering [floor_hour(start), end) without writing anything.
+
+        Returns ``(rollups, open_buckets)``: a queryset of rollup rows for the
+        hours the scheduled job has closed (daily rows for whole days, hourly
+        rows otherwise), and hourly buckets aggregated from raw rows for the
+        hours at or after the watermark, as ``{(hour, tournament_id,
+        device_class): metrics}``. Before the first run every hour is open.
+        """
+        range_start = floor_hour(start)
+        range_end = ceil_hour(end)
+        watermark = cls.get_watermark()
+        closed_end = min(range_end, watermark) if watermark else range_start
+
+        return (
+            cls._closed_rollups(range_start, closed_end, tournament_id),
+            cls._open_buckets(max(range_start, closed_end), range_end, tournament_id),
+        )
+
+    @classmethod
+    def _closed_rollups(cls, range_start, range_end, tournament_id):
+        days_start = floor_day(range_start)
+        if days_start < range_start:
+            days_start += DAY
+        days_end = floor_day(range_end)
+
+        if days_start < days_end:
+            selection = (
+                Q(period_type='daily', period_start__gte=days_start, period_start__lt=days_end) |
+                Q(period_type='hourly', period_start__gte=range_start, period_start__lt=days_start) |
+                Q(period_type='hourly', period_start__gte=days_end, period_start__lt=range_end)
+            )
+        else:
+            selection = Q(period_type='hourly', period_start__gte=range_start, period_start__lt=range_end)
+
+        rollups = AnalyticsRollup.objects.filter(selection)
+        if tournament_id is not None:
+            rollups = rollups.filter(tournament_id=tournament_id)
+        return rollups
+
+    @classmethod
+    def _open_buckets(cls, start, end, tournament_id):
+        if start >= end:
+            return {}
+        return dict(cls._aggregate_hourly(start, end, tournament_id))
+
+    # ------------------------------------------------------------------
+    # Retention
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def prune_raw_data(cls, now=None, batch_size=None):
+        """
+        Delete raw page views (with their engagement and performance rows)
+        older than the retention window, in batches. Rows the scheduled job
+        may still re-read are never pruned. Returns the number of page views
+        deleted.
+        """
+        now = now or timezone.now()
+        batch_size = batch_size or cls.BATCH_SIZE
+
+        watermark = cls.get_watermark()
+        if watermark is None:
+            logger.warning("Skipping analytics pruning: nothing has been rolled up yet")
+            return 0
+
+        cutoff = min(
+            now - timedelta(days=cls.retention_days()),
+            watermark - timedelta(hours=cls.lookback_hours())
+        )
+
+        deleted = 0
+        while True:
+            batch = list(
+                PageView.objects.filter(created_at__lt=cutoff).values_list('id', flat=True)[:batch_size]
+            )
+            if not batch:
+                break
+            with transaction.atomic():
+                PageView.objects.filter(id__in=batch).delete()
+            deleted += len(batch)
+
+        if deleted:
+            logger.info(f"Pruned {deleted} raw page views older than {cutoff}")
+        return deleted
@@ -7,20 +7,31 @@ from django.db import models, transaction
 from django.utils import timezone
 from django.contrib.contenttypes.models import ContentType
 from django.db.models import Avg, Count, Sum, F, Q
+from django.db.models.functions import TruncDate
 from django.core.cache import cache
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone as dt_timezone
 import json
 import logging
+import re
 from typing import Dict, List, Optional, Any
+from urllib.parse import urlparse
 
 from .analytics_models import (
     PageView, UserEngagement, ConversionEvent, 
-    ErrorLog, PerformanceMetric, AnalyticsSummary
+    ErrorLog, PerformanceMetric, AnalyticsSummary, AnalyticsRollup
 )
+from .analytics_rollups import AnalyticsRollupService, METRIC_FIELDS as ROLLUP_METRIC_FIELDS
 from .models import Tournament, Participant
 
 logger = logging.getLogger(__name__)
 
+TOURNAMENT_URL_RE = re.compile(r'^/tournaments/(?P<slug>[-\w]+)/')
+
+ENGAGEMENT_INTERACTION_FIELDS = [
+    'registrationButtonClicks', 'shareButtonClicks', 'tabSwitches',
+    'participantCardClicks', 'bracketPreviewClicks'
+]
+
 
 class AnalyticsService:
     """Service for handling analytics data collection and processing"""
@@ -55,6 +66,8 @@ class AnalyticsService:
             page_view_data = {
                 'url': url,
                 'page_type': 'tournament_detail',
+                'tournament_id': AnalyticsService._tournament_id_for_url(url),
+                'device_class': AnalyticsService._device_class(user_agent),
                 'user': user,
                 'session_key': session_key,
                 'user_agent': user_agent,
@@ -112,35 +125,7 @@ class AnalyticsService:
                 return None
             
             engagement = page_view.engagement
-            
-            # Update engagement metrics
-            if 'timeOnPage' in engagement_data:
-                engagement.time_on_page = engagement_data['timeOnPage']
-            
-            if 'scrollDepth' in engagement_data:
-                engagement.scroll_depth = max(engagement.scroll_depth, engagement_data['scrollDepth'])
-            
-            if 'clicksCount' in engagement_data:
-                engagement.clicks_count = engagement_data['clicksCount']
-            
-            # Update specific interaction counts
-            interaction_fields = [
-                'registrationButtonClicks', 'shareButtonClicks', 'tabSwitches',
-                'participantCardClicks', 'bracketPreviewClicks'
-            ]
-            
-            for field in interaction_fields:
-                if field in engagement_data:
-                    snake_case_field = AnalyticsService._camel_to_snake(field)
-                    setattr(engagement, snake_case_field, engagement_data[field])
-            
-            # Update session end time
-            engagement.session_end = timezone.now()
-            
-            # Calculate if user bounced (less than 30 seconds and minimal interaction)
-            if engagement.time_on_page and engagement.time_on_page < 30 and engagement.clicks_count < 2:
-                engagement.bounced = True
-            
+            AnalyticsService.apply_engagement_data(engagement, engagement_data)
             engagement.save()
             
             logger.info(f"Engagement updated for session {session_key}")
@@ -150,6 +135,43 @@ class AnalyticsService:
             logger.error(f"Error updating engagement: {e}")
             return None
     
+    @staticmethod
+    def apply_engagement_data(engagement: UserEngagement, engagement_data: Dict) -> UserEngagement:
+        """
+        Apply an engagement beacon to an engagement record without saving it
+        
+        Args:
+            engagement: UserEngagement instance to update
+            engagement_data: Dictionary containing engagement metrics
+            
+        Returns:
+            The updated UserEngagement instance
+        """
+        # Update engagement metrics
+        if 'timeOnPage' in engagement_data:
+            engagement.time_on_page = engagement_data['timeOnPage']
+        
+        if 'scrollDepth' in engagement_data:
+            engagement.scroll_depth = max(engagement.scroll_depth, engagement_data['scrollDepth'])
+        
+        if 'clicksCount' in engagement_data:
+            engagement.clicks_count = engagement_data['clicksCount']
+        
+        # Update specific interaction counts
+        for field in ENGAGEMENT_INTERACTION_FIELDS:
+            if field in engagement_data:
+                snake_case_field = AnalyticsService._camel_to_snake(field)
+                setattr(engagement, snake_case_field, engagement_data[field])
+        
+        # Update session end time
+        engagement.session_end = timezone.now()
+        
+        # Calculate if user bounced (less than 30 seconds and minimal interaction)
+        if engagement.time_on_page and engagement.time_on_page < 30 and engagement.clicks_count < 2:
+            engagement.bounced = True
+        
+        return engagement
+    
     @staticmethod
     def track_conversion(event_type: str, content_object: Any, user=None, 
                         session_key: str = None, metadata: Dict = None) -> ConversionEvent:
@@ -291,7 +313,7 @@ class AnalyticsService:
     @staticmethod
     def get_dashboard_data(tournament_slug: str = None, days: int = 7) -> Dict:
         """
-        Get analytics dashboard data
+        Get analytics dashboard data from the hourly/daily rollups
         
         Args:
             tournament_slug: Optional tournament slug to filter by
@@ -304,113 +326,103 @@ class AnalyticsService:
             end_date = timezone.now()
             start_date = end_date - timedelta(days=days)
             
-            # Base queryset
-            page_views_qs = PageView.objects.filter(
-                created_at__gte=start_date,
-                page_type='tournament_detail'
-            )
-            
-            # Filter by tournament if specified
+            tournament_id = None
             if tournament_slug:
-                page_views_qs = page_views_qs.filter(url__contains=tournament_slug)
-            
-            # Basic metrics
-            total_views = page_views_qs.count()
-            unique_visitors = page_views_qs.values('session_key').distinct().count()
+                tournament_id = Tournament.objects.filter(
+                    slug=tournament_slug
+                ).values_list('id', flat=True).first()
             
-            # Performance metrics
-            performance_metrics = page_views_qs.aggregate(
-                avg_load_time=Avg('load_time'),
-                avg_first_paint=Avg('first_paint'),
-                avg_largest_contentful_paint=Avg('largest_contentful_paint')
-            )
+            if tournament_slug and tournament_id is None:
+                rollups, open_buckets = AnalyticsRollup.objects.none(), {}
+            else:
+                # Closed hours from rollups; the open tail is aggregated read-only
+                rollups, open_buckets = AnalyticsRollupService.read_range(
+                    start_date, end_date, tournament_id=tournament_id
+                )
+            
+            totals = {
+                field: value or 0
+                for field, value in rollups.aggregate(
+                    **{field: Sum(field) for field in ROLLUP_METRIC_FIELDS}
+                ).items()
+            }
             
-            # Engagement metrics
-            engagement_metrics = UserEngagement.objects.filter(
-                page_view__in=page_views_qs
-            ).aggregate(
-                avg_time_on_page=Avg('time_on_page'),
-                avg_scroll_depth=Avg('scroll_depth'),
-                total_clicks=Sum('clicks_count'),
-                bounce_rate=Avg(models.Case(
-                    models.When(bounced=True, then=1),
-                    default=0,
-                    output_field=models.FloatField()
-                )) * 100
-            )
+            # Device breakdown
+            devices = {
+                row['device_class']: row['views'] or 0
+                for row in rollups.values('device_class').annotate(views=Sum('page_views'))
+            }
             
-            # Conversion metrics
-            conversions = ConversionEvent.objects.filter(
-                created_at__gte=start_date,
-                event_type='registration_completed'
-            )
+            # Daily breakdown
+            daily_totals = {
+                row['day']: {'views': row['views'] or 0, 'conversions': row['conversions'] or 0}
+                for row in rollups.annotate(
+                    day=TruncDate('period_start', tzinfo=dt_timezone.utc)
+                ).values('day').annotate(
+                    views=Sum('page_views'),
+                    conversions=Sum('conversions')
+                )
+            }
             
-            if tournament_slug:
-                tournament_ct = ContentType.objects.get_for_model(Tournament)
-                tournament = Tournament.objects.filter(slug=tournament_slug).first()
-                if tournament:
-                    conversions = conversions.filter(
-                        content_type=tournament_ct,
-                        object_id=str(tournament.pk)
-                    )
+            for (hour, _, device_class), metrics in open_buckets.items():
+                for field in ROLLUP_METRIC_FIELDS:
+                    totals[field] += metrics[field]
+                devices[device_class] = devices.get(device_class, 0) + metrics['page_views']
+                day_row = daily_totals.setdefault(
+                    hour.astimezone(dt_timezone.utc).date(), {'views': 0, 'conversions': 0}
+                )
+                day_row['views'] += metrics['page_views']
+                day_row['conversions'] += metrics['conversions']
             
-            total_conversions = conversions.count()
-            conversion_rate = (total_conversions / total_views * 100) if total_views > 0 else 0
+            def average(total_field, samples_field):
+                samples = totals[samples_field]
+                return totals[total_field] / samples if samples else 0
             
-            # Error metrics
-            error_count = ErrorLog.objects.filter(
-                created_at__gte=start_date
-            ).count()
-            error_rate = (error_count / total_views * 100) if total_views > 0 else 0
+            def percentage(count, total):
+                return (count / total * 100) if total > 0 else 0
             
-            # Device breakdown
-            mobile_views = page_views_qs.filter(is_mobile=True).count()
-            mobile_percentage = (mobile_views / total_views * 100) if total_views > 0 else 0
+            total_views = totals['page_views']
+            total_conversions = totals['conversions']
+            error_count = totals['errors']
             
-            # Daily breakdown
             daily_data = []
-            for i in range(days):
-                day_start = start_date + timedelta(days=i)
-                day_end = day_start + timedelta(days=1)
-                
-                day_views = page_views_qs.filter(
-                    created_at__gte=day_start,
-                    created_at__lt=day_end
-                ).count()
-                
-                day_conversions = conversions.filter(
-                    created_at__gte=day_start,
-                    created_at__lt=day_end
-                ).count()
-                
+            day = start_date.astimezone(dt_timezone.utc).date()
+            while day <= end_date.astimezone(dt_timezone.utc).date():
+                row = daily_totals.get(day, {})
+                day_views = row.get('views') or 0
+                day_conversions = row.get('conversions') or 0
                 daily_data.append({
-                    'date': day_start.date().isoformat(),
+                    'date': day.isoformat(),
                     'views': day_views,
                     'conversions': day_conversions,
-                    'conversion_rate': (day_conversions / day_views * 100) if day_views > 0 else 0
+                    'conversion_rate': percentage(day_conversions, day_views)
                 })
+                day += timedelta(days=1)
             
             return {
                 'overview': {
                     'total_views': total_views,
-                    'unique_visitors': unique_visitors,
+                    'unique_visitors': totals['unique_visitors'],
                     'total_conversions': total_conversions,
-                    'conversion_rate': round(conversion_rate, 2),
+                    'conversion_rate': round(percentage(total_conversions, total_views), 2),
                     'error_count': error_count,
-                    'error_rate': round(error_rate, 2),
-                    'mobile_percentage': round(mobile_percentage, 2)
+                    'error_rate': round(percentage(error_count, total_views), 2),
+                    'mobile_percentage': round(percentage(devices.get('mobile', 0), total_views), 2)
                 },
                 'performance': {
-                    'avg_load_time': round(performance_metrics['avg_load_time'] or 0, 2),
-                    'avg_first_paint': round(performance_metrics['avg_first_paint'] or 0, 2),
-                    'avg_largest_contentful_paint': round(performance_metrics['avg_largest_contentful_paint'] or 0, 2)
+                    'avg_load_time': round(average('load_time_total', 'load_time_samples'), 2),
+                    'avg_first_paint': round(average('first_paint_total', 'first_paint_samples'), 2),
+                    'avg_largest_contentful_paint': round(
+                        average('largest_contentful_paint_total', 'largest_contentful_paint_samples'), 2
+                    )
                 },
                 'engagement': {
-                    'avg_time_on_page': round(engagement_metrics['avg_time_on_page'] or 0, 2),
-                    'avg_scroll_depth': round(engagement_metrics['avg_scroll_depth'] or 0, 2),
-                    'total_clicks': engagement_metrics['total_clicks'] or 0,
-                    'bounce_rate': round(engagement_metrics['bounce_rate'] or 0, 2)
+                    'avg_time_on_page': round(average('time_on_page_total', 'time_on_page_samples'), 2),
+                    'avg_scroll_depth': round(average('scroll_depth_total', 'engagement_samples'), 2),
+                    'total_clicks': totals['total_clicks'],
+                    'bounce_rate': round(percentage(totals['bounces'], totals['engagement_samples']), 2)
                 },
+                'devices': devices,
                 'daily_data': daily_data,
                 'period': {
                     'start_date': start_date.date().isoformat(),
@@ -547,6 +559,31 @@ class AnalyticsService:
         ]
         return any(keyword in user_agent for keyword in mobile_keywords)
     
+    @staticmethod
+    def _device_class(user_agent: str) -> str:
+        """Classify a user agent as desktop, mobile or tablet"""
+        if 'iPad' in user_agent or 'Tablet' in user_agent or (
+            'Android' in user_agent and 'Mobile' not in user_agent
+        ):
+            return 'tablet'
+        if AnalyticsService._is_mobile_device(user_agent):
+            return 'mobile'
+        return 'desktop'
+    
+    @staticmethod
+    def _tournament_slug_for_url(url: str) -> Optional[str]:
+        """Extract the tournament slug from a /tournaments/<slug>/ URL"""
+        match = TOURNAMENT_URL_RE.match(urlparse(url).path)
+        return match.group('slug') if match else None
+    
+    @staticmethod
+    def _tournament_id_for_url(url: str):
+        """Resolve the tournament a /tournaments/<slug>/ URL belongs to"""
+        slug = AnalyticsService._tournament_slug_for_url(url)
+        if not slug:
+            return None
+        return Tournament.objects.filter(slug=slug).values_list('id', flat=True).first()
+    
     @staticmethod
     def _camel_to_snake(name: str) -> str:
         """Convert camelCase to snake_case"""
@@ -10,8 +10,9 @@ from django.views import View
 import json
 import logging
 
+from .analytics_ingest import BeaconIngestService
 from .analytics_service import AnalyticsService
-from .analytics_models import PageView
+from .analytics_models import UserEngagement
 from .models import Tournament
 
 logger = logging.getLogger(__name__)
@@ -41,8 +42,8 @@ def track_page_performance(request):
         data = json.loads(request.body)
         url = data.get('url', request.META.get('HTTP_REFERER', ''))
         
-        # Track page view with performance data
-        page_view = AnalyticsService.track_page_view(
+        # Queue page view with performance data
+        page_view_id = BeaconIngestService.enqueue_page_view(
             request=request,
             url=url,
             performance_data=data
@@ -50,7 +51,7 @@ def track_page_performance(request):
         
         return JsonResponse({
             'success': True,
-            'page_view_id': str(page_view.id)
+            'page_view_id': page_view_id
         })
         
     except Exception as e:
@@ -89,23 +90,25 @@ def track_engagement(request):
                 'error': 'No session key found'
             }, status=400)
         
-        # Update engagement metrics
-        engagement = AnalyticsService.update_engagement(
-            session_key=session_key,
-            engagement_data=data
-        )
-        
-        if engagement:
-            return JsonResponse({
-                'success': True,
-                'engagement_score': engagement.calculate_engagement_score()
-            })
-        else:
+        if not BeaconIngestService.has_page_view(session_key):
             return JsonResponse({
                 'success': False,
                 'error': 'No page view found for session'
             }, status=404)
         
+        # Queue engagement update for the session's latest page view
+        BeaconIngestService.enqueue_engagement(
+            session_key=session_key,
+            engagement_data=data
+        )
+        
+        # Score this beacon on its own; the stored record is updated at flush
+        engagement = AnalyticsService.apply_engagement_data(UserEngagement(), data)
+        return JsonResponse({
+            'success': True,
+            'engagement_score': engagement.calculate_engagement_score()
+        })
+        
     except Exception as e:
         logger.error(f"Error tracking engagement: {e}")
         return JsonResponse({
@@ -262,7 +265,6 @@ def track_performance_metric(request):
                 'error': 'Missing required fields'
             }, status=400)
         
-        # Find the most recent page view for this session
         session_key = request.session.session_key
         if not session_key:
             return JsonResponse({
@@ -270,19 +272,16 @@ def track_performance_metric(request):
                 'error': 'No session key found'
             }, status=400)
         
-        page_view = PageView.objects.filter(
-            session_key=session_key
-        ).order_by('-created_at').first()
-        
-        if not page_view:
+        if not BeaconIngestService.has_page_view(session_key):
             return JsonResponse({
                 'success': False,
                 'error': 'No page view found for session'
             }, status=404)
         
-        # Track performance metric
-        performance_metric = AnalyticsService.track_performance_metric(
-            page_view=page_view,
+        # Queue performance metric; it is attached to the session's latest
+        # page view when flushed
+        metric_id = BeaconIngestService.enqueue_metric(
+            session_key=session_key,
             metric_name=metric_name,
             metric_value=float(metric_value),
             metric_type=data.get('metricType', 'user_timing'),
@@ -292,7 +291,7 @@ def track_performance_metric(request):
         
         return JsonResponse({
             'success': True,
-            'metric_id': str(performance_metric.id)
+            'metric_id': metric_id
         })
         
     except Exception as e:
@@ -335,12 +334,8 @@ def track_page_view(request, slug):
             except json.JSONDecodeError:
                 pass
         
-        # Ensure session exists
-        if not request.session.session_key:
-            request.session.create()
-        
-        # Track page view using AnalyticsService
-        page_view = AnalyticsService.track_page_view(
+        # Queue page view
+        page_view_id = BeaconIngestService.enqueue_page_view(
             request=request,
             url=request.build_absolute_uri(),
             performance_data=data.get('performance_data')
@@ -348,7 +343,7 @@ def track_page_view(request, slug):
         
         return JsonResponse({
             'success': True,
-            'page_view_id': str(page_view.id) if page_view else None
+            'page_view_id': page_view_id
         })
         
     except Exception as e:
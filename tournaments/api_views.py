@@ -12,6 +12,8 @@ from django.db.models import Q, Prefetch
 from django.utils import timezone
 from .models import Tournament, Participant, Match
 from .cache_utils import TournamentCache
+from .counters import TournamentCounters
+from .stats import TournamentStats
 import logging
 
 logger = logging.getLogger(__name__)
@@ -499,6 +501,12 @@ def tournament_unified_updates_api(request, slug):
     tournament = get_object_or_404(Tournament, slug=slug)
     
     try:
+        # Counters are buffered: stored value plus pending delta
+        counts = TournamentCounters.merged(tournament)
+        registered = counts['total_registered']
+        # Participant and match counters: one aggregate query per table
+        stats = TournamentStats.for_tournament(tournament)
+        
         # Get statistics (try cache first)
         cached_stats = TournamentCache.get_tournament_stats(tournament.id)
         
@@ -506,37 +514,43 @@ def tournament_unified_updates_api(request, slug):
             # Generate fresh statistics
             cached_stats = {
                 'participants': {
-                    'registered': tournament.total_registered,
+                    'registered': registered,
                     'checked_in': tournament.total_checked_in,
                     'capacity': tournament.max_participants,
-                    'percentage_full': (tournament.total_registered / tournament.max_participants) * 100 if tournament.max_participants > 0 else 0,
-                    'spots_remaining': tournament.max_participants - tournament.total_registered if tournament.max_participants > tournament.total_registered else 0,
+                    'percentage_full': (registered / tournament.max_participants) * 100 if tournament.max_participants > 0 else 0,
+                    'spots_remaining': tournament.max_participants - registered if tournament.max_participants > registered else 0,
                     'is_full': tournament.is_full
                 },
                 'engagement': {
-                    'views': tournament.view_count,
-                    'shares': getattr(tournament, 'share_count', 0),
-                    'registrations_today': tournament.get_registrations_today()
+                    'views': counts['view_count'],
+                    'shares': counts['share_count'],
+                    'registrations_today': stats.participants['registrations_24h']
                 },
                 'matches': {
-                    'total': tournament.matches.count(),
-                    'completed': tournament.matches.filter(status='completed').count(),
-                    'in_progress': tournament.matches.filter(status='in_progress').count(),
-                    'pending': tournament.matches.filter(status__in=['pending', 'ready']).count()
+                    'total': stats.matches['total'],
+                    'completed': stats.matches['completed'],
+                    'in_progress': stats.matches['in_progress'],
+                    'pending': stats.matches['pending'] + stats.matches['ready']
                 }
             }
             # Cache the statistics
             TournamentCache.set_tournament_stats(tournament.id, cached_stats)
+        else:
+            # Cached statistics may predate recent views, shares and registrations
+            cached_stats.setdefault('participants', {})['registered'] = registered
+            engagement = cached_stats.setdefault('engagement', {})
+            engagement['views'] = counts['view_count']
+            engagement['shares'] = counts['share_count']
         
         # Registration status
         registration_data = {
             'is_open': tournament.is_registration_open,
             'is_full': tournament.is_full,
-            'spots_remaining': tournament.max_participants - tournament.total_registered if tournament.max_participants > tournament.total_registered else 0,
+            'spots_remaining': tournament.max_participants - registered if tournament.max_participants > registered else 0,
             'capacity': tournament.max_participants,
-            'registered': tournament.total_registered,
+            'registered': registered,
             'checked_in': tournament.total_checked_in,
-            'percentage_full': (tournament.total_registered / tournament.max_participants) * 100 if tournament.max_participants > 0 else 0
+            'percentage_full': (registered / tournament.max_participants) * 100 if tournament.max_participants > 0 else 0
         }
         
         # Timeline progress
@@ -562,8 +576,8 @@ def tournament_unified_updates_api(request, slug):
         ).order_by('-registered_at')[:5]
         
         participants_data = {
-            'total': tournament.participants.count(),
-            'checked_in_count': tournament.participants.filter(checked_in=True).count(),
+            'total': stats.participants['total'],
+            'checked_in_count': stats.participants['checked_in'],
             'recent': [{
                 'id': str(p.id),
                 'display_name': p.display_name,
@@ -629,6 +643,12 @@ def tournament_unified_updates_api(request, slug):
         }, status=500)
 
 
+# Auto-seed request aliases -> SeedingService strategy names
+AUTO_SEED_METHODS = {
+    'registration_order': 'registration',
+}
+
+
 @require_http_methods(["POST"])
 def seed_participants_api(request, slug):
     """
@@ -642,7 +662,9 @@ def seed_participants_api(request, slug):
     from django.db import transaction
     from django.contrib.admin.models import LogEntry, CHANGE
     from django.contrib.contenttypes.models import ContentType
+    from .services.seeding import SeedingService
     import json
+    import uuid
     
     # Check authentication
     if not request.user.is_authenticated:
@@ -687,57 +709,69 @@ def seed_participants_api(request, slug):
             'error': 'Seeds must be an array'
         }, status=400)
     
-    # Validate and update in atomic transaction
+    # Validate every row before writing anything
+    requested = {}
+    for seed_data in seeds:
+        participant_id = seed_data.get('participant_id') if isinstance(seed_data, dict) else None
+        seed_value = seed_data.get('seed') if isinstance(seed_data, dict) else None
+        
+        # Validate participant_id is provided
+        if not participant_id:
+            return JsonResponse({
+                'success': False,
+                'error': 'Missing participant_id in seed data'
+            }, status=400)
+        
+        # Validate seed value - must be positive integer or null
+        if seed_value is not None:
+            if not isinstance(seed_value, int) or isinstance(seed_value, bool) or seed_value <= 0:
+                return JsonResponse({
+                    'success': False,
+                    'error': 'Invalid seed value',
+                    'details': {'invalid_seeds': [seed_value]}
+                }, status=400)
+        
+        try:
+            requested[str(uuid.UUID(str(participant_id)))] = seed_value
+        except ValueError:
+            return JsonResponse({
+                'success': False, 
+                'error': 'Participant not found or not confirmed'
+            }, status=400)
+    
+    # Participants must exist, belong to the tournament and be confirmed
+    participants = {
+        str(p.id): p for p in tournament.participants.filter(
+            id__in=list(requested), status='confirmed'
+        ).select_related('user', 'team')
+    }
+    if len(participants) != len(requested):
+        return JsonResponse({
+            'success': False, 
+            'error': 'Participant not found or not confirmed'
+        }, status=400)
+    
     try:
+        content_type_id = ContentType.objects.get_for_model(Participant).pk
+        log_entries = []
+        for participant_id, seed_value in requested.items():
+            participant = participants[participant_id]
+            old_seed = participant.seed
+            participant.seed = seed_value
+            
+            # Audit log entry with tournament and participant names
+            log_entries.append(LogEntry(
+                user_id=request.user.id,
+                content_type_id=content_type_id,
+                object_id=participant.id,
+                object_repr=str(participant),
+                action_flag=CHANGE,
+                change_message=f"Tournament: {tournament.name} | Participant: {participant.display_name} | Seed changed from {old_seed} to {seed_value}"
+            ))
+        
         with transaction.atomic():
-            for seed_data in seeds:
-                participant_id = seed_data.get('participant_id')
-                seed_value = seed_data.get('seed')
-                
-                # Validate participant_id is provided
-                if not participant_id:
-                    return JsonResponse({
-                        'success': False,
-                        'error': 'Missing participant_id in seed data'
-                    }, status=400)
-                
-                # Validate seed value - must be positive integer or null
-                if seed_value is not None:
-                    if not isinstance(seed_value, int) or seed_value <= 0:
-                        return JsonResponse({
-                            'success': False,
-                            'error': 'Invalid seed value',
-                            'details': {'invalid_seeds': [seed_value]}
-                        }, status=400)
-                
-                # Get participant - must exist, belong to tournament, and be confirmed
-                try:
-                    participant = tournament.participants.get(
-                        id=participant_id, 
-                        status='confirmed'
-                    )
-                except Participant.DoesNotExist:
-                    return JsonResponse({
-                        'success': False, 
-                        'error': 'Participant not found or not confirmed'
-                    }, status=400)
-                
-                # Store old seed for audit log
-                old_seed = participant.seed
-                
-                # Update seed
-                participant.seed = seed_value
-                participant.save()
-                
-                # Create audit log entry with tournament and participant names
-                LogEntry.objects.create(
-                    user_id=request.user.id,
-                    content_type_id=ContentType.objects.get_for_model(Participant).pk,
-                    object_id=participant.id,
-                    object_repr=str(participant),
-                    action_flag=CHANGE,
-                    change_message=f"Tournament: {tournament.name} | Participant: {participant.display_name} | Seed changed from {old_seed} to {seed_value}"
-                )
+            SeedingService.save_seeds(tournament, participants.values())
+            LogEntry.objects.bulk_create(log_entries)
         
         # Return updated participants
         participants = tournament.participants.filter(
@@ -769,15 +803,17 @@ def seed_participants_api(request, slug):
 @require_http_methods(["POST"])
 def auto_seed_api(request, slug):
     """
-    API endpoint for automatic seed assignment by registration order.
+    API endpoint for automatic seed assignment.
     
-    Assigns seeds sequentially (1, 2, 3...) based on participant registration timestamp.
-    Earliest registered participant gets seed 1, second earliest gets seed 2, etc.
+    Assigns seeds sequentially (1, 2, 3...) using a SeedingService strategy.
+    Body: {"method": "registration_order" | "skill" | "random"}; defaults to
+    registration order, so the earliest registered participant gets seed 1.
     """
     from django.contrib.auth.decorators import login_required
     from django.db import transaction
     from django.contrib.admin.models import LogEntry, CHANGE
     from django.contrib.contenttypes.models import ContentType
+    from .services.seeding import SeedingService
     import json
     
     # Check authentication
@@ -807,28 +843,40 @@ def auto_seed_api(request, slug):
             'error': 'Manual seeding is not enabled for this tournament.'
         }, status=400)
     
-    # Get confirmed participants ordered by registration time
+    # Strategy from the request body (the seeding UI sends "registration_order")
+    try:
+        method = json.loads(request.body or b'{}').get('method') or 'registration'
+    except (json.JSONDecodeError, AttributeError):
+        method = 'registration'
+    method = AUTO_SEED_METHODS.get(method, method)
+    if method not in SeedingService.STRATEGIES or method == 'manual':
+        return JsonResponse({
+            'success': False,
+            'error': f'Unknown seeding method: {method}'
+        }, status=400)
+    
     participants = tournament.participants.filter(
         status='confirmed'
-    ).select_related('user', 'team').order_by('registered_at')
+    ).select_related('user', 'team')
     
-    # Auto-assign seeds in atomic transaction
+    # Seed, persist and audit in one transaction
     try:
         with transaction.atomic():
-            for index, participant in enumerate(participants, start=1):
-                old_seed = participant.seed
-                participant.seed = index
-                participant.save()
-                
-                # Create audit log entry with tournament and participant names
-                LogEntry.objects.create(
+            old_seeds = {p.id: p.seed for p in participants}
+            participants = SeedingService.seed(tournament, participants, method)
+            
+            content_type_id = ContentType.objects.get_for_model(Participant).pk
+            LogEntry.objects.bulk_create([
+                LogEntry(
                     user_id=request.user.id,
-                    content_type_id=ContentType.objects.get_for_model(Participant).pk,
+                    content_type_id=content_type_id,
                     object_id=participant.id,
                     object_repr=str(participant),
                     action_flag=CHANGE,
-                    change_message=f"Tournament: {tournament.name} | Participant: {participant.display_name} | Auto-seeded from {old_seed} to {index}"
+                    change_message=f"Tournament: {tournament.name} | Participant: {participant.display_name} | Auto-seeded from {old_seeds[participant.id]} to {participant.seed}"
                 )
+                for participant in participants
+            ])
         
         # Prepare response data
         participant_data = [{
@@ -841,7 +889,7 @@ def auto_seed_api(request, slug):
         
         return JsonResponse({
             'success': True,
-            'message': f'Auto-seeding completed. {participants.count()} participants seeded.',
+            'message': f'Auto-seeding completed. {len(participants)} participants seeded.',
             'participants': participant_data
         })
         
@@ -851,3 +899,109 @@ def auto_seed_api(request, slug):
             'success': False, 
             'error': 'An error occurred during auto-seeding'
         }, status=500)
+
+
+@require_http_methods(["POST"])
+def report_results_api(request, slug):
+    """
+    API endpoint for bulk match result reporting.
+    
+    Lets tournament organizers and admins submit a whole round of results in
+    one request. All results are applied in a single transaction; each row
+    reports its own success or validation error.
+    
+    Body: {"results": [{"match_id": "<uuid>", "score_p1": 2, "score_p2": 1}, ...]}
+    """
+    from .security import log_security_event
+    from .services.score_reporting import ScoreReportingService
+    import json
+    import uuid
+    
+    # Check authentication
+    if not request.user.is_authenticated:
+        return JsonResponse({'success': False, 'error': 'Authentication required'}, status=401)
+    
+    tournament = get_object_or_404(Tournament, slug=slug)
+    
+    # Authorization check - must be organizer, admin or superuser
+    if (request.user != tournament.organizer and request.user.role != 'admin'
+            and not request.user.is_superuser):
+        log_security_event(
+            'UNAUTHORIZED_MATCH_REPORT',
+            request.user,
+            f'Attempted bulk result report for tournament {tournament.id}',
+            'WARNING'
+        )
+        return JsonResponse({
+            'success': False,
+            'error': 'Permission denied. Only tournament organizers can report results in bulk.'
+        }, status=403)
+    
+    if tournament.status != 'in_progress':
+        return JsonResponse({
+            'success': False,
+            'error': 'Results can only be reported while the tournament is in progress.'
+        }, status=409)
+    
+    # Parse request body
+    try:
+        data = json.loads(request.body)
+        rows = data.get('results', [])
+    except (json.JSONDecodeError, AttributeError):
+        return JsonResponse({
+            'success': False,
+            'error': 'Invalid JSON in request body'
+        }, status=400)
+    
+    if not isinstance(rows, list) or not rows:
+        return JsonResponse({
+            'success': False,
+            'error': 'Results must be a non-empty array'
+        }, status=400)
+    
+    results = []
+    for row in rows:
+        try:
+            match_id = uuid.UUID(str(row['match_id']))
+            score_p1 = row['score_p1']
+            score_p2 = row['score_p2']
+        except (KeyError, TypeError, ValueError):
+            return JsonResponse({
+                'success': False,
+                'error': 'Each result needs match_id, score_p1 and score_p2'
+            }, status=400)
+        
+        if (not isinstance(score_p1, int) or not isinstance(score_p2, int)
+                or score_p1 < 0 or score_p2 < 0):
+            return JsonResponse({
+                'success': False,
+                'error': 'Scores must be non-negative integers',
+                'details': {'match_id': str(match_id)}
+            }, status=400)
+        
+        results.append((match_id, score_p1, score_p2))
+    
+    try:
+        outcomes = ScoreReportingService.report_results(
+            results, reporter=request.user, tournament=tournament
+        )
+    except Exception as e:
+        logger.error(f"Error reporting results for tournament {slug}: {e}")
+        return JsonResponse({
+            'success': False,
+            'error': 'An error occurred while reporting results'
+        }, status=500)
+    
+    reported = sum(1 for outcome in outcomes if outcome['success'])
+    log_security_event(
+        'MATCH_SCORE_REPORTED',
+        request.user,
+        f'Bulk reported {reported}/{len(outcomes)} results for tournament {tournament.id}',
+        'INFO'
+    )
+    
+    return JsonResponse({
+        'success': reported == len(outcomes),
+        'reported': reported,
+        'results': outcomes
+    })
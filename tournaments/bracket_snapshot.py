@@ -0,0 +1,215 @@
+"""
+Versioned bracket snapshots for bracket polling.
+
+Every viewer of a live bracket polls ``bracket_json``/``bracket_partial``.
+Instead of rebuilding every bracket from the database per poll, the bracket
+is serialized once per *version* and stored in the cache:
+
+- ``bracket_version:{tournament}`` is a counter bumped whenever matches
+  change. A missing counter (first use or eviction) is seeded from the clock,
+  so a version number is never reused for different content.
+- ``bracket_snapshot:{tournament}:v{n}`` holds the full serialized bracket at
+  version ``n``; responses carry ``ETag: W/"bracket-<tournament>-<n>"`` so an
+  unchanged bracket is answered with ``304 Not Modified``.
+- ``bracket_delta:{tournament}:v{n}`` holds the matches changed by version
+  ``n``. ``?since=<version>`` returns only the matches changed after that
+  version, or the full snapshot if the deltas are no longer available.
+
+``record_changes`` is called after score reports and bracket progression are
+committed: it serializes the changed matches with one query, stores them as
+the new version's delta and patches the previous snapshot forward, so a
+version bump does not cost a full rebuild. ``invalidate`` bumps the version
+without a delta (bracket regenerated), which sends every client a full
+snapshot on its next poll.
+"""
+
+import logging
+import time
+
+from django.core.cache import cache
+from django.db.models import Prefetch
+
+from .models import Bracket, Match
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_TTL = 3600
+# Clients further behind than this many versions get a full snapshot
+MAX_DELTA_VERSIONS = 50
+
+VERSION_KEY = "bracket_version:{tournament_id}"
+SNAPSHOT_KEY = "bracket_snapshot:{tournament_id}:v{version}"
+DELTA_KEY = "bracket_delta:{tournament_id}:v{version}"
+
+MATCH_RELATED = (
+    'participant1__user', 'participant1__team',
+    'participant2__user', 'participant2__team',
+)
+
+
+def _clock_seed():
+    # Microseconds: ahead of any earlier version, yet exact as a JS number
+    return time.time_ns() // 1000
+
+
+def serialize_match(match):
+    """JSON representation of a match (participants' user/team should be loaded)"""
+    return {
+        'id': str(match.id),
+        'bracket_id': str(match.bracket_id),
+        'round': match.round_number,
+        'match_number': match.match_number,
+        'participant1': {
+            'id': str(match.participant1.id) if match.participant1 else None,
+            'name': match.participant1.display_name if match.participant1 else 'TBD'
+        },
+        'participant2': {
+            'id': str(match.participant2.id) if match.participant2 else None,
+            'name': match.participant2.display_name if match.participant2 else 'TBD'
+        },
+        'score': {
+            'p1': match.score_p1,
+            'p2': match.score_p2
+        },
+        'winner_id': str(match.winner_id) if match.winner_id else None,
+        'status': match.status,
+        'is_grand_finals': match.is_grand_finals
+    }
+
+
+class BracketSnapshot:
+    """Build, version and patch cached bracket JSON"""
+
+    @classmethod
+    def get_version(cls, tournament_id):
+        """Current bracket version for a tournament"""
+        key = VERSION_KEY.format(tournament_id=tournament_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, _clock_seed(), None)
+            version = cache.get(key)
+        return version
+
+    @classmethod
+    def etag(cls, tournament_id, version, *parts):
+        suffix = ''.join(f"-{part}" for part in parts)
+        return f'W/"bracket-{tournament_id}-{version}{suffix}"'
+
+    @classmethod
+    def get(cls, tournament_id, version=None):
+        """Full snapshot ``{'version', 'brackets'}`` at the current version"""
+        version = version or cls.get_version(tournament_id)
+        key = SNAPSHOT_KEY.format(tournament_id=tournament_id, version=version)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = cls.build(tournament_id, version)
+            cache.set(key, snapshot, SNAPSHOT_TTL)
+        return snapshot
+
+    @classmethod
+    def build(cls, tournament_id, version):
+        """Serialize every bracket of a tournament with two queries"""
+        brackets = Bracket.objects.filter(tournament_id=tournament_id).prefetch_related(Prefetch(
+            'matches',
+            queryset=Match.objects.select_related(*MATCH_RELATED).order_by('round_number', 'match_number')
+        ))
+        return {
+            'version': version,
+            'brackets': [
+                {
+                    'id': str(bracket.id),
+                    'name': bracket.name,
+                    'type': bracket.bracket_type,
+                    'total_rounds': bracket.total_rounds,
+                    'current_round': bracket.current_round,
+                    'matches': [serialize_match(match) for match in bracket.matches.all()]
+                }
+                for bracket in brackets
+            ]
+        }
+
+    @classmethod
+    def changes_since(cls, tournament_id, since, version=None):
+        """
+        Matches changed after version ``since`` (latest state of each), or
+        None when the client has to reload the full snapshot.
+        """
+        version = version or cls.get_version(tournament_id)
+        if since == version:
+            return []
+        if since > version or version - since > MAX_DELTA_VERSIONS:
+            return None
+
+        keys = [
+            DELTA_KEY.format(tournament_id=tournament_id, version=v)
+            for v in range(since + 1, version + 1)
+        ]
+        deltas = cache.get_many(keys)
+        if len(deltas) != len(keys):
+            return None
+
+        changed = {}
+        for key in keys:
+            for match in deltas[key]:
+                changed[match['id']] = match
+        return list(changed.values())
+
+    @classmethod
+    def record_changes(cls, tournament_id, match_ids):
+        """Store changed matches as a new version and patch the snapshot forward"""
+        # Serialize after bumping: a later version then never carries older
+        # match state than an earlier one, even when changes race
+        version = cls._bump(tournament_id)
+        matches = [
+            serialize_match(match)
+            for match in Match.objects.select_related(*MATCH_RELATED).filter(id__in=set(match_ids))
+        ]
+        cache.set(DELTA_KEY.format(tournament_id=tournament_id, version=version), matches, SNAPSHOT_TTL)
+
+        # Only patch the snapshot this version directly follows; if another
+        # change raced in between, readers rebuild instead
+        previous = cache.get(SNAPSHOT_KEY.format(tournament_id=tournament_id, version=version - 1))
+        if previous is None:
+            return version
+        patched = cls._patch(previous, matches, version)
+        if patched is not None:
+            cache.set(SNAPSHOT_KEY.format(tournament_id=tournament_id, version=version), patched, SNAPSHOT_TTL)
+        return version
+
+    @classmethod
+    def invalidate(cls, tournament_id):
+        """Start a new version without a delta: every client reloads in full"""
+        return cls._bump(tournament_id)
+
+    @classmethod
+    def _bump(cls, tournament_id):
+        key = VERSION_KEY.format(tournament_id=tournament_id)
+        cls.get_version(tournament_id)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # Evicted between the read and the increment
+            cache.add(key, _clock_seed(), None)
+            return cache.incr(key)
+
+    @staticmethod
+    def _patch(snapshot, matches, version):
+        """Copy of ``snapshot`` with ``matches`` replaced; None if one is not in it"""
+        changed = {match['id']: match for match in matches}
+        brackets = []
+        for bracket in snapshot['brackets']:
+            bracket_matches = []
+            for match in bracket['matches']:
+                bracket_matches.append(changed.pop(match['id'], match))
+            brackets.append({**bracket, 'matches': bracket_matches})
+        if changed:
+            return None
+        return {'version': version, 'brackets': brackets}
+
+
+def record_bracket_changes(tournament_id, match_ids):
+    """``record_changes`` that logs instead of failing the caller"""
+    try:
+        BracketSnapshot.record_changes(tournament_id, match_ids)
+    except Exception as e:
+        logger.error(f"Error updating bracket snapshot for tournament {tournament_id}: {e}")
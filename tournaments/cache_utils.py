@@ -7,8 +7,13 @@ from django.core.cache import cache
 from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta
+from collections import defaultdict
 import json
 import logging
+import threading
+import time
+
+from .stats import TournamentStats
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +22,11 @@ class TournamentCache:
     """
     Centralized caching utilities for tournament data.
     Provides consistent cache key generation and TTL management.
+    
+    Every key embeds a per-tournament generation number. Invalidating a
+    tournament is a single atomic increment of that number: entries written
+    under an older generation are never read again and expire on their TTL,
+    so no key has to be guessed or enumerated (e.g. participant pages).
     """
     
     # Cache TTL settings (in seconds)
@@ -26,150 +36,184 @@ class TournamentCache:
     TIMELINE_TTL = 1800  # 30 minutes for timeline phases
     BRACKET_TTL = 900  # 15 minutes for bracket data
     
+    GENERATION_KEY = "tournament_gen:{tournament_id}"
+    
+    # Per-process hit/miss/invalidation counters, see get_metrics()
+    _metrics = defaultdict(int)
+    _metrics_lock = threading.Lock()
+    
     @classmethod
-    def get_tournament_stats(cls, tournament_id):
+    def _record(cls, counter):
+        with cls._metrics_lock:
+            cls._metrics[counter] += 1
+    
+    @classmethod
+    def get_metrics(cls):
         """
-        Get cached tournament statistics.
-        Returns None if not cached.
+        Return hit/miss counters per data kind plus the invalidation count
+        for this process, e.g. ``{'stats': {'hits': 10, 'misses': 2,
+        'hit_rate': 83.33}, ..., 'invalidations': 4}``.
+        Use these to tune the TTL constants against real traffic.
+        """
+        with cls._metrics_lock:
+            snapshot = dict(cls._metrics)
+        
+        metrics = {}
+        for kind in ('stats', 'participants', 'matches', 'timeline', 'bracket_preview'):
+            hits = snapshot.get(f'{kind}:hits', 0)
+            misses = snapshot.get(f'{kind}:misses', 0)
+            total = hits + misses
+            metrics[kind] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': round(hits / total * 100, 2) if total else 0,
+            }
+        metrics['invalidations'] = snapshot.get('invalidations', 0)
+        return metrics
+    
+    @classmethod
+    def reset_metrics(cls):
+        with cls._metrics_lock:
+            cls._metrics.clear()
+    
+    @classmethod
+    def get_generation(cls, tournament_id):
         """
-        cache_key = f"tournament_stats:{tournament_id}"
+        Current cache generation for a tournament.
+        A missing counter (first use or eviction) is seeded from the clock so
+        it can never fall back to a generation that was already used.
+        """
+        gen_key = cls.GENERATION_KEY.format(tournament_id=tournament_id)
+        generation = cache.get(gen_key)
+        if generation is None:
+            cache.add(gen_key, time.time_ns(), None)
+            generation = cache.get(gen_key)
+        return generation
+    
+    @classmethod
+    def _make_key(cls, prefix, tournament_id, suffix=None):
+        generation = cls.get_generation(tournament_id)
+        key = f"{prefix}:{tournament_id}:g{generation}"
+        return f"{key}:{suffix}" if suffix is not None else key
+    
+    @classmethod
+    def _get(cls, kind, prefix, tournament_id, suffix=None):
+        cache_key = None
         try:
-            return cache.get(cache_key)
+            cache_key = cls._make_key(prefix, tournament_id, suffix)
+            value = cache.get(cache_key)
         except Exception as e:
-            logger.warning(f"Cache get failed for {cache_key}: {e}")
+            logger.warning(f"Cache get failed for {cache_key or prefix}: {e}")
             return None
+        cls._record(f'{kind}:hits' if value is not None else f'{kind}:misses')
+        return value
+    
+    @classmethod
+    def _set(cls, prefix, tournament_id, value, ttl, suffix=None):
+        cache_key = None
+        try:
+            cache_key = cls._make_key(prefix, tournament_id, suffix)
+            cache.set(cache_key, value, ttl)
+            return True
+        except Exception as e:
+            logger.warning(f"Cache set failed for {cache_key or prefix}: {e}")
+            return False
+    
+    @classmethod
+    def get_tournament_stats(cls, tournament_id):
+        """
+        Get cached tournament statistics.
+        Returns None if not cached.
+        """
+        return cls._get('stats', 'tournament_stats', tournament_id)
     
     @classmethod
     def set_tournament_stats(cls, tournament_id, stats_data):
         """
         Cache tournament statistics with TTL.
         """
-        cache_key = f"tournament_stats:{tournament_id}"
-        try:
-            cache.set(cache_key, stats_data, cls.STATS_TTL)
+        if cls._set('tournament_stats', tournament_id, stats_data, cls.STATS_TTL):
             logger.debug(f"Cached tournament stats for {tournament_id}")
-        except Exception as e:
-            logger.warning(f"Cache set failed for {cache_key}: {e}")
     
     @classmethod
     def get_participant_list(cls, tournament_id, page=1):
         """
         Get cached participant list for a specific page.
         """
-        cache_key = f"tournament_participants:{tournament_id}:page_{page}"
-        try:
-            return cache.get(cache_key)
-        except Exception as e:
-            logger.warning(f"Cache get failed for {cache_key}: {e}")
-            return None
+        return cls._get('participants', 'tournament_participants', tournament_id, f"page_{page}")
     
     @classmethod
     def set_participant_list(cls, tournament_id, participants_data, page=1):
         """
         Cache participant list with pagination support.
         """
-        cache_key = f"tournament_participants:{tournament_id}:page_{page}"
-        try:
-            cache.set(cache_key, participants_data, cls.PARTICIPANTS_TTL)
+        if cls._set('tournament_participants', tournament_id, participants_data,
+                    cls.PARTICIPANTS_TTL, f"page_{page}"):
             logger.debug(f"Cached participants for tournament {tournament_id}, page {page}")
-        except Exception as e:
-            logger.warning(f"Cache set failed for {cache_key}: {e}")
     
     @classmethod
     def get_match_data(cls, tournament_id, match_type='recent'):
         """
         Get cached match data (recent, upcoming, live).
         """
-        cache_key = f"tournament_matches:{tournament_id}:{match_type}"
-        try:
-            return cache.get(cache_key)
-        except Exception as e:
-            logger.warning(f"Cache get failed for {cache_key}: {e}")
-            return None
+        return cls._get('matches', 'tournament_matches', tournament_id, match_type)
     
     @classmethod
     def set_match_data(cls, tournament_id, match_data, match_type='recent'):
         """
         Cache match data with type-specific keys.
         """
-        cache_key = f"tournament_matches:{tournament_id}:{match_type}"
-        try:
-            cache.set(cache_key, match_data, cls.MATCHES_TTL)
+        if cls._set('tournament_matches', tournament_id, match_data, cls.MATCHES_TTL, match_type):
             logger.debug(f"Cached {match_type} matches for tournament {tournament_id}")
-        except Exception as e:
-            logger.warning(f"Cache set failed for {cache_key}: {e}")
     
     @classmethod
     def get_timeline_phases(cls, tournament_id):
         """
         Get cached timeline phases.
         """
-        cache_key = f"tournament_timeline:{tournament_id}"
-        try:
-            return cache.get(cache_key)
-        except Exception as e:
-            logger.warning(f"Cache get failed for {cache_key}: {e}")
-            return None
+        return cls._get('timeline', 'tournament_timeline', tournament_id)
     
     @classmethod
     def set_timeline_phases(cls, tournament_id, timeline_data):
         """
         Cache timeline phases data.
         """
-        cache_key = f"tournament_timeline:{tournament_id}"
-        try:
-            cache.set(cache_key, timeline_data, cls.TIMELINE_TTL)
+        if cls._set('tournament_timeline', tournament_id, timeline_data, cls.TIMELINE_TTL):
             logger.debug(f"Cached timeline for tournament {tournament_id}")
-        except Exception as e:
-            logger.warning(f"Cache set failed for {cache_key}: {e}")
     
     @classmethod
     def get_bracket_preview(cls, tournament_id):
         """
         Get cached bracket preview data.
         """
-        cache_key = f"tournament_bracket_preview:{tournament_id}"
-        try:
-            return cache.get(cache_key)
-        except Exception as e:
-            logger.warning(f"Cache get failed for {cache_key}: {e}")
-            return None
+        return cls._get('bracket_preview', 'tournament_bracket_preview', tournament_id)
     
     @classmethod
     def set_bracket_preview(cls, tournament_id, bracket_data):
         """
         Cache bracket preview data.
         """
-        cache_key = f"tournament_bracket_preview:{tournament_id}"
-        try:
-            cache.set(cache_key, bracket_data, cls.BRACKET_TTL)
+        if cls._set('tournament_bracket_preview', tournament_id, bracket_data, cls.BRACKET_TTL):
             logger.debug(f"Cached bracket preview for tournament {tournament_id}")
-        except Exception as e:
-            logger.warning(f"Cache set failed for {cache_key}: {e}")
     
     @classmethod
     def invalidate_tournament_cache(cls, tournament_id):
         """
         Invalidate all cached data for a tournament.
         Call this when tournament data changes.
-        """
-        cache_keys = [
-            f"tournament_stats:{tournament_id}",
-            f"tournament_timeline:{tournament_id}",
-            f"tournament_bracket_preview:{tournament_id}",
-        ]
-        
-        # Invalidate participant pages (we don't know how many pages exist)
-        for page in range(1, 11):  # Assume max 10 pages
-            cache_keys.append(f"tournament_participants:{tournament_id}:page_{page}")
-        
-        # Invalidate match data
-        for match_type in ['recent', 'upcoming', 'live']:
-            cache_keys.append(f"tournament_matches:{tournament_id}:{match_type}")
         
+        Bumps the tournament's generation; every existing key becomes
+        unreachable at once and ages out on its own TTL.
+        """
+        gen_key = cls.GENERATION_KEY.format(tournament_id=tournament_id)
         try:
-            cache.delete_many(cache_keys)
-            logger.info(f"Invalidated cache for tournament {tournament_id}")
+            try:
+                cache.incr(gen_key)
+            except ValueError:
+                # Counter missing (never used or evicted): seed a fresh one
+                cache.add(gen_key, time.time_ns(), None)
+            cls._record('invalidations')
+            logger.debug(f"Invalidated cache for tournament {tournament_id}")
         except Exception as e:
             logger.warning(f"Cache invalidation failed for tournament {tournament_id}: {e}")
     
@@ -218,22 +262,28 @@ class TournamentCache:
         """
         Generate tournament statistics data for caching.
         """
+        from .counters import TournamentCounters
+
+        # Buffered counters: stored value plus pending delta
+        counts = TournamentCounters.merged(tournament)
+        registered = counts['total_registered']
+        stats = TournamentStats.for_tournament(tournament)
         return {
             'participants': {
-                'registered': tournament.total_registered,
+                'registered': registered,
                 'checked_in': tournament.total_checked_in,
                 'capacity': tournament.max_participants,
-                'percentage_full': (tournament.total_registered / tournament.max_participants) * 100 if tournament.max_participants > 0 else 0
+                'percentage_full': (registered / tournament.max_participants) * 100 if tournament.max_participants > 0 else 0
             },
             'engagement': {
-                'views': tournament.view_count,
-                'shares': getattr(tournament, 'share_count', 0),
-                'registrations_today': tournament.get_registrations_today()
+                'views': counts['view_count'],
+                'shares': counts['share_count'],
+                'registrations_today': stats.participants['registrations_24h']
             },
             'matches': {
-                'total': tournament.matches.count(),
-                'completed': tournament.matches.filter(status='completed').count(),
-                'in_progress': tournament.matches.filter(status='in_progress').count(),
+                'total': stats.matches['total'],
+                'completed': stats.matches['completed'],
+                'in_progress': stats.matches['in_progress'],
             },
             'cached_at': timezone.now().isoformat()
         }
@@ -248,6 +298,7 @@ class CacheInvalidationMixin:
     def save(self, *args, **kwargs):
         """Override save to invalidate cache."""
         super().save(*args, **kwargs)
+        self._clear_tournament_stats()
         
         # Get tournament ID from the model
         tournament_id = self._get_tournament_id()
@@ -258,10 +309,16 @@ class CacheInvalidationMixin:
         """Override delete to invalidate cache."""
         tournament_id = self._get_tournament_id()
         super().delete(*args, **kwargs)
+        self._clear_tournament_stats()
         
         if tournament_id:
             TournamentCache.invalidate_tournament_cache(tournament_id)
     
+    def _clear_tournament_stats(self):
+        """Drop per-request counters memoized on an already loaded tournament."""
+        tournament = self._state.fields_cache.get('tournament')
+        TournamentStats.clear(tournament)
+    
     def _get_tournament_id(self):
         """
         Get tournament ID from the model.
@@ -0,0 +1,280 @@
+"""
+Tournament counters: write-behind ``view_count`` and ``share_count``, and a
+write-through ``total_registered``.
+
+Increments are applied to a buffer in O(1) instead of saving the tournament:
+a read-modify-write ``save()`` loses concurrent increments and bumps
+``updated_at``, which makes every live-update stream re-send the whole
+tournament. Pending deltas are written periodically with one
+``UPDATE ... SET field = field + delta`` per tournament; ``QuerySet.update``
+leaves ``updated_at`` alone.
+
+``total_registered`` is not buffered: capacity and minimum-participant
+checks read the column directly, so registrations are written through at
+once with the same ``F()`` update.
+
+Readers that display counts use ``TournamentCounters.merged()`` (database
+value plus pending delta), so numbers move immediately even though the row
+is written later. A flush subtracts what it wrote from the buffer only after
+the update succeeded, so increments are never lost; a reader racing the
+flush may briefly see the delta counted twice.
+
+Backends, chosen with the ``TOURNAMENT_COUNTER_BUFFER`` setting:
+
+- ``'local'`` keeps deltas in process memory (development server); the
+  process flushes its own deltas every ``TOURNAMENT_COUNTER_FLUSH_INTERVAL``
+  seconds and at exit.
+- ``'redis'`` keeps one hash per tournament plus a set of dirty ids, shared
+  by all processes; the periodic ``flush_tournament_counters`` task writes
+  them.
+- ``'sync'`` writes every increment through immediately (tests).
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db.models import F
+
+from .models import Tournament
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ('view_count', 'share_count', 'total_registered')
+# Read by admission checks, so never left pending in the buffer
+WRITE_THROUGH_FIELDS = ('total_registered',)
+
+DIRTY_KEY = 'tournament_counters:dirty'
+# Settled hashes linger this long in case new increments arrive
+SETTLED_TTL = 3600
+
+
+def _counter_key(tournament_id):
+    return f"tournament_counters:{tournament_id}"
+
+
+class LocalCounterBuffer:
+    """Per-process deltas keyed by tournament id"""
+
+    def __init__(self):
+        self._deltas = defaultdict(Counter)
+        self._lock = threading.Lock()
+
+    def incr(self, tournament_id, field, amount):
+        with self._lock:
+            self._deltas[str(tournament_id)][field] += amount
+
+    def pending(self, tournament_ids):
+        with self._lock:
+            return {
+                str(tournament_id): dict(self._deltas.get(str(tournament_id), {}))
+                for tournament_id in tournament_ids
+            }
+
+    def dirty(self, limit):
+        with self._lock:
+            return list(self._deltas)[:limit]
+
+    def settle(self, tournament_id, applied):
+        with self._lock:
+            deltas = self._deltas.get(str(tournament_id))
+            if deltas is None:
+                return
+            deltas.subtract(applied)
+            if not any(deltas.values()):
+                del self._deltas[str(tournament_id)]
+
+    def restore(self, tournament_ids):
+        """Nothing to do: ids stay listed until their deltas are settled"""
+
+
+class RedisCounterBuffer:
+    """Deltas shared by all processes: one Redis hash per tournament"""
+
+    def __init__(self, url):
+        self.url = url
+        self._client = None
+
+    def incr(self, tournament_id, field, amount):
+        key = _counter_key(tournament_id)
+        pipe = self._get_client().pipeline(transaction=True)
+        pipe.hincrby(key, field, amount)
+        pipe.persist(key)
+        pipe.sadd(DIRTY_KEY, str(tournament_id))
+        pipe.execute()
+
+    def pending(self, tournament_ids):
+        tournament_ids = [str(tournament_id) for tournament_id in tournament_ids]
+        pipe = self._get_client().pipeline(transaction=False)
+        for tournament_id in tournament_ids:
+            pipe.hgetall(_counter_key(tournament_id))
+        return {
+            tournament_id: {
+                (field.decode() if isinstance(field, bytes) else field): int(value)
+                for field, value in deltas.items()
+            }
+            for tournament_id, deltas in zip(tournament_ids, pipe.execute())
+        }
+
+    def dirty(self, limit):
+        ids = self._get_client().spop(DIRTY_KEY, limit) or []
+        return [tournament_id.decode() if isinstance(tournament_id, bytes) else tournament_id
+                for tournament_id in ids]
+
+    def settle(self, tournament_id, applied):
+        key = _counter_key(tournament_id)
+        pipe = self._get_client().pipeline(transaction=True)
+        for field, amount in applied.items():
+            pipe.hincrby(key, field, -amount)
+        pipe.expire(key, SETTLED_TTL)
+        pipe.execute()
+
+    def restore(self, tournament_ids):
+        """Mark ids dirty again after a failed write"""
+        if tournament_ids:
+            self._get_client().sadd(DIRTY_KEY, *[str(tournament_id) for tournament_id in tournament_ids])
+
+    def _get_client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+
+class TournamentCounters:
+    """Increment, read and flush buffered tournament counters"""
+
+    FLUSH_BATCH_SIZE = 500
+
+    @classmethod
+    def incr(cls, tournament_id, field, amount=1):
+        """Add ``amount`` to a counter without touching the tournament row"""
+        if field not in COUNTER_FIELDS:
+            raise ValueError(f"Unknown tournament counter: {field}")
+
+        buffer = get_counter_buffer()
+        if buffer is None or field in WRITE_THROUGH_FIELDS:
+            Tournament.objects.filter(id=tournament_id).update(**{field: F(field) + amount})
+            return
+
+        try:
+            buffer.incr(tournament_id, field, amount)
+        except Exception as e:
+            # Buffer unavailable: fall back to a direct atomic update
+            logger.warning(f"Writing tournament counter {field} through: {e}")
+            Tournament.objects.filter(id=tournament_id).update(**{field: F(field) + amount})
+            return
+
+        if isinstance(buffer, LocalCounterBuffer):
+            _local_flush_if_due(buffer)
+
+    @classmethod
+    def pending(cls, tournament_ids):
+        """Unflushed deltas: ``{tournament_id: {field: delta}}`` (string ids)"""
+        buffer = get_counter_buffer()
+        if buffer is None or not tournament_ids:
+            return {}
+        try:
+            return buffer.pending(tournament_ids)
+        except Exception as e:
+            logger.warning(f"Could not read pending tournament counters: {e}")
+            return {}
+
+    @classmethod
+    def merged(cls, tournament):
+        """Counter values for display: stored value plus pending delta"""
+        deltas = cls.pending([tournament.id]).get(str(tournament.id), {})
+        return {
+            field: (getattr(tournament, field) or 0) + deltas.get(field, 0)
+            for field in COUNTER_FIELDS
+        }
+
+    @classmethod
+    def flush(cls, buffer=None):
+        """Write pending deltas with one F() update per tournament; returns rows updated"""
+        buffer = buffer or get_counter_buffer()
+        if buffer is None:
+            return 0
+
+        flushed = 0
+        while True:
+            tournament_ids = buffer.dirty(cls.FLUSH_BATCH_SIZE)
+            if not tournament_ids:
+                break
+
+            pending = buffer.pending(tournament_ids)
+            for position, tournament_id in enumerate(tournament_ids):
+                applied = {field: amount for field, amount in pending[tournament_id].items()
+                           if field in COUNTER_FIELDS and amount}
+                if not applied:
+                    buffer.settle(tournament_id, {})
+                    continue
+                try:
+                    Tournament.objects.filter(id=tournament_id).update(
+                        **{field: F(field) + amount for field, amount in applied.items()}
+                    )
+                except Exception:
+                    buffer.restore(tournament_ids[position:])
+                    raise
+                buffer.settle(tournament_id, applied)
+                flushed += 1
+
+            if len(tournament_ids) < cls.FLUSH_BATCH_SIZE:
+                break
+
+        return flushed
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+_last_local_flush = time.monotonic()
+
+
+def _local_flush_if_due(buffer):
+    """Let the local backend write its own deltas once per flush interval"""
+    global _last_local_flush
+    interval = getattr(settings, 'TOURNAMENT_COUNTER_FLUSH_INTERVAL', 60)
+    now = time.monotonic()
+    if now - _last_local_flush < interval:
+        return
+    _last_local_flush = now
+    try:
+        TournamentCounters.flush(buffer)
+    except Exception as e:
+        logger.error(f"Error flushing tournament counters: {e}")
+
+
+def _flush_at_exit(buffer):
+    try:
+        TournamentCounters.flush(buffer)
+    except Exception as e:
+        logger.error(f"Error flushing tournament counters at exit: {e}")
+
+
+def get_counter_buffer():
+    """Process-wide buffer configured by TOURNAMENT_COUNTER_BUFFER (None when write-through)"""
+    global _buffer
+    backend = getattr(settings, 'TOURNAMENT_COUNTER_BUFFER', 'local')
+    if backend == 'sync':
+        return None
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                if backend == 'redis':
+                    _buffer = RedisCounterBuffer(
+                        getattr(settings, 'TOURNAMENT_COUNTER_REDIS_URL', 'redis://localhost:6379/0')
+                    )
+                else:
+                    _buffer = LocalCounterBuffer()
+                    atexit.register(_flush_at_exit, _buffer)
+    return _buffer
+
+
+def reset_counter_buffer():
+    """Drop the process-wide buffer (used by tests)"""
+    global _buffer
+    with _buffer_lock:
+        _buffer = None
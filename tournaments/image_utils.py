@@ -1,18 +1,43 @@
 """
 Image optimization utilities for tournament media.
 Provides WebP format support and responsive image generation.
+
+Derivatives are keyed by the SHA-256 of the source image: every size and
+format lives under ``tournaments/optimized/<hash>/`` next to a
+``manifest.json`` describing them, so an image uploaded twice (or re-saved
+unchanged) is never processed again. The source is decoded once and each
+size is resized from the next larger derivative instead of from the full
+resolution original.
+
+``schedule_tournament_derivatives`` runs from ``post_save`` and only queues
+work for image fields whose file changed; the Celery task
+``generate_image_derivatives`` (or an inline call with
+``IMAGE_DERIVATIVES_BACKEND = 'sync'``) builds the derivatives and stores the
+manifest on ``Tournament.image_derivatives``, which templates read to emit
+``srcset`` without touching storage.
 """
 
-import os
+import hashlib
+import json
 from PIL import Image, ImageOps
 from django.core.files.base import ContentFile
 from django.core.files.storage import default_storage
 from django.conf import settings
+from django.db import transaction
 import logging
 from io import BytesIO
 
 logger = logging.getLogger(__name__)
 
+# Tournament image fields and the derivative set each one gets
+TOURNAMENT_IMAGE_FIELDS = {
+    'banner': 'banner',
+    'thumbnail': 'thumbnail',
+    'social_image': 'social',
+}
+
+DERIVATIVE_ROOT = 'tournaments/optimized'
+
 
 class ImageOptimizer:
     """
@@ -33,6 +58,14 @@ class ImageOptimizer:
         'hero': (2560, 1440)
     }
     
+    # Sizes generated per image type
+    SIZES_BY_TYPE = {
+        'banner': ['thumbnail', 'small', 'medium', 'large', 'hero'],
+        'thumbnail': ['thumbnail', 'small'],
+        'social': ['medium', 'large'],
+    }
+    DEFAULT_SIZES = ['small', 'medium']
+    
     @classmethod
     def optimize_tournament_image(cls, image_file, image_type='banner'):
         """
@@ -46,120 +79,105 @@ class ImageOptimizer:
             dict: Dictionary with optimized image paths
         """
         try:
-            # Open and process the image
-            with Image.open(image_file) as img:
-                # Convert to RGB if necessary (for WebP compatibility)
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    # Create white background for transparent images
-                    background = Image.new('RGB', img.size, (255, 255, 255))
-                    if img.mode == 'P':
-                        img = img.convert('RGBA')
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                    img = background
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Auto-orient based on EXIF data
-                img = ImageOps.exif_transpose(img)
-                
-                # Generate optimized versions
-                optimized_images = {}
-                
-                # Generate different sizes based on image type
-                if image_type == 'banner':
-                    sizes_to_generate = ['thumbnail', 'small', 'medium', 'large', 'hero']
-                elif image_type == 'thumbnail':
-                    sizes_to_generate = ['thumbnail', 'small']
-                elif image_type == 'social':
-                    sizes_to_generate = ['medium', 'large']
-                else:
-                    sizes_to_generate = ['small', 'medium']
-                
-                for size_name in sizes_to_generate:
-                    if size_name in cls.RESPONSIVE_SIZES:
-                        target_size = cls.RESPONSIVE_SIZES[size_name]
-                        
-                        # Generate WebP version
-                        webp_path = cls._generate_webp_image(img, target_size, image_file.name, size_name)
-                        if webp_path:
-                            optimized_images[f'{size_name}_webp'] = webp_path
-                        
-                        # Generate JPEG fallback
-                        jpeg_path = cls._generate_jpeg_image(img, target_size, image_file.name, size_name)
-                        if jpeg_path:
-                            optimized_images[f'{size_name}_jpeg'] = jpeg_path
-                
-                return optimized_images
-                
+            manifest = cls.build_derivatives(image_file, image_type)
         except Exception as e:
             logger.error(f"Image optimization failed: {e}")
             return {}
+        
+        optimized_images = {}
+        for derivative in manifest['derivatives']:
+            optimized_images[f"{derivative['size']}_webp"] = derivative['webp']
+            optimized_images[f"{derivative['size']}_jpeg"] = derivative['jpeg']
+        return optimized_images
     
-    @classmethod
-    def _generate_webp_image(cls, img, target_size, original_name, size_name):
-        """Generate WebP format image"""
-        try:
-            # Resize image maintaining aspect ratio
-            img_resized = cls._resize_image(img, target_size)
-            
-            # Generate filename
-            base_name = os.path.splitext(original_name)[0]
-            webp_filename = f"{base_name}_{size_name}.webp"
-            
-            # Convert to WebP
-            webp_buffer = BytesIO()
-            img_resized.save(
-                webp_buffer,
-                format='WEBP',
-                quality=cls.WEBP_QUALITY,
-                optimize=True
-            )
-            webp_buffer.seek(0)
-            
-            # Save to storage
-            webp_file = ContentFile(webp_buffer.getvalue(), name=webp_filename)
-            webp_path = default_storage.save(f"tournaments/optimized/{webp_filename}", webp_file)
-            
-            return webp_path
-            
-        except Exception as e:
-            logger.warning(f"WebP generation failed for {size_name}: {e}")
-            return None
+    @staticmethod
+    def content_hash(image_file):
+        """SHA-256 of the file contents, read in chunks"""
+        digest = hashlib.sha256()
+        image_file.seek(0)
+        for chunk in iter(lambda: image_file.read(1024 * 1024), b''):
+            digest.update(chunk)
+        image_file.seek(0)
+        return digest.hexdigest()
     
     @classmethod
-    def _generate_jpeg_image(cls, img, target_size, original_name, size_name):
-        """Generate JPEG format image as fallback"""
-        try:
-            # Resize image maintaining aspect ratio
-            img_resized = cls._resize_image(img, target_size)
-            
-            # Generate filename
-            base_name = os.path.splitext(original_name)[0]
-            jpeg_filename = f"{base_name}_{size_name}.jpg"
-            
-            # Convert to JPEG
-            jpeg_buffer = BytesIO()
-            img_resized.save(
-                jpeg_buffer,
-                format='JPEG',
-                quality=cls.JPEG_QUALITY,
-                optimize=True
-            )
-            jpeg_buffer.seek(0)
-            
-            # Save to storage
-            jpeg_file = ContentFile(jpeg_buffer.getvalue(), name=jpeg_filename)
-            jpeg_path = default_storage.save(f"tournaments/optimized/{jpeg_filename}", jpeg_file)
-            
-            return jpeg_path
+    def build_derivatives(cls, image_file, image_type='banner', content_hash=None):
+        """
+        Build (or reuse) every derivative for an image and return its manifest.
+        
+        The manifest lists derivatives largest first:
+        ``{'hash', 'type', 'derivatives': [{'size', 'width', 'height', 'webp', 'jpeg'}]}``
+        """
+        content_hash = content_hash or cls.content_hash(image_file)
+        sizes = cls.SIZES_BY_TYPE.get(image_type, cls.DEFAULT_SIZES)
+        manifest_path = f"{DERIVATIVE_ROOT}/{content_hash}/{image_type}.json"
+        
+        # Same content processed before (re-save, duplicate upload)
+        if default_storage.exists(manifest_path):
+            with default_storage.open(manifest_path) as manifest_file:
+                return json.load(manifest_file)
+        
+        targets = sorted(
+            ((size_name, cls.RESPONSIVE_SIZES[size_name]) for size_name in sizes),
+            key=lambda item: item[1][0] * item[1][1],
+            reverse=True
+        )
+        
+        derivatives = []
+        with Image.open(image_file) as source:
+            # JPEG sources can be decoded at a reduced scale close to the largest target
+            source.draft('RGB', targets[0][1])
+            img = cls._normalize(source)
             
-        except Exception as e:
-            logger.warning(f"JPEG generation failed for {size_name}: {e}")
-            return None
+            # Resize progressively: each size starts from the previous (larger) one
+            for size_name, target_size in targets:
+                img = cls._fit_image(img, target_size)
+                output = cls._pad_image(img, target_size)
+                base_path = f"{DERIVATIVE_ROOT}/{content_hash}/{size_name}"
+                derivatives.append({
+                    'size': size_name,
+                    'width': target_size[0],
+                    'height': target_size[1],
+                    'webp': cls._save_derivative(output, f"{base_path}.webp", 'WEBP', cls.WEBP_QUALITY),
+                    'jpeg': cls._save_derivative(output, f"{base_path}.jpg", 'JPEG', cls.JPEG_QUALITY),
+                })
+        
+        manifest = {'hash': content_hash, 'type': image_type, 'derivatives': derivatives}
+        default_storage.save(manifest_path, ContentFile(json.dumps(manifest).encode()))
+        return manifest
+    
+    @staticmethod
+    def _normalize(img):
+        """RGB on a white background, oriented by EXIF"""
+        img = ImageOps.exif_transpose(img)
+        if img.mode in ('RGBA', 'LA', 'P'):
+            # Create white background for transparent images
+            if img.mode != 'RGBA':
+                img = img.convert('RGBA')
+            background = Image.new('RGB', img.size, (255, 255, 255))
+            background.paste(img, mask=img.split()[-1])
+            return background
+        if img.mode != 'RGB':
+            return img.convert('RGB')
+        img.load()
+        return img
+    
+    @staticmethod
+    def _save_derivative(img, path, image_format, quality):
+        buffer = BytesIO()
+        img.save(buffer, format=image_format, quality=quality, optimize=True)
+        if default_storage.exists(path):
+            default_storage.delete(path)
+        return default_storage.save(path, ContentFile(buffer.getvalue()))
     
     @classmethod
     def _resize_image(cls, img, target_size):
         """Resize image maintaining aspect ratio"""
+        return cls._pad_image(cls._fit_image(img, target_size), target_size)
+    
+    @staticmethod
+    def _fit_image(img, target_size):
+        """Scale to fit inside ``target_size``, keeping the aspect ratio"""
         # Calculate the aspect ratio
         img_ratio = img.width / img.height
         target_ratio = target_size[0] / target_size[1]
@@ -173,19 +191,21 @@ class ImageOptimizer:
             new_height = target_size[1]
             new_width = int(target_size[1] * img_ratio)
         
-        # Resize the image
-        img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        # If the resized image is smaller than target, pad it
-        if new_width < target_size[0] or new_height < target_size[1]:
-            # Create a new image with target size and paste the resized image
-            padded_img = Image.new('RGB', target_size, (255, 255, 255))
-            paste_x = (target_size[0] - new_width) // 2
-            paste_y = (target_size[1] - new_height) // 2
-            padded_img.paste(img_resized, (paste_x, paste_y))
-            return padded_img
-        
-        return img_resized
+        new_size = (max(1, new_width), max(1, new_height))
+        if new_size == img.size:
+            return img
+        return img.resize(new_size, Image.Resampling.LANCZOS)
+    
+    @staticmethod
+    def _pad_image(img, target_size):
+        """Center on a white canvas of ``target_size`` if smaller"""
+        if img.width >= target_size[0] and img.height >= target_size[1]:
+            return img
+        padded_img = Image.new('RGB', target_size, (255, 255, 255))
+        paste_x = (target_size[0] - img.width) // 2
+        paste_y = (target_size[1] - img.height) // 2
+        padded_img.paste(img, (paste_x, paste_y))
+        return padded_img
     
     @classmethod
     def generate_responsive_image_html(cls, image_paths, alt_text="", css_class=""):
@@ -280,40 +300,92 @@ class ImageOptimizer:
             logger.error(f"Image cleanup failed: {e}")
 
 
-def optimize_tournament_banner(sender, instance, **kwargs):
+def schedule_tournament_derivatives(tournament):
     """
-    Signal handler to automatically optimize tournament banners on save.
+    Queue derivative generation for image fields whose file changed.
+    Fields whose file matches the stored manifest are skipped without
+    reading the image.
     """
-    if instance.banner and hasattr(instance.banner, 'file'):
+    # Image fields left deferred by .only()/.defer() were not changed
+    deferred = tournament.get_deferred_fields()
+    fields = [field_name for field_name in TOURNAMENT_IMAGE_FIELDS if field_name not in deferred]
+    if not fields:
+        return
+    
+    manifests = tournament.image_derivatives or {}
+    changed = [
+        field_name for field_name in fields
+        if getattr(tournament, field_name).name != manifests.get(field_name, {}).get('source')
+        and (getattr(tournament, field_name).name or field_name in manifests)
+    ]
+    if not changed:
+        return
+    
+    tournament_id = tournament.id
+    
+    def run():
+        if getattr(settings, 'IMAGE_DERIVATIVES_BACKEND', 'celery') == 'sync':
+            update_tournament_derivatives(tournament_id, changed)
+            return
+        from .tasks import generate_image_derivatives
         try:
-            # Generate optimized versions
-            optimized_images = ImageOptimizer.optimize_tournament_image(
-                instance.banner.file, 
-                image_type='banner'
-            )
-            
-            # Store optimized image paths in a JSON field or related model
-            # For now, we'll just log the success
-            logger.info(f"Optimized banner for tournament {instance.id}: {len(optimized_images)} versions created")
-            
+            generate_image_derivatives.delay(str(tournament_id), changed)
         except Exception as e:
-            logger.error(f"Banner optimization failed for tournament {instance.id}: {e}")
+            logger.error(f"Could not queue image derivatives for tournament {tournament_id}: {e}")
+    
+    transaction.on_commit(run)
 
 
-def optimize_tournament_thumbnail(sender, instance, **kwargs):
+def update_tournament_derivatives(tournament_id, field_names):
     """
-    Signal handler to automatically optimize tournament thumbnails on save.
+    Build derivatives for the given image fields and store their manifests on
+    ``Tournament.image_derivatives``. Returns the names of fields rebuilt.
     """
-    if instance.thumbnail and hasattr(instance.thumbnail, 'file'):
+    from .models import Tournament
+    
+    tournament = Tournament.objects.only(*TOURNAMENT_IMAGE_FIELDS, 'image_derivatives').get(id=tournament_id)
+    manifests = dict(tournament.image_derivatives or {})
+    updated = []
+    
+    for field_name in field_names:
+        field_file = getattr(tournament, field_name)
+        if not field_file.name:
+            if manifests.pop(field_name, None) is not None:
+                updated.append(field_name)
+            continue
+        
+        current = manifests.get(field_name, {})
+        if current.get('source') == field_file.name:
+            continue
+        
         try:
-            # Generate optimized versions
-            optimized_images = ImageOptimizer.optimize_tournament_image(
-                instance.thumbnail.file, 
-                image_type='thumbnail'
-            )
-            
-            # Store optimized image paths
-            logger.info(f"Optimized thumbnail for tournament {instance.id}: {len(optimized_images)} versions created")
-            
+            with field_file.open('rb') as image_file:
+                content_hash = ImageOptimizer.content_hash(image_file)
+                if current.get('hash') == content_hash:
+                    manifest = dict(current)
+                else:
+                    manifest = ImageOptimizer.build_derivatives(
+                        image_file, TOURNAMENT_IMAGE_FIELDS[field_name], content_hash
+                    )
         except Exception as e:
-            logger.error(f"Thumbnail optimization failed for tournament {instance.id}: {e}")
\ No newline at end of file
+            logger.error(f"Image optimization failed for tournament {tournament_id} {field_name}: {e}")
+            continue
+        
+        manifests[field_name] = {**manifest, 'source': field_file.name}
+        updated.append(field_name)
+    
+    if updated:
+        # Merge under a row lock so concurrent field updates do not clobber each other
+        with transaction.atomic():
+            stored = Tournament.objects.select_for_update().values_list(
+                'image_derivatives', flat=True
+            ).get(id=tournament_id) or {}
+            for field_name in updated:
+                if field_name in manifests:
+                    stored[field_name] = manifests[field_name]
+                else:
+                    stored.pop(field_name, None)
+            Tournament.objects.filter(id=tournament_id).update(image_derivatives=stored)
+        logger.info(f"Updated image derivatives for tournament {tournament_id}: {', '.join(updated)}")
+    
+    return updated
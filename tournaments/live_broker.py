@@ -0,0 +1,237 @@
+"""
+Publish/subscribe broker for tournament live updates.
+
+A change is serialized into a Server-Sent Events frame exactly once by the
+publisher and the same frame is fanned out to every viewer subscribed to that
+tournament, so the cost of an update no longer scales with the audience.
+
+Two backends are available:
+
+- ``LocalBroker`` keeps subscribers in-process. Used by tests and the
+  single-process development server.
+- ``RedisBroker`` relays frames between processes through Redis pub/sub.
+  Each process holds one pattern subscription and fans out locally.
+
+The backend is chosen with the ``LIVE_UPDATES_BROKER`` setting
+(``'local'`` or ``'redis'``).
+"""
+
+import asyncio
+import json
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = 'tournament_live:'
+
+# Frames buffered per viewer before a slow consumer starts dropping updates
+MAX_PENDING_EVENTS = 100
+
+LiveEvent = namedtuple('LiveEvent', ['type', 'frame'])
+
+
+def channel_for(tournament_id):
+    """Pub/sub channel name for a tournament"""
+    return f"{CHANNEL_PREFIX}{tournament_id}"
+
+
+def encode_event(payload):
+    """Serialize a payload into a Server-Sent Events frame"""
+    return f"data: {json.dumps(payload, cls=DjangoJSONEncoder)}\n\n"
+
+
+class AsyncSubscription:
+    """
+    Subscription consumed from an asyncio event loop (ASGI SSE stream).
+    Delivery is thread-safe, so publishers may run in any thread.
+    """
+
+    def __init__(self, broker, channel):
+        self.broker = broker
+        self.channel = channel
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=MAX_PENDING_EVENTS)
+
+    def deliver(self, event):
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning(f"Dropping live update for slow subscriber on {self.channel}")
+
+    async def get(self, timeout=None):
+        """Wait for the next event; returns None on timeout"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class SyncSubscription:
+    """
+    Subscription consumed from a blocking generator (WSGI fallback).
+    """
+
+    def __init__(self, broker, channel):
+        self.broker = broker
+        self.channel = channel
+        self.queue = queue.Queue(maxsize=MAX_PENDING_EVENTS)
+
+    def deliver(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            logger.warning(f"Dropping live update for slow subscriber on {self.channel}")
+
+    def get(self, timeout=None):
+        """Block for the next event; returns None on timeout"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    """In-process broker: publishers and subscribers share one process"""
+
+    def __init__(self):
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, tournament_id, payload):
+        """Serialize a payload once and deliver it to every subscriber"""
+        event = LiveEvent(payload.get('type'), encode_event(payload))
+        self._fan_out(channel_for(tournament_id), event)
+        return event
+
+    def subscribe(self, tournament_id):
+        return self._register(SyncSubscription(self, channel_for(tournament_id)))
+
+    def subscribe_async(self, tournament_id):
+        return self._register(AsyncSubscription(self, channel_for(tournament_id)))
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+    def subscriber_count(self, tournament_id):
+        with self._lock:
+            return len(self._subscribers.get(channel_for(tournament_id), ()))
+
+    def _register(self, subscription):
+        with self._lock:
+            self._subscribers[subscription.channel].add(subscription)
+        return subscription
+
+    def _fan_out(self, channel, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+
+class RedisBroker(LocalBroker):
+    """
+    Cross-process broker backed by Redis pub/sub.
+    Publishing sends the encoded frame to Redis; a single listener thread per
+    process receives frames for all tournaments and fans them out locally.
+    """
+
+    RECONNECT_DELAY = 1  # seconds
+
+    def __init__(self, url):
+        super().__init__()
+        self.url = url
+        self._client = None
+        self._listener = None
+        self._listener_lock = threading.Lock()
+
+    def publish(self, tournament_id, payload):
+        event = LiveEvent(payload.get('type'), encode_event(payload))
+        message = json.dumps({'type': event.type, 'frame': event.frame})
+        try:
+            self._get_client().publish(channel_for(tournament_id), message)
+        except Exception as e:
+            logger.warning(f"Live update publish failed for tournament {tournament_id}: {e}")
+        return event
+
+    def _register(self, subscription):
+        self._ensure_listener()
+        return super()._register(subscription)
+
+    def _get_client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    def _ensure_listener(self):
+        with self._listener_lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen, name='tournament-live-updates', daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self._get_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(f"{CHANNEL_PREFIX}*")
+                for message in pubsub.listen():
+                    if message.get('type') != 'pmessage':
+                        continue
+                    channel = message['channel']
+                    if isinstance(channel, bytes):
+                        channel = channel.decode()
+                    data = json.loads(message['data'])
+                    self._fan_out(channel, LiveEvent(data.get('type'), data['frame']))
+            except Exception as e:
+                logger.warning(f"Live update listener disconnected, retrying: {e}")
+                time.sleep(self.RECONNECT_DELAY)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide broker configured by LIVE_UPDATES_BROKER"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                backend = getattr(settings, 'LIVE_UPDATES_BROKER', 'local')
+                if backend == 'redis':
+                    _broker = RedisBroker(
+                        getattr(settings, 'LIVE_UPDATES_REDIS_URL', 'redis://localhost:6379/0')
+                    )
+                else:
+                    _broker = LocalBroker()
+    return _broker
+
+
+def reset_broker():
+    """Drop the process-wide broker (used by tests)"""
+    global _broker
+    with _broker_lock:
+        _broker = None
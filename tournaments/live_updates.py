@@ -1,23 +1,39 @@
 """
 Real-time updates system for tournament detail pages.
 Implements Server-Sent Events (SSE) for live match updates and participant status changes.
+
+Changes are pushed through a publish/subscribe broker (see ``live_broker``):
+each change is serialized once when it is committed and fanned out to every
+connected viewer, instead of every connection polling the database.
 """
 
 import json
-import time
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
 from django.http import StreamingHttpResponse, JsonResponse
-from django.shortcuts import get_object_or_404
+from django.shortcuts import get_object_or_404, aget_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.cache import never_cache
 from django.views.decorators.csrf import csrf_exempt
 from django.utils import timezone
-from django.core.serializers.json import DjangoJSONEncoder
-from django.db import models
+from django.db import models, transaction
+from .counters import TournamentCounters
+from .live_broker import encode_event, get_broker
 from .models import Tournament, Match, Participant
+from .stats import TournamentStats
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Tournament statuses that have an open live stream
+LIVE_STATUSES = ('check_in', 'in_progress')
+
+# Statuses that close every open live stream
+ENDED_STATUSES = ('completed', 'cancelled')
+
+# Seconds without an event before a heartbeat is sent
+HEARTBEAT_INTERVAL = 15
+
 
 class TournamentLiveUpdater:
     """
@@ -178,9 +194,11 @@ class TournamentLiveUpdater:
     
     def _get_tournament_stats(self):
         """Get current tournament statistics"""
-        # Calculate actual participant counts
-        participant_count = self.tournament.participants.count()
-        checked_in_count = self.tournament.participants.filter(checked_in=True).count()
+        # One aggregate per table, shared with the rest of the request
+        stats = TournamentStats.for_tournament(self.tournament)
+        participant_count = stats.participants['total']
+        checked_in_count = stats.participants['checked_in']
+        counts = TournamentCounters.merged(self.tournament)
         
         return {
             'participants': {
@@ -190,15 +208,15 @@ class TournamentLiveUpdater:
                 'percentage_full': (participant_count / self.tournament.max_participants) * 100 if self.tournament.max_participants > 0 else 0
             },
             'matches': {
-                'total': self.tournament.matches.count(),
-                'completed': self.tournament.matches.filter(status='completed').count(),
-                'in_progress': self.tournament.matches.filter(status='in_progress').count(),
-                'upcoming': self.tournament.matches.filter(status__in=['ready', 'pending']).count()
+                'total': stats.matches['total'],
+                'completed': stats.matches['completed'],
+                'in_progress': stats.matches['in_progress'],
+                'upcoming': stats.matches['ready'] + stats.matches['pending']
             },
             'engagement': {
-                'views': self.tournament.view_count,
-                'shares': getattr(self.tournament, 'share_count', 0),
-                'registrations_today': self.tournament.get_registrations_today()
+                'views': counts['view_count'],
+                'shares': counts['share_count'],
+                'registrations_today': stats.participants['registrations_24h']
             },
             'current_round': self._get_current_round()
         }
@@ -219,16 +237,35 @@ class TournamentLiveUpdater:
         return 1
 
 
+def _heartbeat_frame():
+    return encode_event({
+        'type': 'heartbeat',
+        'timestamp': timezone.now().isoformat()
+    })
+
+
+def _error_frame(message):
+    return encode_event({
+        'type': 'error',
+        'message': message,
+        'timestamp': timezone.now().isoformat()
+    })
+
+
 @never_cache
-def tournament_live_updates(request, slug):
+async def tournament_live_updates(request, slug):
     """
     Server-Sent Events endpoint for tournament live updates.
     Streams real-time updates for matches, participants, and statistics.
+    
+    Under ASGI each viewer is an idle coroutine waiting on the broker, so
+    spectators do not hold a worker or query the database. Under WSGI the
+    same broker feed is consumed by a blocking generator.
     """
-    tournament = get_object_or_404(Tournament, slug=slug)
+    tournament = await aget_object_or_404(Tournament, slug=slug)
     
     # Check if tournament supports live updates (in progress or check-in)
-    if tournament.status not in ['check_in', 'in_progress']:
+    if tournament.status not in LIVE_STATUSES:
         return StreamingHttpResponse(
             "data: " + json.dumps({
                 'type': 'error',
@@ -237,63 +274,61 @@ def tournament_live_updates(request, slug):
             content_type='text/event-stream'
         )
     
-    def event_stream():
-        """Generator function for Server-Sent Events"""
-        updater = TournamentLiveUpdater(tournament)
-        
-        # Send initial state
-        initial_state = updater.get_current_state()
-        yield f"data: {json.dumps(initial_state, cls=DjangoJSONEncoder)}\n\n"
-        
-        last_update = timezone.now()
-        
-        # Keep connection alive and send updates
-        while True:
-            try:
-                # Check for updates every 5 seconds
-                time.sleep(5)
-                
-                # Get updates since last check
-                updates = updater.get_updates_since(last_update)
-                
-                if updates:
-                    for update in updates:
-                        yield f"data: {json.dumps(update, cls=DjangoJSONEncoder)}\n\n"
-                    
-                    last_update = timezone.now()
-                else:
-                    # Send heartbeat to keep connection alive
-                    heartbeat = {
-                        'type': 'heartbeat',
-                        'timestamp': timezone.now().isoformat()
-                    }
-                    yield f"data: {json.dumps(heartbeat, cls=DjangoJSONEncoder)}\n\n"
+    broker = get_broker()
+    updater = TournamentLiveUpdater(tournament)
+    
+    async def async_event_stream():
+        """Async generator for Server-Sent Events (ASGI)"""
+        # Subscribe before taking the snapshot so no change is missed
+        subscription = broker.subscribe_async(tournament.id)
+        try:
+            initial_state = await sync_to_async(updater.get_current_state)()
+            yield encode_event(initial_state)
+            
+            while True:
+                event = await subscription.get(timeout=HEARTBEAT_INTERVAL)
+                if event is None:
+                    yield _heartbeat_frame()
+                    continue
                 
-                # Refresh tournament object periodically to get latest data
-                tournament.refresh_from_db()
+                yield event.frame
+                if event.type == 'tournament_ended':
+                    break
+        except Exception as e:
+            logger.error(f"Error in live updates stream: {e}")
+            yield _error_frame('Connection error occurred')
+        finally:
+            subscription.close()
+    
+    def sync_event_stream():
+        """Blocking generator for Server-Sent Events (WSGI fallback)"""
+        subscription = broker.subscribe(tournament.id)
+        try:
+            initial_state = updater.get_current_state()
+            yield encode_event(initial_state)
+            
+            while True:
+                event = subscription.get(timeout=HEARTBEAT_INTERVAL)
+                if event is None:
+                    yield _heartbeat_frame()
+                    continue
                 
-                # Stop streaming if tournament is completed or cancelled
-                if tournament.status in ['completed', 'cancelled']:
-                    final_update = {
-                        'type': 'tournament_ended',
-                        'status': tournament.status,
-                        'timestamp': timezone.now().isoformat()
-                    }
-                    yield f"data: {json.dumps(final_update, cls=DjangoJSONEncoder)}\n\n"
+                yield event.frame
+                if event.type == 'tournament_ended':
                     break
-                    
-            except Exception as e:
-                logger.error(f"Error in live updates stream: {e}")
-                error_update = {
-                    'type': 'error',
-                    'message': 'Connection error occurred',
-                    'timestamp': timezone.now().isoformat()
-                }
-                yield f"data: {json.dumps(error_update, cls=DjangoJSONEncoder)}\n\n"
-                break
+        except Exception as e:
+            logger.error(f"Error in live updates stream: {e}")
+            yield _error_frame('Connection error occurred')
+        finally:
+            subscription.close()
+    
+    if isinstance(request, ASGIRequest):
+        stream = async_event_stream()
+    else:
+        stream = sync_event_stream()
     
     response = StreamingHttpResponse(
-        event_stream(),
+        stream,
         content_type='text/event-stream'
     )
     
@@ -342,10 +377,95 @@ def tournament_stats_api(request, slug):
         }, status=500)
 
 
+def _publish(tournament_id, build_payloads):
+    """
+    Build payloads and publish them once the current transaction commits.
+    Viewers never see uncommitted data, and a rolled back change is never sent.
+    """
+    def send():
+        try:
+            broker = get_broker()
+            for payload in build_payloads():
+                broker.publish(tournament_id, payload)
+        except Exception as e:
+            logger.error(f"Error publishing live update for tournament {tournament_id}: {e}")
+    
+    transaction.on_commit(send)
+
+
+def publish_match_update(match):
+    """Publish a match change to every viewer of its tournament"""
+    tournament = match.tournament
+    if tournament.status not in LIVE_STATUSES:
+        return
+    
+    def build():
+        updater = TournamentLiveUpdater(tournament)
+        fresh = Match.objects.select_related(
+            'participant1', 'participant2', 'winner', 'bracket'
+        ).get(id=match.id)
+        return [{
+            'type': 'match_update',
+            'match': updater._serialize_match(fresh),
+            'timestamp': fresh.updated_at.isoformat()
+        }]
+    
+    _publish(tournament.id, build)
+
+
+def publish_participant_update(participant):
+    """Publish a participant change to every viewer of its tournament"""
+    tournament = participant.tournament
+    if tournament.status not in LIVE_STATUSES:
+        return
+    
+    def build():
+        updater = TournamentLiveUpdater(tournament)
+        fresh = Participant.objects.select_related('user', 'team').get(id=participant.id)
+        return [{
+            'type': 'participant_update',
+            'participant': updater._serialize_participant(fresh),
+            'timestamp': fresh.updated_at.isoformat()
+        }]
+    
+    _publish(tournament.id, build)
+
+
+def publish_tournament_update(tournament):
+    """
+    Publish a tournament status/statistics change.
+    Ending a tournament also publishes ``tournament_ended`` so open streams close.
+    """
+    if tournament.status not in LIVE_STATUSES + ENDED_STATUSES:
+        return
+    
+    def build():
+        # Counters memoized before the commit may be stale now
+        TournamentStats.clear(tournament)
+        updater = TournamentLiveUpdater(tournament)
+        payloads = [{
+            'type': 'tournament_update',
+            'status': tournament.status,
+            'statistics': updater._get_tournament_stats(),
+            'timestamp': tournament.updated_at.isoformat()
+        }]
+        if tournament.status in ENDED_STATUSES:
+            payloads.append({
+                'type': 'tournament_ended',
+                'status': tournament.status,
+                'timestamp': timezone.now().isoformat()
+            })
+        return payloads
+    
+    _publish(tournament.id, build)
+
+
 def trigger_match_update(match_id):
     """
     Utility function to trigger match update notifications.
     Called when match data changes (score updates, status changes).
+    Saving the match publishes it through the ``post_save`` handler in
+    ``tournaments.signals``.
     """
     try:
         from .models import Match
@@ -373,6 +493,8 @@ def trigger_participant_update(participant_id):
     """
     Utility function to trigger participant update notifications.
     Called when participant status changes (check-in, registration status).
+    Saving the participant and tournament publishes both changes through the
+    ``post_save`` handlers in ``tournaments.signals``.
     """
     try:
         from .models import Participant
@@ -399,6 +521,8 @@ def trigger_tournament_update(tournament_id):
     """
     Utility function to trigger tournament-wide update notifications.
     Called when tournament status or major data changes.
+    Saving the tournament publishes it through the ``post_save`` handler in
+    ``tournaments.signals``.
     """
     try:
         from .models import Tournament
@@ -0,0 +1,31 @@
+"""
+Management command to rebuild the materialized leaderboard from scratch
+and verify it against the live participant aggregation.
+"""
+from django.core.management.base import BaseCommand, CommandError
+from tournaments.services import LeaderboardService
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the materialized player/team leaderboard and verify it against live data'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--verify-only',
+            action='store_true',
+            help='Only compare the stored leaderboard with the live aggregation'
+        )
+
+    def handle(self, *args, **options):
+        if not options['verify_only']:
+            self.stdout.write('Rebuilding leaderboard...')
+            count = LeaderboardService.rebuild()
+            self.stdout.write(self.style.SUCCESS(f'Stored {count} leaderboard rows'))
+
+        mismatches = LeaderboardService.verify()
+        if mismatches:
+            for key, stored, expected in mismatches[:20]:
+                self.stdout.write(f'  - {key}: stored={stored} expected={expected}')
+            raise CommandError(f'Leaderboard differs from live data in {len(mismatches)} rows')
+
+        self.stdout.write(self.style.SUCCESS('Leaderboard matches live data'))
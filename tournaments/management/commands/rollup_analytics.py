@@ -0,0 +1,27 @@
+"""
+Django management command to roll raw analytics into hourly/daily rollups.
+The Celery beat schedule runs the same steps; use this for cron setups or to
+backfill rollups after deploy.
+"""
+
+from django.core.management.base import BaseCommand
+from tournaments.analytics_rollups import AnalyticsRollupService
+
+
+class Command(BaseCommand):
+    help = 'Roll up tournament analytics and optionally prune old raw rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Also delete raw page views older than ANALYTICS_RAW_RETENTION_DAYS'
+        )
+
+    def handle(self, *args, **options):
+        watermark = AnalyticsRollupService.rollup_pending()
+        self.stdout.write(self.style.SUCCESS(f"Analytics rolled up to {watermark.isoformat()}"))
+
+        if options['prune']:
+            count = AnalyticsRollupService.prune_raw_data()
+            self.stdout.write(self.style.SUCCESS(f"Pruned {count} raw page views"))
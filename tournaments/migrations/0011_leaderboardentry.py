@@ -0,0 +1,41 @@
+# Generated by Django 5.2.8 on 2026-10-16 10:00
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        ('teams', '0001_initial'),
+        ('tournaments', '0010_add_analytics_models'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('key', models.CharField(max_length=100, unique=True)),
+                ('entry_type', models.CharField(choices=[('player', 'Player'), ('team', 'Team')], max_length=10)),
+                ('total_wins', models.IntegerField(default=0)),
+                ('total_losses', models.IntegerField(default=0)),
+                ('tournaments_played', models.IntegerField(default=0)),
+                ('total_prize', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('game', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='core.game')),
+                ('team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='teams.team')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Leaderboard entries',
+                'db_table': 'tournament_leaderboard_entries',
+                'ordering': ['-total_wins', '-tournaments_played'],
+                'indexes': [models.Index(fields=['entry_type', 'game', '-total_wins', '-tournaments_played'], name='leaderboard_rank_idx'), models.Index(fields=['user'], name='tournament__user_id_1d28e6_idx'), models.Index(fields=['team'], name='tournament__team_id_856fce_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 5.2.8 on 2026-10-16 12:00
+
+import django.db.models.deletion
+import re
+import uuid
+from urllib.parse import urlparse
+
+from django.db import migrations, models
+
+
+TOURNAMENT_URL_RE = re.compile(r'^/tournaments/(?P<slug>[-\w]+)/')
+
+
+def backfill_page_view_keys(apps, schema_editor):
+    """Resolve tournament and device class for page views tracked before rollups"""
+    PageView = apps.get_model('tournaments', 'PageView')
+    Tournament = apps.get_model('tournaments', 'Tournament')
+
+    tournament_ids = dict(Tournament.objects.values_list('slug', 'id'))
+    batch = []
+    for page_view in PageView.objects.only('id', 'url', 'user_agent', 'is_mobile').iterator(chunk_size=1000):
+        match = TOURNAMENT_URL_RE.match(urlparse(page_view.url).path)
+        page_view.tournament_id = tournament_ids.get(match.group('slug')) if match else None
+
+        user_agent = page_view.user_agent or ''
+        if 'iPad' in user_agent or 'Tablet' in user_agent or (
+            'Android' in user_agent and 'Mobile' not in user_agent
+        ):
+            page_view.device_class = 'tablet'
+        else:
+            page_view.device_class = 'mobile' if page_view.is_mobile else 'desktop'
+
+        batch.append(page_view)
+        if len(batch) >= 1000:
+            PageView.objects.bulk_update(batch, ['tournament', 'device_class'])
+            batch = []
+    if batch:
+        PageView.objects.bulk_update(batch, ['tournament', 'device_class'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0011_leaderboardentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pageview',
+            name='tournament',
+            field=models.ForeignKey(blank=True, help_text='Tournament resolved from the URL when tracked', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='page_views', to='tournaments.tournament'),
+        ),
+        migrations.AddField(
+            model_name='pageview',
+            name='device_class',
+            field=models.CharField(choices=[('desktop', 'Desktop'), ('mobile', 'Mobile'), ('tablet', 'Tablet')], default='desktop', max_length=10),
+        ),
+        migrations.AddIndex(
+            model_name='pageview',
+            index=models.Index(fields=['created_at'], name='analytics_pv_created_idx'),
+        ),
+        migrations.CreateModel(
+            name='AnalyticsRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('period_type', models.CharField(choices=[('hourly', 'Hourly'), ('daily', 'Daily')], max_length=10)),
+                ('period_start', models.DateTimeField()),
+                ('device_class', models.CharField(choices=[('desktop', 'Desktop'), ('mobile', 'Mobile'), ('tablet', 'Tablet'), ('unknown', 'Unknown')], max_length=10)),
+                ('page_views', models.PositiveIntegerField(default=0)),
+                ('unique_visitors', models.PositiveIntegerField(default=0, help_text='Distinct sessions within the bucket')),
+                ('load_time_total', models.BigIntegerField(default=0)),
+                ('load_time_samples', models.PositiveIntegerField(default=0)),
+                ('first_paint_total', models.BigIntegerField(default=0)),
+                ('first_paint_samples', models.PositiveIntegerField(default=0)),
+                ('largest_contentful_paint_total', models.BigIntegerField(default=0)),
+                ('largest_contentful_paint_samples', models.PositiveIntegerField(default=0)),
+                ('engagement_samples', models.PositiveIntegerField(default=0)),
+                ('time_on_page_total', models.BigIntegerField(default=0)),
+                ('time_on_page_samples', models.PositiveIntegerField(default=0)),
+                ('scroll_depth_total', models.BigIntegerField(default=0)),
+                ('total_clicks', models.BigIntegerField(default=0)),
+                ('bounces', models.PositiveIntegerField(default=0)),
+                ('conversions', models.PositiveIntegerField(default=0)),
+                ('errors', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('tournament', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='analytics_rollups', to='tournaments.tournament')),
+            ],
+            options={
+                'db_table': 'analytics_rollups',
+                'ordering': ['-period_start'],
+                'indexes': [models.Index(fields=['period_type', 'period_start'], name='analytics_rollup_period_idx'), models.Index(fields=['tournament', 'period_type', 'period_start'], name='analytics_rollup_tourn_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='AnalyticsRollupState',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('watermark', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'analytics_rollup_state',
+            },
+        ),
+        migrations.RunPython(backfill_page_view_keys, migrations.RunPython.noop),
+    ]
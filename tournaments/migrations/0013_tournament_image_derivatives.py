@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-16 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0012_analytics_rollups'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournament',
+            name='image_derivatives',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
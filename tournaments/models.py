@@ -8,6 +8,7 @@ import uuid
 from datetime import timedelta
 import json
 from .cache_utils import CacheInvalidationMixin
+from .stats import TournamentStats
 
 
 class Tournament(models.Model):
@@ -121,6 +122,8 @@ class Tournament(models.Model):
     secondary_color = models.CharField(max_length=7, default='#111827', help_text="Hex color code")
     meta_description = models.TextField(max_length=160, blank=True, help_text="SEO description")
     social_image = models.ImageField(upload_to='tournaments/social/', null=True, blank=True)
+    # Manifests of generated WebP/JPEG sizes per image field (see image_utils)
+    image_derivatives = models.JSONField(default=dict, blank=True)
     
     class Meta:
         db_table = 'tournaments'
@@ -137,6 +140,10 @@ class Tournament(models.Model):
     def get_absolute_url(self):
         return reverse('tournaments:detail', kwargs={'slug': self.slug})
     
+    def refresh_from_db(self, *args, **kwargs):
+        TournamentStats.clear(self)
+        super().refresh_from_db(*args, **kwargs)
+    
     @property
     def is_registration_open(self):
         now = timezone.now()
@@ -144,26 +151,15 @@ class Tournament(models.Model):
                 self.registration_start <= now <= self.registration_end and
                 not self.is_full)
     
+    @property
+    def stats(self):
+        """Participant and match counters, aggregated once per instance"""
+        return TournamentStats.for_tournament(self)
+    
     @property
     def is_full(self):
         """Check if tournament is full based on tournament type"""
-        if not self.max_participants:
-            return False
-        
-        if self.is_team_based:
-            # For team tournaments, count unique teams
-            team_count = self.participants.filter(
-                team__isnull=False,
-                status__in=['confirmed', 'pending_payment', 'pending']
-            ).count()
-            return team_count >= self.max_participants
-        else:
-            # For individual tournaments, count users with active registrations
-            user_count = self.participants.filter(
-                user__isnull=False,
-                status__in=['confirmed', 'pending_payment', 'pending']
-            ).count()
-            return user_count >= self.max_participants
+        return self.stats.is_full
     
     @property
     def is_check_in_open(self):
@@ -173,59 +169,16 @@ class Tournament(models.Model):
     @property
     def spots_remaining(self):
         """Get remaining spots based on tournament type"""
-        if not self.max_participants:
-            return float('inf')  # Unlimited
-        
-        if self.is_team_based:
-            # For team tournaments, count unique teams
-            team_count = self.participants.filter(
-                team__isnull=False,
-                status__in=['confirmed', 'pending_payment', 'pending']
-            ).count()
-            return max(0, self.max_participants - team_count)
-        else:
-            # For individual tournaments, count users with active registrations
-            user_count = self.participants.filter(
-                user__isnull=False,
-                status__in=['confirmed', 'pending_payment', 'pending']
-            ).count()
-            return max(0, self.max_participants - user_count)
+        return self.stats.spots_remaining
     
     @property
     def registration_progress(self):
         """Get registration progress percentage based on tournament type"""
-        if not self.max_participants or self.max_participants == 0:
-            return 0
-        
-        if self.is_team_based:
-            # For team tournaments, count unique teams
-            team_count = self.participants.filter(
-                team__isnull=False,
-                status__in=['confirmed', 'pending_payment', 'pending']
-            ).count()
-            return min(100, (team_count / self.max_participants) * 100)
-        else:
-            # For individual tournaments, count users with active registrations
-            user_count = self.participants.filter(
-                user__isnull=False,
-                status__in=['confirmed', 'pending_payment', 'pending']
-            ).count()
-            return min(100, (user_count / self.max_participants) * 100)
+        return self.stats.registration_progress
     
     def get_current_registrations(self):
         """Get actual registration count based on tournament type"""
-        if self.is_team_based:
-            # For team tournaments, count teams
-            return self.participants.filter(
-                team__isnull=False,
-                status__in=['confirmed', 'pending_payment', 'pending']
-            ).count()
-        else:
-            # For individual tournaments, count users with active registrations
-            return self.participants.filter(
-                user__isnull=False,
-                status__in=['confirmed', 'pending_payment', 'pending']
-            ).count()
+        return self.stats.registered
     
     def can_user_register(self, user):
         """Check if user can register for tournament with detailed error messages"""
@@ -312,8 +265,7 @@ class Tournament(models.Model):
     
     def get_registrations_today(self):
         """Get number of registrations in the last 24 hours"""
-        yesterday = timezone.now() - timezone.timedelta(days=1)
-        return self.participants.filter(registered_at__gte=yesterday).count()
+        return self.stats.participants['registrations_24h']
     
     def get_timeline_phases(self):
         """Get tournament phases for timeline display"""
@@ -662,6 +614,15 @@ class Match(CacheInvalidationMixin, models.Model):
         p2_name = self.participant2.display_name if self.participant2 else "TBD"
         return f"R{self.round_number}M{self.match_number}: {p1_name} vs {p2_name}"
     
+    def save(self, *args, **kwargs):
+        """Save and, once committed, publish the match as a bracket snapshot delta"""
+        from django.db import transaction
+        from .bracket_snapshot import record_bracket_changes
+        
+        super().save(*args, **kwargs)
+        tournament_id, match_id = self.tournament_id, self.id
+        transaction.on_commit(lambda: record_bracket_changes(tournament_id, [match_id]))
+    
     @property
     def is_ready(self):
         """Check if both participants are assigned"""
@@ -673,110 +634,19 @@ class Match(CacheInvalidationMixin, models.Model):
         return (self.participant1 is not None) != (self.participant2 is not None)
     
     def report_score(self, score_p1, score_p2, reporter=None):
-        """Report match result"""
-        if self.status == 'completed':
-            return False, "Match already completed"
-        
-        if not self.is_ready:
-            return False, "Both participants must be assigned"
-        
-        self.score_p1 = score_p1
-        self.score_p2 = score_p2
-        
-        # Determine winner
-        if score_p1 > score_p2:
-            self.winner = self.participant1
-            self.loser = self.participant2
-        elif score_p2 > score_p1:
-            self.winner = self.participant2
-            self.loser = self.participant1
-        else:
-            return False, "Scores cannot be tied"
+        """
+        Report match result.
         
-        self.status = 'completed'
-        self.completed_at = timezone.now()
-        self.save()
+        Match, participant, bracket progression and team statistics updates
+        are applied in one transaction; cache invalidation, live updates and
+        achievement checks run once after commit (see ScoreReportingService).
+        """
+        from .services.score_reporting import ScoreReportingService
         
-        # Update participant stats
-        self.participant1.matches_won += 1 if self.winner == self.participant1 else 0
-        self.participant1.matches_lost += 1 if self.loser == self.participant1 else 0
-        self.participant1.games_won += score_p1
-        self.participant1.games_lost += score_p2
-        self.participant1.save()
-        
-        self.participant2.matches_won += 1 if self.winner == self.participant2 else 0
-        self.participant2.matches_lost += 1 if self.loser == self.participant2 else 0
-        self.participant2.games_won += score_p2
-        self.participant2.games_lost += score_p1
-        self.participant2.save()
-        
-        # Update team statistics if team-based tournament (Requirement 13.3, 13.4)
-        if self.tournament.is_team_based:
-            self._update_team_statistics()
-        
-        # Progress bracket
-        self.progress_bracket()
-        
-        return True, "Match result recorded"
-    
-    def _update_team_statistics(self):
-        """Update team statistics on match completion (Requirement 13.3, 13.4)"""
-        from teams.models import Team, TeamMember
-        from teams.achievement_service import AchievementService
-        
-        # Update team statistics for both teams
-        for participant in [self.participant1, self.participant2]:
-            if not participant or not participant.team:
-                continue
-            
-            team = participant.team
-            is_winner = participant == self.winner
-            
-            # Update team match statistics (Requirement 13.3)
-            if is_winner:
-                team.total_wins += 1
-            else:
-                team.total_losses += 1
-            team.save()
-            
-            # Update team member statistics for participating members (Requirement 13.4)
-            # All active team members get credit for the match
-            active_members = team.members.filter(status='active')
-            for member in active_members:
-                member.matches_played += 1
-                if is_winner:
-                    member.matches_won += 1
-                member.save()
-            
-            # Check and award achievements (Requirement 13.4)
-            AchievementService.check_win_streak_achievements(team)
-            
-            # Post automatic announcement about match result (Requirement 13.4)
-            self._post_match_result_announcement(team, is_winner)
-    
-    def _post_match_result_announcement(self, team, is_winner):
-        """Post automatic announcement about match result to team feed (Requirement 13.4)"""
-        from teams.models import TeamAnnouncement
-        
-        result_text = "won" if is_winner else "lost"
-        opponent = self.participant2 if self.participant1 and self.participant1.team == team else self.participant1
-        opponent_name = opponent.display_name if opponent else "Unknown"
-        
-        score_text = f"{self.score_p1}-{self.score_p2}"
-        if self.participant2 and self.participant2.team == team:
-            score_text = f"{self.score_p2}-{self.score_p1}"
-        
-        TeamAnnouncement.objects.create(
-            team=team,
-            posted_by=team.captain,
-            title=f"Match Result: {result_text.title()} vs {opponent_name}",
-            content=f"The team {result_text} against {opponent_name} with a score of {score_text} in {self.tournament.name} (Round {self.round_number}).",
-            priority='normal',
-            is_pinned=False
-        )
+        return ScoreReportingService.report_match(self, score_p1, score_p2, reporter)
     
     def progress_bracket(self):
-        """Move winner/loser to next matches"""
+        """Move winner/loser to next matches (each save publishes a bracket delta)"""
         if self.next_match_winner and self.winner:
             # Assign winner to next match
             if not self.next_match_winner.participant1:
@@ -913,4 +783,48 @@ class WebhookEvent(models.Model):
         ordering = ['-received_at']
 
     def __str__(self):
-        return f"WebhookEvent {self.provider} @ {self.received_at.isoformat()}"
\ No newline at end of file
+        return f"WebhookEvent {self.provider} @ {self.received_at.isoformat()}"
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Materialized leaderboard row for a player or team.
+    One row per subject across all games (game is NULL) plus one per game.
+    Maintained by LeaderboardService; rebuild with `manage.py rebuild_leaderboard`.
+    """
+    
+    ENTRY_TYPE_CHOICES = [
+        ('player', 'Player'),
+        ('team', 'Team'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    key = models.CharField(max_length=100, unique=True)  # "<type>:<subject id>:<game id or 'all'>"
+    entry_type = models.CharField(max_length=10, choices=ENTRY_TYPE_CHOICES)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True,
+                             related_name='leaderboard_entries')
+    team = models.ForeignKey(Team, on_delete=models.CASCADE, null=True, blank=True,
+                             related_name='leaderboard_entries')
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, null=True, blank=True,
+                             related_name='leaderboard_entries')
+    
+    total_wins = models.IntegerField(default=0)
+    total_losses = models.IntegerField(default=0)
+    tournaments_played = models.IntegerField(default=0)
+    total_prize = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'tournament_leaderboard_entries'
+        ordering = ['-total_wins', '-tournaments_played']
+        indexes = [
+            models.Index(fields=['entry_type', 'game', '-total_wins', '-tournaments_played'],
+                         name='leaderboard_rank_idx'),
+            models.Index(fields=['user']),
+            models.Index(fields=['team']),
+        ]
+        verbose_name_plural = 'Leaderboard entries'
+    
+    def __str__(self):
+        return f"{self.key}: {self.total_wins}W {self.total_losses}L"
@@ -89,7 +89,7 @@ def send_tournament_status_change_notification(tournament, old_status, new_statu
     Requirements: 7.5
     """
     # Get all participants
-    participants = tournament.participants.all()
+    participants = tournament.participants.select_related('user', 'team__captain')
     
     # Define status change messages
     status_messages = {
@@ -127,22 +127,19 @@ def send_tournament_status_change_notification(tournament, old_status, new_statu
     action_url = reverse('tournaments:detail', kwargs={'slug': tournament.slug})
     
     # Send to all participants
-    for participant in participants:
-        user = participant.user if participant.user else participant.team.captain
-        
-        Notification.create_notification(
-            user=user,
-            title=notification_info['title'],
-            message=notification_info['message'],
-            notification_type='tournament',
-            priority=notification_info['priority'],
-            content_object=tournament,
-            action_url=action_url,
-            delivery_methods=['in_app', 'email'],
-            tournament_id=str(tournament.id),
-            old_status=old_status,
-            new_status=new_status
-        )
+    Notification.create_bulk(
+        [participant.user if participant.user else participant.team.captain for participant in participants],
+        title=notification_info['title'],
+        message=notification_info['message'],
+        notification_type='tournament',
+        priority=notification_info['priority'],
+        content_object=tournament,
+        action_url=action_url,
+        delivery_methods=['in_app', 'email'],
+        tournament_id=str(tournament.id),
+        old_status=old_status,
+        new_status=new_status
+    )
 
 
 def send_dispute_notification_to_admins(dispute):
@@ -169,20 +166,19 @@ def send_dispute_notification_to_admins(dispute):
     action_url = f"/admin/tournaments/matchdispute/{dispute.id}/change/"
     
     # Send to all admins
-    for admin in admins:
-        Notification.create_notification(
-            user=admin,
-            title=title,
-            message=message,
-            notification_type='tournament',
-            priority='high',
-            content_object=dispute,
-            action_url=action_url,
-            delivery_methods=['in_app', 'email'],
-            dispute_id=str(dispute.id),
-            match_id=str(match.id),
-            tournament_id=str(tournament.id)
-        )
+    Notification.create_bulk(
+        admins,
+        title=title,
+        message=message,
+        notification_type='tournament',
+        priority='high',
+        content_object=dispute,
+        action_url=action_url,
+        delivery_methods=['in_app', 'email'],
+        dispute_id=str(dispute.id),
+        match_id=str(match.id),
+        tournament_id=str(tournament.id)
+    )
 
 
 def send_match_result_notification(match):
@@ -10,11 +10,11 @@ from django.utils.html import escape
 from django.contrib.auth.decorators import login_required
 from django.http import HttpResponseForbidden
 from django.conf import settings
-from django.core.cache import cache
-from django.utils import timezone
 from functools import wraps
 import logging
 
+from core.rate_limit import RateLimiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -271,50 +271,39 @@ def require_tournament_permission(permission_type):
 class ShareTrackingRateLimit:
     """
     Rate limiting for share tracking to prevent spam.
+    Allows 10 shares per hour per IP, 20 per hour per authenticated user,
+    counted with the shared sliding-window limiter (``core.rate_limit``).
     """
     
-    @staticmethod
-    def is_rate_limited(ip_address, user_id=None):
+    WINDOW = 3600  # 1 hour
+    IP_LIMIT = 10
+    USER_LIMIT = 20
+    
+    @classmethod
+    def check_and_increment(cls, ip_address, user_id=None):
         """
-        Check if IP/user is rate limited for share tracking.
-        Allows 10 shares per hour per IP, 20 per hour per authenticated user.
+        Count a share attempt in one step.
+        Returns True if it exceeds a limit (rejected attempts are not counted).
         """
-        current_time = timezone.now()
-        hour_key = current_time.strftime('%Y%m%d%H')
-        
-        # Check IP-based rate limit
-        ip_key = f"share_rate_limit_ip_{ip_address}_{hour_key}"
-        ip_count = cache.get(ip_key, 0)
-        
-        if ip_count >= 10:  # 10 shares per hour per IP
+        if not RateLimiter.hit('share:ip', ip_address, cls.IP_LIMIT, cls.WINDOW).allowed:
+            return True
+        if user_id and not RateLimiter.hit('share:user', user_id, cls.USER_LIMIT, cls.WINDOW).allowed:
             return True
-        
-        # Check user-based rate limit for authenticated users
-        if user_id:
-            user_key = f"share_rate_limit_user_{user_id}_{hour_key}"
-            user_count = cache.get(user_key, 0)
-            
-            if user_count >= 20:  # 20 shares per hour per user
-                return True
-        
         return False
     
-    @staticmethod
-    def increment_rate_limit(ip_address, user_id=None):
+    @classmethod
+    def is_rate_limited(cls, ip_address, user_id=None):
+        """
+        Check if IP/user is rate limited for share tracking, without counting.
+        """
+        if RateLimiter.is_limited('share:ip', ip_address, cls.IP_LIMIT, cls.WINDOW):
+            return True
+        return bool(user_id) and RateLimiter.is_limited('share:user', user_id, cls.USER_LIMIT, cls.WINDOW)
+    
+    @classmethod
+    def increment_rate_limit(cls, ip_address, user_id=None):
         """Increment rate limit counters."""
-        current_time = timezone.now()
-        hour_key = current_time.strftime('%Y%m%d%H')
-        
-        # Increment IP counter
-        ip_key = f"share_rate_limit_ip_{ip_address}_{hour_key}"
-        ip_count = cache.get(ip_key, 0)
-        cache.set(ip_key, ip_count + 1, 3600)  # 1 hour timeout
-        
-        # Increment user counter for authenticated users
-        if user_id:
-            user_key = f"share_rate_limit_user_{user_id}_{hour_key}"
-            user_count = cache.get(user_key, 0)
-            cache.set(user_key, user_count + 1, 3600)  # 1 hour timeout
+        cls.check_and_increment(ip_address, user_id)
 
 
 def sanitize_tournament_data(data):
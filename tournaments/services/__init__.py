@@ -1,3 +1,10 @@
 from .bracket_generator import BracketGenerator
+from .leaderboard import LeaderboardService
+from .score_reporting import ScoreReportingService
+from .seeding import SeedingService
+from .standings import StandingsService
 
-__all__ = ['BracketGenerator']
\ No newline at end of file
+__all__ = [
+    'BracketGenerator', 'LeaderboardService', 'ScoreReportingService',
+    'SeedingService', 'StandingsService',
+]
@@ -1,36 +1,35 @@
-import random
 import math
+from itertools import groupby
 from typing import List
+from django.db import transaction
+from django.db.models import Max
+from ..bracket_snapshot import BracketSnapshot
+from ..cache_utils import TournamentCache
 from ..models import Tournament, Participant, Bracket, Match
+from .seeding import SeedingService
+from .standings import StandingsService, StandingsTable, pair_swiss_round
 
 
 class BracketGenerator:
-    """Generate tournament brackets based on format"""
+    """Generate tournament brackets based on format.
+
+    Elimination brackets are built as an in-memory graph of unsaved ``Match``
+    instances (UUID primary keys are assigned on instantiation, so
+    ``next_match_winner``/``next_match_loser`` can be wired before anything is
+    written). The graph is then persisted with a single ``bulk_create`` and
+    one cache invalidation, keeping the query count independent of bracket
+    size.
+    """
     
     def __init__(self, tournament: Tournament, participants: List[Participant]):
         self.tournament = tournament
         self.participants = participants
         self.participant_count = len(participants)
+        self._pending_matches = []
     
     def seed_participants(self):
         """Apply seeding based on tournament settings"""
-        if self.tournament.seeding_method == 'random':
-            random.shuffle(self.participants)
-        elif self.tournament.seeding_method == 'skill':
-            # Sort by skill rating (from UserGameProfile)
-            self.participants.sort(
-                key=lambda p: p.user.game_profiles.filter(
-                    game=self.tournament.game
-                ).first().skill_rating if p.user else 0,
-                reverse=True
-            )
-        elif self.tournament.seeding_method == 'registration':
-            self.participants.sort(key=lambda p: p.registered_at)
-        
-        # Assign seeds
-        for idx, participant in enumerate(self.participants, start=1):
-            participant.seed = idx
-            participant.save()
+        self.participants = SeedingService.seed(self.tournament, self.participants)
     
     def next_power_of_two(self, n: int) -> int:
         """Get next power of 2 for bracket size"""
@@ -42,6 +41,31 @@ class BracketGenerator:
         n = max(2, n)
         return 2 ** math.ceil(math.log2(n))
     
+    def _build_match(self, bracket, round_number, match_number, **fields):
+        """Instantiate an unsaved match and queue it for bulk insertion"""
+        match = Match(
+            tournament=self.tournament,
+            bracket=bracket,
+            round_number=round_number,
+            match_number=match_number,
+            **fields
+        )
+        self._pending_matches.append(match)
+        return match
+    
+    def _persist_matches(self):
+        """Write all queued matches in one bulk insert and invalidate cache once"""
+        # Matches are queued from the first round onwards, so every link
+        # points at a match queued later. Inserting in reverse order writes
+        # link targets before the rows that reference them.
+        pending = list(reversed(self._pending_matches))
+        self._pending_matches = []
+        Match.objects.bulk_create(pending)
+        TournamentCache.invalidate_tournament_cache(self.tournament.id)
+        tournament_id = self.tournament.id
+        transaction.on_commit(lambda: BracketSnapshot.invalidate(tournament_id))
+        return pending
+    
     def generate_single_elimination(self):
         """Generate single elimination bracket"""
         # Validate minimum participants
@@ -74,12 +98,7 @@ class BracketGenerator:
         
         participant_idx = 0
         for match_num in range(round_1_matches):
-            match = Match.objects.create(
-                tournament=self.tournament,
-                bracket=bracket,
-                round_number=1,
-                match_number=match_num + 1
-            )
+            match = self._build_match(bracket, 1, match_num + 1)
             
             # Assign participants with bye logic
             if participant_idx < self.participant_count:
@@ -99,7 +118,6 @@ class BracketGenerator:
             elif match.is_ready:
                 match.status = 'ready'
             
-            match.save()
             matches_by_round[1].append(match)
         
         # Create subsequent rounds
@@ -108,11 +126,8 @@ class BracketGenerator:
             matches_by_round[round_num] = []
             
             for match_num in range(matches_in_round):
-                match = Match.objects.create(
-                    tournament=self.tournament,
-                    bracket=bracket,
-                    round_number=round_num,
-                    match_number=match_num + 1,
+                match = self._build_match(
+                    bracket, round_num, match_num + 1,
                     is_grand_finals=(round_num == total_rounds)
                 )
                 matches_by_round[round_num].append(match)
@@ -125,8 +140,8 @@ class BracketGenerator:
             for idx, match in enumerate(current_round):
                 next_match_idx = idx // 2
                 match.next_match_winner = next_round[next_match_idx]
-                match.save()
         
+        self._persist_matches()
         return bracket
     
     def generate_double_elimination(self):
@@ -172,21 +187,17 @@ class BracketGenerator:
         self._link_double_elimination(winners_matches, losers_matches)
         
         # Create grand finals
-        grand_finals = Match.objects.create(
-            tournament=self.tournament,
-            bracket=winners_bracket,
-            round_number=winners_rounds + 1,
-            match_number=1,
+        grand_finals = self._build_match(
+            winners_bracket, winners_rounds + 1, 1,
             is_grand_finals=True
         )
         
         # Link final matches to grand finals
         winners_matches[winners_rounds][-1].next_match_winner = grand_finals
-        losers_matches[losers_rounds][-1].next_match_winner = grand_finals
-        
-        winners_matches[winners_rounds][-1].save()
-        losers_matches[losers_rounds][-1].save()
+        if losers_matches:
+            losers_matches[losers_rounds][-1].next_match_winner = grand_finals
         
+        self._persist_matches()
         return winners_bracket, losers_bracket
     
     def _generate_bracket_rounds(self, bracket, bracket_size, total_rounds):
@@ -199,12 +210,7 @@ class BracketGenerator:
         
         participant_idx = 0
         for match_num in range(round_1_matches):
-            match = Match.objects.create(
-                tournament=self.tournament,
-                bracket=bracket,
-                round_number=1,
-                match_number=match_num + 1
-            )
+            match = self._build_match(bracket, 1, match_num + 1)
             
             if participant_idx < self.participant_count:
                 match.participant1 = self.participants[participant_idx]
@@ -220,7 +226,6 @@ class BracketGenerator:
             elif match.is_ready:
                 match.status = 'ready'
             
-            match.save()
             matches_by_round[1].append(match)
         
         # Subsequent rounds
@@ -229,12 +234,7 @@ class BracketGenerator:
             matches_by_round[round_num] = []
             
             for match_num in range(matches_in_round):
-                match = Match.objects.create(
-                    tournament=self.tournament,
-                    bracket=bracket,
-                    round_number=round_num,
-                    match_number=match_num + 1
-                )
+                match = self._build_match(bracket, round_num, match_num + 1)
                 matches_by_round[round_num].append(match)
         
         # Link matches
@@ -242,7 +242,6 @@ class BracketGenerator:
             for idx, match in enumerate(matches_by_round[round_num]):
                 next_match_idx = idx // 2
                 match.next_match_winner = matches_by_round[round_num + 1][next_match_idx]
-                match.save()
         
         return matches_by_round
     
@@ -260,12 +259,7 @@ class BracketGenerator:
             matches_by_round[round_num] = []
             
             for match_num in range(matches_in_round):
-                match = Match.objects.create(
-                    tournament=self.tournament,
-                    bracket=bracket,
-                    round_number=round_num,
-                    match_number=match_num + 1
-                )
+                match = self._build_match(bracket, round_num, match_num + 1)
                 matches_by_round[round_num].append(match)
         
         # Link losers bracket matches
@@ -275,7 +269,6 @@ class BracketGenerator:
                     next_idx = idx // 2 if round_num % 2 == 0 else idx
                     if next_idx < len(matches_by_round[round_num + 1]):
                         match.next_match_winner = matches_by_round[round_num + 1][next_idx]
-                        match.save()
         
         return matches_by_round
     
@@ -287,7 +280,6 @@ class BracketGenerator:
                 for idx, match in enumerate(winners_matches[1]):
                     if idx < len(losers_matches.get(1, [])):
                         match.next_match_loser = losers_matches[1][idx]
-                        match.save()
             else:
                 # Subsequent rounds feed into losers bracket
                 losers_round = (round_num - 1) * 2
@@ -295,7 +287,6 @@ class BracketGenerator:
                     for idx, match in enumerate(winners_matches[round_num]):
                         if idx < len(losers_matches[losers_round]):
                             match.next_match_loser = losers_matches[losers_round][idx]
-                            match.save()
     
     def generate_swiss_rounds(self):
         """Generate Swiss system rounds"""
@@ -322,53 +313,59 @@ class BracketGenerator:
         
         return bracket
     
+    def generate_next_swiss_round(self, bracket=None):
+        """Pair the next Swiss round from the current standings"""
+        if bracket is None:
+            bracket = Bracket.objects.get(tournament=self.tournament, name='Swiss Rounds')
+        last_round = Match.objects.filter(bracket=bracket).aggregate(
+            last=Max('round_number')
+        )['last'] or 0
+        if last_round >= bracket.total_rounds:
+            raise ValueError("All Swiss rounds have been generated")
+        return self._generate_swiss_round(bracket, last_round + 1)
+    
     def _generate_swiss_round(self, bracket, round_number):
-        """Generate pairings for a Swiss round"""
-        # Get participants sorted by current score
-        participants = sorted(
-            self.participants,
-            key=lambda p: (p.matches_won, p.games_won),
-            reverse=True
-        )
+        """Generate pairings for a Swiss round by score groups, avoiding rematches"""
+        # Completed results are read in one query; round 1 starts from an empty table
+        if round_number == 1:
+            table = StandingsTable()
+        else:
+            table = StandingsService.rebuild(self.tournament.id)
+        
+        by_id = {p.id: p for p in self.participants}
+        seeds = {p.id: p.seed for p in self.participants}
+        ranked = [
+            row for row in table.ranking(by_id, seeds)
+            if row['participant_id'] in by_id
+        ]
+        score_groups = [
+            [row['participant_id'] for row in rows]
+            for _, rows in groupby(ranked, key=lambda row: row['score'])
+        ]
+        byes = [pid for pid, row in table.rows.items() if row['byes']]
+        pairs, bye_id = pair_swiss_round(score_groups, table.played_pairs(), byes)
+        
+        for match_number, (p1, p2) in enumerate(pairs, start=1):
+            self._build_match(
+                bracket, round_number, match_number,
+                participant1=by_id[p1],
+                participant2=by_id[p2],
+                status='ready'
+            )
         
-        # Pair adjacent participants
-        matches_created = []
-        used_participants = set()
-        
-        for i in range(0, len(participants) - 1, 2):
-            if participants[i] not in used_participants and participants[i + 1] not in used_participants:
-                match = Match.objects.create(
-                    tournament=self.tournament,
-                    bracket=bracket,
-                    round_number=round_number,
-                    match_number=len(matches_created) + 1,
-                    participant1=participants[i],
-                    participant2=participants[i + 1],
-                    status='ready'
-                )
-                matches_created.append(match)
-                used_participants.add(participants[i])
-                used_participants.add(participants[i + 1])
-        
-        # Handle odd participant (bye)
-        if len(participants) % 2 == 1:
-            bye_participant = [p for p in participants if p not in used_participants][0]
-            match = Match.objects.create(
-                tournament=self.tournament,
-                bracket=bracket,
-                round_number=round_number,
-                match_number=len(matches_created) + 1,
-                participant1=bye_participant,
+        if bye_id is not None:
+            self._build_match(
+                bracket, round_number, len(pairs) + 1,
+                participant1=by_id[bye_id],
                 status='completed',
-                winner=bye_participant,
+                winner=by_id[bye_id],
                 score_p1=1
             )
-            matches_created.append(match)
         
-        return matches_created
+        return list(reversed(self._persist_matches()))
     
     def generate_round_robin(self):
-        """Generate round robin all-vs-all matches"""
+        """Generate round robin all-vs-all matches with the circle method"""
         # Validate minimum participants
         if self.participant_count < 2:
             raise ValueError("Round robin requires at least 2 participants")
@@ -385,21 +382,28 @@ class BracketGenerator:
             total_rounds=total_rounds
         )
         
-        # Generate all matchups
-        for i, p1 in enumerate(self.participants):
-            for j, p2 in enumerate(self.participants[i + 1:], start=i + 1):
-                round_num = (i + j) % total_rounds + 1
-                
-                Match.objects.create(
-                    tournament=self.tournament,
-                    bracket=bracket,
-                    round_number=round_num,
-                    match_number=Match.objects.filter(
-                        bracket=bracket, round_number=round_num
-                    ).count() + 1,
+        # Fix the first slot and rotate the rest; None is the bye slot for odd fields
+        slots = list(self.participants)
+        if n % 2:
+            slots.append(None)
+        half = len(slots) // 2
+        
+        for round_num in range(1, total_rounds + 1):
+            match_number = 0
+            for i in range(half):
+                p1, p2 = slots[i], slots[-1 - i]
+                if p1 is None or p2 is None:
+                    continue
+                if p1.seed and p2.seed and p2.seed < p1.seed:
+                    p1, p2 = p2, p1
+                match_number += 1
+                self._build_match(
+                    bracket, round_num, match_number,
                     participant1=p1,
                     participant2=p2,
                     status='ready'
                 )
+            slots = [slots[0], slots[-1]] + slots[1:-1]
         
-        return bracket
\ No newline at end of file
+        self._persist_matches()
+        return bracket
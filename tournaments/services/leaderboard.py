@@ -0,0 +1,188 @@
+"""
+Materialized player and team leaderboards.
+
+LeaderboardEntry rows hold each subject's totals over confirmed
+participations in public tournaments, once across all games and once per
+game. Rows are refreshed per affected player/team when a match completes or
+participant records change (prizes, status), so the leaderboard page only
+does indexed top-N reads instead of aggregating every participant.
+"""
+
+import logging
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from ..models import LeaderboardEntry, Participant
+
+logger = logging.getLogger(__name__)
+
+# Entry type -> Participant field holding the subject
+SUBJECT_FIELDS = {
+    'player': 'user',
+    'team': 'team',
+}
+
+STAT_FIELDS = ['total_wins', 'total_losses', 'tournaments_played', 'total_prize']
+
+
+class LeaderboardService:
+    """Read, incrementally refresh, rebuild and verify the leaderboard store"""
+
+    TOP_N = 20
+    BATCH_SIZE = 500
+
+    @classmethod
+    def top_players(cls, game=None, limit=TOP_N):
+        """Top players by wins, shaped like the former live aggregation rows"""
+        return cls._top('player', game, limit).values(
+            'user__id', 'user__username', 'user__display_name', 'user__avatar',
+            *STAT_FIELDS
+        )
+
+    @classmethod
+    def top_teams(cls, game=None, limit=TOP_N):
+        """Top teams by wins, shaped like the former live aggregation rows"""
+        return cls._top('team', game, limit).values(
+            'team__id', 'team__name', 'team__tag', 'team__logo',
+            *STAT_FIELDS
+        )
+
+    @classmethod
+    def _top(cls, entry_type, game, limit):
+        entries = LeaderboardEntry.objects.filter(entry_type=entry_type, total_wins__gt=0)
+        if game is None:
+            entries = entries.filter(game__isnull=True)
+        else:
+            entries = entries.filter(game=game)
+        return entries.order_by('-total_wins', '-tournaments_played')[:limit]
+
+    @classmethod
+    def refresh_for_participants(cls, participant_ids):
+        """Refresh the rows of every player and team behind the given participants"""
+        user_ids, team_ids = set(), set()
+        for user_id, team_id in Participant.objects.filter(
+            id__in=list(participant_ids)
+        ).values_list('user_id', 'team_id'):
+            if user_id:
+                user_ids.add(user_id)
+            if team_id:
+                team_ids.add(team_id)
+        cls.refresh(user_ids=user_ids, team_ids=team_ids)
+
+    @classmethod
+    def refresh(cls, user_ids=(), team_ids=()):
+        """
+        Recompute the rows of specific players and teams.
+        Cost depends on the subjects' own participations, not on the size of
+        the whole leaderboard.
+        """
+        for entry_type, subject_ids in (('player', user_ids), ('team', team_ids)):
+            subject_ids = {subject_id for subject_id in subject_ids if subject_id}
+            if not subject_ids:
+                continue
+
+            field = SUBJECT_FIELDS[entry_type]
+            rows = cls.compute_rows(entry_type, subject_ids)
+
+            with transaction.atomic():
+                # Subjects that dropped out of a game (or entirely) lose those rows
+                LeaderboardEntry.objects.filter(
+                    entry_type=entry_type,
+                    **{f'{field}_id__in': subject_ids}
+                ).exclude(key__in=list(rows)).delete()
+
+                LeaderboardEntry.objects.bulk_create(
+                    rows.values(),
+                    batch_size=cls.BATCH_SIZE,
+                    update_conflicts=True,
+                    unique_fields=['key'],
+                    update_fields=STAT_FIELDS + ['updated_at'],
+                )
+
+    @classmethod
+    def rebuild(cls):
+        """Replace the whole store with a fresh aggregation; returns the row count"""
+        rows = [
+            row
+            for entry_type in SUBJECT_FIELDS
+            for row in cls.compute_rows(entry_type).values()
+        ]
+        with transaction.atomic():
+            LeaderboardEntry.objects.all().delete()
+            LeaderboardEntry.objects.bulk_create(rows, batch_size=cls.BATCH_SIZE)
+        return len(rows)
+
+    @classmethod
+    def verify(cls):
+        """
+        Compare the store with the live aggregation.
+        Returns a list of ``(key, stored, expected)`` mismatches, where either
+        side is None for rows missing on that side.
+        """
+        expected = {
+            key: tuple(getattr(row, field) for field in STAT_FIELDS)
+            for entry_type in SUBJECT_FIELDS
+            for key, row in cls.compute_rows(entry_type).items()
+        }
+        stored = {
+            row[0]: tuple(row[1:])
+            for row in LeaderboardEntry.objects.values_list('key', *STAT_FIELDS)
+        }
+        return [
+            (key, stored.get(key), expected.get(key))
+            for key in sorted(expected.keys() | stored.keys())
+            if stored.get(key) != expected.get(key)
+        ]
+
+    @classmethod
+    def compute_rows(cls, entry_type, subject_ids=None):
+        """
+        Aggregate participations into unsaved LeaderboardEntry rows keyed by
+        ``key``: one per (subject, game) plus an all-games row per subject.
+        """
+        field = SUBJECT_FIELDS[entry_type]
+        participants = Participant.objects.filter(
+            status='confirmed',
+            tournament__is_public=True,
+            **{f'{field}__isnull': False}
+        )
+        if subject_ids is not None:
+            participants = participants.filter(**{f'{field}_id__in': list(subject_ids)})
+
+        totals = defaultdict(lambda: [0, 0, 0, Decimal('0.00')])
+        for row in participants.values(f'{field}_id', 'tournament__game_id').annotate(
+            wins=Sum('matches_won'),
+            losses=Sum('matches_lost'),
+            played=Count('tournament', distinct=True),
+            prize=Sum('prize_won'),
+        ):
+            subject_id = row[f'{field}_id']
+            # A tournament belongs to one game, so per-game counts add up
+            for game_id in (row['tournament__game_id'], None):
+                total = totals[(subject_id, game_id)]
+                total[0] += row['wins'] or 0
+                total[1] += row['losses'] or 0
+                total[2] += row['played'] or 0
+                total[3] += row['prize'] or Decimal('0.00')
+
+        rows = {}
+        for (subject_id, game_id), (wins, losses, played, prize) in totals.items():
+            key = cls.make_key(entry_type, subject_id, game_id)
+            rows[key] = LeaderboardEntry(
+                key=key,
+                entry_type=entry_type,
+                game_id=game_id,
+                total_wins=wins,
+                total_losses=losses,
+                tournaments_played=played,
+                total_prize=Decimal(prize).quantize(Decimal('0.01')),
+                **{f'{field}_id': subject_id}
+            )
+        return rows
+
+    @staticmethod
+    def make_key(entry_type, subject_id, game_id=None):
+        return f"{entry_type}:{subject_id}:{game_id or 'all'}"
@@ -0,0 +1,321 @@
+"""
+Batched, transactional match score reporting.
+
+All row updates for a batch of results (matches, participant records, bracket
+progression and, for team events, team/member statistics and result
+announcements) are applied inside one transaction using ``F()`` expressions
+and ``bulk_update``. Side effects that should only follow a committed result
+(cache invalidation, live updates, leaderboard refresh, achievement checks)
+run once from a single ``on_commit`` hook for the whole batch.
+"""
+
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from ..bracket_snapshot import record_bracket_changes
+from ..cache_utils import TournamentCache
+from ..models import Match, Participant
+from .leaderboard import LeaderboardService
+
+logger = logging.getLogger(__name__)
+
+MATCH_UPDATE_FIELDS = [
+    'score_p1', 'score_p2', 'winner', 'loser', 'status', 'completed_at',
+    'participant1', 'participant2', 'updated_at',
+]
+
+
+def _delta_case(deltas, index, key='id'):
+    """Per-row increment expression: CASE WHEN <key>=x THEN dx ... ELSE 0"""
+    return Case(
+        *[When(**{key: row_id}, then=Value(delta[index])) for row_id, delta in deltas.items()],
+        default=Value(0),
+        output_field=IntegerField()
+    )
+
+
+class ScoreReportingService:
+    """Record match results individually or a whole round at a time"""
+
+    @classmethod
+    def report_match(cls, match, score_p1, score_p2, reporter=None):
+        """
+        Report a single match result.
+        Returns ``(success, message)`` and updates ``match`` in place.
+        """
+        result = cls.report_results([(match, score_p1, score_p2)], reporter=reporter)[0]
+        return result['success'], result['message']
+
+    @classmethod
+    def report_results(cls, results, reporter=None, tournament=None):
+        """
+        Report a batch of match results in one transaction.
+
+        Args:
+            results: iterable of ``(match_or_match_id, score_p1, score_p2)``
+            reporter: user submitting the results
+            tournament: if given, matches from other tournaments are rejected
+
+        Returns:
+            One ``{'match_id', 'success', 'message'}`` dict per input row, in order.
+        """
+        results = list(results)
+        match_ids = [getattr(item, 'pk', item) for item, _, _ in results]
+
+        with transaction.atomic():
+            queryset = Match.objects.select_for_update(of=('self',)).select_related(
+                'tournament',
+                'participant1__user', 'participant1__team',
+                'participant2__user', 'participant2__team',
+            )
+            if tournament is not None:
+                queryset = queryset.filter(tournament=tournament)
+            matches = {match.id: match for match in queryset.filter(id__in=match_ids)}
+
+            outcomes = []
+            completed = []
+            for match_id, (_, score_p1, score_p2) in zip(match_ids, results):
+                match = matches.get(match_id)
+                success, message = cls._apply_result(match, score_p1, score_p2)
+                outcomes.append({'match_id': str(match_id), 'success': success, 'message': message})
+                if success:
+                    completed.append(match)
+
+            if completed:
+                cls._write_batch(completed, matches)
+
+        # Reflect the committed state on caller-provided instances
+        for (item, _, _), outcome in zip(results, outcomes):
+            if isinstance(item, Match) and outcome['success']:
+                cls._sync_instance(item, matches[item.pk])
+
+        return outcomes
+
+    @staticmethod
+    def _apply_result(match, score_p1, score_p2):
+        """Validate a result and apply it to the in-memory match"""
+        if match is None:
+            return False, "Match not found"
+
+        if match.status == 'completed':
+            return False, "Match already completed"
+
+        if not match.is_ready:
+            return False, "Both participants must be assigned"
+
+        if score_p1 == score_p2:
+            return False, "Scores cannot be tied"
+
+        match.score_p1 = score_p1
+        match.score_p2 = score_p2
+
+        if score_p1 > score_p2:
+            match.winner, match.loser = match.participant1, match.participant2
+        else:
+            match.winner, match.loser = match.participant2, match.participant1
+
+        match.status = 'completed'
+        match.completed_at = timezone.now()
+        return True, "Match result recorded"
+
+    @classmethod
+    def _write_batch(cls, completed, matches):
+        """Apply every row update for the completed matches"""
+        now = timezone.now()
+
+        # Bracket progression: lock every target match in one query, then
+        # fill slots in reporting order so matches feeding the same target
+        # (e.g. a whole round) land in consistent slots.
+        target_ids = {
+            target_id
+            for match in completed
+            for target_id in (match.next_match_winner_id, match.next_match_loser_id)
+            if target_id and target_id not in matches
+        }
+        if target_ids:
+            matches.update({
+                target.id: target
+                for target in Match.objects.select_for_update().filter(id__in=target_ids)
+            })
+
+        touched = {match.id: match for match in completed}
+        for match in completed:
+            for target_id, participant in ((match.next_match_winner_id, match.winner),
+                                           (match.next_match_loser_id, match.loser)):
+                target = matches.get(target_id) if target_id else None
+                if target is None or participant is None:
+                    continue
+                if not target.participant1_id:
+                    target.participant1 = participant
+                elif not target.participant2_id:
+                    target.participant2 = participant
+                touched[target.id] = target
+
+        for match in touched.values():
+            match.updated_at = now
+        Match.objects.bulk_update(list(touched.values()), MATCH_UPDATE_FIELDS)
+
+        # Participant records: one UPDATE for the whole batch
+        # delta = [matches_won, matches_lost, games_won, games_lost]
+        participant_deltas = defaultdict(lambda: [0, 0, 0, 0])
+        for match in completed:
+            for participant, games_won, games_lost in (
+                (match.participant1, match.score_p1, match.score_p2),
+                (match.participant2, match.score_p2, match.score_p1),
+            ):
+                delta = participant_deltas[participant.id]
+                delta[0] += 1 if participant.id == match.winner_id else 0
+                delta[1] += 1 if participant.id == match.loser_id else 0
+                delta[2] += games_won
+                delta[3] += games_lost
+
+        Participant.objects.filter(id__in=participant_deltas).update(
+            matches_won=F('matches_won') + _delta_case(participant_deltas, 0),
+            matches_lost=F('matches_lost') + _delta_case(participant_deltas, 1),
+            games_won=F('games_won') + _delta_case(participant_deltas, 2),
+            games_lost=F('games_lost') + _delta_case(participant_deltas, 3),
+            updated_at=now,
+        )
+
+        # Keep the loaded participant objects consistent with the database
+        for match in completed:
+            for participant in (match.participant1, match.participant2):
+                cls._apply_participant_delta(participant, participant_deltas[participant.id])
+
+        team_matches = [match for match in completed if match.tournament.is_team_based]
+        teams = cls._write_team_statistics(team_matches) if team_matches else []
+
+        tournament_ids = {match.tournament_id for match in completed}
+        transaction.on_commit(
+            lambda: cls._after_commit(tournament_ids, list(touched.values()),
+                                      list(participant_deltas), teams)
+        )
+
+    @staticmethod
+    def _apply_participant_delta(participant, delta):
+        if getattr(participant, '_score_delta_applied', None) is delta:
+            return
+        participant.matches_won += delta[0]
+        participant.matches_lost += delta[1]
+        participant.games_won += delta[2]
+        participant.games_lost += delta[3]
+        participant._score_delta_applied = delta
+
+    @staticmethod
+    def _write_team_statistics(team_matches):
+        """Team and active member statistics plus result announcements (Requirement 13.3, 13.4)"""
+        from teams.models import Team, TeamMember, TeamAnnouncement
+
+        # delta = [wins, losses]
+        team_deltas = defaultdict(lambda: [0, 0])
+        announcements = []
+        teams = {}
+
+        for match in team_matches:
+            for participant, opponent, own_score, opponent_score in (
+                (match.participant1, match.participant2, match.score_p1, match.score_p2),
+                (match.participant2, match.participant1, match.score_p2, match.score_p1),
+            ):
+                if not participant.team_id:
+                    continue
+
+                team = participant.team
+                teams[team.id] = team
+                is_winner = participant.id == match.winner_id
+                team_deltas[team.id][0 if is_winner else 1] += 1
+
+                result_text = "won" if is_winner else "lost"
+                opponent_name = opponent.display_name if opponent else "Unknown"
+                announcements.append(TeamAnnouncement(
+                    team=team,
+                    posted_by_id=team.captain_id,
+                    title=f"Match Result: {result_text.title()} vs {opponent_name}",
+                    content=(
+                        f"The team {result_text} against {opponent_name} with a score of "
+                        f"{own_score}-{opponent_score} in {match.tournament.name} "
+                        f"(Round {match.round_number})."
+                    ),
+                    priority='normal',
+                    is_pinned=False
+                ))
+
+        if not team_deltas:
+            return []
+
+        Team.objects.filter(id__in=team_deltas).update(
+            total_wins=F('total_wins') + _delta_case(team_deltas, 0),
+            total_losses=F('total_losses') + _delta_case(team_deltas, 1),
+        )
+
+        # All active team members get credit for the match
+        played = {team_id: [wins + losses] for team_id, (wins, losses) in team_deltas.items()}
+        TeamMember.objects.filter(team_id__in=team_deltas, status='active').update(
+            matches_played=F('matches_played') + _delta_case(played, 0, key='team_id'),
+            matches_won=F('matches_won') + _delta_case(team_deltas, 0, key='team_id'),
+        )
+
+        TeamAnnouncement.objects.bulk_create(announcements)
+        return list(teams.values())
+
+    @staticmethod
+    def _after_commit(tournament_ids, matches, participant_ids, teams):
+        """Single post-commit hook: cache, live updates, bracket snapshots, leaderboard and achievements"""
+        from ..live_updates import publish_match_update, publish_participant_update
+
+        for tournament_id in tournament_ids:
+            TournamentCache.invalidate_tournament_cache(tournament_id)
+
+        try:
+            for match in matches:
+                publish_match_update(match)
+            for participant in Participant.objects.select_related('tournament').filter(id__in=participant_ids):
+                publish_participant_update(participant)
+        except Exception as e:
+            logger.error(f"Error publishing score updates: {e}")
+
+        matches_by_tournament = defaultdict(list)
+        for match in matches:
+            matches_by_tournament[match.tournament_id].append(match)
+
+        for tournament_id, tournament_matches in matches_by_tournament.items():
+            record_bracket_changes(tournament_id, [match.id for match in tournament_matches])
+
+        try:
+            LeaderboardService.refresh_for_participants(participant_ids)
+        except Exception as e:
+            logger.error(f"Error refreshing leaderboard after score report: {e}")
+
+        if teams:
+            from teams.achievement_service import AchievementService
+            for team in teams:
+                try:
+                    AchievementService.check_win_streak_achievements(team)
+                except Exception as e:
+                    logger.error(f"Error checking win streak achievements for team {team.id}: {e}")
+
+    @staticmethod
+    def _sync_instance(instance, source):
+        """Copy reported state from the locked row onto the caller's instance"""
+        instance.score_p1 = source.score_p1
+        instance.score_p2 = source.score_p2
+        instance.status = source.status
+        instance.completed_at = source.completed_at
+        instance.updated_at = source.updated_at
+
+        # Reuse the caller's participant objects where possible
+        by_id = {
+            p.id: p for p in (instance.participant1, instance.participant2) if p is not None
+        }
+        for source_participant in (source.participant1, source.participant2):
+            caller_participant = by_id.get(source_participant.id)
+            if caller_participant is not None and caller_participant is not source_participant:
+                caller_participant.matches_won = source_participant.matches_won
+                caller_participant.matches_lost = source_participant.matches_lost
+                caller_participant.games_won = source_participant.games_won
+                caller_participant.games_lost = source_participant.games_lost
+        instance.winner = by_id.get(source.winner_id, source.winner)
+        instance.loser = by_id.get(source.loser_id, source.loser)
@@ -0,0 +1,163 @@
+"""
+Participant seeding.
+
+Seeding strategies order a tournament's participants; ``SeedingService``
+numbers them 1..n and persists the seeds with one ``bulk_update`` followed by
+a single cache invalidation. Skill seeding loads every rating it needs up
+front (one query for players, one for teams), so ordering never queries per
+participant, and participants without a game profile sort after rated ones
+instead of failing.
+
+Register extra strategies with ``SeedingService.register``. ``snake_groups``
+spreads a seeded list across groups (1-8-9-16 pattern) for group stages.
+"""
+
+import logging
+import random
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Avg, Q
+
+from ..cache_utils import TournamentCache
+from ..models import Participant
+
+logger = logging.getLogger(__name__)
+
+_EARLIEST = datetime.min.replace(tzinfo=dt_timezone.utc)
+
+
+def _registration_key(participant):
+    return participant.registered_at or _EARLIEST
+
+
+def seed_by_registration(tournament, participants):
+    """Earliest registration first"""
+    return sorted(participants, key=_registration_key)
+
+
+def seed_randomly(tournament, participants):
+    """Uniformly random order"""
+    ordered = list(participants)
+    random.shuffle(ordered)
+    return ordered
+
+
+def seed_manually(tournament, participants):
+    """Keep organizer-assigned seeds; unseeded participants follow by registration"""
+    return sorted(
+        participants,
+        key=lambda p: (p.seed is None, p.seed or 0, _registration_key(p))
+    )
+
+
+def seed_by_skill(tournament, participants):
+    """Highest rating first; unrated participants last, then registration order"""
+    ratings = load_ratings(tournament, participants)
+    return sorted(
+        participants,
+        key=lambda p: (-(ratings.get(p.id) or 0), _registration_key(p))
+    )
+
+
+def load_ratings(tournament, participants):
+    """
+    Skill rating per participant id for the tournament's game.
+
+    Players use their own ``UserGameProfile`` rating; teams use the average
+    rating of their active members. Participants without a rating are absent
+    from the result.
+    """
+    from core.models import UserGameProfile
+    from teams.models import TeamMember
+
+    user_ids = {p.user_id: p.id for p in participants if p.user_id}
+    team_ids = {p.team_id: p.id for p in participants if p.team_id and not p.user_id}
+    ratings = {}
+
+    if user_ids:
+        for user_id, rating in UserGameProfile.objects.filter(
+            game_id=tournament.game_id, user_id__in=user_ids
+        ).values_list('user_id', 'skill_rating'):
+            ratings[user_ids[user_id]] = rating
+
+    if team_ids:
+        team_ratings = TeamMember.objects.filter(
+            team_id__in=team_ids, status='active'
+        ).values('team_id').annotate(
+            rating=Avg(
+                'user__game_profiles__skill_rating',
+                filter=Q(user__game_profiles__game_id=tournament.game_id)
+            )
+        )
+        for row in team_ratings:
+            if row['rating'] is not None:
+                ratings[team_ids[row['team_id']]] = row['rating']
+
+    return ratings
+
+
+def snake_groups(participants, group_count):
+    """
+    Distribute seeded participants across groups in snake order.
+
+    With four groups, seeds 1-4 go to groups A-D, seeds 5-8 to D-A, and so
+    on, so every group gets a comparable spread of strength.
+    """
+    if group_count < 1:
+        raise ValueError("Snake seeding requires at least one group")
+
+    groups = [[] for _ in range(group_count)]
+    for index, participant in enumerate(participants):
+        lap, position = divmod(index, group_count)
+        groups[position if lap % 2 == 0 else group_count - 1 - position].append(participant)
+    return groups
+
+
+class SeedingService:
+    """Order participants with a named strategy and persist their seeds"""
+
+    STRATEGIES = {
+        'random': seed_randomly,
+        'skill': seed_by_skill,
+        'manual': seed_manually,
+        'registration': seed_by_registration,
+    }
+
+    @classmethod
+    def register(cls, name, strategy):
+        """Add or replace a strategy: ``strategy(tournament, participants) -> ordered list``"""
+        cls.STRATEGIES[name] = strategy
+        return strategy
+
+    @classmethod
+    def order(cls, tournament, participants, method=None):
+        """Participants ordered by ``method`` (default: the tournament's seeding method)"""
+        method = method or tournament.seeding_method
+        strategy = cls.STRATEGIES.get(method)
+        if strategy is None:
+            raise ValueError(f"Unknown seeding method: {method}")
+        return strategy(tournament, list(participants))
+
+    @classmethod
+    def seed(cls, tournament, participants, method=None):
+        """
+        Order participants, number them from 1 and save the seeds.
+
+        Returns the ordered list with ``seed`` set on each participant.
+        """
+        ordered = cls.order(tournament, participants, method)
+        for index, participant in enumerate(ordered, start=1):
+            participant.seed = index
+        cls.save_seeds(tournament, ordered)
+        return ordered
+
+    @classmethod
+    def save_seeds(cls, tournament, participants):
+        """Persist ``seed`` for all participants in one update and invalidate cache once"""
+        participants = list(participants)
+        if not participants:
+            return
+        with transaction.atomic():
+            Participant.objects.bulk_update(participants, ['seed'])
+        TournamentCache.invalidate_tournament_cache(tournament.id)
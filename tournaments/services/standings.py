@@ -0,0 +1,326 @@
+"""
+Incremental standings and Swiss pairing.
+
+``StandingsTable`` keeps score, win/draw/loss counts and the Buchholz and
+Sonneborn-Berger tiebreakers for every participant. Each result is applied
+in O(opponents) by pushing score changes to the participant's previous
+opponents, so tiebreakers never need a full recomputation as results arrive.
+
+``StandingsService`` builds a tournament's table from its completed matches
+in one query whenever standings are needed (next Swiss round, final
+placements), so it always reflects corrected and regenerated results.
+
+``pair_swiss_round`` pairs a Swiss round by score groups: each group (plus
+players floated down from the group above) is split into halves and matched
+top-half against bottom-half with augmenting paths, so rematches are avoided
+whenever the group allows it without trying permutations. Players left over
+at the bottom are re-paired with a bounded exhaustive search before any
+rematch is accepted.
+"""
+
+import logging
+from collections import defaultdict, deque
+
+
+logger = logging.getLogger(__name__)
+
+WIN, DRAW, LOSS = 1.0, 0.5, 0.0
+
+# Largest bottom-board pool re-paired exhaustively before allowing rematches
+MAX_REPAIR_POOL = 12
+
+
+class StandingsTable:
+    """
+    Score and tiebreak table updated one result at a time.
+
+    For a game between ``a`` and ``b`` where ``a`` scores ``r``:
+    Buchholz(a) is the sum of a's opponents' scores and Sonneborn-Berger(a)
+    is the sum of each opponent's score weighted by a's result against them.
+    When a's score changes by ``d``, every opponent ``o`` of a gains ``d`` in
+    Buchholz and ``d * result(o vs a)`` in Sonneborn-Berger.
+    """
+
+    def __init__(self):
+        self.rows = {}
+        # participant_id -> [(opponent_id, participant's result)]
+        self.opponents = defaultdict(list)
+        # match_id -> (participant1_id, participant2_id, result for participant1)
+        self.results = {}
+
+    def row(self, participant_id):
+        row = self.rows.get(participant_id)
+        if row is None:
+            row = self.rows[participant_id] = {
+                'participant_id': participant_id,
+                'score': 0.0,
+                'wins': 0,
+                'draws': 0,
+                'losses': 0,
+                'byes': 0,
+                'buchholz': 0.0,
+                'sonneborn_berger': 0.0,
+            }
+        return row
+
+    def has_result(self, match_id, participant1_id, participant2_id, result):
+        """True if this exact result is already applied"""
+        return self.results.get(match_id) == (participant1_id, participant2_id, result)
+
+    def add_result(self, match_id, participant1_id, participant2_id, result):
+        """
+        Apply one completed match.
+
+        ``participant2_id`` is None for a bye; ``result`` is participant1's
+        score (WIN, DRAW or LOSS).
+        """
+        self.results[match_id] = (participant1_id, participant2_id, result)
+        a = self.row(participant1_id)
+
+        if participant2_id is None:
+            a['byes'] += 1
+            a['wins'] += 1
+            self._add_score(participant1_id, WIN)
+            return
+
+        b = self.row(participant2_id)
+
+        # Link the pair using the scores they had before this game
+        a['buchholz'] += b['score']
+        a['sonneborn_berger'] += result * b['score']
+        b['buchholz'] += a['score']
+        b['sonneborn_berger'] += (1 - result) * a['score']
+        self.opponents[participant1_id].append((participant2_id, result))
+        self.opponents[participant2_id].append((participant1_id, 1 - result))
+
+        for row, own in ((a, result), (b, 1 - result)):
+            if own == WIN:
+                row['wins'] += 1
+            elif own == LOSS:
+                row['losses'] += 1
+            else:
+                row['draws'] += 1
+
+        self._add_score(participant1_id, result)
+        self._add_score(participant2_id, 1 - result)
+
+    def _add_score(self, participant_id, delta):
+        if not delta:
+            return
+        self.rows[participant_id]['score'] += delta
+        for opponent_id, own in self.opponents[participant_id]:
+            row = self.rows[opponent_id]
+            row['buchholz'] += delta
+            row['sonneborn_berger'] += delta * (1 - own)
+
+    def played_pairs(self):
+        """Set of frozenset pairs that have already met"""
+        return {
+            frozenset((participant_id, opponent_id))
+            for participant_id, opponents in self.opponents.items()
+            for opponent_id, _ in opponents
+        }
+
+    def ranking(self, participant_ids=None, seeds=None):
+        """
+        Rows ordered by score, Buchholz, Sonneborn-Berger, wins, then seed.
+
+        ``participant_ids`` adds empty rows for participants without results.
+        """
+        seeds = seeds or {}
+        for participant_id in participant_ids or ():
+            self.row(participant_id)
+        return sorted(
+            self.rows.values(),
+            key=lambda row: (
+                -row['score'], -row['buchholz'], -row['sonneborn_berger'], -row['wins'],
+                seeds.get(row['participant_id']) or float('inf'),
+            )
+        )
+
+
+def match_result(participant1_id, participant2_id, winner_id):
+    """participant1's result for a completed match (draw if no winner)"""
+    if participant2_id is None or winner_id == participant1_id:
+        return WIN
+    if winner_id == participant2_id:
+        return LOSS
+    return DRAW
+
+
+class StandingsService:
+    """Standings tables built from completed matches"""
+
+    @classmethod
+    def rebuild(cls, tournament_id):
+        """Compute the table from completed matches in one query"""
+        from ..models import Match
+
+        table = StandingsTable()
+        completed = Match.objects.filter(
+            tournament_id=tournament_id,
+            status='completed',
+            participant1__isnull=False,
+        ).order_by('round_number', 'completed_at', 'match_number').values_list(
+            'id', 'participant1_id', 'participant2_id', 'winner_id'
+        )
+        for match_id, participant1_id, participant2_id, winner_id in completed:
+            table.add_result(
+                match_id, participant1_id, participant2_id,
+                match_result(participant1_id, participant2_id, winner_id)
+            )
+        return table
+
+    @classmethod
+    def get_standings(cls, tournament, table=None):
+        """
+        Ranked rows with their Participant and 1-based rank attached, from
+        ``table`` or a freshly built one.
+        """
+        participants = {p.id: p for p in tournament.participants.select_related('user', 'team')}
+        seeds = {participant_id: p.seed for participant_id, p in participants.items()}
+        table = table if table is not None else cls.rebuild(tournament.id)
+        ranked = table.ranking(participants, seeds)
+
+        standings = []
+        for row in ranked:
+            participant = participants.get(row['participant_id'])
+            if participant is None:
+                continue
+            standings.append(dict(row, participant=participant, rank=len(standings) + 1))
+        return standings
+
+
+def pair_swiss_round(ranked_ids, played=frozenset(), byes=None):
+    """
+    Pair one Swiss round.
+
+    Args:
+        ranked_ids: Participant ids in ranking order, grouped by score; a list
+            of lists (one per score group, best group first)
+        played: Set of frozenset pairs that have already met
+        byes: Participant ids that already had a bye
+
+    Returns:
+        Tuple of (pairs, bye_id): pairs are (higher, lower) tuples in board
+        order, bye_id is the participant sitting out (or None)
+    """
+    byes = set(byes or ())
+    groups = [list(group) for group in ranked_ids if group]
+    everyone = [pid for group in groups for pid in group]
+
+    bye_id = None
+    if len(everyone) % 2:
+        # Lowest-ranked participant who has not had a bye yet
+        candidates = [pid for pid in reversed(everyone) if pid not in byes]
+        bye_id = candidates[0] if candidates else everyone[-1]
+        for group in groups:
+            if bye_id in group:
+                group.remove(bye_id)
+
+    pairs = []
+    floaters = []
+    for group in groups:
+        pool = floaters + group
+        paired, floaters = _pair_pool(pool, played)
+        pairs.extend(paired)
+
+    if floaters:
+        pairs.extend(_repair_tail(pairs, floaters, played))
+
+    return pairs, bye_id
+
+
+def _repair_tail(pairs, floaters, played):
+    """
+    Pair players left over after the lowest score group.
+
+    Pairs are taken back from the bottom boards one at a time and the freed
+    players re-paired with an exhaustive search, so a rematch-free round is
+    found whenever one exists among the last ``MAX_REPAIR_POOL`` players.
+    Only if none exists do the leftovers meet again. Mutates ``pairs``.
+    """
+    pool = list(floaters)
+    while len(pool) <= MAX_REPAIR_POOL:
+        repaired = _pair_exhaustive(pool, played)
+        if repaired is not None:
+            return repaired
+        if not pairs:
+            break
+        pool = list(pairs.pop()) + pool
+
+    # Last resort: the remaining players meet again where they must
+    paired, leftover = _pair_pool(pool, played)
+    rematches, _ = _pair_pool(leftover, frozenset())
+    return paired + rematches
+
+
+def _pair_exhaustive(pool, played):
+    """Rematch-free perfect matching of a small pool in rank order, or None"""
+    if not pool:
+        return []
+    first, rest = pool[0], pool[1:]
+    for index, opponent in enumerate(rest):
+        if frozenset((first, opponent)) in played:
+            continue
+        remainder = _pair_exhaustive(rest[:index] + rest[index + 1:], played)
+        if remainder is not None:
+            return [(first, opponent)] + remainder
+    return None
+
+
+def _pair_pool(pool, played):
+    """
+    Pair a pool's top half against its bottom half without rematches.
+
+    Uses augmenting paths (Kuhn's algorithm) with each top player's
+    candidates tried in order of distance from their natural partner, so the
+    result stays as close to the 1-vs-(n/2+1) Dutch pattern as the rematch
+    constraints allow. Returns (pairs, unpaired) with unpaired in pool order.
+    """
+    half = len(pool) // 2
+    top, bottom = pool[:half], pool[half:]
+    top_match = {}
+    bottom_match = {}
+
+    for start in range(len(top)):
+        parent = {}
+        seen = set()
+        queue = deque([start])
+        found = None
+        while queue and found is None:
+            u = queue.popleft()
+            for j in _candidates(u, len(bottom)):
+                if j in seen or frozenset((top[u], bottom[j])) in played:
+                    continue
+                seen.add(j)
+                parent[j] = u
+                if j not in bottom_match:
+                    found = j
+                    break
+                queue.append(bottom_match[j])
+
+        j = found
+        while j is not None:
+            u = parent[j]
+            previous = top_match.get(u)
+            top_match[u] = j
+            bottom_match[j] = u
+            j = previous
+
+    pairs = [(top[u], bottom[top_match[u]]) for u in sorted(top_match)]
+    paired = {pid for pair in pairs for pid in pair}
+    return pairs, [pid for pid in pool if pid not in paired]
+
+
+def _candidates(index, size):
+    """Bottom-half indices ordered by distance from ``index``"""
+    if size == 0:
+        return
+    index = min(index, size - 1)
+    yield index
+    for offset in range(1, size):
+        if index + offset < size:
+            yield index + offset
+        if index - offset >= 0:
+            yield index - offset
@@ -0,0 +1,79 @@
+"""
+Signal handlers for the tournaments app.
+
+Live updates: committed changes to matches, participants and tournaments are
+published once to the live update broker, which fans them out to every open
+SSE stream for that tournament.
+
+Leaderboard: participant record changes (status, prizes, wins) refresh the
+affected player's and team's materialized leaderboard rows after commit.
+
+Images: new or replaced tournament banners/thumbnails/social images get
+their responsive derivatives built in the background after commit.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from tournaments.models import Tournament, Participant, Match
+from tournaments.image_utils import schedule_tournament_derivatives
+from tournaments.live_updates import (
+    publish_match_update,
+    publish_participant_update,
+    publish_tournament_update,
+)
+from tournaments.services.leaderboard import LeaderboardService
+
+# Participant fields that feed the leaderboard
+LEADERBOARD_FIELDS = {'status', 'matches_won', 'matches_lost', 'prize_won'}
+
+
+@receiver(post_save, sender=Match)
+def publish_match_change(sender, instance, raw=False, **kwargs):
+    """Push match changes (scores, status, progression) to live viewers"""
+    if raw:
+        return
+    publish_match_update(instance)
+
+
+@receiver(post_save, sender=Participant)
+def publish_participant_change(sender, instance, raw=False, **kwargs):
+    """Push participant changes (check-in, status, record) to live viewers"""
+    if raw:
+        return
+    publish_participant_update(instance)
+
+
+@receiver(post_save, sender=Participant)
+def refresh_participant_leaderboard(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Keep the materialized leaderboard rows of this player/team current"""
+    if raw:
+        return
+    if update_fields is not None and not LEADERBOARD_FIELDS.intersection(update_fields):
+        return
+    transaction.on_commit(lambda: LeaderboardService.refresh(
+        user_ids=[instance.user_id], team_ids=[instance.team_id]
+    ))
+
+
+@receiver(post_delete, sender=Participant)
+def refresh_removed_participant_leaderboard(sender, instance, **kwargs):
+    """Drop a withdrawn participation from the player's/team's leaderboard rows"""
+    transaction.on_commit(lambda: LeaderboardService.refresh(
+        user_ids=[instance.user_id], team_ids=[instance.team_id]
+    ))
+
+
+@receiver(post_save, sender=Tournament)
+def publish_tournament_change(sender, instance, raw=False, **kwargs):
+    """Push tournament status and statistics changes to live viewers"""
+    if raw:
+        return
+    publish_tournament_update(instance)
+
+
+@receiver(post_save, sender=Tournament)
+def build_tournament_image_derivatives(sender, instance, raw=False, **kwargs):
+    """Queue responsive image sizes for changed tournament images"""
+    if raw:
+        return
+    schedule_tournament_derivatives(instance)
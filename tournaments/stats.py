@@ -0,0 +1,117 @@
+"""
+Per-request tournament statistics.
+
+Participant and match counters used to be computed one ``count()`` at a
+time: the detail page, the live-update stream, the cached stats blob and the
+unified updates API each ran four to six queries, and ``Tournament.is_full``,
+``spots_remaining``, ``registration_progress`` and
+``get_current_registrations`` each repeated the same participant count.
+
+``TournamentStats`` computes every participant counter with one conditional
+aggregate over ``tournament_participants`` and every match counter with one
+over ``tournament_matches``, each on first use. The result is memoized on the
+tournament instance, so everything that shares the instance during a request
+shares the two queries. Saving or deleting a participant or match through
+``CacheInvalidationMixin`` drops the memo from the cached tournament, and
+``TournamentStats.clear`` drops it explicitly after bulk writes.
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.utils import timezone
+
+# Participant statuses that hold a spot in the tournament
+ACTIVE_STATUSES = ('confirmed', 'pending_payment', 'pending')
+
+MEMO_ATTR = '_tournament_stats'
+
+
+class TournamentStats:
+    """Lazily aggregated participant and match counters for one tournament"""
+
+    def __init__(self, tournament):
+        self.tournament = tournament
+        self._participants = None
+        self._matches = None
+
+    @classmethod
+    def for_tournament(cls, tournament):
+        """Stats memoized on the tournament instance"""
+        stats = tournament.__dict__.get(MEMO_ATTR)
+        if stats is None:
+            stats = cls(tournament)
+            tournament.__dict__[MEMO_ATTR] = stats
+        return stats
+
+    @classmethod
+    def clear(cls, tournament):
+        """Forget memoized counters after participants or matches changed"""
+        if tournament is not None:
+            tournament.__dict__.pop(MEMO_ATTR, None)
+
+    @property
+    def participants(self):
+        """
+        Participant counters from one aggregate query.
+
+        ``active_users``/``active_teams`` count registrations holding a spot;
+        ``registrations_today`` is since local midnight and
+        ``registrations_24h`` covers the last 24 hours.
+        """
+        if self._participants is None:
+            now = timezone.now()
+            active = Q(status__in=ACTIVE_STATUSES)
+            self._participants = self.tournament.participants.aggregate(
+                total=Count('id'),
+                active_users=Count('id', filter=active & Q(user__isnull=False)),
+                active_teams=Count('id', filter=active & Q(team__isnull=False)),
+                checked_in=Count('id', filter=Q(checked_in=True)),
+                confirmed=Count('id', filter=Q(status='confirmed')),
+                pending_approval=Count('id', filter=Q(status='pending')),
+                pending_payment=Count('id', filter=Q(status='pending_payment')),
+                registrations_today=Count('id', filter=Q(registered_at__date=timezone.localdate(now))),
+                registrations_24h=Count('id', filter=Q(registered_at__gte=now - timedelta(days=1))),
+            )
+        return self._participants
+
+    @property
+    def matches(self):
+        """Match counters by status from one aggregate query"""
+        if self._matches is None:
+            yesterday = timezone.now() - timedelta(days=1)
+            self._matches = self.tournament.matches.aggregate(
+                total=Count('id'),
+                pending=Count('id', filter=Q(status='pending')),
+                ready=Count('id', filter=Q(status='ready')),
+                in_progress=Count('id', filter=Q(status='in_progress')),
+                completed=Count('id', filter=Q(status='completed')),
+                disputed=Count('id', filter=Q(status='disputed')),
+                completed_24h=Count('id', filter=Q(completed_at__gte=yesterday)),
+            )
+        return self._matches
+
+    @property
+    def registered(self):
+        """Registrations holding a spot: teams for team events, players otherwise"""
+        counts = self.participants
+        return counts['active_teams'] if self.tournament.is_team_based else counts['active_users']
+
+    @property
+    def spots_remaining(self):
+        max_participants = self.tournament.max_participants
+        if not max_participants:
+            return float('inf')
+        return max(0, max_participants - self.registered)
+
+    @property
+    def registration_progress(self):
+        max_participants = self.tournament.max_participants
+        if not max_participants:
+            return 0
+        return min(100, (self.registered / max_participants) * 100)
+
+    @property
+    def is_full(self):
+        max_participants = self.tournament.max_participants
+        return bool(max_participants) and self.registered >= max_participants
@@ -360,6 +360,67 @@ def cleanup_old_tournament_data():
     return f"Cleaned up {count} old draft tournaments"
 
 
+@shared_task
+def flush_analytics_beacons():
+    """
+    Write buffered analytics beacons that no web process has flushed yet
+    and report drop counts. Runs every minute.
+    """
+    from .analytics_ingest import BeaconIngestService
+
+    stats = BeaconIngestService.stats()
+    written = BeaconIngestService.flush()
+    return f"Flushed {written} analytics beacons, dropped {stats['dropped']}"
+
+
+@shared_task
+def flush_tournament_counters():
+    """
+    Write buffered view/share/registration counter deltas with F() updates.
+    Runs every minute.
+    """
+    from .counters import TournamentCounters
+
+    flushed = TournamentCounters.flush()
+    return f"Flushed counters for {flushed} tournaments"
+
+
+@shared_task
+def rollup_tournament_analytics():
+    """
+    Fold closed hours of raw analytics into hourly/daily rollups.
+    Runs hourly.
+    """
+    from .analytics_rollups import AnalyticsRollupService
+
+    watermark = AnalyticsRollupService.rollup_pending()
+    return f"Analytics rolled up to {watermark.isoformat()}"
+
+
+@shared_task
+def prune_tournament_analytics():
+    """
+    Delete raw page views past the retention window, in batches.
+    Runs daily.
+    """
+    from .analytics_rollups import AnalyticsRollupService
+
+    count = AnalyticsRollupService.prune_raw_data()
+    return f"Pruned {count} raw page views"
+
+
+@shared_task
+def generate_image_derivatives(tournament_id, field_names):
+    """Build responsive WebP/JPEG sizes for changed tournament images"""
+    from .image_utils import update_tournament_derivatives
+
+    try:
+        updated = update_tournament_derivatives(tournament_id, field_names)
+    except Tournament.DoesNotExist:
+        return f"Tournament {tournament_id} not found"
+    return f"Updated image derivatives: {', '.join(updated) or 'none'}"
+
+
 @shared_task
 def generate_tournament_standings(tournament_id):
     """Generate and cache tournament standings"""
@@ -367,9 +428,15 @@ def generate_tournament_standings(tournament_id):
         tournament = Tournament.objects.get(id=tournament_id)
         
         # Calculate standings based on tournament format
-        participants = tournament.participants.all().order_by(
-            '-matches_won', '-games_won', 'matches_lost', 'games_lost'
-        )
+        if tournament.format in ('swiss', 'round_robin'):
+            from .services import StandingsService
+            participants = [
+                row['participant'] for row in StandingsService.get_standings(tournament)
+            ]
+        else:
+            participants = tournament.participants.all().order_by(
+                '-matches_won', '-games_won', 'matches_lost', 'games_lost'
+            )
         
         # Update placements
         for idx, participant in enumerate(participants, start=1):
@@ -158,7 +158,8 @@ def responsive_image(image_field, alt_text="", css_class="", sizes=""):
             html_parts.append(f'  <source media="{media_query}" srcset="{settings.MEDIA_URL}{jpeg_path}" type="image/jpeg">')
     
     # Fallback img tag
-    html_parts.append(f'  <img src="{image_url}" alt="{alt_text}" loading="lazy" {f"sizes=\"{sizes}\"" if sizes else ""}>')
+    sizes_attr = f'sizes="{sizes}"' if sizes else ""
+    html_parts.append(f'  <img src="{image_url}" alt="{alt_text}" loading="lazy" {sizes_attr}>')
     html_parts.append('</picture>')
     
     return mark_safe('\n'.join(html_parts))
@@ -2,7 +2,7 @@
 Tests for tournament analytics functionality.
 """
 
-from django.test import TestCase, Client
+from django.test import TestCase, Client, override_settings
 from django.urls import reverse
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -15,6 +15,7 @@ from .analytics_models import (
     PageView, UserEngagement, ConversionEvent, ErrorLog, 
     PerformanceMetric, AnalyticsSummary
 )
+from .analytics_ingest import reset_beacon_buffer
 from .analytics_service import AnalyticsService
 
 User = get_user_model()
@@ -193,10 +194,15 @@ class AnalyticsServiceTest(TestCase):
         self.assertEqual(dashboard_data['overview']['conversion_rate'], 40.0)
 
 
+@override_settings(ANALYTICS_BEACON_BUFFER='sync')
 class AnalyticsAPITest(TestCase):
     """Test analytics API endpoints"""
     
     def setUp(self):
+        # Beacons are written through, so the API results can be asserted on
+        reset_beacon_buffer()
+        self.addCleanup(reset_beacon_buffer)
+        
         self.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
@@ -6,12 +6,13 @@ Tests WebSocket/SSE connection handling, message processing, UI refresh function
 import json
 import time
 from unittest.mock import Mock, patch, MagicMock
-from django.test import TestCase, Client
+from django.test import TestCase, Client, AsyncClient, SimpleTestCase, override_settings
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.http import StreamingHttpResponse, JsonResponse
 from tournaments.models import Tournament, Match, Participant, Game, Bracket
 from venues.models import Venue
+from tournaments.live_broker import LocalBroker, get_broker, reset_broker
 from tournaments.live_updates import (
     TournamentLiveUpdater, 
     tournament_live_updates, 
@@ -278,12 +279,8 @@ class TournamentLiveUpdatesViewTest(TestCase):
         response = self.client.get('/tournaments/nonexistent/live-updates/')
         self.assertEqual(response.status_code, 404)
     
-    @patch('tournaments.live_updates.time.sleep')
-    def test_sse_stream_content(self, mock_sleep):
+    def test_sse_stream_content(self):
         """Test SSE stream sends initial state"""
-        # Mock sleep to prevent actual delays in test
-        mock_sleep.return_value = None
-        
         response = self.client.get(f'/tournaments/{self.tournament.slug}/live-updates/')
         
         # Get the stream content
@@ -747,4 +744,163 @@ class LiveUpdatesErrorHandlingTest(TestCase):
         self.assertEqual(serialized['participant1']['display_name'], 'TBD')
         self.assertEqual(serialized['participant2']['display_name'], 'TBD')
         self.assertIsNone(serialized['participant1']['id'])
-        self.assertIsNone(serialized['participant2']['id'])
\ No newline at end of file
+        self.assertIsNone(serialized['participant2']['id'])
+
+
+class LocalBrokerTest(SimpleTestCase):
+    """Test the in-process publish/subscribe broker"""
+    
+    def test_publish_serializes_once_for_all_subscribers(self):
+        broker = LocalBroker()
+        subscriptions = [broker.subscribe('t1') for _ in range(3)]
+        
+        event = broker.publish('t1', {'type': 'match_update', 'match': {'id': 'm1'}})
+        
+        received = [subscription.get(timeout=0) for subscription in subscriptions]
+        for item in received:
+            self.assertIs(item.frame, event.frame)
+        self.assertEqual(event.type, 'match_update')
+        self.assertTrue(event.frame.startswith('data: '))
+        self.assertTrue(event.frame.endswith('\n\n'))
+    
+    def test_publish_only_reaches_tournament_subscribers(self):
+        broker = LocalBroker()
+        subscription = broker.subscribe('t1')
+        
+        broker.publish('t2', {'type': 'match_update'})
+        
+        self.assertIsNone(subscription.get(timeout=0))
+    
+    def test_close_unsubscribes(self):
+        broker = LocalBroker()
+        subscription = broker.subscribe('t1')
+        self.assertEqual(broker.subscriber_count('t1'), 1)
+        
+        subscription.close()
+        
+        self.assertEqual(broker.subscriber_count('t1'), 0)
+
+
+@override_settings(LIVE_UPDATES_BROKER='local')
+class LiveUpdatesPublishTest(TestCase):
+    """Test that committed changes are published to live viewers"""
+    
+    def setUp(self):
+        reset_broker()
+        self.addCleanup(reset_broker)
+        
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.game = Game.objects.create(name='Test Game', slug='test-game')
+        self.tournament = Tournament.objects.create(
+            name='Test Tournament',
+            slug='test-tournament',
+            game=self.game,
+            organizer=self.user,
+            max_participants=16,
+            status='in_progress',
+            registration_start=timezone.now() - timezone.timedelta(days=2),
+            registration_end=timezone.now() - timezone.timedelta(days=1),
+            check_in_start=timezone.now() - timezone.timedelta(hours=2),
+            start_datetime=timezone.now() - timezone.timedelta(hours=1),
+        )
+        self.bracket = Bracket.objects.create(
+            tournament=self.tournament,
+            name='Main Bracket',
+            bracket_type='main'
+        )
+        self.participant = Participant.objects.create(
+            tournament=self.tournament,
+            user=self.user,
+            seed=1
+        )
+        self.match = Match.objects.create(
+            tournament=self.tournament,
+            bracket=self.bracket,
+            participant1=self.participant,
+            round_number=1,
+            match_number=1,
+            status='in_progress'
+        )
+    
+    def _drain(self, subscription):
+        events = []
+        while True:
+            event = subscription.get(timeout=0)
+            if event is None:
+                return events
+            events.append(event)
+    
+    def test_match_save_is_published_on_commit(self):
+        subscription = get_broker().subscribe(self.tournament.id)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.match.score_p1 = 2
+            self.match.save()
+        
+        events = self._drain(subscription)
+        self.assertEqual([event.type for event in events], ['match_update'])
+        payload = json.loads(events[0].frame[len('data: '):])
+        self.assertEqual(payload['match']['score_p1'], 2)
+    
+    def test_nothing_is_published_before_commit(self):
+        subscription = get_broker().subscribe(self.tournament.id)
+        
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.match.save()
+        
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self._drain(subscription), [])
+    
+    def test_trigger_participant_update_publishes_participant_and_stats(self):
+        subscription = get_broker().subscribe(self.tournament.id)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            trigger_participant_update(self.participant.id)
+        
+        types = [event.type for event in self._drain(subscription)]
+        self.assertEqual(types, ['participant_update', 'tournament_update'])
+    
+    def test_tournament_end_closes_streams(self):
+        subscription = get_broker().subscribe(self.tournament.id)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tournament.status = 'completed'
+            self.tournament.save()
+        
+        types = [event.type for event in self._drain(subscription)]
+        self.assertEqual(types, ['tournament_update', 'tournament_ended'])
+    
+    def test_inactive_tournament_changes_are_not_published(self):
+        self.tournament.status = 'registration'
+        self.tournament.save()
+        subscription = get_broker().subscribe(self.tournament.id)
+        
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.participant.save()
+        
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self._drain(subscription), [])
+    
+    async def test_async_stream_fans_out_published_events(self):
+        response = await AsyncClient().get(f'/tournaments/{self.tournament.slug}/live-updates/')
+        stream = response.streaming_content
+        
+        initial = json.loads((await anext(stream))[len(b'data: '):])
+        self.assertEqual(initial['type'], 'full_update')
+        
+        broker = get_broker()
+        broker.publish(self.tournament.id, {'type': 'match_update', 'match': {'id': 'm1'}})
+        frame = await anext(stream)
+        self.assertEqual(json.loads(frame[len(b'data: '):])['type'], 'match_update')
+        
+        broker.publish(self.tournament.id, {'type': 'tournament_ended', 'status': 'completed'})
+        frame = await anext(stream)
+        self.assertEqual(json.loads(frame[len(b'data: '):])['type'], 'tournament_ended')
+        
+        with self.assertRaises(StopAsyncIteration):
+            await anext(stream)
+        self.assertEqual(broker.subscriber_count(self.tournament.id), 0)
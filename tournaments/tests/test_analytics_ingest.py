@@ -0,0 +1,229 @@
+# tournaments/tests/test_analytics_ingest.py
+"""Tests for buffered analytics beacon ingestion.
+Beacons are queued in O(1) and written in batches by the flusher; events
+beyond the pending limit are dropped and counted.
+"""
+
+import json
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Game, User
+from tournaments.analytics_ingest import (
+    BeaconFlusher, BeaconIngestService, LocalBeaconBuffer, get_beacon_buffer, reset_beacon_buffer
+)
+from tournaments.analytics_models import PageView, UserEngagement, PerformanceMetric
+from tournaments.models import Tournament
+
+
+def page_view_event(session_key, url='/tournaments/beacon-cup/', ts=None, **performance):
+    return {
+        'kind': 'page_view',
+        'id': str(uuid.uuid4()),
+        'ts': (ts or timezone.now()).isoformat(),
+        'url': url,
+        'session_key': session_key,
+        'user_id': None,
+        'user_agent': 'Mozilla/5.0 (iPhone; CPU iPhone OS 14_0) Mobile',
+        'ip_address': '127.0.0.1',
+        'referrer': '',
+        'performance': {
+            key: performance.get(key) for key in (
+                'loadTime', 'domContentLoaded', 'firstPaint', 'firstContentfulPaint',
+                'largestContentfulPaint', 'screenWidth', 'screenHeight',
+                'viewportWidth', 'viewportHeight',
+            )
+        },
+    }
+
+
+@override_settings(ANALYTICS_BEACON_BUFFER='sync')
+class BeaconIngestTestCase(TestCase):
+    def setUp(self):
+        reset_beacon_buffer()
+        self.addCleanup(reset_beacon_buffer)
+        game = Game.objects.create(name='Beacon Game', slug='beacon-game', genre='other')
+        organizer = User.objects.create_user(email='organizer@example.com', password='x', username='organizer')
+        now = timezone.now()
+        self.tournament = Tournament.objects.create(
+            name='Beacon Cup', slug='beacon-cup', description='Beacons', game=game, organizer=organizer,
+            registration_start=now, registration_end=now + timedelta(days=1),
+            check_in_start=now + timedelta(days=1), start_datetime=now + timedelta(days=2),
+        )
+
+
+class LocalBeaconBufferTest(TestCase):
+    def test_drops_and_counts_beyond_limit(self):
+        buffer = LocalBeaconBuffer(max_pending=2)
+        results = [buffer.push({'kind': kind}) for kind in ('page_view', 'metric', 'metric', 'page_view')]
+
+        self.assertEqual(results, [True, True, False, False])
+        self.assertEqual(buffer.dropped_counts(reset=True), {'metric': 1, 'page_view': 1})
+        self.assertEqual(buffer.dropped_counts(), {})
+        self.assertEqual([e['kind'] for e in buffer.drain(10)], ['page_view', 'metric'])
+        self.assertEqual(buffer.pending(), 0)
+
+    def test_flusher_wakes_when_batch_is_full(self):
+        flusher = BeaconFlusher(LocalBeaconBuffer(10), batch_size=3, max_age=60)
+        with patch.object(BeaconFlusher, '_ensure_running'):
+            flusher.notify()
+            flusher.notify()
+            self.assertFalse(flusher._wake.is_set())
+            flusher.notify()
+        self.assertTrue(flusher._wake.is_set())
+
+
+class WriteBatchTest(BeaconIngestTestCase):
+    def test_batch_writes_page_views_engagement_and_metrics(self):
+        arrived = timezone.now() - timedelta(seconds=30)
+        events = [
+            page_view_event('s1', ts=arrived, loadTime=900, screenWidth=390),
+            {'kind': 'engagement', 'ts': arrived.isoformat(), 'session_key': 's1',
+             'data': {'timeOnPage': 45, 'scrollDepth': 40, 'clicksCount': 1}},
+            {'kind': 'engagement', 'ts': arrived.isoformat(), 'session_key': 's1',
+             'data': {'timeOnPage': 95, 'scrollDepth': 20, 'clicksCount': 4}},
+            {'kind': 'metric', 'id': str(uuid.uuid4()), 'ts': arrived.isoformat(),
+             'session_key': 's1', 'metric_name': 'lcp', 'metric_value': 1200.0,
+             'metric_type': 'core_web_vitals', 'metric_unit': 'ms', 'metadata': {}},
+            {'kind': 'metric', 'id': str(uuid.uuid4()), 'ts': arrived.isoformat(),
+             'session_key': 'unknown', 'metric_name': 'lcp', 'metric_value': 1.0,
+             'metric_type': 'core_web_vitals', 'metric_unit': 'ms', 'metadata': {}},
+        ]
+
+        orphaned = BeaconIngestService.write_batch(events)
+
+        self.assertEqual(orphaned, {'metric': 1})
+        page_view = PageView.objects.get()
+        self.assertEqual(page_view.tournament, self.tournament)
+        self.assertEqual(page_view.device_class, 'mobile')
+        self.assertEqual(page_view.load_time, 900)
+        self.assertEqual(page_view.created_at, arrived)
+
+        engagement = UserEngagement.objects.get(page_view=page_view)
+        self.assertEqual((engagement.time_on_page, engagement.scroll_depth, engagement.clicks_count), (95, 40, 4))
+        self.assertFalse(engagement.bounced)
+
+        metric = PerformanceMetric.objects.get()
+        self.assertEqual((metric.page_view_id, metric.is_mobile), (page_view.id, True))
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        def count_queries(size):
+            events = [page_view_event(f'q{size}-{i}') for i in range(size)]
+            events += [{'kind': 'engagement', 'ts': timezone.now().isoformat(),
+                        'session_key': f'q{size}-{i}', 'data': {'timeOnPage': 5}} for i in range(size)]
+            # Savepoint pair plus seven statements, whatever the batch size
+            with self.assertNumQueries(9):
+                BeaconIngestService.write_batch(events)
+
+        count_queries(2)
+        count_queries(40)
+
+
+class BufferedViewTest(BeaconIngestTestCase):
+    @override_settings(ANALYTICS_BEACON_BUFFER='local', ANALYTICS_BEACON_BATCH_SIZE=2)
+    def test_beacons_are_queued_then_flushed_in_batches(self):
+        with patch.object(BeaconFlusher, '_ensure_running'):
+            for load_time in (100, 200, 300):
+                response = self.client.post(
+                    reverse('tournaments:analytics_performance'),
+                    data=json.dumps({'url': '/tournaments/beacon-cup/', 'loadTime': load_time}),
+                    content_type='application/json'
+                )
+                self.assertEqual(response.status_code, 200)
+            response = self.client.post(
+                reverse('tournaments:analytics_engagement'),
+                data=json.dumps({'timeOnPage': 40, 'clicksCount': 2}),
+                content_type='application/json'
+            )
+            self.assertEqual(response.json()['engagement_score'], 4.0)
+
+        self.assertFalse(PageView.objects.exists())
+        self.assertEqual(get_beacon_buffer()[0].pending(), 4)
+
+        self.assertEqual(BeaconIngestService.flush(), 4)
+
+        self.assertEqual(sorted(PageView.objects.values_list('load_time', flat=True)), [100, 200, 300])
+        latest = PageView.objects.order_by('-created_at').first()
+        self.assertEqual(latest.engagement.time_on_page, 40)
+
+    @override_settings(ANALYTICS_BEACON_BUFFER='local', ANALYTICS_BEACON_MAX_PENDING=1)
+    def test_backpressure_drops_are_reported(self):
+        with patch.object(BeaconFlusher, '_ensure_running'):
+            for _ in range(3):
+                self.client.post(
+                    reverse('tournaments:track_page_view', kwargs={'slug': 'beacon-cup'}),
+                    data='{}', content_type='application/json'
+                )
+
+        self.assertEqual(BeaconIngestService.stats()['dropped'], {'page_view': 2})
+        with self.assertLogs('tournaments.analytics_ingest', level='WARNING'):
+            self.assertEqual(BeaconIngestService.flush(), 1)
+        self.assertEqual(BeaconIngestService.stats()['dropped'], {})
+
+    def test_beacons_without_page_view_are_not_found(self):
+        session = self.client.session
+        session.save()
+        for name, data in (
+            ('tournaments:analytics_metric', {'metricName': 'ttfb', 'metricValue': 80}),
+            ('tournaments:analytics_engagement', {'timeOnPage': 40}),
+        ):
+            response = self.client.post(reverse(name), data=json.dumps(data), content_type='application/json')
+            self.assertEqual(response.status_code, 404)
+
+        self.assertFalse(PerformanceMetric.objects.exists())
+        self.assertEqual(BeaconIngestService.stats()['pending'], 0)
+
+    def test_metric_orphaned_at_flush_is_counted_not_stored(self):
+        with self.assertLogs('tournaments.analytics_ingest', level='WARNING') as logs:
+            BeaconIngestService.enqueue_metric('no-page-view', 'ttfb', 80.0)
+
+        self.assertFalse(PerformanceMetric.objects.exists())
+        self.assertIn("'metric': 1", logs.output[0])
+
+    @override_settings(ANALYTICS_BEACON_BUFFER='local')
+    def test_invalid_timings_are_coerced_when_queued(self):
+        with patch.object(BeaconFlusher, '_ensure_running'):
+            self.client.post(
+                reverse('tournaments:analytics_performance'),
+                data=json.dumps({'url': '/tournaments/beacon-cup/', 'loadTime': -5,
+                                 'firstPaint': 'soon', 'screenWidth': 390.4}),
+                content_type='application/json'
+            )
+
+        self.assertEqual(BeaconIngestService.flush(), 1)
+        page_view = PageView.objects.get()
+        self.assertEqual((page_view.load_time, page_view.first_paint, page_view.screen_width), (None, None, 390))
+
+
+class FlushFailureTest(BeaconIngestTestCase):
+    @override_settings(ANALYTICS_BEACON_BUFFER='local')
+    def test_bad_event_is_skipped_not_the_batch(self):
+        buffer = get_beacon_buffer()[0]
+        buffer.push(page_view_event('good-1', loadTime=100))
+        # Bypasses enqueue-time coercion
+        buffer.push(page_view_event('bad', loadTime=-1))
+        buffer.push(page_view_event('good-2', loadTime=200))
+
+        with self.assertLogs('tournaments.analytics_ingest', level='WARNING'):
+            self.assertEqual(BeaconIngestService.flush(buffer), 2)
+        self.assertEqual(
+            sorted(PageView.objects.values_list('session_key', flat=True)), ['good-1', 'good-2']
+        )
+
+    @override_settings(ANALYTICS_BEACON_BUFFER='local')
+    def test_batch_is_requeued_when_database_is_unavailable(self):
+        from django.db import OperationalError
+
+        buffer = get_beacon_buffer()[0]
+        buffer.push(page_view_event('s1'))
+        with patch.object(BeaconIngestService, 'write_batch', side_effect=OperationalError('down')):
+            with self.assertLogs('tournaments.analytics_ingest', level='ERROR'):
+                self.assertEqual(BeaconIngestService.flush(buffer), 0)
+
+        self.assertEqual(buffer.pending(), 1)
+        self.assertEqual(BeaconIngestService.flush(buffer), 1)
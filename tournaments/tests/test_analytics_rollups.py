@@ -0,0 +1,238 @@
+# tournaments/tests/test_analytics_rollups.py
+"""Tests for the tournament analytics rollup pipeline.
+Dashboards read hourly/daily rollups keyed by tournament and device class;
+raw rows past the retention window are pruned once rolled up.
+"""
+
+from datetime import timedelta
+
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import Game, User
+from tournaments.analytics_models import (
+    PageView, UserEngagement, ConversionEvent, ErrorLog, AnalyticsRollup, AnalyticsRollupState
+)
+from tournaments.analytics_rollups import AnalyticsRollupService, floor_hour
+from tournaments.analytics_service import AnalyticsService
+from tournaments.models import Tournament
+
+
+class AnalyticsRollupTestCase(TestCase):
+    def setUp(self):
+        self.game = Game.objects.create(name='Rollup Game', slug='rollup-game', genre='other')
+        self.organizer = User.objects.create_user(
+            email='organizer@example.com', password='testpass123', username='organizer'
+        )
+        self.cup = self.make_tournament('cup')
+        # Slug containing the other one: a url__contains filter would mix them
+        self.cup_two = self.make_tournament('cup-2')
+
+    def make_tournament(self, slug):
+        now = timezone.now()
+        return Tournament.objects.create(
+            name=slug.title(),
+            slug=slug,
+            description='Analytics',
+            game=self.game,
+            organizer=self.organizer,
+            registration_start=now - timedelta(days=1),
+            registration_end=now + timedelta(days=1),
+            check_in_start=now + timedelta(days=1),
+            start_datetime=now + timedelta(days=2),
+        )
+
+    def view(self, tournament, session='s1', device_class='desktop', ago=None, load_time=None,
+             time_on_page=None, bounced=False, clicks=0):
+        page_view = PageView.objects.create(
+            url=f'https://example.com/tournaments/{tournament.slug}/',
+            tournament=tournament,
+            session_key=session,
+            device_class=device_class,
+            is_mobile=device_class == 'mobile',
+            load_time=load_time,
+        )
+        UserEngagement.objects.create(
+            page_view=page_view, time_on_page=time_on_page, bounced=bounced, clicks_count=clicks
+        )
+        if ago:
+            PageView.objects.filter(id=page_view.id).update(created_at=timezone.now() - ago)
+        return page_view
+
+    def convert(self, tournament, page_view=None, ago=None):
+        event = ConversionEvent.objects.create(
+            event_type='registration_completed',
+            content_type=ContentType.objects.get_for_model(Tournament),
+            object_id=str(tournament.pk),
+            session_key='s1',
+            page_view=page_view,
+        )
+        if ago:
+            ConversionEvent.objects.filter(id=event.id).update(created_at=timezone.now() - ago)
+        return event
+
+
+class DashboardRollupTest(AnalyticsRollupTestCase):
+    def test_dashboard_totals_per_tournament(self):
+        first = self.view(self.cup, session='a', load_time=1000, time_on_page=20, bounced=True, clicks=1)
+        self.view(self.cup, session='b', device_class='mobile', load_time=2000, time_on_page=40, clicks=3)
+        self.view(self.cup_two, session='c', load_time=9000)
+        self.convert(self.cup, page_view=first)
+        ErrorLog.objects.create(error_type='javascript', message='boom', url=first.url,
+                                session_key='a', page_view=first)
+
+        data = AnalyticsService.get_dashboard_data(tournament_slug='cup', days=1)
+
+        self.assertEqual(data['overview']['total_views'], 2)
+        self.assertEqual(data['overview']['unique_visitors'], 2)
+        self.assertEqual(data['overview']['total_conversions'], 1)
+        self.assertEqual(data['overview']['conversion_rate'], 50.0)
+        self.assertEqual(data['overview']['error_count'], 1)
+        self.assertEqual(data['overview']['mobile_percentage'], 50.0)
+        self.assertEqual(data['performance']['avg_load_time'], 1500.0)
+        self.assertEqual(data['engagement']['avg_time_on_page'], 30.0)
+        self.assertEqual(data['engagement']['total_clicks'], 4)
+        self.assertEqual(data['engagement']['bounce_rate'], 50.0)
+        self.assertEqual(data['devices'], {'desktop': 1, 'mobile': 1})
+
+        site_wide = AnalyticsService.get_dashboard_data(days=1)
+        self.assertEqual(site_wide['overview']['total_views'], 3)
+        self.assertEqual(AnalyticsService.get_dashboard_data(tournament_slug='missing')['overview']['total_views'], 0)
+
+    def test_dashboard_reads_rollups_not_raw_rows(self):
+        self.view(self.cup, ago=timedelta(hours=5))
+        self.view(self.cup, ago=timedelta(days=3))
+        AnalyticsRollupService.rollup_pending()
+
+        # Raw rows are gone; closed buckets still answer the dashboard
+        PageView.objects.all().delete()
+
+        data = AnalyticsService.get_dashboard_data(tournament_slug='cup', days=7)
+        self.assertEqual(data['overview']['total_views'], 2)
+        self.assertEqual(sum(day['views'] for day in data['daily_data']), 2)
+
+    def test_time_window_and_open_hour(self):
+        self.view(self.cup, ago=timedelta(days=2))
+        AnalyticsRollupService.rollup_pending()
+        # Tracked after the last scheduled run
+        self.view(self.cup)
+
+        self.assertEqual(AnalyticsService.get_dashboard_data(tournament_slug='cup', days=1)['overview']['total_views'], 1)
+        self.assertEqual(AnalyticsService.get_dashboard_data(tournament_slug='cup', days=7)['overview']['total_views'], 2)
+
+    def test_dashboard_reads_do_not_write_rollups(self):
+        self.view(self.cup, ago=timedelta(hours=5))
+        AnalyticsRollupService.rollup_pending()
+        rollups = list(AnalyticsRollup.objects.order_by('id').values_list('id', 'page_views'))
+        state = AnalyticsRollupState.objects.get()
+        self.view(self.cup)
+
+        data = AnalyticsService.get_dashboard_data(tournament_slug='cup', days=1)
+
+        self.assertEqual(data['overview']['total_views'], 2)
+        self.assertEqual(sum(day['views'] for day in data['daily_data']), 2)
+        self.assertEqual(list(AnalyticsRollup.objects.order_by('id').values_list('id', 'page_views')), rollups)
+        self.assertEqual(AnalyticsRollupState.objects.get().updated_at, state.updated_at)
+
+    def test_open_hours_are_read_for_one_tournament_only(self):
+        first = self.view(self.cup)
+        self.view(self.cup_two, session='b')
+        self.convert(self.cup, page_view=first)
+        self.convert(self.cup_two)
+        ErrorLog.objects.create(error_type='javascript', message='boom', url=first.url,
+                                session_key='s1', page_view=first)
+
+        now = timezone.now()
+        _, open_buckets = AnalyticsRollupService.read_range(now - timedelta(hours=1), now, tournament_id=self.cup.id)
+
+        self.assertEqual({tournament_id for _, tournament_id, _ in open_buckets}, {self.cup.id})
+        metrics = list(open_buckets.values())
+        self.assertEqual(sum(m['page_views'] for m in metrics), 1)
+        self.assertEqual(sum(m['conversions'] for m in metrics), 1)
+        self.assertEqual(sum(m['errors'] for m in metrics), 1)
+
+    def test_dashboard_before_first_rollup_writes_nothing(self):
+        self.view(self.cup, ago=timedelta(days=2))
+
+        data = AnalyticsService.get_dashboard_data(tournament_slug='cup', days=7)
+
+        self.assertEqual(data['overview']['total_views'], 1)
+        self.assertFalse(AnalyticsRollup.objects.exists())
+        self.assertFalse(AnalyticsRollupState.objects.exists())
+
+
+class RollupPipelineTest(AnalyticsRollupTestCase):
+    def test_hourly_rows_fold_into_daily_rows(self):
+        now = timezone.now()
+        for hours in (30, 31, 50):
+            self.view(self.cup, load_time=hours * 10, ago=timedelta(hours=hours))
+        self.view(self.cup, device_class='tablet', ago=timedelta(hours=30))
+
+        watermark = AnalyticsRollupService.rollup_pending(now=now)
+
+        self.assertEqual(watermark, floor_hour(now))
+        self.assertEqual(AnalyticsRollupService.get_watermark(), watermark)
+        hourly = AnalyticsRollup.objects.filter(period_type='hourly', tournament=self.cup)
+        daily = AnalyticsRollup.objects.filter(period_type='daily', tournament=self.cup)
+        self.assertEqual(sum(hourly.values_list('page_views', flat=True)), 4)
+        self.assertEqual(sum(daily.values_list('page_views', flat=True)), 4)
+        self.assertEqual(set(daily.values_list('device_class', flat=True)), {'desktop', 'tablet'})
+
+        # Averages combine correctly across buckets
+        data = AnalyticsService.get_dashboard_data(tournament_slug='cup', days=7)
+        self.assertEqual(data['performance']['avg_load_time'], round((300 + 310 + 500) / 3, 2))
+
+    def test_rerun_is_idempotent(self):
+        self.view(self.cup, ago=timedelta(hours=2))
+        AnalyticsRollupService.rollup_pending()
+        AnalyticsRollupService.rollup_pending()
+
+        self.assertEqual(
+            sum(AnalyticsRollup.objects.filter(period_type='hourly').values_list('page_views', flat=True)), 1
+        )
+
+    def test_conversions_for_deleted_tournaments_are_site_wide(self):
+        gone = self.make_tournament('gone')
+        self.convert(gone, ago=timedelta(hours=2))
+        gone.delete()
+
+        AnalyticsRollupService.rollup_pending()
+
+        rollup = AnalyticsRollup.objects.get(period_type='hourly', conversions=1)
+        self.assertIsNone(rollup.tournament_id)
+        self.assertEqual(rollup.device_class, 'unknown')
+
+
+class PruneRawDataTest(AnalyticsRollupTestCase):
+    @override_settings(ANALYTICS_RAW_RETENTION_DAYS=7)
+    def test_prunes_old_rows_in_batches(self):
+        for days in (10, 11, 12):
+            self.view(self.cup, ago=timedelta(days=days))
+        recent = self.view(self.cup, ago=timedelta(days=1))
+
+        # Nothing is pruned before it has been rolled up
+        self.assertEqual(AnalyticsRollupService.prune_raw_data(batch_size=2), 0)
+
+        AnalyticsRollupService.rollup_pending()
+        self.assertEqual(AnalyticsRollupService.prune_raw_data(batch_size=2), 3)
+
+        self.assertEqual(list(PageView.objects.values_list('id', flat=True)), [recent.id])
+        self.assertEqual(UserEngagement.objects.count(), 1)
+        data = AnalyticsService.get_dashboard_data(tournament_slug='cup', days=30)
+        self.assertEqual(data['overview']['total_views'], 4)
+
+
+class PageViewKeyTest(AnalyticsRollupTestCase):
+    def test_tournament_resolved_from_url(self):
+        self.assertEqual(
+            AnalyticsService._tournament_id_for_url('https://example.com/tournaments/cup-2/?tab=bracket'),
+            self.cup_two.id
+        )
+        self.assertIsNone(AnalyticsService._tournament_id_for_url('/store/cup/'))
+
+    def test_device_class(self):
+        self.assertEqual(AnalyticsService._device_class('Mozilla/5.0 (iPhone; CPU iPhone OS 14_0) Mobile'), 'mobile')
+        self.assertEqual(AnalyticsService._device_class('Mozilla/5.0 (iPad; CPU OS 14_0)'), 'tablet')
+        self.assertEqual(AnalyticsService._device_class('Mozilla/5.0 (Linux; Android 12; SM-X200)'), 'tablet')
+        self.assertEqual(AnalyticsService._device_class('Mozilla/5.0 (Windows NT 10.0; Win64; x64)'), 'desktop')
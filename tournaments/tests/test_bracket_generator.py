@@ -0,0 +1,144 @@
+# tournaments/tests/test_bracket_generator.py
+"""Tests for the bulk-insert elimination bracket engine.
+Brackets are built in memory and written with one ``bulk_create``, so the
+number of queries must not grow with the number of entrants (beyond the
+backend's own insert batching).
+"""
+
+import math
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.models import Game, User
+from tournaments.models import Tournament, Participant, Match
+from tournaments.services import BracketGenerator
+
+
+class BracketGeneratorBulkInsertTest(TestCase):
+    def setUp(self):
+        self.game = Game.objects.create(name='Bench Game', slug='bench-game', genre='other')
+        self.organizer = User.objects.create_user(
+            email='organizer@example.com',
+            password='testpass123',
+            username='organizer'
+        )
+        self.sequence = 0
+
+    def _make_tournament(self, entrants, bracket_format):
+        self.sequence += 1
+        now = timezone.now()
+        tournament = Tournament.objects.create(
+            name=f'Bench {self.sequence}',
+            slug=f'bench-{self.sequence}',
+            description='Benchmark tournament',
+            game=self.game,
+            format=bracket_format,
+            status='in_progress',
+            organizer=self.organizer,
+            seeding_method='registration',
+            max_participants=entrants,
+            registration_start=now - timezone.timedelta(days=3),
+            registration_end=now - timezone.timedelta(days=2),
+            check_in_start=now - timezone.timedelta(days=1),
+            start_datetime=now,
+        )
+        users = User.objects.bulk_create([
+            User(email=f'p{self.sequence}-{i}@example.com', username=f'p{self.sequence}-{i}')
+            for i in range(entrants)
+        ])
+        Participant.objects.bulk_create([
+            Participant(tournament=tournament, user=user, checked_in=True)
+            for user in users
+        ])
+        return tournament, list(tournament.participants.all())
+
+    def _generate(self, entrants, bracket_format):
+        tournament, participants = self._make_tournament(entrants, bracket_format)
+        generator = BracketGenerator(tournament, participants)
+        with CaptureQueriesContext(connection) as ctx:
+            if bracket_format == 'double_elim':
+                generator.generate_double_elimination()
+            else:
+                generator.generate_single_elimination()
+        match_count = Match.objects.filter(tournament=tournament).count()
+        return tournament, ctx.captured_queries, match_count
+
+    def _non_insert_query_count(self, queries):
+        return len([
+            q for q in queries
+            if not q['sql'].startswith('INSERT INTO "tournament_matches"')
+        ])
+
+    def _match_insert_count(self, queries):
+        return len([
+            q for q in queries
+            if q['sql'].startswith('INSERT INTO "tournament_matches"')
+        ])
+
+    def _expected_insert_batches(self, match_count):
+        fields = [f for f in Match._meta.concrete_fields]
+        batch_size = connection.ops.bulk_batch_size(fields, [None] * match_count)
+        return math.ceil(match_count / max(1, batch_size))
+
+    def test_single_elimination_query_count_is_constant(self):
+        counts = []
+        for entrants in (8, 64, 256):
+            _, queries, match_count = self._generate(entrants, 'single_elim')
+            self.assertEqual(match_count, entrants - 1)
+            self.assertEqual(
+                self._match_insert_count(queries),
+                self._expected_insert_batches(match_count)
+            )
+            counts.append(self._non_insert_query_count(queries))
+        self.assertEqual(len(set(counts)), 1, counts)
+
+    def test_double_elimination_query_count_is_constant(self):
+        counts = []
+        for entrants in (8, 64, 256):
+            _, queries, match_count = self._generate(entrants, 'double_elim')
+            self.assertEqual(
+                self._match_insert_count(queries),
+                self._expected_insert_batches(match_count)
+            )
+            counts.append(self._non_insert_query_count(queries))
+        self.assertEqual(len(set(counts)), 1, counts)
+
+    def test_single_elimination_links_rounds(self):
+        tournament, _, _ = self._generate(8, 'single_elim')
+        matches = Match.objects.filter(tournament=tournament)
+        final = matches.get(round_number=3)
+        self.assertTrue(final.is_grand_finals)
+        self.assertEqual(final.previous_winner_matches.count(), 2)
+        for match in matches.filter(round_number=1):
+            self.assertEqual(match.status, 'ready')
+            self.assertEqual(match.next_match_winner.round_number, 2)
+
+    def test_single_elimination_assigns_byes(self):
+        tournament, _, _ = self._generate(5, 'single_elim')
+        byes = Match.objects.filter(tournament=tournament, round_number=1, status='completed')
+        self.assertEqual(byes.count(), 1)
+        bye = byes.get()
+        self.assertEqual(bye.winner_id, bye.participant1_id)
+
+    def test_double_elimination_links_losers_bracket(self):
+        tournament, _, _ = self._generate(8, 'double_elim')
+        matches = Match.objects.filter(tournament=tournament)
+        grand_finals = matches.get(is_grand_finals=True)
+        self.assertEqual(grand_finals.previous_winner_matches.count(), 2)
+        dropping = matches.filter(
+            bracket__bracket_type='main', round_number=1, next_match_loser__isnull=False
+        )
+        self.assertEqual(
+            dropping.count(),
+            matches.filter(bracket__bracket_type='losers', round_number=1).count()
+        )
+        for match in dropping:
+            self.assertEqual(match.next_match_loser.bracket.bracket_type, 'losers')
+
+    def test_seeds_are_persisted(self):
+        tournament, _, _ = self._generate(8, 'single_elim')
+        seeds = list(tournament.participants.order_by('seed').values_list('seed', flat=True))
+        self.assertEqual(seeds, list(range(1, 9)))
@@ -0,0 +1,123 @@
+# tournaments/tests/test_bracket_snapshot.py
+"""Tests for versioned bracket snapshots.
+Unchanged brackets answer 304, score reports publish deltas that ``?since``
+clients can apply, and the patched snapshot matches a fresh rebuild.
+"""
+
+from unittest.mock import patch
+
+from django.contrib import admin
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Game, User
+from tournaments.admin import MatchAdmin
+from tournaments.bracket_snapshot import MAX_DELTA_VERSIONS, SNAPSHOT_KEY, BracketSnapshot
+from tournaments.models import Tournament, Participant, Match
+from tournaments.services import BracketGenerator, ScoreReportingService
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class BracketSnapshotTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.game = Game.objects.create(name='Snapshot Game', slug='snapshot-game', genre='other')
+        self.organizer = User.objects.create_user(
+            email='organizer@example.com', password='testpass123', username='organizer'
+        )
+        self.tournament = Tournament.objects.create(
+            name='Snapshot Cup',
+            slug='snapshot-cup',
+            description='Snapshots',
+            game=self.game,
+            status='in_progress',
+            organizer=self.organizer,
+            seeding_method='registration',
+            max_participants=8,
+            registration_start=now - timezone.timedelta(days=3),
+            registration_end=now - timezone.timedelta(days=2),
+            check_in_start=now - timezone.timedelta(days=1),
+            start_datetime=now,
+        )
+        users = User.objects.bulk_create([
+            User(email=f'snap{i}@example.com', username=f'snap{i}') for i in range(8)
+        ])
+        Participant.objects.bulk_create([
+            Participant(tournament=self.tournament, user=user, checked_in=True) for user in users
+        ])
+        with self.captureOnCommitCallbacks(execute=True):
+            BracketGenerator(
+                self.tournament, list(self.tournament.participants.all())
+            ).generate_single_elimination()
+        self.url = reverse('tournaments:bracket_json', kwargs={'slug': self.tournament.slug})
+
+    def _first_round(self):
+        return list(Match.objects.filter(
+            tournament=self.tournament, round_number=1
+        ).order_by('match_number'))
+
+    def test_unchanged_bracket_answers_not_modified(self):
+        response = self.client.get(self.url)
+        data = response.json()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(data['full'])
+        self.assertEqual(sum(len(b['matches']) for b in data['brackets']), 7)
+
+        # The snapshot is cached: only the tournament lookup remains
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_score_report_publishes_delta(self):
+        before = self.client.get(self.url).json()
+        match = self._first_round()[0]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            ScoreReportingService.report_results([(match, 2, 0)])
+
+        delta = self.client.get(self.url, {'since': before['version']}).json()
+        self.assertFalse(delta['full'])
+        self.assertEqual(delta['version'], before['version'] + 1)
+        changed = {m['id']: m for m in delta['matches']}
+        self.assertEqual(changed[str(match.id)]['status'], 'completed')
+        self.assertEqual(changed[str(match.next_match_winner_id)]['participant1']['id'],
+                         str(match.participant1_id))
+
+        # The new version was patched forward, not rebuilt, and agrees with a rebuild
+        patched = cache.get(SNAPSHOT_KEY.format(tournament_id=self.tournament.id, version=delta['version']))
+        self.assertIsNotNone(patched)
+        self.assertEqual(patched, BracketSnapshot.build(self.tournament.id, delta['version']))
+
+    def test_stale_or_unknown_versions_get_full_snapshot(self):
+        version = BracketSnapshot.get_version(self.tournament.id)
+
+        for since in (version - MAX_DELTA_VERSIONS - 1, version + 10):
+            data = self.client.get(self.url, {'since': since}).json()
+            self.assertTrue(data['full'])
+
+        BracketSnapshot.invalidate(self.tournament.id)
+        self.assertTrue(self.client.get(self.url, {'since': version}).json()['full'])
+
+    def test_admin_status_actions_publish_changes(self):
+        response = self.client.get(self.url)
+        version = response.json()['version']
+        match = self._first_round()[0]
+        match_admin = MatchAdmin(Match, admin.site)
+        request = RequestFactory().post('/admin/tournaments/match/')
+
+        with patch.object(MatchAdmin, 'message_user'), self.captureOnCommitCallbacks(execute=True):
+            match_admin.mark_completed(request, Match.objects.filter(id=match.id))
+
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 200)
+        delta = self.client.get(self.url, {'since': version}).json()
+        self.assertFalse(delta['full'])
+        self.assertEqual([m['status'] for m in delta['matches']], ['completed'])
+
+    def test_invalid_since_is_rejected(self):
+        self.assertEqual(self.client.get(self.url, {'since': 'abc'}).status_code, 400)
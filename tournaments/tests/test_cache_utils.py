@@ -0,0 +1,61 @@
+# tournaments/tests/test_cache_utils.py
+"""Unit tests for the generation-based tournament cache namespace.
+Invalidation bumps a per-tournament generation instead of deleting guessed
+keys, so every cached entry (including deep participant pages) goes stale.
+"""
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from tournaments.cache_utils import TournamentCache
+
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class TournamentCacheGenerationTest(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        TournamentCache.reset_metrics()
+        self.tournament_id = 'abc123'
+
+    def test_round_trip(self):
+        TournamentCache.set_tournament_stats(self.tournament_id, {'views': 3})
+        self.assertEqual(TournamentCache.get_tournament_stats(self.tournament_id), {'views': 3})
+
+    def test_invalidation_reaches_every_participant_page(self):
+        for page in (1, 10, 25):
+            TournamentCache.set_participant_list(self.tournament_id, [page], page=page)
+
+        TournamentCache.invalidate_tournament_cache(self.tournament_id)
+
+        for page in (1, 10, 25):
+            self.assertIsNone(TournamentCache.get_participant_list(self.tournament_id, page))
+
+    def test_invalidation_increments_generation(self):
+        before = TournamentCache.get_generation(self.tournament_id)
+        TournamentCache.invalidate_tournament_cache(self.tournament_id)
+        self.assertEqual(TournamentCache.get_generation(self.tournament_id), before + 1)
+
+    def test_invalidation_is_scoped_to_tournament(self):
+        TournamentCache.set_match_data('other', ['m1'], 'live')
+        TournamentCache.invalidate_tournament_cache(self.tournament_id)
+        self.assertEqual(TournamentCache.get_match_data('other', 'live'), ['m1'])
+
+    def test_evicted_generation_does_not_resurrect_old_entries(self):
+        TournamentCache.set_timeline_phases(self.tournament_id, ['phase'])
+        cache.delete(TournamentCache.GENERATION_KEY.format(tournament_id=self.tournament_id))
+        self.assertIsNone(TournamentCache.get_timeline_phases(self.tournament_id))
+
+    def test_metrics_count_hits_misses_and_invalidations(self):
+        TournamentCache.get_tournament_stats(self.tournament_id)
+        TournamentCache.set_tournament_stats(self.tournament_id, {'views': 1})
+        TournamentCache.get_tournament_stats(self.tournament_id)
+        TournamentCache.get_tournament_stats(self.tournament_id)
+        TournamentCache.invalidate_tournament_cache(self.tournament_id)
+
+        metrics = TournamentCache.get_metrics()
+        self.assertEqual(metrics['stats']['hits'], 2)
+        self.assertEqual(metrics['stats']['misses'], 1)
+        self.assertEqual(metrics['stats']['hit_rate'], 66.67)
+        self.assertEqual(metrics['invalidations'], 1)
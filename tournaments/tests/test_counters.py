@@ -0,0 +1,91 @@
+# tournaments/tests/test_counters.py
+"""Tests for write-behind tournament counters.
+Increments are buffered without touching the tournament row, readers see
+the stored value plus the pending delta, and flushes use F() updates that
+leave ``updated_at`` alone. Registrations are written through at once.
+"""
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import Game, User
+from tournaments.counters import TournamentCounters, get_counter_buffer, reset_counter_buffer
+from tournaments.models import Tournament
+
+
+@override_settings(TOURNAMENT_COUNTER_BUFFER='local', TOURNAMENT_COUNTER_FLUSH_INTERVAL=3600)
+class TournamentCountersTest(TestCase):
+    def setUp(self):
+        reset_counter_buffer()
+        self.addCleanup(reset_counter_buffer)
+        now = timezone.now()
+        self.game = Game.objects.create(name='Counter Game', slug='counter-game', genre='other')
+        self.organizer = User.objects.create_user(
+            email='organizer@example.com', password='testpass123', username='organizer'
+        )
+        self.tournament = Tournament.objects.create(
+            name='Counter Cup',
+            slug='counter-cup',
+            description='Counters',
+            game=self.game,
+            status='registration',
+            organizer=self.organizer,
+            view_count=10,
+            registration_start=now - timezone.timedelta(days=1),
+            registration_end=now + timezone.timedelta(days=2),
+            check_in_start=now + timezone.timedelta(days=3),
+            start_datetime=now + timezone.timedelta(days=4),
+        )
+
+    def test_increments_are_buffered_and_merged(self):
+        updated_at = self.tournament.updated_at
+        with self.assertNumQueries(0):
+            TournamentCounters.incr(self.tournament.id, 'view_count')
+            TournamentCounters.incr(self.tournament.id, 'view_count', 2)
+            TournamentCounters.incr(self.tournament.id, 'share_count')
+
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.view_count, 10)
+        self.assertEqual(self.tournament.updated_at, updated_at)
+
+        merged = TournamentCounters.merged(self.tournament)
+        self.assertEqual(merged['view_count'], 13)
+        self.assertEqual(merged['share_count'], 1)
+        self.assertEqual(merged['total_registered'], 0)
+
+    def test_flush_writes_deltas_without_touching_updated_at(self):
+        updated_at = self.tournament.updated_at
+        TournamentCounters.incr(self.tournament.id, 'view_count', 5)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(TournamentCounters.flush(), 1)
+
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.view_count, 15)
+        self.assertEqual(self.tournament.updated_at, updated_at)
+        self.assertEqual(TournamentCounters.pending([self.tournament.id]), {str(self.tournament.id): {}})
+        self.assertEqual(TournamentCounters.merged(self.tournament)['view_count'], 15)
+
+    def test_registrations_are_written_through(self):
+        updated_at = self.tournament.updated_at
+        with self.assertNumQueries(1):
+            TournamentCounters.incr(self.tournament.id, 'total_registered')
+
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.total_registered, 1)
+        self.assertEqual(self.tournament.updated_at, updated_at)
+        self.assertEqual(TournamentCounters.pending([self.tournament.id]), {str(self.tournament.id): {}})
+        self.assertEqual(TournamentCounters.merged(self.tournament)['total_registered'], 1)
+
+    def test_unknown_counter_is_rejected(self):
+        with self.assertRaises(ValueError):
+            TournamentCounters.incr(self.tournament.id, 'prize_pool')
+
+    @override_settings(TOURNAMENT_COUNTER_BUFFER='sync')
+    def test_sync_mode_writes_through(self):
+        self.assertIsNone(get_counter_buffer())
+
+        TournamentCounters.incr(self.tournament.id, 'share_count', 3)
+
+        self.tournament.refresh_from_db()
+        self.assertEqual(self.tournament.share_count, 3)
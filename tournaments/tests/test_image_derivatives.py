@@ -0,0 +1,102 @@
+# tournaments/tests/test_image_derivatives.py
+"""Tests for the tournament image derivative pipeline.
+Uploads are turned into every size once, re-saves and duplicate uploads
+reuse the stored derivatives, and cleared images drop their manifest.
+"""
+
+from io import BytesIO
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+
+from core.models import Game, User
+from tournaments.image_utils import ImageOptimizer
+from tournaments.models import Tournament
+
+
+def make_image(color='red', size=(3000, 1500)):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, format='JPEG')
+    return SimpleUploadedFile('banner.jpg', buffer.getvalue(), content_type='image/jpeg')
+
+
+@override_settings(
+    IMAGE_DERIVATIVES_BACKEND='sync',
+    STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.InMemoryStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+)
+class ImageDerivativesTest(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.game = Game.objects.create(name='Image Game', slug='image-game', genre='other')
+        self.organizer = User.objects.create_user(
+            email='organizer@example.com', password='testpass123', username='organizer'
+        )
+        self.tournament_kwargs = dict(
+            description='Images',
+            game=self.game,
+            organizer=self.organizer,
+            registration_start=now,
+            registration_end=now + timezone.timedelta(days=1),
+            check_in_start=now + timezone.timedelta(days=2),
+            start_datetime=now + timezone.timedelta(days=3),
+        )
+
+    def _create(self, slug, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Tournament.objects.create(name=slug, slug=slug, **self.tournament_kwargs, **kwargs)
+
+    def test_upload_builds_every_size_once(self):
+        tournament = self._create('banner-cup', banner=make_image())
+        tournament.refresh_from_db()
+
+        manifest = tournament.image_derivatives['banner']
+        self.assertEqual(manifest['source'], tournament.banner.name)
+        self.assertEqual(
+            [d['size'] for d in manifest['derivatives']],
+            ['hero', 'large', 'medium', 'small', 'thumbnail'],
+        )
+        hero = manifest['derivatives'][0]
+        with Image.open(tournament.banner.storage.open(hero['webp'])) as img:
+            self.assertEqual((img.format, img.size), ('WEBP', (2560, 1440)))
+
+        # Unrelated saves do not touch the image again
+        with mock.patch.object(ImageOptimizer, 'build_derivatives') as build:
+            with self.captureOnCommitCallbacks(execute=True):
+                tournament.name = 'Renamed Cup'
+                tournament.save()
+        build.assert_not_called()
+
+    def test_duplicate_upload_reuses_derivatives(self):
+        first = self._create('first-cup', banner=make_image('blue'))
+
+        with mock.patch.object(ImageOptimizer, '_save_derivative') as save:
+            second = self._create('second-cup', banner=make_image('blue'))
+        save.assert_not_called()
+
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(
+            first.image_derivatives['banner']['derivatives'],
+            second.image_derivatives['banner']['derivatives'],
+        )
+
+    def test_cleared_image_drops_manifest(self):
+        tournament = self._create('cleared-cup', thumbnail=make_image(size=(800, 600)))
+        tournament.refresh_from_db()
+        self.assertEqual(
+            [d['size'] for d in tournament.image_derivatives['thumbnail']['derivatives']],
+            ['small', 'thumbnail'],
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tournament.thumbnail = None
+            tournament.save()
+
+        tournament.refresh_from_db()
+        self.assertNotIn('thumbnail', tournament.image_derivatives)
@@ -0,0 +1,150 @@
+# tournaments/tests/test_leaderboard.py
+"""Tests for the materialized player/team leaderboard.
+Rows are refreshed per subject after commit and must always agree with the
+live aggregation over confirmed participations in public tournaments.
+"""
+
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Game, User
+from teams.models import Team
+from tournaments.models import Tournament, Participant, Bracket, Match, LeaderboardEntry
+from tournaments.services import LeaderboardService
+
+
+class LeaderboardTestCase(TestCase):
+    def setUp(self):
+        self.game = Game.objects.create(name='Board Game', slug='board-game', genre='other')
+        self.other_game = Game.objects.create(name='Other Board', slug='other-board', genre='other')
+        self.organizer = User.objects.create_user(
+            email='organizer@example.com', password='testpass123', username='organizer'
+        )
+        self.alice = User.objects.create_user(email='alice@example.com', password='x', username='alice')
+        self.bob = User.objects.create_user(email='bob@example.com', password='x', username='bob')
+
+    def make_tournament(self, slug, game=None, **kwargs):
+        now = timezone.now()
+        return Tournament.objects.create(
+            name=slug.title(),
+            slug=slug,
+            description='Leaderboard',
+            game=game or self.game,
+            organizer=self.organizer,
+            status='in_progress',
+            registration_start=now - timezone.timedelta(days=3),
+            registration_end=now - timezone.timedelta(days=2),
+            check_in_start=now - timezone.timedelta(days=1),
+            start_datetime=now,
+            **kwargs
+        )
+
+    def participate(self, tournament, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Participant.objects.create(tournament=tournament, status='confirmed', **kwargs)
+
+
+class LeaderboardServiceTest(LeaderboardTestCase):
+    def test_participant_changes_refresh_rows(self):
+        cup = self.make_tournament('cup-one')
+        participant = self.participate(cup, user=self.alice, matches_won=3, matches_lost=1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            participant.prize_won = Decimal('150.00')
+            participant.save(update_fields=['prize_won'])
+
+        row = LeaderboardEntry.objects.get(entry_type='player', user=self.alice, game__isnull=True)
+        self.assertEqual(
+            (row.total_wins, row.total_losses, row.tournaments_played, row.total_prize),
+            (3, 1, 1, Decimal('150.00'))
+        )
+        self.assertEqual(LeaderboardService.verify(), [])
+
+    def test_per_game_and_overall_rows(self):
+        self.participate(self.make_tournament('cup-a'), user=self.alice, matches_won=2)
+        self.participate(self.make_tournament('cup-b', game=self.other_game), user=self.alice, matches_won=5)
+
+        overall = LeaderboardService.top_players()
+        per_game = LeaderboardService.top_players(game=self.other_game)
+
+        self.assertEqual([(p['user__username'], p['total_wins'], p['tournaments_played']) for p in overall],
+                         [('alice', 7, 2)])
+        self.assertEqual([p['total_wins'] for p in per_game], [5])
+
+    def test_private_and_unconfirmed_participations_are_excluded(self):
+        self.participate(self.make_tournament('private-cup', is_public=False), user=self.alice, matches_won=4)
+        with self.captureOnCommitCallbacks(execute=True):
+            Participant.objects.create(
+                tournament=self.make_tournament('pending-cup'), user=self.bob,
+                status='pending', matches_won=4
+            )
+
+        self.assertFalse(LeaderboardService.top_players().exists())
+        self.assertEqual(LeaderboardService.verify(), [])
+
+    def test_withdrawal_removes_rows(self):
+        participant = self.participate(self.make_tournament('cup-w'), user=self.alice, matches_won=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            participant.delete()
+
+        self.assertFalse(LeaderboardEntry.objects.filter(user=self.alice).exists())
+
+    def test_team_rows(self):
+        team = Team.objects.create(name='Board Team', tag='BRD', game=self.game, captain=self.alice)
+        self.participate(self.make_tournament('team-cup', is_team_based=True), team=team, matches_won=2)
+
+        teams = list(LeaderboardService.top_teams())
+        self.assertEqual([(t['team__name'], t['total_wins']) for t in teams], [('Board Team', 2)])
+
+    def test_completed_match_updates_leaderboard(self):
+        cup = self.make_tournament('match-cup')
+        p1 = self.participate(cup, user=self.alice)
+        p2 = self.participate(cup, user=self.bob)
+        bracket = Bracket.objects.create(tournament=cup, name='Main Bracket')
+        match = Match.objects.create(
+            tournament=cup, bracket=bracket, round_number=1, match_number=1,
+            participant1=p1, participant2=p2, status='ready'
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            success, message = match.report_score(2, 1)
+
+        self.assertTrue(success, message)
+        leaders = list(LeaderboardService.top_players())
+        self.assertEqual([(p['user__username'], p['total_wins'], p['total_losses']) for p in leaders],
+                         [('alice', 1, 0)])
+        self.assertEqual(LeaderboardService.verify(), [])
+
+    def test_rebuild_command_repairs_drift(self):
+        self.participate(self.make_tournament('drift-cup'), user=self.alice, matches_won=3)
+        # Bulk updates bypass the signals
+        Participant.objects.filter(user=self.alice).update(matches_won=9)
+        self.assertNotEqual(LeaderboardService.verify(), [])
+
+        out = StringIO()
+        call_command('rebuild_leaderboard', stdout=out)
+
+        self.assertIn('Leaderboard matches live data', out.getvalue())
+        self.assertEqual(LeaderboardService.top_players()[0]['total_wins'], 9)
+
+
+class LeaderboardViewTest(LeaderboardTestCase):
+    def test_view_reads_materialized_rows(self):
+        self.participate(self.make_tournament('view-cup'), user=self.alice, matches_won=6)
+
+        with patch('core.views.render', return_value=HttpResponse()) as render:
+            response = self.client.get(reverse('core:leaderboard'))
+
+        self.assertEqual(response.status_code, 200)
+        context = render.call_args[0][2]
+        self.assertEqual(
+            [(p['user__username'], p['total_wins']) for p in context['top_players']],
+            [('alice', 6)]
+        )
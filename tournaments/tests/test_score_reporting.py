@@ -0,0 +1,240 @@
+# tournaments/tests/test_score_reporting.py
+"""Tests for batched, transactional score reporting.
+Row updates happen in one transaction; cache invalidation and other side
+effects run once from a single post-commit hook.
+"""
+
+import json
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Game, User
+from teams.models import Team, TeamMember, TeamAnnouncement
+from tournaments.models import Tournament, Participant, Bracket, Match
+from tournaments.services import ScoreReportingService
+
+
+class ScoreReportingTestMixin:
+    def make_tournament(self, slug, **kwargs):
+        now = timezone.now()
+        return Tournament.objects.create(
+            name=slug.title(),
+            slug=slug,
+            description='Score reporting',
+            game=self.game,
+            status='in_progress',
+            organizer=self.organizer,
+            registration_start=now - timezone.timedelta(days=3),
+            registration_end=now - timezone.timedelta(days=2),
+            check_in_start=now - timezone.timedelta(days=1),
+            start_datetime=now,
+            **kwargs
+        )
+
+    def make_round(self, tournament, participants):
+        """Round 1 of a four/eight entrant bracket plus the round 2 matches it feeds"""
+        bracket = Bracket.objects.create(tournament=tournament, name='Main Bracket')
+        next_round = [
+            Match.objects.create(tournament=tournament, bracket=bracket,
+                                 round_number=2, match_number=i + 1)
+            for i in range(len(participants) // 4)
+        ]
+        first_round = [
+            Match.objects.create(
+                tournament=tournament, bracket=bracket, round_number=1, match_number=i + 1,
+                participant1=participants[2 * i], participant2=participants[2 * i + 1],
+                next_match_winner=next_round[i // 2], status='ready'
+            )
+            for i in range(len(participants) // 2)
+        ]
+        return first_round, next_round
+
+
+class ScoreReportingServiceTest(ScoreReportingTestMixin, TestCase):
+    def setUp(self):
+        self.game = Game.objects.create(name='Score Game', slug='score-game', genre='other')
+        self.organizer = User.objects.create_user(
+            email='organizer@example.com', password='testpass123', username='organizer'
+        )
+        self.tournament = self.make_tournament('score-cup')
+        users = User.objects.bulk_create([
+            User(email=f'player{i}@example.com', username=f'player{i}') for i in range(8)
+        ])
+        self.participants = [
+            Participant.objects.create(tournament=self.tournament, user=user, checked_in=True)
+            for user in users
+        ]
+        self.first_round, self.next_round = self.make_round(self.tournament, self.participants)
+
+    def test_report_score_updates_match_participants_and_progression(self):
+        match = self.first_round[0]
+        success, message = match.report_score(3, 1)
+
+        self.assertTrue(success, message)
+        self.assertEqual(match.status, 'completed')
+        self.assertEqual(match.winner, self.participants[0])
+        # Caller's in-memory objects reflect the update
+        self.assertEqual(match.participant1.matches_won, 1)
+        self.assertEqual(match.participant2.games_lost, 3)
+
+        winner = Participant.objects.get(id=self.participants[0].id)
+        loser = Participant.objects.get(id=self.participants[1].id)
+        self.assertEqual((winner.matches_won, winner.games_won, winner.games_lost), (1, 3, 1))
+        self.assertEqual((loser.matches_lost, loser.games_won, loser.games_lost), (1, 1, 3))
+
+        next_match = Match.objects.get(id=self.next_round[0].id)
+        self.assertEqual(next_match.participant1_id, self.participants[0].id)
+
+    def test_report_score_validation_messages(self):
+        match = self.first_round[0]
+        self.assertEqual(match.report_score(1, 1), (False, "Scores cannot be tied"))
+        self.assertTrue(match.report_score(2, 0)[0])
+        self.assertEqual(match.report_score(2, 0), (False, "Match already completed"))
+        self.assertEqual(
+            self.next_round[1].report_score(2, 0),
+            (False, "Both participants must be assigned")
+        )
+
+    def test_round_is_reported_in_one_batch(self):
+        results = [(match.id, 2, 1) for match in self.first_round]
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            outcomes = ScoreReportingService.report_results(results, tournament=self.tournament)
+
+        self.assertTrue(all(outcome['success'] for outcome in outcomes))
+        self.assertEqual(len(callbacks), 1)
+
+        for next_match in Match.objects.filter(id__in=[m.id for m in self.next_round]):
+            self.assertIsNotNone(next_match.participant1_id)
+            self.assertIsNotNone(next_match.participant2_id)
+
+        winners = Participant.objects.filter(matches_won=1).count()
+        losers = Participant.objects.filter(matches_lost=1).count()
+        self.assertEqual((winners, losers), (4, 4))
+
+    def test_batch_query_count_does_not_grow_with_round_size(self):
+        with self.assertNumQueries(6):
+            ScoreReportingService.report_results([(self.first_round[0].id, 2, 1)])
+        with self.assertNumQueries(6):
+            ScoreReportingService.report_results(
+                [(match.id, 2, 1) for match in self.first_round[1:]]
+            )
+
+    def test_invalid_rows_do_not_block_valid_ones(self):
+        other = self.make_tournament('other-cup')
+        outcomes = ScoreReportingService.report_results(
+            [(self.first_round[0].id, 2, 2), (self.first_round[1].id, 0, 2)],
+            tournament=other
+        )
+        self.assertEqual([o['message'] for o in outcomes], ["Match not found", "Match not found"])
+
+        outcomes = ScoreReportingService.report_results(
+            [(self.first_round[0].id, 2, 2), (self.first_round[1].id, 0, 2)],
+            tournament=self.tournament
+        )
+        self.assertEqual([o['success'] for o in outcomes], [False, True])
+
+    def test_cache_is_invalidated_once_after_commit(self):
+        with patch('tournaments.services.score_reporting.TournamentCache.invalidate_tournament_cache') as invalidate:
+            with self.captureOnCommitCallbacks(execute=True):
+                ScoreReportingService.report_results([(match.id, 2, 1) for match in self.first_round])
+        invalidate.assert_called_once_with(self.tournament.id)
+
+
+class TeamScoreReportingTest(ScoreReportingTestMixin, TestCase):
+    def setUp(self):
+        self.game = Game.objects.create(name='Team Game', slug='team-game', genre='other')
+        self.organizer = User.objects.create_user(
+            email='organizer@example.com', password='testpass123', username='organizer'
+        )
+        self.tournament = self.make_tournament('team-cup', is_team_based=True)
+        self.teams = []
+        participants = []
+        for i in range(4):
+            captain = User.objects.create(email=f'captain{i}@example.com', username=f'captain{i}')
+            team = Team.objects.create(name=f'Team {i}', tag=f'T{i}', game=self.game, captain=captain)
+            TeamMember.objects.create(team=team, user=captain, role='captain', status='active')
+            member = User.objects.create(email=f'member{i}@example.com', username=f'member{i}')
+            TeamMember.objects.create(team=team, user=member, status='active')
+            self.teams.append(team)
+            participants.append(Participant.objects.create(tournament=self.tournament, team=team))
+        self.first_round, _ = self.make_round(self.tournament, participants)
+
+    def test_team_statistics_and_announcements(self):
+        success, message = self.first_round[0].report_score(2, 0)
+        self.assertTrue(success, message)
+
+        winner, loser = Team.objects.get(id=self.teams[0].id), Team.objects.get(id=self.teams[1].id)
+        self.assertEqual((winner.total_wins, winner.total_losses), (1, 0))
+        self.assertEqual((loser.total_wins, loser.total_losses), (0, 1))
+
+        self.assertEqual(
+            list(TeamMember.objects.filter(team=winner).values_list('matches_played', 'matches_won')),
+            [(1, 1), (1, 1)]
+        )
+        self.assertEqual(
+            list(TeamMember.objects.filter(team=loser).values_list('matches_played', 'matches_won')),
+            [(1, 0), (1, 0)]
+        )
+        self.assertTrue(
+            TeamAnnouncement.objects.filter(team=winner, title='Match Result: Won vs Team 1').exists()
+        )
+        self.assertTrue(
+            TeamAnnouncement.objects.filter(team=loser, title='Match Result: Lost vs Team 0').exists()
+        )
+
+
+class ReportResultsAPITest(ScoreReportingTestMixin, TestCase):
+    def setUp(self):
+        self.game = Game.objects.create(name='API Game', slug='api-game', genre='other')
+        self.organizer = User.objects.create_user(
+            email='organizer@example.com', password='testpass123', username='organizer'
+        )
+        self.player = User.objects.create_user(
+            email='player@example.com', password='testpass123', username='player'
+        )
+        self.tournament = self.make_tournament('api-cup')
+        users = User.objects.bulk_create([
+            User(email=f'p{i}@example.com', username=f'p{i}') for i in range(4)
+        ])
+        participants = [
+            Participant.objects.create(tournament=self.tournament, user=user) for user in users
+        ]
+        self.first_round, _ = self.make_round(self.tournament, participants)
+        self.url = reverse('tournaments:api_report_results', kwargs={'slug': self.tournament.slug})
+
+    def post(self, payload):
+        return self.client.post(self.url, data=json.dumps(payload), content_type='application/json')
+
+    def test_organizer_reports_round(self):
+        self.client.force_login(self.organizer)
+        response = self.post({'results': [
+            {'match_id': str(match.id), 'score_p1': 2, 'score_p2': 1} for match in self.first_round
+        ]})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertTrue(data['success'])
+        self.assertEqual(data['reported'], 2)
+        self.assertEqual(
+            Match.objects.filter(id__in=[m.id for m in self.first_round], status='completed').count(), 2
+        )
+
+    def test_non_organizer_is_rejected(self):
+        self.client.force_login(self.player)
+        response = self.post({'results': [
+            {'match_id': str(self.first_round[0].id), 'score_p1': 2, 'score_p2': 1}
+        ]})
+        self.assertEqual(response.status_code, 403)
+
+    def test_malformed_rows_are_rejected(self):
+        self.client.force_login(self.organizer)
+        response = self.post({'results': [{'match_id': 'nope', 'score_p1': 2, 'score_p2': 1}]})
+        self.assertEqual(response.status_code, 400)
+        response = self.post({'results': [
+            {'match_id': str(self.first_round[0].id), 'score_p1': '2', 'score_p2': 1}
+        ]})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,119 @@
+# tournaments/tests/test_seeding.py
+"""Tests for seeding strategies.
+Ratings are loaded once per seeding run, missing game profiles sort last
+instead of failing, and seeds are written with a single bulk update.
+"""
+
+import json
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Game, User, UserGameProfile
+from tournaments.models import Tournament, Participant
+from tournaments.services import SeedingService
+from tournaments.services.seeding import snake_groups
+
+
+class SnakeGroupsTest(SimpleTestCase):
+    def test_seeds_snake_across_groups(self):
+        groups = snake_groups(list(range(1, 9)), 4)
+
+        self.assertEqual(groups, [[1, 8], [2, 7], [3, 6], [4, 5]])
+
+    def test_requires_a_group(self):
+        with self.assertRaises(ValueError):
+            snake_groups([1, 2], 0)
+
+
+class SeedingServiceTest(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.game = Game.objects.create(name='Seed Game', slug='seed-game', genre='other')
+        self.organizer = User.objects.create_user(
+            email='organizer@example.com', password='testpass123', username='organizer'
+        )
+        self.tournament = Tournament.objects.create(
+            name='Seed Cup',
+            slug='seed-cup',
+            description='Seeding',
+            game=self.game,
+            status='registration',
+            organizer=self.organizer,
+            seeding_method='skill',
+            registration_start=now - timezone.timedelta(days=3),
+            registration_end=now + timezone.timedelta(days=2),
+            check_in_start=now + timezone.timedelta(days=3),
+            start_datetime=now + timezone.timedelta(days=4),
+        )
+        self.sequence = 0
+
+    def _add_players(self, ratings):
+        participants = []
+        for rating in ratings:
+            self.sequence += 1
+            user = User.objects.create_user(
+                email=f'seed{self.sequence}@example.com',
+                password='testpass123',
+                username=f'seed{self.sequence}'
+            )
+            if rating is not None:
+                UserGameProfile.objects.create(user=user, game=self.game, skill_rating=rating)
+            participants.append(Participant.objects.create(
+                tournament=self.tournament, user=user, status='confirmed'
+            ))
+        return participants
+
+    def test_skill_seeding_orders_by_rating_with_unrated_last(self):
+        low, unrated, high = self._add_players([900, None, 1500])
+
+        ordered = SeedingService.seed(self.tournament, [low, unrated, high])
+
+        self.assertEqual(ordered, [high, low, unrated])
+        self.assertEqual(
+            list(self.tournament.participants.order_by('seed').values_list('id', flat=True)),
+            [high.id, low.id, unrated.id]
+        )
+
+    def test_skill_seeding_query_count_is_constant(self):
+        def count_queries(ratings):
+            Participant.objects.filter(tournament=self.tournament).delete()
+            participants = self._add_players(ratings)
+            with CaptureQueriesContext(connection) as ctx:
+                SeedingService.seed(self.tournament, participants)
+            return len(ctx.captured_queries)
+
+        self.assertEqual(count_queries([1000, 1100]), count_queries([1000 + i for i in range(12)]))
+
+    def test_manual_seeding_keeps_assigned_seeds(self):
+        first, second, third = self._add_players([1000, 1000, 1000])
+        first.seed, second.seed, third.seed = 3, None, 1
+
+        ordered = SeedingService.seed(self.tournament, [first, second, third], 'manual')
+
+        self.assertEqual(ordered, [third, first, second])
+        self.assertEqual([p.seed for p in ordered], [1, 2, 3])
+
+    def test_unknown_method_is_rejected(self):
+        with self.assertRaises(ValueError):
+            SeedingService.order(self.tournament, [], 'alphabetical')
+
+    def test_auto_seed_api_accepts_skill_method(self):
+        low, high = self._add_players([800, 1600])
+        self.tournament.seeding_method = 'manual'
+        self.tournament.save()
+        self.client.login(email='organizer@example.com', password='testpass123')
+
+        response = self.client.post(
+            reverse('tournaments:api_auto_seed', kwargs={'slug': self.tournament.slug}),
+            data=json.dumps({'method': 'skill'}),
+            content_type='application/json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        high.refresh_from_db()
+        low.refresh_from_db()
+        self.assertEqual((high.seed, low.seed), (1, 2))
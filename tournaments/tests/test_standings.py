@@ -0,0 +1,187 @@
+# tournaments/tests/test_standings.py
+"""Tests for incremental standings, Swiss pairing and circle-method round robins.
+Tiebreakers are maintained as results arrive, Swiss rounds avoid rematches
+and round robins are written with a constant number of queries.
+"""
+
+from itertools import combinations
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.models import Game, User
+from tournaments.models import Tournament, Participant, Match
+from tournaments.services import BracketGenerator, ScoreReportingService, StandingsService
+from tournaments.services.standings import DRAW, LOSS, WIN, StandingsTable, pair_swiss_round
+from tournaments.tasks import generate_tournament_standings
+
+
+class StandingsTableTest(SimpleTestCase):
+    def test_tiebreakers_follow_later_results(self):
+        table = StandingsTable()
+        table.add_result(1, 'a', 'b', WIN)
+        table.add_result(2, 'c', 'd', DRAW)
+        # b's later win raises a's Buchholz and Sonneborn-Berger
+        table.add_result(3, 'b', 'c', WIN)
+        table.add_result(4, 'a', 'd', LOSS)
+
+        a, b, c, d = (table.rows[pid] for pid in 'abcd')
+        self.assertEqual((a['score'], b['score'], c['score'], d['score']), (1.0, 1.0, 0.5, 1.5))
+        self.assertEqual(a['buchholz'], b['score'] + d['score'])
+        self.assertEqual(a['sonneborn_berger'], b['score'])
+        self.assertEqual(d['buchholz'], c['score'] + a['score'])
+        self.assertEqual(d['sonneborn_berger'], 0.5 * c['score'] + a['score'])
+
+    def test_ranking_breaks_ties_with_buchholz(self):
+        table = StandingsTable()
+        table.add_result(1, 'a', 'b', WIN)
+        table.add_result(2, 'c', 'd', WIN)
+        table.add_result(3, 'b', 'd', WIN)
+
+        # a, b and c all have one point; c's only opponent has none
+        ranking = [row['participant_id'] for row in table.ranking()]
+        self.assertEqual(ranking, ['a', 'b', 'c', 'd'])
+
+    def test_bye_counts_as_win_without_opponent(self):
+        table = StandingsTable()
+        table.add_result(1, 'a', None, WIN)
+
+        self.assertEqual(table.rows['a']['score'], 1.0)
+        self.assertEqual(table.rows['a']['byes'], 1)
+        self.assertEqual(table.played_pairs(), set())
+
+
+class SwissPairingTest(SimpleTestCase):
+    def test_first_round_pairs_top_half_against_bottom_half(self):
+        pairs, bye = pair_swiss_round([['p1', 'p2', 'p3', 'p4', 'p5', 'p6']])
+
+        self.assertEqual(pairs, [('p1', 'p4'), ('p2', 'p5'), ('p3', 'p6')])
+        self.assertIsNone(bye)
+
+    def test_rematches_are_avoided(self):
+        played = {frozenset(('p1', 'p3')), frozenset(('p2', 'p4'))}
+        pairs, _ = pair_swiss_round([['p1', 'p2', 'p3', 'p4']], played)
+
+        self.assertEqual(pairs, [('p1', 'p4'), ('p2', 'p3')])
+
+    def test_bye_goes_to_lowest_player_without_one(self):
+        _, bye = pair_swiss_round([['p1', 'p2'], ['p3']], byes={'p3'})
+
+        self.assertEqual(bye, 'p2')
+
+    def test_large_field_is_fully_paired(self):
+        players = [f'p{i}' for i in range(1000)]
+        pairs, bye = pair_swiss_round([players[:500], players[500:]])
+
+        self.assertIsNone(bye)
+        self.assertEqual(len({pid for pair in pairs for pid in pair}), 1000)
+
+
+class StandingsBracketTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.game = Game.objects.create(name='Swiss Game', slug='swiss-game', genre='other')
+        self.organizer = User.objects.create_user(
+            email='organizer@example.com', password='testpass123', username='organizer'
+        )
+        self.sequence = 0
+
+    def _make_tournament(self, entrants, bracket_format):
+        self.sequence += 1
+        now = timezone.now()
+        tournament = Tournament.objects.create(
+            name=f'Standings {self.sequence}',
+            slug=f'standings-{self.sequence}',
+            description='Standings tournament',
+            game=self.game,
+            format=bracket_format,
+            status='in_progress',
+            organizer=self.organizer,
+            seeding_method='registration',
+            max_participants=entrants,
+            registration_start=now - timezone.timedelta(days=3),
+            registration_end=now - timezone.timedelta(days=2),
+            check_in_start=now - timezone.timedelta(days=1),
+            start_datetime=now,
+        )
+        users = User.objects.bulk_create([
+            User(email=f's{self.sequence}-{i}@example.com', username=f's{self.sequence}-{i}')
+            for i in range(entrants)
+        ])
+        Participant.objects.bulk_create([
+            Participant(tournament=tournament, user=user, checked_in=True)
+            for user in users
+        ])
+        return tournament, list(tournament.participants.all())
+
+    def test_round_robin_pairs_everyone_once(self):
+        tournament, participants = self._make_tournament(7, 'round_robin')
+        bracket = BracketGenerator(tournament, participants).generate_round_robin()
+
+        matches = list(Match.objects.filter(bracket=bracket))
+        pairs = {frozenset((m.participant1_id, m.participant2_id)) for m in matches}
+        self.assertEqual(len(matches), 21)
+        self.assertEqual(pairs, {frozenset(pair) for pair in combinations([p.id for p in participants], 2)})
+        for round_number in range(1, bracket.total_rounds + 1):
+            players = [
+                pid for m in matches if m.round_number == round_number
+                for pid in (m.participant1_id, m.participant2_id)
+            ]
+            self.assertEqual(len(players), len(set(players)))
+
+    def test_round_robin_query_count_is_constant(self):
+        def count_queries(entrants):
+            tournament, participants = self._make_tournament(entrants, 'round_robin')
+            with CaptureQueriesContext(connection) as ctx:
+                BracketGenerator(tournament, participants).generate_round_robin()
+            return len([
+                q for q in ctx.captured_queries
+                if not q['sql'].startswith('INSERT INTO "tournament_matches"')
+            ])
+
+        self.assertEqual(count_queries(6), count_queries(20))
+
+    def test_swiss_rounds_avoid_rematches_and_update_standings(self):
+        tournament, participants = self._make_tournament(8, 'swiss')
+        generator = BracketGenerator(tournament, participants)
+        bracket = generator.generate_swiss_rounds()
+        played = set()
+
+        for _ in range(bracket.total_rounds):
+            round_matches = list(
+                Match.objects.filter(bracket=bracket, status='ready').order_by('match_number')
+            )
+            for match in round_matches:
+                pair = frozenset((match.participant1_id, match.participant2_id))
+                self.assertNotIn(pair, played)
+                played.add(pair)
+            with self.captureOnCommitCallbacks(execute=True):
+                ScoreReportingService.report_results([(m, 2, 1) for m in round_matches])
+            if len(played) < 4 * bracket.total_rounds:
+                generator.generate_next_swiss_round(bracket)
+
+        table = StandingsService.rebuild(tournament.id)
+        self.assertEqual(sum(row['score'] for row in table.rows.values()), 12.0)
+
+        standings = StandingsService.get_standings(tournament)
+        self.assertEqual(standings[0]['score'], 3.0)
+        self.assertEqual([row['rank'] for row in standings], list(range(1, 9)))
+
+    def test_final_placements_follow_the_reported_results(self):
+        tournament, participants = self._make_tournament(4, 'round_robin')
+        bracket = BracketGenerator(tournament, participants).generate_round_robin()
+        matches = list(Match.objects.filter(bracket=bracket).order_by('round_number', 'match_number'))
+        with self.captureOnCommitCallbacks(execute=True):
+            ScoreReportingService.report_results([(m, 2, 1) for m in matches])
+
+        generate_tournament_standings(tournament.id)
+
+        expected = [row['participant'].id for row in StandingsService.get_standings(tournament)]
+        placed = list(
+            tournament.participants.order_by('final_placement').values_list('id', flat=True)
+        )
+        self.assertEqual(placed, expected)
+        self.assertEqual(sum(row['score'] for row in StandingsService.rebuild(tournament.id).rows.values()), 6.0)
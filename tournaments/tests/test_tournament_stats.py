@@ -0,0 +1,107 @@
+# tournaments/tests/test_tournament_stats.py
+"""Tests for the per-request tournament stats provider.
+Every participant counter comes from one aggregate query and every match
+counter from another, and the capacity helpers share them.
+"""
+
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.models import Game, User
+from tournaments.models import Tournament, Participant, Bracket, Match
+from tournaments.stats import TournamentStats
+from tournaments.views import TournamentContextMixin
+
+
+class TournamentStatsTest(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.game = Game.objects.create(name='Stats Game', slug='stats-game', genre='other')
+        self.organizer = User.objects.create_user(
+            email='organizer@example.com', password='testpass123', username='organizer'
+        )
+        self.tournament = Tournament.objects.create(
+            name='Stats Cup',
+            slug='stats-cup',
+            description='Stats',
+            game=self.game,
+            status='registration',
+            organizer=self.organizer,
+            max_participants=4,
+            registration_start=now - timezone.timedelta(days=3),
+            registration_end=now + timezone.timedelta(days=2),
+            check_in_start=now + timezone.timedelta(days=3),
+            start_datetime=now + timezone.timedelta(days=4),
+        )
+        users = User.objects.bulk_create([
+            User(email=f'stats{i}@example.com', username=f'stats{i}') for i in range(5)
+        ])
+        Participant.objects.bulk_create([
+            Participant(tournament=self.tournament, user=users[0], status='confirmed', checked_in=True),
+            Participant(tournament=self.tournament, user=users[1], status='confirmed'),
+            Participant(tournament=self.tournament, user=users[2], status='pending_payment'),
+            Participant(tournament=self.tournament, user=users[3], status='pending'),
+            Participant(tournament=self.tournament, user=users[4], status='withdrawn'),
+        ])
+        bracket = Bracket.objects.create(tournament=self.tournament, name='Main Bracket')
+        Match.objects.bulk_create([
+            Match(tournament=self.tournament, bracket=bracket, round_number=1, match_number=1,
+                  status='completed', completed_at=now),
+            Match(tournament=self.tournament, bracket=bracket, round_number=1, match_number=2,
+                  status='in_progress'),
+            Match(tournament=self.tournament, bracket=bracket, round_number=2, match_number=1,
+                  status='pending'),
+        ])
+        self.tournament = Tournament.objects.get(id=self.tournament.id)
+
+    def test_counters(self):
+        stats = TournamentStats.for_tournament(self.tournament)
+
+        self.assertEqual(stats.participants['total'], 5)
+        self.assertEqual(stats.participants['checked_in'], 1)
+        self.assertEqual(stats.participants['pending_approval'], 1)
+        self.assertEqual(stats.participants['pending_payment'], 1)
+        self.assertEqual(stats.registered, 4)
+        self.assertEqual(stats.matches['total'], 3)
+        self.assertEqual(stats.matches['completed'], 1)
+        self.assertEqual(stats.matches['in_progress'], 1)
+        self.assertEqual(stats.matches['pending'], 1)
+        self.assertEqual(stats.matches['completed_24h'], 1)
+
+    def test_capacity_helpers_share_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertTrue(self.tournament.is_full)
+            self.assertEqual(self.tournament.spots_remaining, 0)
+            self.assertEqual(self.tournament.registration_progress, 100)
+            self.assertEqual(self.tournament.get_current_registrations(), 4)
+            self.assertEqual(self.tournament.get_registrations_today(), 5)
+
+    def test_saving_a_participant_clears_the_memo(self):
+        self.assertEqual(self.tournament.get_current_registrations(), 4)
+        participant = self.tournament.participants.get(status='pending')
+        participant.tournament = self.tournament
+        participant.status = 'rejected'
+        participant.save()
+
+        self.assertEqual(self.tournament.get_current_registrations(), 3)
+        self.assertFalse(self.tournament.is_full)
+
+    def test_detail_statistics_query_each_table_once(self):
+        mixin = TournamentContextMixin()
+        mixin.request = RequestFactory().get('/')
+
+        with CaptureQueriesContext(connection) as ctx:
+            statistics = mixin.get_tournament_statistics(self.tournament)
+
+        tables = [
+            table for query in ctx.captured_queries
+            for table in ('tournament_participants', 'tournament_matches')
+            if f'FROM "{table}"' in query['sql']
+        ]
+        self.assertEqual(tables.count('tournament_participants'), 1)
+        self.assertEqual(tables.count('tournament_matches'), 1)
+        self.assertEqual(statistics['participants']['registered'], 4)
+        self.assertEqual(statistics['matches']['completed'], 1)
+        self.assertEqual(statistics['engagement']['recent_activity'], 6)
@@ -30,6 +30,7 @@ urlpatterns = [
     path('match/<uuid:pk>/', views.MatchDetailView.as_view(), name='match_detail'),
     path('match/<uuid:pk>/report/', views.match_report_score, name='match_report'),
     path('match/<uuid:pk>/dispute/', views.match_dispute, name='match_dispute'),
+    path('<slug:slug>/api/matches/report/', api_views.report_results_api, name='api_report_results'),
     
     # Admin actions
     path('<slug:slug>/start/', views.tournament_start, name='start'),
@@ -12,19 +12,23 @@ from django.views.decorators.http import require_http_methods
 from django.core.paginator import Paginator
 from django.db.models import Q, Count, Prefetch
 from django.utils.html import escape
+from django.utils.cache import get_conditional_response
 from django.core.exceptions import PermissionDenied
-from datetime import timedelta
 import json
 import logging
 try:
     import stripe
 except Exception:
     stripe = None
+from core.instrumentation import query_budget
 from core.models import Game
 from .models import Tournament, Participant, Match, Bracket, MatchDispute, Payment
 from .forms import TournamentForm, MatchReportForm, DisputeForm
 from .services.bracket import generate_bracket
+from .bracket_snapshot import BracketSnapshot
 from .cache_utils import TournamentCache
+from .counters import TournamentCounters
+from .stats import TournamentStats
 from .security import (
     TournamentAccessControl, 
     require_tournament_permission,
@@ -178,8 +182,11 @@ class TournamentContextMixin:
         Calculate comprehensive tournament statistics for display
         Requirements: 4.1, 4.2, 4.3
         """
-        # Use get_current_registrations() instead of cached total_registered
-        registered_count = tournament.get_current_registrations()
+        # Participant and match counters come from one aggregate per table,
+        # memoized on the tournament and shared with is_full/spots_remaining
+        stats = TournamentStats.for_tournament(tournament)
+        registered_count = stats.registered
+        counts = TournamentCounters.merged(tournament)
         max_participants = tournament.max_participants or 0
         checked_in_count = tournament.total_checked_in or 0
         
@@ -208,16 +215,16 @@ class TournamentContextMixin:
                 'has_participants': registered_count > 0,
             },
             'engagement': {
-                'views': getattr(tournament, 'view_count', 0),
-                'shares': getattr(tournament, 'share_count', 0),
+                'views': counts['view_count'],
+                'shares': counts['share_count'],
                 'registrations_today': self.get_registrations_today(tournament),
                 'recent_activity': self.get_recent_activity_count(tournament),
             },
             'matches': {
-                'total': tournament.matches.count() if hasattr(tournament, 'matches') else 0,
-                'completed': tournament.matches.filter(status='completed').count() if hasattr(tournament, 'matches') else 0,
-                'in_progress': tournament.matches.filter(status='in_progress').count() if hasattr(tournament, 'matches') else 0,
-                'pending': tournament.matches.filter(status='pending').count() if hasattr(tournament, 'matches') else 0,
+                'total': stats.matches['total'],
+                'completed': stats.matches['completed'],
+                'in_progress': stats.matches['in_progress'],
+                'pending': stats.matches['pending'],
             },
             'timeline': {
                 'current_phase': self.get_current_phase(tournament),
@@ -310,7 +317,7 @@ class TournamentContextMixin:
         Provide consistently formatted participant information
         Requirements: 6.3 - Consistent participant count display
         """
-        registered_count = tournament.total_registered or 0
+        registered_count = TournamentCounters.merged(tournament)['total_registered']
         max_participants = tournament.max_participants or 0
         
         return {
@@ -544,29 +551,12 @@ class TournamentContextMixin:
     
     def get_registrations_today(self, tournament):
         """Get number of registrations today"""
-        today = timezone.now().date()
-        if hasattr(tournament, 'participants'):
-            return tournament.participants.filter(
-                registered_at__date=today
-            ).count()
-        return 0
+        return TournamentStats.for_tournament(tournament).participants['registrations_today']
     
     def get_recent_activity_count(self, tournament):
         """Get recent activity count (last 24 hours)"""
-        yesterday = timezone.now() - timedelta(hours=24)
-        activity_count = 0
-        
-        if hasattr(tournament, 'participants'):
-            activity_count += tournament.participants.filter(
-                registered_at__gte=yesterday
-            ).count()
-        
-        if hasattr(tournament, 'matches'):
-            activity_count += tournament.matches.filter(
-                completed_at__gte=yesterday
-            ).count()
-        
-        return activity_count
+        stats = TournamentStats.for_tournament(tournament)
+        return stats.participants['registrations_24h'] + stats.matches['completed_24h']
     
     def get_current_phase(self, tournament):
         """Get current tournament phase"""
@@ -667,21 +657,18 @@ class TournamentDetailView(DetailView, TournamentContextMixin):
             )
             raise PermissionDenied("You don't have permission to view this tournament")
         
-        # Increment view count (with basic rate limiting per IP) - disabled during testing
-        # TODO: Re-enable view count increment in production
-        # x_forwarded_for = self.request.META.get('HTTP_X_FORWARDED_FOR')
-        # if x_forwarded_for:
-        #     ip_address = x_forwarded_for.split(',')[0]
-        # else:
-        #     ip_address = self.request.META.get('REMOTE_ADDR')
-        # 
-        # # Simple rate limiting for view count (1 per minute per IP)
-        # from django.core.cache import cache
-        # view_key = f"tournament_view_{tournament.id}_{ip_address}"
-        # if not cache.get(view_key):
-        #     tournament.view_count += 1
-        #     tournament.save(update_fields=['view_count'])
-        #     cache.set(view_key, True, 60)  # 1 minute
+        # Increment view count (1 per minute per IP). The counter is buffered,
+        # so this neither writes the row nor bumps updated_at.
+        x_forwarded_for = self.request.META.get('HTTP_X_FORWARDED_FOR')
+        if x_forwarded_for:
+            ip_address = x_forwarded_for.split(',')[0].strip()
+        else:
+            ip_address = self.request.META.get('REMOTE_ADDR')
+        
+        from django.core.cache import cache
+        view_key = f"tournament_view_{tournament.id}_{ip_address}"
+        if cache.add(view_key, True, 60):
+            TournamentCounters.incr(tournament.id, 'view_count')
         
         return tournament
     
@@ -865,6 +852,7 @@ class TournamentDetailView(DetailView, TournamentContextMixin):
             # Generate fresh statistics
             # Use proper counting for team vs individual tournaments
             registered_count = tournament.get_current_registrations()
+            match_counts = TournamentStats.for_tournament(tournament).matches
             
             stats = {
                 'participants': {
@@ -881,10 +869,10 @@ class TournamentDetailView(DetailView, TournamentContextMixin):
                     'registrations_today': tournament.get_registrations_today()
                 },
                 'matches': {
-                    'total': tournament.matches.count(),
-                    'completed': tournament.matches.filter(status='completed').count(),
-                    'in_progress': tournament.matches.filter(status='in_progress').count(),
-                    'pending': tournament.matches.filter(status='pending').count(),
+                    'total': match_counts['total'],
+                    'completed': match_counts['completed'],
+                    'in_progress': match_counts['in_progress'],
+                    'pending': match_counts['pending'],
                 },
                 'timeline': {
                     'current_phase': self.get_current_phase(tournament),
@@ -1098,8 +1086,8 @@ class TournamentDetailView(DetailView, TournamentContextMixin):
         participant_stats = {
             'total_registered': tournament.total_registered,
             'total_checked_in': tournament.total_checked_in,
-            'pending_approval': tournament.participants.filter(status='pending').count(),
-            'pending_payment': tournament.participants.filter(status='pending_payment').count(),
+            'pending_approval': tournament.stats.participants['pending_approval'],
+            'pending_payment': tournament.stats.participants['pending_payment'],
         }
         
         # Get critical actions (Requirement 10.4)
@@ -1192,7 +1180,7 @@ class TournamentDetailView(DetailView, TournamentContextMixin):
         actions = []
         
         # Check for participants needing approval
-        pending_approval = tournament.participants.filter(status='pending').count()
+        pending_approval = tournament.stats.participants['pending_approval']
         if pending_approval > 0:
             actions.append({
                 'type': 'approval_needed',
@@ -1206,7 +1194,7 @@ class TournamentDetailView(DetailView, TournamentContextMixin):
             })
         
         # Check for payment issues
-        pending_payment = tournament.participants.filter(status='pending_payment').count()
+        pending_payment = tournament.stats.participants['pending_payment']
         if pending_payment > 0:
             actions.append({
                 'type': 'payment_pending',
@@ -1305,9 +1293,7 @@ class TournamentDetailView(DetailView, TournamentContextMixin):
     
     def get_registrations_today(self, tournament):
         """Get number of registrations in the last 24 hours"""
-        from django.utils import timezone
-        yesterday = timezone.now() - timezone.timedelta(days=1)
-        return tournament.participants.filter(registered_at__gte=yesterday).count()
+        return tournament.stats.participants['registrations_24h']
     
     def get_timeline_phases(self, tournament):
         """Get tournament phases for timeline display"""
@@ -1411,8 +1397,8 @@ class TournamentDetailView(DetailView, TournamentContextMixin):
             'preview_type': None,
             'rounds': [],
             'stats': {
-                'total_matches': tournament.matches.count(),
-                'completed_matches': tournament.matches.filter(status='completed').count(),
+                'total_matches': tournament.stats.matches['total'],
+                'completed_matches': tournament.stats.matches['completed'],
                 'current_round': 1
             }
         }
@@ -1861,8 +1847,7 @@ def tournament_register(request, slug):
 
         # Only increment total_registered if immediately confirmed (no payment required)
         if initial_status == 'confirmed':
-            tournament.total_registered += 1
-            tournament.save()
+            TournamentCounters.incr(tournament.id, 'total_registered')
             
             # Send registration confirmation notification
             try:
@@ -1903,8 +1888,7 @@ def tournament_unregister(request, slug):
     
     # Only decrement total_registered if participant was confirmed
     if participant.status == 'confirmed':
-        tournament.total_registered -= 1
-        tournament.save()
+        TournamentCounters.incr(tournament.id, 'total_registered', -1)
     
     participant.delete()
     
@@ -2108,74 +2092,90 @@ class BracketView(DetailView):
         return context
 
 
+@query_budget(5)
 def bracket_json(request, slug):
-    """Return bracket data as JSON for dynamic rendering"""
-    tournament = get_object_or_404(Tournament, slug=slug)
+    """
+    Return bracket data as JSON for dynamic rendering.
     
-    brackets_data = []
-    for bracket in tournament.brackets.all():
-        matches = []
-        for match in bracket.matches.select_related('participant1', 'participant2', 'winner'):
-            matches.append({
-                'id': str(match.id),
-                'round': match.round_number,
-                'match_number': match.match_number,
-                'participant1': {
-                    'id': str(match.participant1.id) if match.participant1 else None,
-                    'name': match.participant1.display_name if match.participant1 else 'TBD'
-                },
-                'participant2': {
-                    'id': str(match.participant2.id) if match.participant2 else None,
-                    'name': match.participant2.display_name if match.participant2 else 'TBD'
-                },
-                'score': {
-                    'p1': match.score_p1,
-                    'p2': match.score_p2
-                },
-                'winner_id': str(match.winner.id) if match.winner else None,
-                'status': match.status,
-                'is_grand_finals': match.is_grand_finals
-            })
-        
-        brackets_data.append({
-            'id': str(bracket.id),
-            'name': bracket.name,
-            'type': bracket.bracket_type,
-            'total_rounds': bracket.total_rounds,
-            'current_round': bracket.current_round,
-            'matches': matches
-        })
+    The bracket is served from a versioned snapshot (see bracket_snapshot)
+    with an ETag, so unchanged brackets answer 304. ``?since=<version>``
+    returns only the matches changed after that version, or the full
+    bracket (``full: true``) when the client is too far behind.
+    """
+    tournament = get_object_or_404(Tournament.objects.only('id'), slug=slug)
+    version = BracketSnapshot.get_version(tournament.id)
     
-    return JsonResponse({'brackets': brackets_data})
+    since = request.GET.get('since')
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            return JsonResponse({'error': 'since must be a bracket version'}, status=400)
+    
+    etag = BracketSnapshot.etag(tournament.id, version, *([f'since{since}'] if since is not None else []))
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    
+    changed = BracketSnapshot.changes_since(tournament.id, since, version) if since is not None else None
+    if changed is not None:
+        data = {'version': version, 'since': since, 'full': False, 'matches': changed}
+    else:
+        data = {**BracketSnapshot.get(tournament.id, version), 'full': True}
+    
+    response = JsonResponse(data)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
+    return response
 
 
 def bracket_partial(request, slug):
-    """Return partial bracket HTML for HTMX polling updates"""
+    """
+    Return partial bracket HTML for HTMX polling updates.
+    
+    Polls for an unchanged bracket version answer 304; the ETag includes the
+    viewer because report buttons depend on who is looking, and the
+    tournament's last update for organizer changes.
+    """
     tournament = get_object_or_404(Tournament, slug=slug)
     
-    # Get all brackets
-    brackets = tournament.brackets.all()
+    version = BracketSnapshot.get_version(tournament.id)
+    viewer = request.user.pk if request.user.is_authenticated else 'anon'
+    etag = BracketSnapshot.etag(
+        tournament.id, version, f'html-{viewer}', int(tournament.updated_at.timestamp())
+    )
+    not_modified = get_conditional_response(request, etag=etag)
+    if not_modified is not None:
+        return not_modified
+    
+    # Match counts come from the bracket query; all matches load in one query
+    brackets = tournament.brackets.annotate(
+        match_total=Count('matches'),
+        match_completed=Count('matches', filter=Q(matches__status='completed')),
+    ).prefetch_related(Prefetch(
+        'matches',
+        queryset=Match.objects.select_related(
+            'participant1__user', 'participant1__team',
+            'participant2__user', 'participant2__team', 'winner',
+        ).order_by('round_number', 'match_number')
+    ))
     
     # Get all matches organized by bracket and round
     matches_by_bracket = {}
     for bracket in brackets:
-        matches = bracket.matches.select_related(
-            'participant1', 'participant2', 'winner'
-        ).order_by('round_number', 'match_number')
-        
         rounds = {}
-        for match in matches:
-            if match.round_number not in rounds:
-                rounds[match.round_number] = []
-            rounds[match.round_number].append(match)
-        
+        for match in bracket.matches.all():
+            rounds.setdefault(match.round_number, []).append(match)
         matches_by_bracket[bracket.id] = rounds
     
-    return render(request, 'tournaments/bracket_partial.html', {
+    response = render(request, 'tournaments/bracket_partial.html', {
         'tournament': tournament,
         'brackets': brackets,
         'matches_by_bracket': matches_by_bracket,
     })
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
+    return response
 
 
 class MatchListView(ListView):
@@ -2353,8 +2353,7 @@ def tournament_payment(request, participant_id):
         # Confirm participant and increment count if this is their first payment
         if participant.status == 'pending_payment':
             participant.status = 'confirmed'
-            tournament.total_registered += 1
-            tournament.save()
+            TournamentCounters.incr(tournament.id, 'total_registered')
             
             # Send registration confirmation notification
             from .notifications import send_registration_confirmation
@@ -2485,8 +2484,7 @@ def stripe_success(request):
                     # Confirm participant and increment count if this is their first payment
                     if participant.status == 'pending_payment':
                         participant.status = 'confirmed'
-                        tournament.total_registered += 1
-                        tournament.save()
+                        TournamentCounters.incr(tournament.id, 'total_registered')
                         
                         # Send registration confirmation notification
                         from .notifications import send_registration_confirmation
@@ -2662,8 +2660,7 @@ def paystack_success(request):
                         # Confirm participant and increment count if this is their first payment
                         if participant.status == 'pending_payment':
                             participant.status = 'confirmed'
-                            tournament.total_registered += 1
-                            tournament.save()
+                            TournamentCounters.incr(tournament.id, 'total_registered')
                             
                             # Send registration confirmation notification
                             from .notifications import send_registration_confirmation
@@ -2755,7 +2752,7 @@ def generate_bracket(request, slug):
         # Update tournament status to in_progress if it's not already
         if tournament.status == 'check_in':
             tournament.status = 'in_progress'
-            tournament.save()
+            tournament.save(update_fields=['status', 'updated_at'])
         
         # Verify bracket was created
         if tournament.brackets.exists():
@@ -2873,7 +2870,7 @@ class ParticipantListView(LoginRequiredMixin, UserPassesTestMixin, ListView):
                         
                         # Update tournament total with safety check
                         tournament.total_checked_in = max(0, tournament.total_checked_in - 1)
-                        tournament.save()
+                        tournament.save(update_fields=['total_checked_in', 'updated_at'])
                         
                         messages.success(request, f'{participant.display_name} has been checked out')
                     else:
@@ -3001,8 +2998,8 @@ def tournament_stats_api(request, slug):
         },
         'progress': {
             'current_round': getattr(tournament.brackets.first(), 'current_round', 1) if tournament.brackets.exists() else 1,
-            'matches_completed': tournament.matches.filter(status='completed').count(),
-            'live_matches': tournament.matches.filter(status='in_progress').count(),
+            'matches_completed': tournament.stats.matches['completed'],
+            'live_matches': tournament.stats.matches['in_progress'],
             'checked_in': tournament.total_checked_in,
         },
         'last_updated': timezone.now().isoformat(),
@@ -3028,9 +3025,9 @@ def tournament_share(request, slug):
     else:
         ip_address = request.META.get('REMOTE_ADDR')
     
-    # Check rate limiting
+    # Check and count the share attempt against the rate limits
     user_id = request.user.id if request.user.is_authenticated else None
-    if ShareTrackingRateLimit.is_rate_limited(ip_address, user_id):
+    if ShareTrackingRateLimit.check_and_increment(ip_address, user_id):
         log_security_event(
             'SHARE_RATE_LIMITED',
             request.user,
@@ -3039,9 +3036,6 @@ def tournament_share(request, slug):
         )
         return JsonResponse({'error': 'Rate limit exceeded'}, status=429)
     
-    # Increment rate limit counters for every share attempt
-    ShareTrackingRateLimit.increment_rate_limit(ip_address, user_id)
-    
     # Track the share (avoid duplicates from same IP/user/platform within 1 hour)
     from django.utils import timezone
     from .models import TournamentShare
@@ -3069,9 +3063,8 @@ def tournament_share(request, slug):
             user_agent=request.META.get('HTTP_USER_AGENT', '')[:500]  # Limit user agent length
         )
         
-        # Increment tournament share count
-        tournament.share_count += 1
-        tournament.save(update_fields=['share_count'])
+        # Increment tournament share count (buffered, flushed with an F() update)
+        TournamentCounters.incr(tournament.id, 'share_count')
     
     # Generate share content
     tournament_url = request.build_absolute_uri(tournament.get_absolute_url())
@@ -3153,9 +3146,10 @@ def tournament_share_count(request, slug):
             'shared_by': share.shared_by.username if share.shared_by else None
         })
     
+    share_count = TournamentCounters.merged(tournament)['share_count']
     data = {
-        'count': tournament.share_count,  # For JavaScript compatibility
-        'total_shares': tournament.share_count,
+        'count': share_count,  # For JavaScript compatibility
+        'total_shares': share_count,
         'platform_breakdown': platform_counts,
         'recent_shares': recent_shares
     }